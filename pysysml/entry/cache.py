@@ -0,0 +1,32 @@
+import click
+
+from .base import CONTEXT_SETTINGS, command_wrap
+from ..kerml.cst import open_kerml_lark_parser, clear_parser_cache, list_cached_parsers, parser_cache_dir
+
+
+def _add_cache_subcommand(cli: click.Group) -> click.Group:
+    @cli.group('cache', help='Manage the on-disk cache of compiled KerML parsers.',
+               context_settings=CONTEXT_SETTINGS)
+    def cache():
+        pass  # pragma: no cover
+
+    @cache.command('warm', help='Build the KerML parser and save it to cache.',
+                   context_settings=CONTEXT_SETTINGS)
+    @click.option('-f', '--force', 'force', is_flag=True, default=False,
+                  help='Clear the existing cache before warming.', show_default=True)
+    @command_wrap()
+    def warm(force: bool):
+        if force:
+            clear_parser_cache()
+        open_kerml_lark_parser(use_cache=True)
+        click.echo(f'Parser cache is ready in {parser_cache_dir()!r}, '
+                   f'{len(list_cached_parsers())} file(s) in total.')
+
+    @cache.command('clear', help='Remove all the cached KerML parsers.',
+                   context_settings=CONTEXT_SETTINGS)
+    @command_wrap()
+    def clear():
+        count = clear_parser_cache()
+        click.echo(f'{count} cached parser(s) removed from {parser_cache_dir()!r}.')
+
+    return cli
@@ -1,9 +1,15 @@
 from .dispatch import pysysmlcli
+from .cache import _add_cache_subcommand
 from .health import _add_health_subcommand
+from .parse import _add_parse_subcommand
+from .validate import _add_validate_subcommand
 
 # add adding methods here
 _DECORATORS = [
     _add_health_subcommand,
+    _add_parse_subcommand,
+    _add_validate_subcommand,
+    _add_cache_subcommand,
 ]
 
 cli = pysysmlcli
@@ -1,3 +1,5 @@
+import os
+
 import click
 from click.core import Context, Option
 
@@ -43,4 +45,5 @@ def print_version(ctx: Context, param: Option, value: bool) -> None:
               callback=print_version, expose_value=False, is_eager=True,
               help="Show pysysml' version information.")
 def pysysmlcli():
-    pass  # pragma: no cover
+    # the CLI uses the on-disk parser cache unless it is disabled explicitly, see parser_cache_enabled
+    os.environ.setdefault('PYSYSML_PARSER_CACHE', '1')
@@ -0,0 +1,60 @@
+import sys
+
+import click
+
+from .base import CONTEXT_SETTINGS, command_wrap, ClickErrorException
+from ..kerml.cst import parse_many, list_kerml_files, RuleCoverage
+
+
+def _add_parse_subcommand(cli: click.Group) -> click.Group:
+    @cli.command('parse', help='Parse KerML files (or directories of them) and report the errors.',
+                 context_settings=CONTEXT_SETTINGS)
+    @click.argument('paths', nargs=-1, required=True, type=click.Path(exists=True))
+    @click.option('-j', '--jobs', 'jobs', type=int, default=None,
+                  help='Number of worker processes, default is the number of CPUs.')
+    @click.option('-p', '--parser', 'parser', type=click.Choice(['auto', 'lalr', 'earley']), default='auto',
+                  help='Parser mode.', show_default=True)
+    @click.option('--unordered', 'unordered', is_flag=True, default=False,
+                  help='Report the files as soon as they are parsed.', show_default=True)
+    @click.option('--recover', 'recover', is_flag=True, default=False,
+                  help='Recover from the syntax errors, and report all of them in each file.', show_default=True)
+    @click.option('--cache', 'use_cache', is_flag=True, default=False,
+                  help='Reuse the cached CSTs of the unchanged files.', show_default=True)
+    @click.option('--coverage', 'coverage', is_flag=True, default=False,
+                  help='Report the coverage of the grammar rules.', show_default=True)
+    @command_wrap()
+    def parse(paths, jobs, parser, unordered, recover, use_cache, coverage):
+        if jobs is not None and jobs <= 0:
+            raise click.BadParameter(f'Positive number expected, but {jobs!r} found.', param_hint='--jobs')
+        if coverage and (recover or use_cache):
+            raise click.BadOptionUsage('coverage', 'Coverage can not be used with --recover or --cache.')
+
+        files = list_kerml_files(paths)
+        failed, cached = 0, 0
+        total_coverage = RuleCoverage() if coverage else None
+        for result in parse_many(files, jobs=jobs, ordered=not unordered, parser=parser,
+                                 recover=recover, use_cache=use_cache, coverage=coverage):
+            if result.coverage is not None:
+                total_coverage.merge(result.coverage)
+            if result.ok:
+                cached += int(result.cached)
+                click.echo(f'OK    {result.path} ({result.seconds:.3f}s{", cached" if result.cached else ""})')
+            elif result.diagnostics:
+                failed += 1
+                click.secho(f'FAIL  {result.path} - {len(result.diagnostics)} syntax error(s)', fg='red', file=sys.stderr)
+                for diagnostic in result.diagnostics:
+                    click.secho(f'{result.path}:{diagnostic}', fg='red', file=sys.stderr)
+            else:
+                failed += 1
+                click.secho(f'FAIL  {result.path} - {result.error_type}: {result.error}', fg='red', file=sys.stderr)
+
+        click.echo(f'{len(files)} file(s) parsed, {failed} failed.')
+        if use_cache:
+            click.echo(f'{cached} file(s) loaded from cache.')
+        if total_coverage is not None:
+            click.echo(f'Grammar coverage: {len(total_coverage.covered)}/{len(total_coverage)} rule(s) '
+                       f'({total_coverage.ratio:.1%}).')
+        if failed:
+            raise ClickErrorException(f'Failed to parse {failed} file(s).')
+
+    return cli
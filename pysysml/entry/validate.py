@@ -0,0 +1,35 @@
+import sys
+
+import click
+
+from .base import CONTEXT_SETTINGS, command_wrap, ClickErrorException
+from ..kerml.ast import load_env, validate_parallel
+
+
+def _add_validate_subcommand(cli: click.Group) -> click.Group:
+    @cli.command('validate', help='Check the constraints of the elements in a KerML AST snapshot file. '
+                                  'The snapshot is unpickled, which can run arbitrary code, '
+                                  'so only validate the snapshots from a trusted source.',
+                 context_settings=CONTEXT_SETTINGS)
+    @click.argument('snapshot', type=click.Path(exists=True, dir_okay=False))
+    @click.option('-j', '--jobs', 'jobs', type=int, default=None,
+                  help='Number of worker processes, default is the number of CPUs.')
+    @command_wrap()
+    def validate(snapshot, jobs):
+        if jobs is not None and jobs <= 0:
+            raise click.BadParameter(f'Positive number expected, but {jobs!r} found.', param_hint='--jobs')
+
+        try:
+            env = load_env(snapshot)
+        except ValueError as err:
+            raise ClickErrorException(f'Invalid snapshot {snapshot!r} - {err}')
+        report = validate_parallel(env, jobs=jobs)
+        for violation in report.violations:
+            click.secho(f'FAIL  {violation}', fg='red', file=sys.stderr)
+
+        click.echo(f'{report.elements} element(s) validated in {report.partitions} partition(s) '
+                   f'({report.seconds:.3f}s), {len(report.violations)} violation(s).')
+        if report.violations:
+            raise ClickErrorException(f'Found {len(report.violations)} constraint violation(s).')
+
+    return cli
@@ -1,2 +1,5 @@
-from .base import Env, ElementNotFoundError, ConstraintsError, IElementID, EConn
+from .base import Env, ElementNotFoundError, ConstraintsError, ConstraintViolation, IElementID, EConn, \
+    SequentialIDAllocator, uuid_id_allocator, IncrementalMemo
 from .root import *
+from .snapshot import dumps_env, loads_env, save_env, load_env
+from .validate import validate_parallel, partition_env, ValidationReport
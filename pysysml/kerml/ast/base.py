@@ -1,11 +1,14 @@
 import uuid
 import weakref
-from abc import ABC
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from collections.abc import Sized
-from typing import Dict, Union, Optional, Iterator, TypeVar, Generic, Iterable, Type, Callable
+from dataclasses import dataclass
+from typing import Dict, Union, Optional, Iterator, TypeVar, Generic, Iterable, Type, Callable, Tuple, List
 
 from hbutils.string import plural_word
-from ordered_set import OrderedSet
+
+ElementIDTyping = Union[int, str]
 
 
 class ElementNotFoundError(Exception):
@@ -15,14 +18,409 @@ class ElementNotFoundError(Exception):
         self.key = key
 
 
+class SequentialIDAllocator:
+    """
+    Allocator of the element IDs, which are sequential integers.
+
+    Integer IDs are much smaller than UUID strings, and are cheaper to hash and compare,
+    so they are used as the keys of :class:`Env` and of all the :class:`EConn` sets.
+
+    :param start: First ID to allocate, default is ``1``.
+    :type start: int
+    """
+
+    def __init__(self, start: int = 1):
+        # a plain counter instead of itertools.count, so the allocator can be pickled with the env
+        self._next = start
+
+    def __call__(self) -> int:
+        element_id = self._next
+        self._next += 1
+        return element_id
+
+
+def uuid_id_allocator() -> str:
+    """
+    Allocator of the element IDs, which are UUID4 strings (the format of the IDs before
+    the sequential IDs are introduced).
+    """
+    return str(uuid.uuid4())
+
+
+_IDAllocatorTyping = Callable[[], ElementIDTyping]
+
+_CONJ_ADD = 'add'
+_CONJ_REMOVE = 'remove'
+
+# roles of the elements in the relationships, the sources are the outgoing ends and the targets are the incoming ends
+_ROLE_SOURCE = 'source'
+_ROLE_TARGET = 'target'
+_ROLES = (_ROLE_SOURCE, _ROLE_TARGET)
+
 T = TypeVar('T', bound='IElementID')
 
 
 class Env(Sized, Generic[T]):
-    def __init__(self):
-        self._elements: Dict[str, T] = {}
+    """
+    Environment of the elements, indexed by their IDs.
+
+    :param id_allocator: Allocator of the IDs of the elements without explicit ``element_id``,
+        called with no arguments for each new ID. Default is :class:`SequentialIDAllocator`.
+        Use :func:`uuid_id_allocator` for UUID strings as the IDs.
+    :type id_allocator: Optional[Callable[[], Union[int, str]]]
+    """
+
+    def __init__(self, id_allocator: Optional[_IDAllocatorTyping] = None):
+        self._elements: Dict[ElementIDTyping, T] = {}
+        self._id_allocator: _IDAllocatorTyping = id_allocator or SequentialIDAllocator()
+        self._export_ids: Dict[ElementIDTyping, str] = {}
+        self._batch_depth: int = 0
+        # (id of EConn, element ID, operation) -> (EConn, element), pending conjugate callbacks
+        self._pending_conj: Dict[Tuple[int, ElementIDTyping, str], Tuple['EConn', T]] = {}
+        # lookup name -> element IDs, element ID -> its lookup names, and the element IDs to reindex
+        self._name_index: Dict[str, Dict[ElementIDTyping, None]] = {}
+        self._indexed_names: Dict[ElementIDTyping, Tuple[str, ...]] = {}
+        self._dirty_names: Dict[ElementIDTyping, None] = {}
+        # version of the elements and their connections, and the memo of the values derived from this version
+        self._version: int = 0
+        self._memo: Dict[object, object] = {}
+        # memo of the values which are invalidated by the changed elements, and the element IDs changed since
+        # the values are invalidated last time (only tracked when there are such values)
+        self._incremental_memo: Dict[object, 'IncrementalMemo'] = {}
+        self._dirty_memo: Dict[ElementIDTyping, None] = {}
+        # element IDs whose constraints should be checked again, and the violations found in the last checks
+        self._dirty_constraints: Dict[ElementIDTyping, None] = {}
+        self._violations: Dict[ElementIDTyping, List['ConstraintViolation']] = {}
+        # type -> element IDs of exactly this type, and type -> the indexed types which are its subclasses
+        self._type_index: Dict[type, Dict[ElementIDTyping, None]] = {}
+        self._subtypes: Dict[type, Tuple[type, ...]] = {}
+        # (element ID, role) -> type of relationship -> IDs of the relationships with the element in the role
+        self._endpoint_index: Dict[Tuple[ElementIDTyping, str], Dict[type, Dict[ElementIDTyping, None]]] = {}
+
+    def __getstate__(self):
+        # the memo and the pending callbacks are not kept in the snapshots (see pysysml.kerml.ast.snapshot)
+        state = self.__dict__.copy()
+        state['_batch_depth'] = 0
+        state['_pending_conj'] = {}
+        state['_memo'] = {}
+        state['_incremental_memo'] = {}
+        state['_dirty_memo'] = {}
+        return state
+
+    def allocate_id(self) -> ElementIDTyping:
+        """
+        Allocate a new element ID, the IDs which are already used are skipped.
+        """
+        element_id = self._id_allocator()
+        while element_id in self._elements:
+            element_id = self._id_allocator()
+        return element_id
+
+    def export_id(self, key: Union[ElementIDTyping, T]) -> str:
+        """
+        Get the ID of the element to export, such as in the interchange files.
+
+        String IDs (the explicit ones, or the ones from a UUID allocator) are exported as they are.
+        A UUID4 string is generated on the first export of each non-string ID, and the same one
+        is returned afterwards.
+
+        :param key: Element or its ID.
+
+        :return: Exported ID.
+        :rtype: str
+        """
+        if isinstance(key, IElementID):
+            key = key.element_id
+        if isinstance(key, str):
+            return key
+        try:
+            return self._export_ids[key]
+        except KeyError:
+            export_id = self._export_ids[key] = str(uuid.uuid4())
+            return export_id
+
+    @contextmanager
+    def batch(self):
+        """
+        Defer the conjugate callbacks of the :class:`EConn` objects in this environment to the
+        end of the ``with`` block.
+
+        The deferred callbacks are deduplicated, and called in order when the outermost batch exits
+        (also when it exits with an error, so the connections are kept consistent). The callbacks
+        triggered by them are processed in the same way until there is none. A callback is skipped
+        when its change is reverted afterwards, such as an element added to and then removed from
+        the same connection, so its add callback is not called.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            try:
+                if self._batch_depth == 1:
+                    self._flush_conj()
+            finally:
+                self._batch_depth -= 1
+
+    def _defer_conj(self, conn: 'EConn', op: str, element_id: ElementIDTyping, element: T):
+        key = (id(conn), element_id, op)
+        if key not in self._pending_conj:
+            self._pending_conj[key] = (conn, element)
+
+    def _flush_conj(self):
+        while self._pending_conj:
+            pending, self._pending_conj = self._pending_conj, {}
+            for (_, element_id, op), (conn, element) in pending.items():
+                # skip the stale ones, which are reverted by the former callbacks
+                if op == _CONJ_ADD:
+                    if element_id in conn._set:
+                        conn._fn_add_conj(element)
+                else:
+                    if element_id not in conn._set:
+                        conn._fn_remove_conj(element)
+
+    @property
+    def version(self) -> int:
+        """
+        Version of this environment, which is increased on each change of the elements,
+        their connections and their names.
+        """
+        return self._version
+
+    def _touch(self):
+        self._version += 1
+        if self._memo:
+            self._memo = {}
+
+    @property
+    def memo(self) -> Dict[object, object]:
+        """
+        Memo of the values derived from the current :attr:`version`. It is dropped on each change,
+        so the values in it are never stale.
+        """
+        return self._memo
 
-    def __getitem__(self, key: Union[str, T]) -> T:
+    @property
+    def incremental_memo(self) -> Dict[object, 'IncrementalMemo']:
+        """
+        Memo of the values which are invalidated incrementally, such as the visible memberships of the
+        namespaces. Unlike :attr:`memo`, it is not dropped on each change. The elements are marked as
+        changed when they are created, deleted or replaced, or when their connections, names or owners
+        are changed (through the change hooks of :class:`EConn`), and the IDs of the changed elements are
+        passed to :meth:`IncrementalMemo.invalidate` of each value before the memo is returned.
+        """
+        if self._dirty_memo:
+            dirty, self._dirty_memo = list(self._dirty_memo), {}
+            for value in self._incremental_memo.values():
+                value.invalidate(dirty)
+        return self._incremental_memo
+
+    def _mark_memo_dirty(self, key: ElementIDTyping):
+        if self._incremental_memo:
+            self._dirty_memo[key] = None
+
+    def _mark_dirty(self, key: ElementIDTyping):
+        # the element is changed, so its constraints are checked again, and the values derived from it are invalidated
+        self._dirty_constraints[key] = None
+        self._mark_memo_dirty(key)
+
+    def _mark_names_dirty(self, key: ElementIDTyping):
+        self._dirty_names[key] = None
+
+    def _unindex_names(self, key: ElementIDTyping):
+        for name in self._indexed_names.pop(key, ()):
+            keys = self._name_index[name]
+            del keys[key]
+            if not keys:
+                del self._name_index[name]
+
+    def _reindex_names(self):
+        if not self._dirty_names:
+            return
+        dirty, self._dirty_names = list(self._dirty_names), {}
+        for i, key in enumerate(dirty):
+            element = self._elements.get(key)
+            if element is None:
+                continue
+            try:
+                names = tuple(element._lookup_names())
+            except BaseException:
+                # kept dirty, so they are indexed by the next lookup (such as after a cyclic ownership is fixed)
+                self._dirty_names.update(dict.fromkeys(dirty[i:]))
+                raise
+            self._unindex_names(key)
+            if names:
+                self._indexed_names[key] = names
+                for name in names:
+                    self._name_index.setdefault(name, {})[key] = None
+
+    def lookup_all(self, name: str) -> List[T]:
+        """
+        Find all the elements with the given qualified name.
+
+        The index of the names is updated incrementally, only the elements which are created,
+        renamed or moved since the last lookup are evaluated again.
+
+        :param name: Qualified name, such as ``A::B::'c d'``. The short names can be used as well
+            as the names, such as ``A::'+'`` for an element with the short name ``+``.
+        :type name: str
+
+        :return: Elements with the name, in the order they are indexed with it.
+        :rtype: List[T]
+        """
+        self._reindex_names()
+        return [self._elements[key] for key in self._name_index.get(name, ())]
+
+    def lookup(self, name: str) -> Optional[T]:
+        """
+        Find the element with the given qualified name, see :meth:`lookup_all`.
+
+        :param name: Qualified name.
+        :type name: str
+
+        :return: The first element indexed with the name, or ``None`` when not found.
+        :rtype: Optional[T]
+        """
+        self._reindex_names()
+        for key in self._name_index.get(name, ()):
+            return self._elements[key]
+        return None
+
+    def validate(self, incremental: bool = True) -> List['ConstraintViolation']:
+        """
+        Check the constraints of the elements, and collect the violations instead of raising
+        the first :class:`ConstraintsError`.
+
+        The elements are marked to be checked again when they are created, or when their
+        connections, names or owners are changed (through the change hooks of :class:`EConn`).
+        So the incremental validation after a small edit only checks the affected elements,
+        and the violations of the other elements are kept from the former validations.
+
+        :param incremental: Only check the elements changed since the last validation.
+            Default is ``True``. Check all the elements when ``False``.
+        :type incremental: bool
+
+        :return: Violations of all the elements.
+        :rtype: List[ConstraintViolation]
+        """
+        if not incremental:
+            self._violations = {}
+            self._dirty_constraints = dict.fromkeys(self._elements)
+        dirty, self._dirty_constraints = list(self._dirty_constraints), {}
+        for i, key in enumerate(dirty):
+            element = self._elements.get(key)
+            if element is None:
+                self._violations.pop(key, None)
+                continue
+            try:
+                violations = element._constraint_violations()
+            except BaseException:
+                # kept dirty, so they are checked by the next validation
+                self._dirty_constraints.update(dict.fromkeys(dirty[i:]))
+                raise
+            if violations:
+                self._violations[key] = violations
+            else:
+                self._violations.pop(key, None)
+
+        return [violation for violations in self._violations.values() for violation in violations]
+
+    def _index_type(self, key: ElementIDTyping, element: T):
+        type_ = type(element)
+        if type_ not in self._type_index:
+            self._type_index[type_] = {}
+            self._subtypes = {}
+        self._type_index[type_][key] = None
+
+    def _unindex_type(self, key: ElementIDTyping, element: T):
+        keys = self._type_index[type(element)]
+        del keys[key]
+
+    def _get_subtypes(self, type_: type) -> Tuple[type, ...]:
+        try:
+            return self._subtypes[type_]
+        except KeyError:
+            subtypes = self._subtypes[type_] = tuple(t for t in self._type_index if issubclass(t, type_))
+            return subtypes
+
+    def elements_of_type(self, type_: Type[T]) -> List[T]:
+        """
+        Find all the elements of the given type, including the ones of its subclasses.
+
+        The elements are indexed by their types, so the cost is proportional to the number of the
+        found elements (and of the distinct types in this environment), not to the size of it.
+
+        :param type_: Type of the elements, such as ``Dependency``.
+
+        :return: Elements of the type, grouped by their exact types. The elements of each type are
+            in the order they are added.
+        :rtype: List[T]
+        """
+        elements = self._elements
+        return [elements[key] for t in self._get_subtypes(type_) for key in self._type_index[t]]
+
+    def _index_endpoint(self, key: ElementIDTyping, role: str, relationship: T):
+        by_type = self._endpoint_index.setdefault((key, role), {})
+        by_type.setdefault(type(relationship), {})[relationship.element_id] = None
+
+    def _unindex_endpoint(self, key: ElementIDTyping, role: str, relationship: T):
+        by_type = self._endpoint_index.get((key, role))
+        if by_type is not None:
+            keys = by_type.get(type(relationship))
+            if keys is not None:
+                keys.pop(relationship.element_id, None)
+                if not keys:
+                    del by_type[type(relationship)]
+            if not by_type:
+                del self._endpoint_index[(key, role)]
+
+    def relationships_of(self, element: Union[ElementIDTyping, T], role: str,
+                         type_: Optional[Type[T]] = None) -> List[T]:
+        """
+        Find the relationships which have the element in the given role.
+
+        For example, all the ``Dependency`` relationships whose client is ``x`` are
+        ``env.relationships_of(x, 'source', Dependency)``, and all the ``Annotation`` relationships
+        annotating ``y`` are ``env.relationships_of(y, 'target', Annotation)``.
+
+        The relationships are indexed by their sources and targets when they are changed, so the
+        cost is proportional to the number of the found relationships.
+
+        :param element: Element or its ID.
+        :param role: ``source`` for the outgoing relationships of the element, or ``target`` for the
+            incoming ones.
+        :type role: str
+        :param type_: Type of the relationships, including its subclasses. All the relationships
+            are found when ``None``, which is the default.
+
+        :return: Relationships, grouped by their exact types. The relationships of each type are
+            in the order they are connected to the element.
+        :rtype: List[T]
+
+        :raises ValueError: Unknown role.
+        """
+        if role not in _ROLES:
+            raise ValueError(f'Unknown role, one of {_ROLES!r} expected but {role!r} found.')
+        if isinstance(element, IElementID):
+            element = element.element_id
+        by_type = self._endpoint_index.get((element, role))
+        if not by_type:
+            return []
+
+        elements = self._elements
+        return [
+            elements[key]
+            for t, keys in by_type.items() if type_ is None or issubclass(t, type_)
+            for key in keys
+        ]
+
+    def _unindex_element(self, key: ElementIDTyping, element: T):
+        # drops the element from all the indexes, when it is deleted or replaced
+        self._unindex_type(key, element)
+        for endpoint, role in element._endpoints():
+            self._unindex_endpoint(endpoint, role, element)
+        self._unindex_names(key)
+
+    def __getitem__(self, key: Union[ElementIDTyping, T]) -> T:
         if isinstance(key, IElementID):
             key = key.element_id
         if key in self._elements:
@@ -30,20 +428,38 @@ class Env(Sized, Generic[T]):
         else:
             raise ElementNotFoundError(self, key)
 
-    def __setitem__(self, key: Union[str, T], value: T):
+    def __setitem__(self, key: Union[ElementIDTyping, T], value: T):
         if isinstance(key, IElementID):
             key = key.element_id
         if isinstance(value, IElementID):
+            old_value = self._elements.get(key)
+            if old_value is not None:
+                self._unindex_element(key, old_value)
+                if old_value is not value:
+                    old_value._invalidate_referrers()
             self._elements[key] = value
+            self._index_type(key, value)
+            for endpoint, role in value._endpoints():
+                self._index_endpoint(endpoint, role, value)
+            self._dirty_names[key] = None
+            self._mark_dirty(key)
+            self._touch()
         else:
             raise TypeError(f'Element should be IElementID, but {value!r} given.')
 
-    def __delitem__(self, key: Union[str, T]):
+    def __delitem__(self, key: Union[ElementIDTyping, T]):
         if isinstance(key, IElementID):
             key = key.element_id
-        del self._elements[key]
-
-    def __contains__(self, key: Union[str, T]):
+        element = self._elements.pop(key)
+        self._unindex_element(key, element)
+        element._invalidate_referrers()
+        self._dirty_names.pop(key, None)
+        self._dirty_constraints.pop(key, None)
+        self._violations.pop(key, None)
+        self._mark_memo_dirty(key)
+        self._touch()
+
+    def __contains__(self, key: Union[ElementIDTyping, T]):
         if isinstance(key, IElementID):
             key = key.element_id
         return key in self._elements
@@ -58,54 +474,157 @@ class Env(Sized, Generic[T]):
         return f'<{self.__class__.__name__} {hex(id(self))}, {plural_word(len(self._elements), "item")}>'
 
 
+class IncrementalMemo(ABC):
+    """
+    Value in :attr:`Env.incremental_memo`, which drops the parts derived from the changed elements.
+    """
+
+    @abstractmethod
+    def invalidate(self, keys: List[ElementIDTyping]):
+        """
+        Drop the parts derived from the changed elements.
+
+        :param keys: IDs of the elements changed since the last call, including the deleted ones.
+        :type keys: List[ElementIDTyping]
+        """
+        raise NotImplementedError  # pragma: no cover
+
+
 class ConstraintsError(Exception):
     pass
 
 
+@dataclass
+class ConstraintViolation:
+    """
+    Violation of a constraint, found by :meth:`Env.validate`.
+
+    :param element_id: ID of the element which violates the constraint.
+    :param constraint: Name of the constraint, such as ``derive_element_owner``.
+    :param message: Message of the :class:`ConstraintsError`.
+    """
+    element_id: ElementIDTyping
+    constraint: str
+    message: str
+
+    def __str__(self):
+        return f'{self.element_id!r} {self.constraint}: {self.message}'
+
+
 class IElementID(ABC):
-    def __init__(self, env: Env, element_id: Optional[str] = None):
+    def __init__(self, env: Env, element_id: Optional[ElementIDTyping] = None):
         self._env_ref = weakref.ref(env)
-        self._element_id: str = element_id if element_id else str(uuid.uuid4())
-        self.env[self._element_id] = self
+        # an element already in the env with the given ID is replaced by this one,
+        # and the other elements referring to the ID refer to this one then
+        self._element_id: ElementIDTyping = element_id if element_id is not None else env.allocate_id()
+        env[self._element_id] = self
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_env_ref'] = self.env
+        return state
+
+    def __setstate__(self, state):
+        state['_env_ref'] = weakref.ref(state['_env_ref'])
+        self.__dict__.update(state)
 
     @property
     def env(self) -> Env:
         return self._env_ref()
 
     @property
-    def element_id(self) -> str:
+    def element_id(self) -> ElementIDTyping:
         return self._element_id
 
+    @property
+    def export_id(self) -> str:
+        return self.env.export_id(self._element_id)
 
-def _to_element_id(value: Union[str, IElementID]) -> str:
+    def __repr__(self):
+        # without the address, so the messages of the violations are the same in all the processes
+        return f'<{self.__class__.__name__} {self._element_id!r}>'
+
+    def _lookup_names(self) -> Iterable[str]:
+        # names of this element in the index of Env.lookup
+        return ()
+
+    def _constraint_violations(self) -> List[ConstraintViolation]:
+        # violations of the constraints of this element, checked by Env.validate
+        return []
+
+    def _endpoints(self) -> Iterable[Tuple[ElementIDTyping, str]]:
+        # (element ID, role) of the ends of this relationship in the index of Env.relationships_of
+        return ()
+
+    def _invalidate_referrers(self):
+        # called when this element is replaced in (or deleted from) the env, the values cached by the
+        # other elements may still refer to this one
+        pass
+
+
+def _to_element_id(value: Union[ElementIDTyping, IElementID]) -> ElementIDTyping:
     return value.element_id if isinstance(value, IElementID) else value
 
 
 _AddConjFuncTyping = Callable[[T], None]
 _RemoveConjFuncTyping = Callable[[T], None]
+_ChangedFuncTyping = Callable[[], None]
+_AddedFuncTyping = Callable[[T], None]
+_RemovedFuncTyping = Callable[[T], None]
 
 
 class EConn(Generic[T]):
     def __init__(self, env: Env, type_: Type[T] = IElementID,
-                 initial: Optional[Iterable[Union[str, T]]] = None,
+                 initial: Optional[Iterable[Union[ElementIDTyping, T]]] = None,
                  no_conj_when_init: bool = False,
                  fn_add_conj: Optional[_AddConjFuncTyping] = None,
-                 fn_remove_conj: Optional[_RemoveConjFuncTyping] = None):
+                 fn_remove_conj: Optional[_RemoveConjFuncTyping] = None,
+                 fn_changed: Optional[_ChangedFuncTyping] = None,
+                 fn_added: Optional[_AddedFuncTyping] = None,
+                 fn_removed: Optional[_RemovedFuncTyping] = None):
         self._env_ref = weakref.ref(env)
         self._type: Type[T] = type_
-        self._set = OrderedSet()
+        # insertion-ordered dict as the ordered set, removing is O(1) (it is O(n) in OrderedSet)
+        self._set: Dict[ElementIDTyping, None] = {}
         self._fn_add_conj = fn_add_conj
         self._fn_remove_conj = fn_remove_conj
+        # called right after each change of the elements, even when the conjugate callbacks are skipped or deferred
+        self._fn_changed = fn_changed
+        # called right after each element is added or removed, also when the conjugate callbacks are skipped or deferred
+        self._fn_added = fn_added
+        self._fn_removed = fn_removed
 
-        for element in (initial or []):
-            self.add(element, no_conj=no_conj_when_init)
+        if initial:
+            self.update_many(initial, no_conj=no_conj_when_init)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_env_ref'] = self.env
+        return state
+
+    def __setstate__(self, state):
+        state['_env_ref'] = weakref.ref(state['_env_ref'])
+        self.__dict__.update(state)
 
     @property
     def env(self) -> Env:
         return self._env_ref()
 
-    def _to_ielement(self, element_id: str) -> T:
-        return self.env[element_id]
+    def _to_ielement(self, element_id: ElementIDTyping) -> T:
+        env = self.env
+        try:
+            return env._elements[element_id]
+        except KeyError:
+            raise ElementNotFoundError(env, element_id) from None
+
+    def _conj(self, op: str, element_id: ElementIDTyping, element: T):
+        fn = self._fn_add_conj if op == _CONJ_ADD else self._fn_remove_conj
+        if fn is not None:
+            env = self.env
+            if env._batch_depth:
+                env._defer_conj(self, op, element_id, element)
+            else:
+                fn(element)
 
     def __len__(self) -> int:
         return len(self._set)
@@ -113,38 +632,107 @@ class EConn(Generic[T]):
     def __iter__(self) -> Iterator[T]:
         yield from (self._to_ielement(idx) for idx in self._set)
 
-    def __contains__(self, value: Union[str, T]) -> bool:
+    def __contains__(self, value: Union[ElementIDTyping, T]) -> bool:
         return _to_element_id(value) in self._set
 
-    def add(self, value: Union[T, str], no_conj: bool = False) -> 'EConn[T]':
+    def add(self, value: Union[T, ElementIDTyping], no_conj: bool = False) -> 'EConn[T]':
         element_id = _to_element_id(value)
         element = self._to_ielement(element_id)
         if not isinstance(element, self._type):
             raise TypeError(f'Element type {self._type!r} expected, but {element!r} found.')
         else:
             if element_id not in self._set:
-                self._set.add(element_id)
-                if not no_conj and self._fn_add_conj:
-                    self._fn_add_conj(element)
+                self._set[element_id] = None
+                self.env._touch()
+                if self._fn_added is not None:
+                    self._fn_added(element)
+                if self._fn_changed is not None:
+                    self._fn_changed()
+                if not no_conj:
+                    self._conj(_CONJ_ADD, element_id, element)
             return self
 
-    def update(self, values: Iterable[Union[T, str]], no_conj: bool = False) -> 'EConn[T]':
+    def update(self, values: Iterable[Union[T, ElementIDTyping]], no_conj: bool = False) -> 'EConn[T]':
         for item in values:
             self.add(item, no_conj=no_conj)
         return self
 
-    def remove(self, value: Union[T, str], no_conj: bool = False) -> 'EConn[T]':
+    def update_many(self, values: Iterable[Union[T, ElementIDTyping]], no_conj: bool = False) -> 'EConn[T]':
+        """
+        Add the elements in bulk.
+
+        All the elements are resolved and type-checked before any of them is added, so nothing
+        is changed when one of them is not found or has a wrong type. The conjugate callbacks of
+        the newly added elements are called once for each element after all of them are added,
+        or deferred to the end of :meth:`Env.batch`.
+
+        :param values: Elements or their IDs.
+        :param no_conj: Do not call the conjugate callbacks. Default is ``False``.
+        :type no_conj: bool
+
+        :return: This object.
+        """
+        env = self.env
+        elements = env._elements
+        new_items = {}
+        for value in values:
+            element_id = value.element_id if isinstance(value, IElementID) else value
+            if element_id not in self._set and element_id not in new_items:
+                try:
+                    new_items[element_id] = elements[element_id]
+                except KeyError:
+                    raise ElementNotFoundError(env, element_id) from None
+
+        type_ = self._type
+        for element in new_items.values():
+            if not isinstance(element, type_):
+                raise TypeError(f'Element type {type_!r} expected, but {element!r} found.')
+
+        if new_items:
+            self._set.update(dict.fromkeys(new_items))
+            env._touch()
+            if self._fn_added is not None:
+                for element in new_items.values():
+                    self._fn_added(element)
+            if self._fn_changed is not None:
+                self._fn_changed()
+        if not no_conj and self._fn_add_conj is not None:
+            for element_id, element in new_items.items():
+                self._conj(_CONJ_ADD, element_id, element)
+        return self
+
+    def remove(self, value: Union[T, ElementIDTyping], no_conj: bool = False) -> 'EConn[T]':
         element_id = _to_element_id(value)
         element = self._to_ielement(element_id)
         if element_id in self._set:
-            self._set.remove(element_id)
-            if not no_conj and self._fn_remove_conj:
-                self._fn_remove_conj(element)
+            del self._set[element_id]
+            self.env._touch()
+            if self._fn_removed is not None:
+                self._fn_removed(element)
+            if self._fn_changed is not None:
+                self._fn_changed()
+            if not no_conj:
+                self._conj(_CONJ_REMOVE, element_id, element)
         return self
 
+    def _remove_many(self, element_ids: Iterable[ElementIDTyping], no_conj: bool = False):
+        # the elements are all removed before the conjugate callbacks are called
+        removed = [(element_id, self._to_ielement(element_id)) for element_id in element_ids]
+        for element_id, _ in removed:
+            del self._set[element_id]
+        if removed:
+            self.env._touch()
+            if self._fn_removed is not None:
+                for _, element in removed:
+                    self._fn_removed(element)
+            if self._fn_changed is not None:
+                self._fn_changed()
+        if not no_conj and self._fn_remove_conj is not None:
+            for element_id, element in removed:
+                self._conj(_CONJ_REMOVE, element_id, element)
+
     def clear(self, no_conj: bool = False):
-        for element in list(self._set):
-            self.remove(element, no_conj=no_conj)
+        self._remove_many(list(self._set), no_conj=no_conj)
         return self
 
     def first(self) -> Optional[T]:
@@ -152,23 +740,23 @@ class EConn(Generic[T]):
             return self._to_ielement(element_id)
         return None
 
-    def set_to(self, element: Union[str, T], no_conj: bool = False):
+    def set_to(self, element: Union[ElementIDTyping, T], no_conj: bool = False):
         element_id = _to_element_id(element)
         element = self._to_ielement(element_id)
-        for e in list(self._set):
-            if e != element_id:
-                self.remove(e, no_conj=no_conj)
-        if element not in self:
+        others = [e for e in self._set if e != element_id]
+        if others:
+            self._remove_many(others, no_conj=no_conj)
+        if element_id not in self._set:
             self.add(element, no_conj=no_conj)
         return self
 
-    def is_subset(self, superset: Iterable[Union[str, T]]) -> bool:
+    def is_subset(self, superset: Iterable[Union[ElementIDTyping, T]]) -> bool:
         superset = {_to_element_id(e) for e in superset}
-        return self._set.issubset(superset)
+        return self._set.keys() <= superset
 
-    def is_superset(self, subset: Iterable[Union[str, T]]) -> bool:
+    def is_superset(self, subset: Iterable[Union[ElementIDTyping, T]]) -> bool:
         subset = {_to_element_id(e) for e in subset}
-        return self._set.issuperset(subset)
+        return self._set.keys() >= subset
 
     def __bool__(self) -> bool:
         return bool(self._set)
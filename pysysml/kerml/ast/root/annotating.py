@@ -1,7 +1,7 @@
 from typing import Optional, List, Union
 
 from .base import Element, Relationship
-from ..base import Env, EConn
+from ..base import Env, EConn, ElementIDTyping
 
 
 class AnnotatingElement(Element):
@@ -14,12 +14,12 @@ class AnnotatingElement(Element):
             declared_short_name: Optional[str] = None,
             is_implied_included: bool = False,
 
-            annotations: Optional[List[Union[str, 'Annotation']]] = None,
-            owning_relationship: Optional[Union[str, 'Relationship']] = None,
-            owned_relationships: Optional[List[Union[str, 'Relationship']]] = None,
+            annotations: Optional[List[Union[ElementIDTyping, 'Annotation']]] = None,
+            owning_relationship: Optional[Union[ElementIDTyping, 'Relationship']] = None,
+            owned_relationships: Optional[List[Union[ElementIDTyping, 'Relationship']]] = None,
             no_conj_when_init: bool = False,
 
-            element_id: Optional[str] = None,
+            element_id: Optional[ElementIDTyping] = None,
     ):
         Element.__init__(
             self,
@@ -85,15 +85,15 @@ class Annotation(Relationship):
             declared_short_name: Optional[str] = None,
             is_implied_included: bool = False,
 
-            annotating_elements: Optional[List[Union[str, Element]]] = None,
-            annotated_elements: Optional[List[Union[str, Element]]] = None,
-            owning_related_element: Optional[Union[str, Element]] = None,
-            owned_related_elements: Optional[List[Union[str, Element]]] = None,
-            owning_relationship: Optional[Union[str, 'Relationship']] = None,
-            owned_relationships: Optional[List[Union[str, 'Relationship']]] = None,
+            annotating_elements: Optional[List[Union[ElementIDTyping, Element]]] = None,
+            annotated_elements: Optional[List[Union[ElementIDTyping, Element]]] = None,
+            owning_related_element: Optional[Union[ElementIDTyping, Element]] = None,
+            owned_related_elements: Optional[List[Union[ElementIDTyping, Element]]] = None,
+            owning_relationship: Optional[Union[ElementIDTyping, 'Relationship']] = None,
+            owned_relationships: Optional[List[Union[ElementIDTyping, 'Relationship']]] = None,
             no_conj_when_init: bool = False,
 
-            element_id: Optional[str] = None
+            element_id: Optional[ElementIDTyping] = None
     ):
         Relationship.__init__(
             self,
@@ -1,13 +1,66 @@
 import re
-from typing import List, Optional, Union
+from functools import wraps, partial
+from typing import List, Optional, Union, Callable, Any, Iterable, Tuple
 
-from ..base import Env, IElementID, ConstraintsError, EConn
+from ..base import Env, IElementID, ConstraintsError, ConstraintViolation, EConn, ElementIDTyping, \
+    _ROLE_SOURCE, _ROLE_TARGET
 
 
 def _is_basic_name(name: str) -> bool:
     return bool(re.fullmatch(r'^[a-zA-Z_][a-zA-Z\d_]*$', name))
 
 
+def _escape_name(name: str) -> str:
+    return name if _is_basic_name(name) else repr(name)
+
+
+_MISSING = object()
+
+# derived values which depend on the owned relationships, and the ones which depend on the owning relationship
+_OWNED_DERIVED = ('owned_elements', 'documentations', 'textual_representations', 'owned_annotations',
+                  'owned_memberships', 'owned_imports')
+_OWNER_DERIVED = ('owner', 'owning_membership', 'owning_namespace')
+
+
+def _derived_property(func: Callable[[Any], Any]) -> property:
+    # cached in the _derived dict of the element, until it is invalidated by the changes of the relationships
+    name = func.__name__
+
+    @wraps(func)
+    def _get(self):
+        value = self._derived.get(name, _MISSING)
+        if value is _MISSING:
+            value = self._derived[name] = func(self)
+        return value
+
+    return property(_get)
+
+
+def _derived_list_property(func: Callable[[Any], List[Any]]) -> property:
+    # a copy is returned, so the cached list is not changed by the callers
+    name = func.__name__
+
+    @wraps(func)
+    def _get(self):
+        value = self._derived.get(name)
+        if value is None:
+            value = self._derived[name] = func(self)
+        return list(value)
+
+    return property(_get)
+
+
+def _replaced_element(env: Env, element_id: Optional[ElementIDTyping]) -> Optional[IElementID]:
+    # the element replaced by the one created with the given ID
+    return env._elements.get(element_id) if element_id is not None else None
+
+
+def _existing_ids(conn: EConn) -> List[ElementIDTyping]:
+    # IDs in the connection, without the ones already deleted from the env
+    elements = conn.env._elements
+    return [key for key in conn._set if key in elements]
+
+
 # noinspection PyUnresolvedReferences
 class Element(IElementID):
     def __init__(
@@ -19,12 +72,15 @@ class Element(IElementID):
             declared_short_name: Optional[str] = None,
             is_implied_included: bool = False,
 
-            owning_relationship: Optional[Union[str, 'Relationship']] = None,
-            owned_relationships: Optional[List[Union[str, 'Relationship']]] = None,
+            owning_relationship: Optional[Union[ElementIDTyping, 'Relationship']] = None,
+            owned_relationships: Optional[List[Union[ElementIDTyping, 'Relationship']]] = None,
             no_conj_when_init: bool = False,
 
-            element_id: Optional[str] = None,
+            element_id: Optional[ElementIDTyping] = None,
     ):
+        # Cached derived values, see _derived_property.
+        self._derived = {}
+        replaced = _replaced_element(env, element_id)
         super().__init__(env, element_id)
 
         # Various alternative identifiers for this Element. Generally, these will be set by tools.
@@ -43,17 +99,94 @@ class Element(IElementID):
             env=self.env, type_=Relationship,
             fn_add_conj=self._fn_add_to_owning_relationship,
             fn_remove_conj=self._fn_remove_from_owning_relationship,
+            fn_changed=self._invalidate_owner_derived,
         )
         self._owned_relationships: EConn['Relationship'] = EConn(
             env=self.env, type_=Relationship,
             fn_add_conj=self._fn_add_to_owned_relationship,
             fn_remove_conj=self._fn_remove_from_owned_relationship,
+            fn_changed=self._invalidate_owned_derived,
         )
+        if isinstance(replaced, Element):
+            # the relationships of the replaced element still refer to its ID, so they are kept
+            self._owning_relationships.update_many(_existing_ids(replaced._owning_relationships), no_conj=True)
+            self._owned_relationships.update_many(_existing_ids(replaced._owned_relationships), no_conj=True)
         if owning_relationship:
             self._owning_relationships.set_to(owning_relationship, no_conj=no_conj_when_init)
         self._owned_relationships.update(owned_relationships or [], no_conj=no_conj_when_init)
 
+    def __getstate__(self):
+        # the cached derived values refer to the other elements, they are derived again after loading
+        state = IElementID.__getstate__(self)
+        state['_derived'] = {}
+        return state
+
     @property
+    def declared_name(self) -> Optional[str]:
+        return self._declared_name
+
+    @declared_name.setter
+    def declared_name(self, value: Optional[str]):
+        self._declared_name = value
+        self._invalidate_name()
+        self.env._touch()
+
+    @property
+    def declared_short_name(self) -> Optional[str]:
+        return self._declared_short_name
+
+    @declared_short_name.setter
+    def declared_short_name(self, value: Optional[str]):
+        self._declared_short_name = value
+        self._invalidate_name()
+        self.env._touch()
+
+    def _invalidate_owned_derived(self):
+        for name in _OWNED_DERIVED:
+            self._derived.pop(name, None)
+        self.env._mark_dirty(self.element_id)
+
+    def _invalidate_owner_derived(self):
+        for name in _OWNER_DERIVED:
+            self._derived.pop(name, None)
+        self.env._mark_dirty(self.element_id)
+        self._invalidate_qualified_name()
+
+    def _invalidate_referrers(self):
+        # the owner of this element caches it in the owned elements, and the owned relationships
+        # (and the members owned by them) cache it as the owner (or the owning namespace)
+        elements = self.env._elements
+        for key in _existing_ids(self._owning_relationships):
+            elements[key]._invalidate_owning_element_derived()
+        for key in _existing_ids(self._owned_relationships):
+            relationship = elements[key]
+            relationship._invalidate_owner_derived()
+            relationship._invalidate_owned_elements_derived()
+
+    def _invalidate_name(self):
+        # the names of the owning membership (such as in the name tables of the namespaces) are the ones of
+        # this element, the owning relationships are not initialized yet when the names are set in __init__
+        owning_relationships = getattr(self, '_owning_relationships', None)
+        if owning_relationships is not None:
+            for key in _existing_ids(owning_relationships):
+                self.env._mark_dirty(key)
+        self._invalidate_qualified_name()
+
+    def _invalidate_qualified_name(self):
+        # the qualified name of an element is only cached after the one of its owning namespace
+        # (see _compute_qualified_name), so the subtrees without cached names are skipped
+        # (the names in the index of Env.lookup, and their constraints, are derived from the qualified names as well)
+        env = self.env
+        env._mark_dirty(self.element_id)
+        stack = [self]
+        while stack:
+            element = stack.pop()
+            if element._derived.pop('qualified_name', _MISSING) is not _MISSING:
+                env._mark_names_dirty(element.element_id)
+                env._mark_dirty(element.element_id)
+                stack.extend(element.owned_elements)
+
+    @_derived_list_property
     def documentations(self) -> List["Documentation"]:
         from .annotating import Documentation
         return [item for item in self.owned_elements if isinstance(item, Documentation)]
@@ -69,26 +202,26 @@ class Element(IElementID):
     def _get_name(self):
         return self.effective_name()
 
-    @property
+    @_derived_list_property
     def owned_annotations(self) -> List["Annotation"]:
         from .annotating import Annotation
         return [item for item in self.owned_relationships if isinstance(item, Annotation)]
 
-    @property
+    @_derived_list_property
     def owned_elements(self) -> List["Element"]:
         retval = []
         for relationship in self.owned_relationships:
             retval.extend(relationship.owned_related_elements)
         return retval
 
-    @property
+    @_derived_property
     def owner(self) -> Optional["Element"]:
         if self.owning_relationship:
             return self.owning_relationship.owning_related_element
         else:
             return None
 
-    @property
+    @_derived_property
     def owning_membership(self) -> Optional["OwningMembership"]:
         from .namespace import OwningMembership
         owning_relationship = self.owning_relationship
@@ -97,7 +230,7 @@ class Element(IElementID):
         else:
             return None
 
-    @property
+    @_derived_property
     def owning_namespace(self) -> Optional["Namespace"]:
         from .namespace import Namespace
         owning_membership: Optional[Namespace] = self.owning_membership
@@ -110,7 +243,8 @@ class Element(IElementID):
         relationship.owning_related_element = self
 
     def _fn_remove_from_owned_relationship(self, relationship: 'Relationship'):
-        relationship.owning_related_element = None
+        # only this element is removed, so a new owner set in the same Env.batch is kept
+        relationship._owning_related_elements.remove(self)
 
     @property
     def owned_relationships(self) -> EConn['Relationship']:
@@ -127,15 +261,14 @@ class Element(IElementID):
         return self._owning_relationships.first()
 
     @owning_relationship.setter
-    def owning_relationship(self, value: Optional[Union[str, 'Relationship']]):
+    def owning_relationship(self, value: Optional[Union[ElementIDTyping, 'Relationship']]):
         if value is not None:
             self._owning_relationships.set_to(value)
         else:
             self._owning_relationships.clear()
 
-    @property
+    @_derived_property
     def qualified_name(self) -> Optional[str]:
-        from .namespace import Namespace
         return self._compute_qualified_name()
 
     @property
@@ -145,7 +278,7 @@ class Element(IElementID):
     def _get_short_name(self):
         return self.effective_short_name()
 
-    @property
+    @_derived_list_property
     def textual_representations(self) -> List["TextualRepresentation"]:
         from .annotating import TextualRepresentation
         return [item for item in self.owned_elements if isinstance(item, TextualRepresentation)]
@@ -160,29 +293,50 @@ class Element(IElementID):
         name = self.name or self.short_name
         if name is None:
             return None
-        if _is_basic_name(name):
-            return name
-        else:
-            return repr(name)
+        return _escape_name(name)
 
     def library_namespace(self) -> Optional["Namespace"]:
         if self.owning_relationship:
             return self.owning_relationship.library_namespace()
         return None
 
+    def _constraint_checks(self) -> List[Callable[[], None]]:
+        # the checks raise ConstraintsError when violated, they are named as _check_<constraint>
+        return [
+            self._check_num_owning_relationships,
+            self._check_derive_element_documentation,
+            self._check_derive_element_is_library_element,
+            self._check_derive_element_name,
+            self._check_derive_element_owned_annotation,
+            self._check_derive_element_owned_element,
+            self._check_derive_element_owner,
+            self._check_derive_element_qualified_name,
+            self._check_derive_element_short_name,
+            self._check_derive_element_textual_representation,
+            self._check_derive_owning_namespace,
+            self._check_validate_element_is_implied_included,
+        ]
+
     def check_constraints(self):
-        self._check_num_owning_relationships()
-        self._check_derive_element_documentation()
-        self._check_derive_element_is_library_element()
-        self._check_derive_element_name()
-        self._check_derive_element_owned_annotation()
-        self._check_derive_element_owned_element()
-        self._check_derive_element_owner()
-        self._check_derive_element_qualified_name()
-        self._check_derive_element_short_name()
-        self._check_derive_element_textual_representation()
-        self._check_derive_owning_namespace()
-        self._check_validate_element_is_implied_included()
+        """
+        Check all constraints of this element.
+        Raises ConstraintsError when the first one is not satisfied.
+        """
+        for check in self._constraint_checks():
+            check()
+
+    def _constraint_violations(self) -> List[ConstraintViolation]:
+        violations = []
+        for check in self._constraint_checks():
+            try:
+                check()
+            except ConstraintsError as err:
+                violations.append(ConstraintViolation(
+                    element_id=self.element_id,
+                    constraint=check.__name__[len('_check_'):],
+                    message=str(err),
+                ))
+        return violations
 
     def _check_num_owning_relationships(self):
         if len(self._owning_relationships) > 1:
@@ -255,14 +409,34 @@ class Element(IElementID):
         if self.qualified_name != expected_qualified_name:
             raise ConstraintsError("QualifiedName constraint violated")
 
+    def _lookup_names(self) -> List[str]:
+        names = []
+        qualified_name = self.qualified_name
+        if qualified_name is not None:
+            names.append(qualified_name)
+
+        # the short name can be used in place of the name
+        short_name, name = self.short_name, self.name
+        if short_name is not None and name is not None and short_name != name:
+            owning_namespace = self.owning_namespace
+            if owning_namespace is not None:
+                if owning_namespace.owner is None:
+                    names.append(_escape_name(short_name))
+                elif owning_namespace.qualified_name is not None:
+                    names.append(f'{owning_namespace.qualified_name}::{_escape_name(short_name)}')
+        return names
+
     def _compute_qualified_name(self) -> Optional[str]:
-        if not self.owning_namespace:
+        owning_namespace = self.owning_namespace
+        if not owning_namespace:
             return None
-        if self.owning_namespace.owner is None:
+        # always evaluated first, so the qualified name of the owning namespace is cached before this one
+        namespace_qualified_name = owning_namespace.qualified_name
+        if owning_namespace.owner is None:
             return self.escaped_name()
-        if self.owning_namespace.qualified_name is None or self.escaped_name() is None:
+        if namespace_qualified_name is None or self.escaped_name() is None:
             return None
-        return f"{self.owning_namespace.qualified_name}::{self.escaped_name()}"
+        return f"{namespace_qualified_name}::{self.escaped_name()}"
 
     def _check_derive_element_short_name(self):
         """
@@ -309,16 +483,17 @@ class Relationship(Element):
             declared_short_name: Optional[str] = None,
             is_implied_included: bool = False,
 
-            sources: Optional[List[Union[str, Element]]] = None,
-            targets: Optional[List[Union[str, Element]]] = None,
-            owning_related_element: Optional[Union[str, Element]] = None,
-            owned_related_elements: Optional[List[Union[str, Element]]] = None,
-            owning_relationship: Optional[Union[str, 'Relationship']] = None,
-            owned_relationships: Optional[List[Union[str, 'Relationship']]] = None,
+            sources: Optional[List[Union[ElementIDTyping, Element]]] = None,
+            targets: Optional[List[Union[ElementIDTyping, Element]]] = None,
+            owning_related_element: Optional[Union[ElementIDTyping, Element]] = None,
+            owned_related_elements: Optional[List[Union[ElementIDTyping, Element]]] = None,
+            owning_relationship: Optional[Union[ElementIDTyping, 'Relationship']] = None,
+            owned_relationships: Optional[List[Union[ElementIDTyping, 'Relationship']]] = None,
             no_conj_when_init: bool = False,
 
-            element_id: Optional[str] = None
+            element_id: Optional[ElementIDTyping] = None
     ):
+        replaced = _replaced_element(env, element_id)
         Element.__init__(
             self,
             env=env,
@@ -337,23 +512,34 @@ class Relationship(Element):
             env=self.env, type_=Element,
             no_conj_when_init=no_conj_when_init,
             initial=list(sources or []),
+            fn_changed=self._invalidate_related_elements,
+            fn_added=partial(self._fn_endpoint_added, _ROLE_SOURCE),
+            fn_removed=partial(self._fn_endpoint_removed, _ROLE_SOURCE),
         )
         self._targets: EConn[Element] = EConn(
             env=self.env, type_=Element,
             no_conj_when_init=no_conj_when_init,
             initial=list(targets or []),
+            fn_changed=self._invalidate_related_elements,
+            fn_added=partial(self._fn_endpoint_added, _ROLE_TARGET),
+            fn_removed=partial(self._fn_endpoint_removed, _ROLE_TARGET),
         )
 
         self._owned_related_elements: EConn[Element] = EConn(
             env=self.env, type_=Element,
             fn_add_conj=self._fn_add_to_owned_related_element,
             fn_remove_conj=self._fn_remove_from_owned_related_element,
+            fn_changed=self._invalidate_owning_element_derived,
         )
         self._owning_related_elements: EConn[Element] = EConn(
             env=self.env, type_=Element,
             fn_add_conj=self._fn_add_to_owning_related_element,
             fn_remove_conj=self._fn_remove_from_owning_related_element,
+            fn_changed=self._invalidate_owned_elements_derived,
         )
+        if isinstance(replaced, Relationship):
+            self._owned_related_elements.update_many(_existing_ids(replaced._owned_related_elements), no_conj=True)
+            self._owning_related_elements.update_many(_existing_ids(replaced._owning_related_elements), no_conj=True)
         self._owned_related_elements.update(owned_related_elements or [], no_conj=no_conj_when_init)
         if owning_related_element:
             self._owning_related_elements.set_to(owning_related_element, no_conj=no_conj_when_init)
@@ -374,11 +560,54 @@ class Relationship(Element):
     def related_elements(self) -> List[Element]:
         return [*self._sources, *self.targets]
 
+    def _fn_endpoint_added(self, role: str, element: Element):
+        self.env._index_endpoint(element.element_id, role, self)
+
+    def _fn_endpoint_removed(self, role: str, element: Element):
+        self.env._unindex_endpoint(element.element_id, role, self)
+
+    def _endpoints(self) -> Iterable[Tuple[ElementIDTyping, str]]:
+        # the sources and targets are not initialized yet when this relationship is added to the env
+        for role, conn in ((_ROLE_SOURCE, getattr(self, '_sources', None)),
+                           (_ROLE_TARGET, getattr(self, '_targets', None))):
+            if conn is not None:
+                yield from ((element_id, role) for element_id in conn._set)
+
+    def _invalidate_related_elements(self):
+        # the owned annotations of the owning related element depend on the related elements as well,
+        # which are not initialized yet when the sources and targets are
+        env = self.env
+        env._mark_dirty(self.element_id)
+        owning_related_elements = getattr(self, '_owning_related_elements', None)
+        if owning_related_elements is not None:
+            for element in owning_related_elements:
+                env._mark_dirty(element.element_id)
+
+    def _invalidate_referrers(self):
+        Element._invalidate_referrers(self)
+        elements = self.env._elements
+        for key in _existing_ids(self._owning_related_elements):
+            elements[key]._invalidate_owned_derived()
+        for key in _existing_ids(self._owned_related_elements):
+            elements[key]._invalidate_owner_derived()
+
+    def _invalidate_owning_element_derived(self):
+        self.env._mark_dirty(self.element_id)
+        owning_related_element = self.owning_related_element
+        if owning_related_element is not None:
+            owning_related_element._invalidate_owned_derived()
+
+    def _invalidate_owned_elements_derived(self):
+        self.env._mark_dirty(self.element_id)
+        for element in self._owned_related_elements:
+            element._invalidate_owner_derived()
+
     def _fn_add_to_owned_related_element(self, element: Element):
         element.owning_relationship = self
 
     def _fn_remove_from_owned_related_element(self, element: Element):
-        element.owning_relationship = None
+        # only this relationship is removed, so a new owner set in the same Env.batch is kept
+        element._owning_relationships.remove(self)
 
     @property
     def owned_related_elements(self) -> EConn[Element]:
@@ -395,7 +624,7 @@ class Relationship(Element):
         return self._owning_related_elements.first()
 
     @owning_related_element.setter
-    def owning_related_element(self, value: Optional[Union[str, Element]]):
+    def owning_related_element(self, value: Optional[Union[ElementIDTyping, Element]]):
         if value is not None:
             self._owning_related_elements.set_to(value)
         else:
@@ -411,16 +640,14 @@ class Relationship(Element):
             return owning_relationship.library_namespace()
         return None
 
-    def check_constraints(self):
-        """
-        Check all constraints for the Relationship.
-        Raises ConstraintsError if any constraint is not satisfied.
-        """
-        Element.check_constraints(self)
-        self._check_num_owning_related_element()
-        self._check_derive_relationship_related_element()
-        self._check_consistence_of_owned_related_element()
-        self._check_consistence_of_owning_related_element()
+    def _constraint_checks(self) -> List[Callable[[], None]]:
+        return [
+            *Element._constraint_checks(self),
+            self._check_num_owning_related_element,
+            self._check_derive_relationship_related_element,
+            self._check_consistence_of_owned_related_element,
+            self._check_consistence_of_owning_related_element,
+        ]
 
     def _check_num_owning_related_element(self):
         if len(self._owning_related_elements) > 1:
@@ -1,7 +1,7 @@
-from typing import Optional, List, Union
+from typing import Optional, List, Union, Callable
 
 from .base import Relationship, ConstraintsError, Element
-from ..base import Env, EConn
+from ..base import Env, EConn, ElementIDTyping
 
 
 class Dependency(Relationship):
@@ -15,15 +15,15 @@ class Dependency(Relationship):
             declared_short_name: Optional[str] = None,
             is_implied_included: bool = False,
 
-            clients: Optional[List[Union[str, Element]]] = None,
-            suppliers: Optional[List[Union[str, Element]]] = None,
-            owning_related_element: Optional[Union[str, Element]] = None,
-            owned_related_elements: Optional[List[Union[str, Element]]] = None,
-            owning_relationship: Optional[Union[str, 'Relationship']] = None,
-            owned_relationships: Optional[List[Union[str, 'Relationship']]] = None,
+            clients: Optional[List[Union[ElementIDTyping, Element]]] = None,
+            suppliers: Optional[List[Union[ElementIDTyping, Element]]] = None,
+            owning_related_element: Optional[Union[ElementIDTyping, Element]] = None,
+            owned_related_elements: Optional[List[Union[ElementIDTyping, Element]]] = None,
+            owning_relationship: Optional[Union[ElementIDTyping, 'Relationship']] = None,
+            owned_relationships: Optional[List[Union[ElementIDTyping, 'Relationship']]] = None,
             no_conj_when_init: bool = False,
 
-            element_id: Optional[str] = None
+            element_id: Optional[ElementIDTyping] = None
     ):
         Relationship.__init__(
             self,
@@ -62,7 +62,9 @@ class Dependency(Relationship):
         if len(self.suppliers) < 1:
             raise ConstraintsError('Dependency should have no less than 1 supplier.')
 
-    def check_constraints(self):
-        super().check_constraints()
-        self._check_num_of_clients()
-        self._check_num_of_suppliers()
+    def _constraint_checks(self) -> List[Callable[[], None]]:
+        return [
+            *super()._constraint_checks(),
+            self._check_num_of_clients,
+            self._check_num_of_suppliers,
+        ]
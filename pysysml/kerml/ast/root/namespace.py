@@ -1,32 +1,679 @@
+"""
+Namespaces, memberships and imports of KerML, and the resolution of the qualified names.
+
+The visible memberships of the namespaces are computed lazily, and memoized in :attr:`Env.incremental_memo`.
+The (kind, namespace) nodes which depend on each other through the imports are grouped into the strongly
+connected components of the import graph, and each component is evaluated once after the ones it depends on.
+All the nodes in an import cycle see the same memberships, so the cycles are resolved without enumerating
+the import paths. The memberships of a component, and the table of their names, are shared by all its nodes,
+and each node only keeps its own local memberships (which are placed first), so the tables of all the
+namespaces in a model are built in time linear to their sizes.
+
+When the elements are changed, only the nodes which read them, and the nodes depending on those ones
+through the import graph, are evaluated again.
+"""
+
+import ast
+import re
 from enum import Enum, unique
+from typing import Optional, List, Union, Sequence, Dict, Tuple
+
+from .base import Element, Relationship, _derived_list_property, _escape_name
+from ..base import Env, ElementIDTyping, IncrementalMemo
+
+
+@unique
+class VisibilityKind(Enum):
+    PUBLIC = 'public'
+    PRIVATE = 'private'
+    PROTECTED = 'protected'
+
+
+_NAME_PATTERN = re.compile(r"""\s*('(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|[^\s:'"]+)\s*(::|$)""")
+
+
+def _split_qualified_name(qualified_name: str) -> List[str]:
+    # the unrestricted names are unquoted, so they can be compared with the names of the elements
+    names, position = [], 0
+    while position < len(qualified_name):
+        match = _NAME_PATTERN.match(qualified_name, position)
+        if not match or (match.group(2) and match.end() == len(qualified_name)):
+            raise ValueError(f'Invalid qualified name - {qualified_name!r}.')
+        name = match.group(1)
+        names.append(ast.literal_eval(name) if name[0] in '\'"' else name)
+        position = match.end()
+    return names
+
+
+# node of the visibility graph, (kind, namespace, include all)
+_Node = Tuple[str, 'Namespace', bool]
+_VISIBLE = 'visible'
+_RECURSIVE = 'recursive'
+_IMPORTED = 'imported'
 
-from .base import Element, Relationship
+_RESOLUTION_MEMO = 'namespace.resolution'
 
 
 class Namespace(Element):
-    pass
+    @_derived_list_property
+    def owned_memberships(self) -> List['Membership']:
+        return [item for item in self.owned_relationships if isinstance(item, Membership)]
+
+    @_derived_list_property
+    def owned_imports(self) -> List['Import']:
+        return [item for item in self.owned_relationships if isinstance(item, Import)]
+
+    @property
+    def owned_members(self) -> List[Element]:
+        return [
+            membership.member_element
+            for membership in self.owned_memberships
+            if isinstance(membership, OwningMembership) and membership.member_element is not None
+        ]
+
+    def imported_memberships(self) -> List['Membership']:
+        """
+        Memberships imported by all the owned imports of this namespace, regardless of their visibility.
+        """
+        return list(_memberships_of(_solve(self.env, (_IMPORTED, self, True))))
+
+    def memberships(self) -> List['Membership']:
+        """
+        Owned memberships of this namespace, followed by the imported ones.
+        """
+        return list(dict.fromkeys([*self.owned_memberships, *self.imported_memberships()]))
+
+    def visible_memberships(self, is_recursive: bool = False, include_all: bool = False) -> List['Membership']:
+        """
+        Memberships which are visible outside this namespace.
+
+        :param is_recursive: Include the visible memberships of the visible owned namespaces, recursively.
+            Default is ``False``.
+        :type is_recursive: bool
+        :param include_all: Include the non-public memberships and imports as well. Default is ``False``.
+        :type include_all: bool
+
+        :return: Visible memberships, the owned ones are before the imported ones.
+        :rtype: List[Membership]
+        """
+        node = (_RECURSIVE if is_recursive else _VISIBLE, self, include_all)
+        return list(_memberships_of(_solve(self.env, node)))
+
+    def _names_table(self, kind: str) -> Tuple[Dict[str, 'Membership'], '_Component']:
+        # names of the local memberships, which are looked up before the shared table of the component
+        resolution = _get_resolution(self.env)
+        key = (kind, self)
+        table = resolution.tables.get(key)
+        if table is None:
+            if kind == _VISIBLE:
+                local, component = _solve(self.env, (_VISIBLE, self, False))
+            else:
+                # the owned memberships hide the imported ones with the same names
+                local, component = _solve(self.env, (_IMPORTED, self, True))
+                local = (*self.owned_memberships, *local)
+            table = resolution.tables[key] = (_names_of(local), component)
+        return table
+
+    def _resolve_name(self, kind: str, name: str) -> Optional['Membership']:
+        local_names, component = self._names_table(kind)
+        membership = local_names.get(name)
+        return membership if membership is not None else component.names.get(name)
+
+    def resolve_local(self, name: str) -> Optional['Membership']:
+        """
+        Find the membership with the given name (or short name) in the memberships of this namespace,
+        including the non-public and the imported ones.
+        """
+        return self._resolve_name(_IMPORTED, name)
+
+    def resolve_visible(self, name: str) -> Optional['Membership']:
+        """
+        Find the membership with the given name (or short name) in the visible memberships of this namespace.
+        """
+        return self._resolve_name(_VISIBLE, name)
+
+    def resolve(self, qualified_name: Union[str, Sequence[str]]) -> Optional['Membership']:
+        """
+        Resolve the qualified name in the scope of this namespace.
+
+        The first name is resolved in this namespace, then in its owning namespaces, and at last in
+        the public memberships of the root namespaces. Each of the following names is resolved in the
+        visible memberships of the namespace resolved by the former names (all the memberships when
+        that namespace contains this one).
+
+        :param qualified_name: Qualified name, such as ``A::B::'c d'``, or its unquoted names,
+            such as ``['A', 'B', 'c d']``.
+        :type qualified_name: Union[str, Sequence[str]]
+
+        :return: Resolved membership, or ``None`` when the name is not resolved.
+        :rtype: Optional[Membership]
+
+        :raises ValueError: The qualified name is invalid.
+        """
+        names = _split_qualified_name(qualified_name) if isinstance(qualified_name, str) else list(qualified_name)
+        if not names:
+            return None
+
+        membership = self._resolve_unqualified(names[0])
+        for name in names[1:]:
+            namespace = membership.member_element if membership is not None else None
+            if not isinstance(namespace, Namespace):
+                return None
+            if namespace._contains(self):
+                membership = namespace.resolve_local(name)
+            else:
+                membership = namespace.resolve_visible(name)
+        return membership
+
+    def _resolve_unqualified(self, name: str) -> Optional['Membership']:
+        namespace = self
+        while namespace is not None:
+            membership = namespace.resolve_local(name)
+            if membership is not None:
+                return membership
+            namespace = namespace.owning_namespace
+        return _resolve_global(self.env, name)
+
+    def _contains(self, element: Element) -> bool:
+        while element is not None:
+            if element is self:
+                return True
+            element = element.owning_namespace
+        return False
+
+
+def _resolve_global(env: Env, name: str) -> Optional['Membership']:
+    # the names of the root namespaces are indexed by Env.lookup
+    for element in env.lookup_all(_escape_name(name)):
+        membership = element.owning_membership
+        if membership is not None and membership.visibility is VisibilityKind.PUBLIC and \
+                name in (membership.member_name, membership.member_short_name):
+            return membership
+    return None
 
 
 class Membership(Relationship):
-    pass
+    def __init__(
+            self,
+            env: Env,
+
+            is_implied: bool = False,
+            alias_ids: Optional[List[str]] = None,
+            declared_name: Optional[str] = None,
+            declared_short_name: Optional[str] = None,
+            is_implied_included: bool = False,
+
+            member_name: Optional[str] = None,
+            member_short_name: Optional[str] = None,
+            visibility: VisibilityKind = VisibilityKind.PUBLIC,
+
+            member_elements: Optional[List[Union[ElementIDTyping, Element]]] = None,
+            owning_related_element: Optional[Union[ElementIDTyping, Element]] = None,
+            owned_related_elements: Optional[List[Union[ElementIDTyping, Element]]] = None,
+            owning_relationship: Optional[Union[ElementIDTyping, 'Relationship']] = None,
+            owned_relationships: Optional[List[Union[ElementIDTyping, 'Relationship']]] = None,
+            no_conj_when_init: bool = False,
+
+            element_id: Optional[ElementIDTyping] = None
+    ):
+        # The name of the member element relative to the owning namespace, such as the name of an alias.
+        self._member_name: Optional[str] = member_name
+        # The short name of the member element relative to the owning namespace.
+        self._member_short_name: Optional[str] = member_short_name
+        # Whether the member element is visible outside the owning namespace.
+        self._visibility: VisibilityKind = visibility
+
+        Relationship.__init__(
+            self,
+            env=env,
+            is_implied=is_implied,
+
+            alias_ids=alias_ids,
+            declared_name=declared_name,
+            declared_short_name=declared_short_name,
+            is_implied_included=is_implied_included,
+
+            targets=member_elements,  # only 1
+            owning_related_element=owning_related_element,
+            owned_related_elements=owned_related_elements,
+            owning_relationship=owning_relationship,
+            owned_relationships=owned_relationships,
+            no_conj_when_init=no_conj_when_init,
+
+            element_id=element_id,
+        )
+
+    @property
+    def member_element(self) -> Optional[Element]:
+        return self.targets.first()
+
+    @member_element.setter
+    def member_element(self, value):
+        if value is not None:
+            self.targets.set_to(value)
+        else:
+            self.targets.clear()
+
+    @property
+    def member_name(self) -> Optional[str]:
+        return self._member_name
+
+    @member_name.setter
+    def member_name(self, value: Optional[str]):
+        self._member_name = value
+        self.env._mark_dirty(self.element_id)
+        self.env._touch()
+
+    @property
+    def member_short_name(self) -> Optional[str]:
+        return self._member_short_name
+
+    @member_short_name.setter
+    def member_short_name(self, value: Optional[str]):
+        self._member_short_name = value
+        self.env._mark_dirty(self.element_id)
+        self.env._touch()
+
+    @property
+    def visibility(self) -> VisibilityKind:
+        return self._visibility
+
+    @visibility.setter
+    def visibility(self, value: VisibilityKind):
+        self._visibility = value
+        self.env._mark_dirty(self.element_id)
+        self.env._touch()
+
+    @property
+    def membership_owning_namespace(self) -> Optional[Namespace]:
+        owning_related_element = self.owning_related_element
+        return owning_related_element if isinstance(owning_related_element, Namespace) else None
 
 
 class OwningMembership(Membership):
-    pass
+    @property
+    def owned_member_element(self) -> Optional[Element]:
+        return self.owned_related_elements.first()
+
+    @property
+    def member_element(self) -> Optional[Element]:
+        return self.owned_member_element
+
+    @property
+    def member_name(self) -> Optional[str]:
+        owned_member_element = self.owned_member_element
+        return owned_member_element.name if owned_member_element is not None else None
+
+    @property
+    def member_short_name(self) -> Optional[str]:
+        owned_member_element = self.owned_member_element
+        return owned_member_element.short_name if owned_member_element is not None else None
 
 
 class Import(Relationship):
-    pass
+    def __init__(
+            self,
+            env: Env,
+
+            is_implied: bool = False,
+            alias_ids: Optional[List[str]] = None,
+            declared_name: Optional[str] = None,
+            declared_short_name: Optional[str] = None,
+            is_implied_included: bool = False,
+
+            visibility: VisibilityKind = VisibilityKind.PUBLIC,
+            is_recursive: bool = False,
+            is_import_all: bool = False,
+
+            imported_elements: Optional[List[Union[ElementIDTyping, Element]]] = None,
+            owning_related_element: Optional[Union[ElementIDTyping, Element]] = None,
+            owned_related_elements: Optional[List[Union[ElementIDTyping, Element]]] = None,
+            owning_relationship: Optional[Union[ElementIDTyping, 'Relationship']] = None,
+            owned_relationships: Optional[List[Union[ElementIDTyping, 'Relationship']]] = None,
+            no_conj_when_init: bool = False,
+
+            element_id: Optional[ElementIDTyping] = None
+    ):
+        # Whether the imported memberships are visible outside the importing namespace.
+        self._visibility: VisibilityKind = visibility
+        # Whether the visible memberships of the visible owned namespaces are imported, recursively.
+        self._is_recursive: bool = is_recursive
+        # Whether the non-public memberships are imported as well.
+        self._is_import_all: bool = is_import_all
+
+        Relationship.__init__(
+            self,
+            env=env,
+            is_implied=is_implied,
+
+            alias_ids=alias_ids,
+            declared_name=declared_name,
+            declared_short_name=declared_short_name,
+            is_implied_included=is_implied_included,
+
+            targets=imported_elements,  # only 1
+            owning_related_element=owning_related_element,
+            owned_related_elements=owned_related_elements,
+            owning_relationship=owning_relationship,
+            owned_relationships=owned_relationships,
+            no_conj_when_init=no_conj_when_init,
+
+            element_id=element_id,
+        )
+
+    @property
+    def visibility(self) -> VisibilityKind:
+        return self._visibility
+
+    @visibility.setter
+    def visibility(self, value: VisibilityKind):
+        self._visibility = value
+        self.env._mark_dirty(self.element_id)
+        self.env._touch()
+
+    @property
+    def is_recursive(self) -> bool:
+        return self._is_recursive
+
+    @is_recursive.setter
+    def is_recursive(self, value: bool):
+        self._is_recursive = value
+        self.env._mark_dirty(self.element_id)
+        self.env._touch()
+
+    @property
+    def is_import_all(self) -> bool:
+        return self._is_import_all
+
+    @is_import_all.setter
+    def is_import_all(self, value: bool):
+        self._is_import_all = value
+        self.env._mark_dirty(self.element_id)
+        self.env._touch()
+
+    @property
+    def imported_element(self) -> Optional[Element]:
+        return self.targets.first()
+
+    @imported_element.setter
+    def imported_element(self, value):
+        if value is not None:
+            self.targets.set_to(value)
+        else:
+            self.targets.clear()
+
+    @property
+    def import_owning_namespace(self) -> Optional[Namespace]:
+        owning_related_element = self.owning_related_element
+        return owning_related_element if isinstance(owning_related_element, Namespace) else None
+
+    def imported_memberships(self) -> List[Membership]:
+        """
+        Memberships imported by this import.
+        """
+        memberships, nodes = self._imported_parts()
+        retval = dict.fromkeys(memberships)
+        for node in nodes:
+            retval.update(dict.fromkeys(_memberships_of(_solve(self.env, node))))
+        return list(retval)
+
+    def _imported_parts(self) -> Tuple[List[Membership], List[_Node]]:
+        # the directly imported memberships, and the nodes whose memberships are imported
+        return [], []
 
 
 class NamespaceImport(Import):
-    pass
+    @property
+    def imported_namespace(self) -> Optional[Namespace]:
+        imported_element = self.imported_element
+        return imported_element if isinstance(imported_element, Namespace) else None
+
+    def _imported_parts(self) -> Tuple[List[Membership], List[_Node]]:
+        imported_namespace = self.imported_namespace
+        if imported_namespace is None:
+            return [], []
+        return [], [(_RECURSIVE if self.is_recursive else _VISIBLE, imported_namespace, self.is_import_all)]
 
 
 class MembershipImport(Import):
-    pass
+    @property
+    def imported_membership(self) -> Optional[Membership]:
+        imported_element = self.imported_element
+        return imported_element if isinstance(imported_element, Membership) else None
 
+    def _imported_parts(self) -> Tuple[List[Membership], List[_Node]]:
+        imported_membership = self.imported_membership
+        if imported_membership is None:
+            return [], []
+        member_element = imported_membership.member_element
+        if self.is_recursive and isinstance(member_element, Namespace):
+            return [imported_membership], [(_RECURSIVE, member_element, self.is_import_all)]
+        else:
+            return [imported_membership], []
 
-@unique
-class VisibilityKind(Enum):
-    pass
+
+def _member_names(membership: Membership) -> Tuple[Optional[str], Optional[str]]:
+    # the owned member element is only found once for both of its names
+    if isinstance(membership, OwningMembership):
+        element = membership.owned_member_element
+        return (element.name, element.short_name) if element is not None else (None, None)
+    else:
+        return membership.member_name, membership.member_short_name
+
+
+def _names_of(memberships: Sequence[Membership]) -> Dict[str, Membership]:
+    names = {}
+    for membership in memberships:
+        for name in _member_names(membership):
+            if name is not None:
+                names.setdefault(name, membership)
+    return names
+
+
+class _Component:
+    # memberships of a strongly connected component, shared by all its nodes, and the table of their names
+    __slots__ = ('memberships', '_names')
+
+    def __init__(self, memberships: Tuple[Membership, ...]):
+        self.memberships = memberships
+        self._names: Optional[Dict[str, Membership]] = None
+
+    @property
+    def names(self) -> Dict[str, Membership]:
+        if self._names is None:
+            self._names = _names_of(self.memberships)
+        return self._names
+
+
+# local memberships of the node (the ones of the component are placed after them), and the component
+_Solution = Tuple[Tuple[Membership, ...], _Component]
+
+
+def _memberships_of(solution: _Solution) -> Tuple[Membership, ...]:
+    local, component = solution
+    if not local:
+        return component.memberships
+    local_set = dict.fromkeys(local)
+    return (*local, *(membership for membership in component.memberships if membership not in local_set))
+
+
+class _Resolution(IncrementalMemo):
+    # solved nodes and the tables of the names, the IDs of the elements read by each node and its dependencies
+    # are indexed, so the changed elements only invalidate the nodes which read them, and their dependents
+
+    def __init__(self):
+        self.solved: Dict[_Node, _Solution] = {}
+        self.tables: Dict[Tuple[str, 'Namespace'], Tuple[Dict[str, Membership], _Component]] = {}
+        self._edges: Dict[_Node, Tuple[List[_Node], List[ElementIDTyping]]] = {}
+        self._dependents: Dict[_Node, Dict[_Node, None]] = {}
+        self._readers: Dict[ElementIDTyping, Dict[_Node, None]] = {}
+
+    def add(self, node: _Node, deps: List[_Node], reads: List[ElementIDTyping], solution: _Solution):
+        self.solved[node] = solution
+        self._edges[node] = (deps, reads)
+        for dep in deps:
+            self._dependents.setdefault(dep, {})[node] = None
+        for key in reads:
+            self._readers.setdefault(key, {})[node] = None
+
+    def _discard(self, index: Dict[object, Dict[_Node, None]], key: object, node: _Node):
+        nodes = index.get(key)
+        if nodes is not None:
+            nodes.pop(node, None)
+            if not nodes:
+                del index[key]
+
+    def invalidate(self, keys: List[ElementIDTyping]):
+        stack = [node for key in keys for node in self._readers.get(key, ())]
+        while stack:
+            node = stack.pop()
+            if node not in self.solved:
+                continue
+            del self.solved[node]
+            kind, namespace, _ = node
+            self.tables.pop((kind, namespace), None)
+            deps, reads = self._edges.pop(node)
+            for dep in deps:
+                self._discard(self._dependents, dep, node)
+            for key in reads:
+                self._discard(self._readers, key, node)
+            stack.extend(self._dependents.pop(node, ()))
+
+
+def _get_resolution(env: Env) -> _Resolution:
+    memo = env.incremental_memo
+    resolution = memo.get(_RESOLUTION_MEMO)
+    if resolution is None:
+        resolution = memo[_RESOLUTION_MEMO] = _Resolution()
+    return resolution
+
+
+def _expand(node: _Node) -> Tuple[List[Membership], List[_Node], List[ElementIDTyping]]:
+    # local memberships and dependencies of the node, the recursive node depends on the visible
+    # node of the same namespace, and on the recursive nodes of its visible owned namespaces,
+    # and the IDs of the elements read, which are all the owned memberships and imports (even the
+    # invisible ones), and the imported elements (the memberships are marked as changed when the
+    # names of their owned member elements are changed)
+    kind, namespace, include_all = node
+    owned_memberships = namespace.owned_memberships
+    reads = [namespace.element_id, *(membership.element_id for membership in owned_memberships)]
+
+    if kind == _RECURSIVE:
+        deps = [(_VISIBLE, namespace, include_all)]
+        for membership in owned_memberships:
+            if isinstance(membership, OwningMembership) and \
+                    (include_all or membership.visibility is VisibilityKind.PUBLIC):
+                member_element = membership.member_element
+                if isinstance(member_element, Namespace):
+                    deps.append((_RECURSIVE, member_element, include_all))
+        return [], deps, reads
+
+    memberships, deps = [], []
+    if kind == _VISIBLE:
+        memberships.extend(
+            membership for membership in owned_memberships
+            if include_all or membership.visibility is VisibilityKind.PUBLIC
+        )
+    for import_ in namespace.owned_imports:
+        reads.append(import_.element_id)
+        if include_all or import_.visibility is VisibilityKind.PUBLIC:
+            imported_element = import_.imported_element
+            if imported_element is not None:
+                reads.append(imported_element.element_id)
+            imported, import_deps = import_._imported_parts()
+            memberships.extend(imported)
+            deps.extend(import_deps)
+    return memberships, deps, reads
+
+
+def _solve(env: Env, root: _Node) -> _Solution:
+    """
+    Solve the memberships of the node, and of all the nodes it depends on, into the memo of the env.
+    The strongly connected components of the dependency graph are found with the iterative Tarjan's
+    algorithm, which emits each component after all the ones it depends on.
+    """
+    resolution = _get_resolution(env)
+    solved = resolution.solved
+    if root in solved:
+        return solved[root]
+
+    expanded: Dict[_Node, Tuple[List[Membership], List[_Node], List[ElementIDTyping]]] = {}
+    index: Dict[_Node, int] = {}
+    lowlink: Dict[_Node, int] = {}
+    scc_stack: List[_Node] = []
+    on_stack: Dict[_Node, None] = {}
+
+    def _visit(n: _Node):
+        index[n] = lowlink[n] = len(index)
+        expanded[n] = _expand(n)
+        scc_stack.append(n)
+        on_stack[n] = None
+        work.append((n, 0))
+
+    work: List[Tuple[_Node, int]] = []
+    _visit(root)
+    while work:
+        node, i = work[-1]
+        deps = expanded[node][1]
+        if i < len(deps):
+            work[-1] = (node, i + 1)
+            dep = deps[i]
+            if dep in solved:
+                continue
+            elif dep not in index:
+                _visit(dep)
+            elif dep in on_stack:
+                lowlink[node] = min(lowlink[node], index[dep])
+        else:
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index[node]:
+                component = []
+                while True:
+                    member = scc_stack.pop()
+                    del on_stack[member]
+                    component.append(member)
+                    if member is node:
+                        break
+                _solve_component(component[::-1], expanded, resolution)
+
+    return solved[root]
+
+
+def _solve_component(component: List[_Node],
+                     expanded: Dict[_Node, Tuple[List[Membership], List[_Node], List[ElementIDTyping]]],
+                     resolution: _Resolution):
+    # all the nodes of a cycle see the same memberships, their local ones are placed first
+    solved = resolution.solved
+    members = dict.fromkeys(component)
+    shared, external = {}, {}
+    for node in component:
+        memberships, deps, _ = expanded[node]
+        shared.update(dict.fromkeys(memberships))
+        for dep in deps:
+            if dep not in members:
+                external[dep] = None
+
+    if len(component) == 1 and not shared and external and \
+            len({id(solved[dep][1]) for dep in external}) == 1:
+        # such as a namespace with a single import, the solution of the imported node is shared as it is
+        # (the other external nodes in the same component add no more memberships)
+        node = component[0]
+        resolution.add(node, expanded[node][1], expanded[node][2], solved[next(iter(external))])
+        return
+
+    merged = set()
+    for dep in external:
+        # the nodes of a component have the same memberships, so each component is merged only once
+        solution = solved[dep]
+        if id(solution[1]) not in merged:
+            merged.add(id(solution[1]))
+            shared.update(dict.fromkeys(_memberships_of(solution)))
+
+    shared_component = _Component(tuple(shared))
+    for node in component:
+        memberships, deps, reads = expanded[node]
+        local = () if len(component) == 1 else tuple(dict.fromkeys(memberships))
+        resolution.add(node, deps, reads, (local, shared_component))
@@ -0,0 +1,106 @@
+"""
+Serialized snapshots of the KerML AST environments.
+
+An :class:`Env` is pickled with all its elements and connections, so it can be saved to a file
+(such as the input of ``pysysml validate``) or sent to the worker processes. The cached derived
+values and the memo of the env are not kept, they are derived again after loading.
+
+The snapshots are pickles, and loading a pickle can run arbitrary code, so only load the
+snapshots from a trusted source (such as the ones saved by yourself).
+"""
+
+import gc
+import os
+import pickle
+from contextlib import contextmanager
+from typing import Union
+
+from .base import Env
+
+_SNAPSHOT_MAGIC = b'PYSYSML-KERML-AST\n'
+_SNAPSHOT_FORMAT = 2  # increase it when the pickled layout of the AST elements is changed
+
+
+@contextmanager
+def _gc_paused():
+    # the snapshots are large graphs of small objects, the collections triggered by
+    # their allocations take most of the time and never free anything
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def dumps_env(env: Env) -> bytes:
+    """
+    Serialize the environment into a snapshot.
+
+    :param env: Environment to serialize. The ID allocator of it should be picklable, such as
+        :class:`SequentialIDAllocator` or :func:`uuid_id_allocator`.
+    :type env: Env
+
+    :return: Bytes of the snapshot.
+    :rtype: bytes
+    """
+    with _gc_paused():
+        payload = pickle.dumps(env, protocol=pickle.HIGHEST_PROTOCOL)
+    return b''.join([_SNAPSHOT_MAGIC, f'{_SNAPSHOT_FORMAT}\n'.encode(), payload])
+
+
+def loads_env(data: bytes) -> Env:
+    """
+    Load the environment from a snapshot created by :func:`dumps_env`.
+    The snapshot is unpickled, so it should come from a trusted source.
+
+    :param data: Bytes of the snapshot.
+    :type data: bytes
+
+    :return: Loaded environment.
+    :rtype: Env
+
+    :raises ValueError: The data is not a snapshot, its format is not supported, or its payload is corrupted.
+    """
+    magic, _, rest = data.partition(b'\n')
+    format_, _, payload = rest.partition(b'\n')
+    if magic + b'\n' != _SNAPSHOT_MAGIC:
+        raise ValueError('Invalid header of KerML AST snapshot.')
+    if format_.decode(errors='replace').strip() != str(_SNAPSHOT_FORMAT):
+        raise ValueError(f'Unsupported format of KerML AST snapshot, '
+                         f'{_SNAPSHOT_FORMAT!r} expected but {format_.decode(errors="replace")!r} found.')
+
+    try:
+        with _gc_paused():
+            env = pickle.loads(payload)
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, IndexError, TypeError) as err:
+        raise ValueError(f'Corrupted payload of KerML AST snapshot - {err!r}.') from err
+    if not isinstance(env, Env):
+        raise ValueError(f'Env expected in KerML AST snapshot, but {env!r} found.')
+    return env
+
+
+def save_env(env: Env, file: Union[str, os.PathLike]):
+    """
+    Save the snapshot of the environment to the file, see :func:`dumps_env`.
+
+    :param env: Environment to save.
+    :type env: Env
+    :param file: Path of the snapshot file.
+    """
+    with open(file, 'wb') as f:
+        f.write(dumps_env(env))
+
+
+def load_env(file: Union[str, os.PathLike]) -> Env:
+    """
+    Load the environment from the snapshot file, see :func:`loads_env`.
+
+    :param file: Path of the snapshot file.
+
+    :return: Loaded environment.
+    :rtype: Env
+    """
+    with open(file, 'rb') as f:
+        return loads_env(f.read())
@@ -0,0 +1,201 @@
+"""
+Parallel validation of the constraints of a whole KerML AST environment.
+
+The ownership tree of the env is partitioned into subtrees of similar sizes, and they are
+checked in a process pool. Every worker loads the snapshot of the env (see
+:mod:`pysysml.kerml.ast.snapshot`) only once, and sends back compact violation records, which
+are merged into one report in the order of the elements in the env, so the report does not
+depend on the number of the workers.
+"""
+
+import heapq
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple, Dict
+
+from .base import Env, IElementID, ElementIDTyping, ConstraintViolation
+from .snapshot import dumps_env, loads_env
+
+# (element ID, constraint, message)
+_ViolationRecord = Tuple[ElementIDTyping, str, str]
+
+
+@dataclass
+class ValidationReport:
+    """
+    Report of :func:`validate_parallel`.
+
+    :param elements: Number of the checked elements.
+    :param violations: Violations of all the elements, in the order of the elements in the env.
+    :param partitions: Number of the partitions checked separately.
+    :param seconds: Time of the validation in seconds.
+    """
+    elements: int
+    violations: List[ConstraintViolation] = field(default_factory=list)
+    partitions: int = 1
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.violations
+
+
+def _owned_ids(element: IElementID) -> List[ElementIDTyping]:
+    # owned relationships of the elements, and owned related elements of the relationships
+    owned = []
+    for name in ('_owned_relationships', '_owned_related_elements'):
+        conn = getattr(element, name, None)
+        if conn is not None:
+            owned.extend(conn._set)
+    return owned
+
+
+def _is_owned(element: IElementID) -> bool:
+    for name in ('_owning_relationships', '_owning_related_elements'):
+        conn = getattr(element, name, None)
+        if conn:
+            return True
+    return False
+
+
+def partition_env(env: Env, parts: int) -> List[List[ElementIDTyping]]:
+    """
+    Partition the elements of the env by the ownership tree.
+
+    The subtrees larger than ``1 / parts`` of all the elements are split into their root and
+    the subtrees of their owned elements, then all the subtrees are packed into the partitions
+    (the largest one first, into the smallest partition). The elements which are not reachable
+    from the roots of the ownership tree (such as the ones in an ownership cycle) are packed
+    as single elements.
+
+    :param env: Environment to partition.
+    :type env: Env
+    :param parts: Max number of the partitions.
+    :type parts: int
+
+    :return: Element IDs of the non-empty partitions, each element is in exactly one of them.
+    :rtype: List[List[Union[int, str]]]
+    """
+    if parts <= 0:
+        raise ValueError(f'Number of partitions should be positive, but {parts!r} found.')
+    elements = env._elements
+
+    # the tree children and the subtree sizes, each element is owned by the first one which reaches it
+    children: Dict[ElementIDTyping, List[ElementIDTyping]] = {}
+    sizes: Dict[ElementIDTyping, int] = {}
+    roots = [key for key, element in elements.items() if not _is_owned(element)]
+    for root in roots:
+        if root in children:
+            continue
+        children[root] = []
+        stack = [(root, False)]
+        while stack:
+            key, expanded = stack.pop()
+            if expanded:
+                sizes[key] = 1 + sum(sizes[child] for child in children[key])
+                continue
+            stack.append((key, True))
+            for child in _owned_ids(elements[key]):
+                if child not in children and child in elements:
+                    children[child] = []
+                    children[key].append(child)
+                    stack.append((child, False))
+    for key in elements:
+        if key not in children:
+            children[key] = []
+            sizes[key] = 1
+            roots.append(key)
+
+    # split the large subtrees, the roots of them are left as single elements
+    limit = max(-(-len(elements) // parts), 1)
+    pieces: List[Tuple[int, ElementIDTyping, bool]] = []  # (size, root, whole subtree)
+    stack = list(roots)
+    while stack:
+        key = stack.pop()
+        if sizes[key] <= limit or not children[key]:
+            pieces.append((sizes[key], key, True))
+        else:
+            pieces.append((1, key, False))
+            stack.extend(children[key])
+
+    # pack the pieces, the largest one into the smallest partition
+    bins: List[Tuple[int, int]] = [(0, i) for i in range(min(parts, len(pieces)))]
+    partitions: List[List[ElementIDTyping]] = [[] for _ in bins]
+    for size, key, whole in sorted(pieces, key=lambda x: -x[0]):
+        load, index = heapq.heappop(bins)
+        partition = partitions[index]
+        if whole:
+            subtree = [key]
+            while subtree:
+                item = subtree.pop()
+                partition.append(item)
+                subtree.extend(children[item])
+        else:
+            partition.append(key)
+        heapq.heappush(bins, (load + size, index))
+    return [partition for partition in partitions if partition]
+
+
+_WORKER_ENV: Optional[Env] = None
+
+
+def _init_worker(snapshot: bytes):
+    global _WORKER_ENV
+    _WORKER_ENV = loads_env(snapshot)
+
+
+def _check_partition(keys: List[ElementIDTyping], env: Optional[Env] = None) -> List[_ViolationRecord]:
+    env = env if env is not None else _WORKER_ENV
+    elements = env._elements
+    records = []
+    for key in keys:
+        for violation in elements[key]._constraint_violations():
+            records.append((violation.element_id, violation.constraint, violation.message))
+    return records
+
+
+def validate_parallel(env: Env, jobs: Optional[int] = None) -> ValidationReport:
+    """
+    Check the constraints of all the elements in the env with a process pool.
+
+    Unlike :meth:`Env.validate`, the violations are not kept in the env, and all the elements
+    are checked every time.
+
+    :param env: Environment to validate.
+    :type env: Env
+    :param jobs: Number of the worker processes, default is the number of CPUs. When ``1`` is
+        given, the elements are checked in the current process.
+    :type jobs: Optional[int]
+
+    :return: Report of the validation, the violations are in the order of the elements in the env,
+        regardless of the number of the workers.
+    :rtype: ValidationReport
+    """
+    if jobs is not None and jobs <= 0:
+        raise ValueError(f'Number of jobs should be positive, but {jobs!r} found.')
+    start_time = time.perf_counter()
+    jobs = jobs or os.cpu_count() or 1
+    jobs = min(jobs, max(len(env), 1))
+    if jobs == 1:
+        records = _check_partition(list(env._elements), env)
+        partitions = 1
+    else:
+        # several partitions for each worker, so the workers are kept busy when the subtrees are uneven
+        parts = partition_env(env, jobs * 4)
+        partitions = len(parts)
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(dumps_env(env),)) as executor:
+            futures = [executor.submit(_check_partition, part) for part in parts]
+            records = [record for future in futures for record in future.result()]
+
+        # the records of each element are produced together, so the stable sort keeps their order
+        positions = {key: i for i, key in enumerate(env._elements)}
+        records.sort(key=lambda record: positions[record[0]])
+
+    return ValidationReport(
+        elements=len(env),
+        violations=[ConstraintViolation(*record) for record in records],
+        partitions=partitions,
+        seconds=time.perf_counter() - start_time,
+    )
@@ -1,5 +1,17 @@
 from .base import list_reserved_words, is_reserved_word, _grammar_file, resource_health_check
-from .lark import open_kerml_lark_parser
-from .transforms import tree_to_kerml_cst, KerMLTransRecorder, KerMLTransformer, KerMLTransTemplate
+from .batch import parse_many, list_kerml_files, ParseResult
+from .binary import dump_cst_binary, load_cst_binary, CSTFormatError
+from .cache import parser_cache_dir, parser_cache_enabled, grammar_sha256, list_cached_parsers, clear_parser_cache
+from .columnar import ColumnarCST, ColumnarCSTBuilder, parse_kerml_columnar
+from .cstcache import KerMLCstCache, CstCacheStats, get_kerml_cst_cache
+from .incremental import IncrementalKerMLParser
+from .lark import open_kerml_lark_parser, KerMLAutoParser, AutoParseReport, ParsePathStats
+from .parse import parse_kerml
+from .pool import KerMLParserPool, ParserPoolStats, get_kerml_parser_pool
+from .recover import parse_kerml_recovering, RecoveryResult, SyntaxDiagnostic
+from .stream import iter_kerml_elements
+from .transforms import tree_to_kerml_cst, KerMLTransRecorder, KerMLTransformer, KerMLTransTemplate, \
+    KerMLTableTransformer, RuleCoverage
+from .visitors import walk, CSTVisitor, CSTTransformer
 
 __grammar_file__ = _grammar_file
@@ -7,6 +7,7 @@ from pysysml.utils import file_health_check
 
 _reserved_words_file = os.path.normpath(os.path.join(__file__, '..', 'reserved_words.txt'))
 _grammar_file = os.path.normpath(os.path.join(__file__, '..', 'syntax.lark'))
+_lalr_grammar_file = os.path.normpath(os.path.join(__file__, '..', 'syntax_lalr.lark'))
 
 
 @lru_cache()
@@ -27,3 +28,4 @@ def is_reserved_word(word: str) -> bool:
 def resource_health_check():
     file_health_check(_reserved_words_file)
     file_health_check(_grammar_file)
+    file_health_check(_lalr_grammar_file)
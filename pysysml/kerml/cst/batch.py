@@ -0,0 +1,165 @@
+"""
+Batch parsing of KerML files with a process pool.
+
+Every worker process keeps its own warm parser (see :func:`parse_kerml`), so the parser is
+built or loaded from cache only once per worker, not once per file.
+"""
+
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, Future, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, List, Optional
+
+from .cstcache import get_kerml_cst_cache
+from .lark import _PARSER_MODES
+from .parse import parse_kerml
+from .recover import parse_kerml_recovering, SyntaxDiagnostic
+from .transforms import RuleCoverage
+
+
+@dataclass
+class ParseResult:
+    path: str
+    cst: Optional[Any] = None
+    error_type: Optional[str] = None
+    error: Optional[str] = None
+    seconds: float = 0.0
+    diagnostics: List[SyntaxDiagnostic] = field(default_factory=list)
+    cached: bool = False
+    coverage: Optional[RuleCoverage] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error_type is None and not self.diagnostics
+
+
+def list_kerml_files(paths: Iterable[str]) -> List[str]:
+    """
+    List the KerML files in the given paths.
+
+    :param paths: Files or directories. Directories are searched recursively for ``*.kerml`` files.
+    :type paths: Iterable[str]
+
+    :return: Paths of the files, in the given order (sorted inside each directory).
+    :rtype: List[str]
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, '**', '*.kerml'), recursive=True)))
+        else:
+            files.append(path)
+    return files
+
+
+_WORKER_PARSER = 'auto'
+
+
+def _init_worker(parser: str):
+    global _WORKER_PARSER
+    _WORKER_PARSER = parser
+    parse_kerml('', parser=parser)  # warm up the parser of this worker
+
+
+def _parse_file(path: str, parser: Optional[str] = None, encoding: str = 'utf-8',
+                recover: bool = False, use_cache: bool = False, coverage: bool = False) -> ParseResult:
+    start_time = time.perf_counter()
+    try:
+        if use_cache and not recover:
+            cst, cached = get_kerml_cst_cache().parse_file_cached(path, parser or _WORKER_PARSER, encoding)
+            return ParseResult(path, cst=cst, cached=cached, seconds=time.perf_counter() - start_time)
+
+        with open(path, 'r', encoding=encoding) as f:
+            text = f.read()
+        if recover:
+            result = parse_kerml_recovering(text, parser=parser or _WORKER_PARSER)
+            return ParseResult(path, cst=result.cst, diagnostics=result.diagnostics,
+                               seconds=time.perf_counter() - start_time)
+        file_coverage = RuleCoverage() if coverage else None
+        cst = parse_kerml(text, parser=parser or _WORKER_PARSER, coverage=file_coverage)
+    except Exception as err:
+        # errors are sent back as text, lark exceptions may hold unpicklable parser states
+        return ParseResult(path, error_type=type(err).__name__, error=str(err),
+                           seconds=time.perf_counter() - start_time)
+    else:
+        return ParseResult(path, cst=cst, coverage=file_coverage, seconds=time.perf_counter() - start_time)
+
+
+def _submit(executor: ProcessPoolExecutor, *args) -> Future:
+    try:
+        return executor.submit(_parse_file, *args)
+    except BrokenProcessPool as err:
+        # the pool is broken before all the files are submitted, such as when the warm-up fails
+        future = Future()
+        future.set_exception(err)
+        return future
+
+
+def _future_result(future: Future, path: str) -> ParseResult:
+    # when a worker dies (such as killed for running out of memory), the pool is broken and all
+    # the pending files fail, they are reported as the errors of these files
+    try:
+        return future.result()
+    except Exception as err:
+        return ParseResult(path, error_type=type(err).__name__, error=str(err))
+
+
+def parse_many(paths: Iterable[str], jobs: Optional[int] = None, ordered: bool = True,
+               parser: str = 'auto', encoding: str = 'utf-8', recover: bool = False,
+               use_cache: bool = False, coverage: bool = False) -> Iterator[ParseResult]:
+    """
+    Parse KerML files with a process pool.
+
+    Errors of each file (including reading errors) are captured in the :class:`ParseResult`
+    objects, so one broken file does not abort the whole batch. When a worker process dies,
+    the files not parsed yet are reported with the ``BrokenProcessPool`` error.
+
+    :param paths: Paths of the KerML files.
+    :type paths: Iterable[str]
+    :param jobs: Number of the worker processes, default is the number of CPUs. When ``1`` is
+        given, the files are parsed in the current process.
+    :type jobs: Optional[int]
+    :param ordered: Yield the results in the order of the given paths. Otherwise, the results
+        are yielded as soon as they are completed. Default is ``True``.
+    :type ordered: bool
+    :param parser: Parser mode, the same as the argument of :func:`parse_kerml`.
+    :type parser: str
+    :param encoding: Encoding of the files, default is ``utf-8``.
+    :type encoding: str
+    :param recover: Use :func:`parse_kerml_recovering`, so all the syntax errors of each file are
+        reported in ``diagnostics`` of the results, with the partial CSTs. Default is ``False``.
+    :type recover: bool
+    :param use_cache: Load the CSTs of the unchanged files from the on-disk CST cache
+        (see :class:`KerMLCstCache`), and save the others to it. It is not used in recovering
+        mode. Default is ``False``.
+    :type use_cache: bool
+    :param coverage: Count the hits of the grammar rules of each file into ``coverage`` of the
+        results, they can be merged with :meth:`RuleCoverage.merged`. It can not be used with
+        ``recover`` or ``use_cache``. Default is ``False``.
+    :type coverage: bool
+
+    :return: Iterator of the parse results.
+    :rtype: Iterator[ParseResult]
+    """
+    if parser not in _PARSER_MODES:
+        raise ValueError(f'Unknown parser mode, one of {_PARSER_MODES!r} expected but {parser!r} found.')
+    if jobs is not None and jobs <= 0:
+        raise ValueError(f'Number of jobs should be positive, but {jobs!r} found.')
+    if coverage and (recover or use_cache):
+        raise ValueError('Coverage can not be collected in recovering mode or with the CST cache.')
+
+    paths = list(paths)
+    jobs = jobs or os.cpu_count() or 1
+    jobs = min(jobs, max(len(paths), 1))
+    if jobs == 1:
+        for path in paths:
+            yield _parse_file(path, parser, encoding, recover, use_cache, coverage)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(parser,)) as executor:
+        futures = {_submit(executor, path, None, encoding, recover, use_cache, coverage): path for path in paths}
+        for future in (futures if ordered else as_completed(futures)):
+            yield _future_result(future, futures[future])
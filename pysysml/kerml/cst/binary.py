@@ -0,0 +1,374 @@
+"""
+Binary container format of the KerML CSTs, which is loaded with :mod:`mmap`.
+
+The file is the :class:`ColumnarCST` arrays written one by one, so the reader only maps the
+file into memory, and casts the sections to :class:`memoryview` objects without copying or
+decoding them. Strings and atoms are decoded when they are accessed, and model objects are
+created only for the accessed nodes, so loading a large pre-parsed library costs almost nothing.
+
+Layout of the file (all integers are unsigned, in the byte order recorded in the header):
+
+* Magic ``b'PYSYSML-KERML-CST-BIN\\n'``, then a header of 64-bit integers: format version,
+  byte order flag (``1`` for little-endian) and ``(offset, length)`` of every section.
+* Sections, each of them is aligned to 8 bytes:
+
+  * ``classes`` - names of the node classes, joined with ``\\n`` in UTF-8. Only ``list``,
+    ``tuple`` and the classes in :mod:`pysysml.kerml.cst.models` are allowed.
+  * ``string_offsets`` (32-bit) and ``string_data`` (UTF-8) - the string table, string ``i``
+    is ``string_data[string_offsets[i]:string_offsets[i + 1]]``.
+  * ``atom_offsets`` and ``atom_data`` (32-bit) - the atom table, each record is a type code
+    followed by its data: enum member (class code, string of the member name), qualified name
+    (strings of the names) or feature chain (atoms of the qualified names).
+  * ``kinds`` (8-bit), ``parents``, ``value_starts`` and ``values`` (32-bit) - the node arrays,
+    see :mod:`pysysml.kerml.cst.columnar`.
+"""
+
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from enum import Enum
+from typing import Any, List, Callable, Union, Sequence, Dict, Optional, Tuple, Iterator
+
+from . import models
+from .columnar import ColumnarCST
+from .models import QualifiedName, FeatureChain
+
+_MAGIC = b'PYSYSML-KERML-CST-BIN\n'
+_FORMAT_VERSION = 1
+_SECTIONS = (
+    'classes', 'string_offsets', 'string_data', 'atom_offsets', 'atom_data',
+    'kinds', 'parents', 'value_starts', 'values',
+)
+_HEADER = struct.Struct(f'<QQ{len(_SECTIONS) * 2}Q')
+_ALIGNMENT = 8
+
+_ATOM_ENUM, _ATOM_QUALIFIED_NAME, _ATOM_FEATURE_CHAIN = range(3)
+
+
+class CSTFormatError(Exception):
+    """
+    Error raised when the binary CST file is invalid.
+    """
+    pass
+
+
+def _class_name(cls: type) -> str:
+    if cls is list or cls is tuple:
+        return cls.__name__
+    elif getattr(models, cls.__name__, None) is cls:
+        return cls.__name__
+    else:
+        raise TypeError(f'Class {cls!r} is not a KerML CST model.')
+
+
+def _load_class(name: str) -> type:
+    if name == 'list':
+        return list
+    elif name == 'tuple':
+        return tuple
+    cls = getattr(models, name, None)
+    if not isinstance(cls, type):
+        raise CSTFormatError(f'Unknown KerML CST model class {name!r}.')
+    return cls
+
+
+def _encode_atoms(cst: ColumnarCST, classes: List[type]):
+    class_codes = {cls: code for code, cls in enumerate(classes)}
+    string_codes = {string: code for code, string in enumerate(cst.strings)}
+    strings = list(cst.strings)
+    atom_codes = {atom: code for code, atom in enumerate(cst.atoms)}
+    atoms = list(cst.atoms)
+
+    def _string_code(string: str) -> int:
+        if string not in string_codes:
+            string_codes[string] = len(strings)
+            strings.append(string)
+        return string_codes[string]
+
+    def _atom_code(atom: Any) -> int:
+        # qualified names in the feature chains are appended to the table if they are not in it
+        if atom not in atom_codes:
+            atom_codes[atom] = len(atoms)
+            atoms.append(atom)
+        return atom_codes[atom]
+
+    offsets, data = array('I', [0]), array('I')
+    index = 0
+    while index < len(atoms):
+        atom = atoms[index]
+        index += 1
+        if isinstance(atom, Enum):
+            if type(atom) not in class_codes:
+                class_codes[type(atom)] = len(classes)
+                classes.append(type(atom))
+            data.extend([_ATOM_ENUM, class_codes[type(atom)], _string_code(atom.name)])
+        elif isinstance(atom, QualifiedName):
+            data.append(_ATOM_QUALIFIED_NAME)
+            data.extend(_string_code(name) for name in atom.names)
+        elif isinstance(atom, FeatureChain):
+            data.append(_ATOM_FEATURE_CHAIN)
+            data.extend(_atom_code(item) for item in atom.items)
+        else:  # pragma: no cover
+            raise TypeError(f'Unknown atom {atom!r}.')
+        offsets.append(len(data))
+
+    return strings, offsets, data
+
+
+def _native_array(typecode: str, values: Sequence[int]) -> array:
+    return values if isinstance(values, array) and values.typecode == typecode else array(typecode, values)
+
+
+def dump_cst_binary(cst: Union[ColumnarCST, Any], file: str):
+    """
+    Write the CST into the binary file.
+
+    :param cst: Columnar CST, or the CST objects (usually a ``RootNamespace`` object)
+        which will be converted with :meth:`ColumnarCST.from_cst`.
+    :param file: Path of the file to write.
+    :type file: str
+    """
+    if not isinstance(cst, ColumnarCST):
+        cst = ColumnarCST.from_cst(cst)
+
+    classes = list(cst.classes)
+    strings, atom_offsets, atom_data = _encode_atoms(cst, classes)
+    string_offsets, string_chunks = array('I', [0]), []
+    for string in strings:
+        chunk = string.encode('utf-8')
+        string_chunks.append(chunk)
+        string_offsets.append(string_offsets[-1] + len(chunk))
+
+    sections = {
+        'classes': '\n'.join(map(_class_name, classes)).encode('utf-8'),
+        'string_offsets': string_offsets.tobytes(),
+        'string_data': b''.join(string_chunks),
+        'atom_offsets': atom_offsets.tobytes(),
+        'atom_data': atom_data.tobytes(),
+        'kinds': _native_array('B', cst.kinds).tobytes(),
+        'parents': _native_array('I', cst.parents).tobytes(),
+        'value_starts': _native_array('I', cst.value_starts).tobytes(),
+        'values': _native_array('I', cst.values).tobytes(),
+    }
+
+    position = len(_MAGIC) + _HEADER.size
+    layout = []
+    for name in _SECTIONS:
+        position += -position % _ALIGNMENT
+        layout.extend([position, len(sections[name])])
+        position += len(sections[name])
+
+    with open(file, 'wb') as f:
+        f.write(_MAGIC)
+        f.write(_HEADER.pack(_FORMAT_VERSION, int(sys.byteorder == 'little'), *layout))
+        for name, offset in zip(_SECTIONS, layout[::2]):
+            f.write(b'\0' * (offset - f.tell()))
+            f.write(sections[name])
+
+
+class _LazyTable:
+    # items are decoded on demand and cached in a dict, so nothing is allocated per item when loading
+    def __init__(self, name: str, file: str, offsets: Sequence[int], decode: Callable[[int, int], Any]):
+        self._name = name
+        self._file = file
+        self._offsets = offsets
+        self._decode = decode
+        self._items: Dict[int, Any] = {}
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> Any:
+        try:
+            return self._items[index]
+        except KeyError:
+            pass
+
+        if not 0 <= index < len(self):
+            raise CSTFormatError(f'Invalid index {index!r} of {self._name} table in binary CST file {self._file!r}.')
+        try:
+            item = self._decode(self._offsets[index], self._offsets[index + 1])
+        except (IndexError, KeyError, ValueError) as err:
+            raise CSTFormatError(f'Invalid item {index!r} of {self._name} table '
+                                 f'in binary CST file {self._file!r} - {err}.') from err
+        self._items[index] = item
+        return item
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+class _MappedColumnarCST(ColumnarCST):
+    # the node arrays are not validated when loading, so the invalid indices found in them
+    # when they are accessed are reported as format errors
+    def __init__(self, file: str, **kwargs):
+        super().__init__(**kwargs)
+        self._file = file
+
+    def _checked(self, index: Optional[int], method: Callable[..., Any], *args: Any) -> Any:
+        if index is not None:
+            _ = range(len(self))[index]  # invalid index of the caller is not a format error
+        try:
+            return method(index, *args)
+        except (IndexError, KeyError, TypeError, ValueError) as err:
+            if self._on_close is None:
+                raise  # views are released after closing
+            raise CSTFormatError(f'Invalid node {index!r} in binary CST file {self._file!r}.') from err
+
+    def children(self, index: int) -> List[int]:
+        children = self._checked(index, super().children)
+        if any(child >= index % len(self) for child in children):  # nodes are stored in post-order
+            raise CSTFormatError(f'Invalid children of node {index!r} in binary CST file {self._file!r}.')
+        return children
+
+    def subtree(self, index: int) -> range:
+        return self._checked(index, super().subtree)
+
+    def field(self, index: int, name: str) -> Any:
+        _ = self._field_offsets[self.kinds[index]][name]  # unknown field is not a format error
+        return self._checked(index, super().field, name)
+
+    def node(self, index: Optional[int] = None) -> Any:
+        return self._checked(index, super().node)
+
+    def find(self, cls: Union[type, Tuple[type, ...]], exact: bool = False, **conditions: Any) -> Iterator[int]:
+        try:
+            yield from super().find(cls, exact, **conditions)
+        except IndexError as err:
+            if self._on_close is None:  # pragma: no cover
+                raise
+            raise CSTFormatError(f'Invalid node values in binary CST file {self._file!r}.') from err
+
+
+def _check_layout(file: str, sections: Dict[str, Sequence[int]], class_count: int):
+    # only the checks in constant time (and the scan of kind codes in C), so loading is still cheap
+    if len(sections['string_offsets']) < 1 or sections['string_offsets'][-1] > len(sections['string_data']):
+        raise CSTFormatError(f'Invalid string table in binary CST file {file!r}.')
+    if len(sections['atom_offsets']) < 1 or sections['atom_offsets'][-1] > len(sections['atom_data']):
+        raise CSTFormatError(f'Invalid atom table in binary CST file {file!r}.')
+
+    kinds, parents, value_starts = sections['kinds'], sections['parents'], sections['value_starts']
+    if len(parents) != len(kinds) or len(value_starts) != len(kinds) + 1 or \
+            value_starts[-1] > len(sections['values']):
+        raise CSTFormatError(f'Inconsistent node arrays in binary CST file {file!r}.')
+    if class_count <= 0xff and re.search(b'[' + re.escape(bytes([class_count])) + b'-\xff]', kinds):
+        raise CSTFormatError(f'Invalid kind code in binary CST file {file!r}.')
+
+
+def load_cst_binary(file: str) -> ColumnarCST:
+    """
+    Load the binary CST file with :mod:`mmap`.
+
+    The node arrays of the returned :class:`ColumnarCST` are memory views of the mapped file,
+    so nothing is copied or decoded when loading. The file should not be modified while the
+    returned object is in use, and the mapping is released by :meth:`ColumnarCST.close`
+    (or by using the returned object as a context manager).
+
+    :param file: Path of the binary CST file.
+    :type file: str
+
+    :return: Columnar CST.
+    :rtype: ColumnarCST
+    :raises CSTFormatError: When the file is not a valid binary CST file. The errors in the
+        node arrays and tables are raised when they are accessed.
+    """
+    with open(file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < len(_MAGIC) + _HEADER.size:
+            raise CSTFormatError(f'File {file!r} is too small for binary CST.')
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    views: List[memoryview] = []
+
+    def _close():
+        # all the views must be released before closing the mapping
+        for item in reversed(views):
+            item.release()
+        buffer.close()
+
+    try:
+        return _load_cst_buffer(file, buffer, views, _close)
+    except BaseException:
+        _close()
+        raise
+
+
+def _load_cst_buffer(file: str, buffer: mmap.mmap, views: List[memoryview], on_close: Callable[[], None]) \
+        -> ColumnarCST:
+    def _view(value: memoryview) -> memoryview:
+        views.append(value)
+        return value
+
+    view = _view(memoryview(buffer))
+    if view[:len(_MAGIC)] != _MAGIC:
+        raise CSTFormatError(f'Invalid magic of binary CST file {file!r}.')
+    version, little_endian, *layout = _HEADER.unpack_from(view, len(_MAGIC))
+    if version != _FORMAT_VERSION:
+        raise CSTFormatError(f'Unsupported binary CST format version {version!r} in {file!r}.')
+    swap = bool(little_endian) != (sys.byteorder == 'little')
+
+    sections = {}
+    for name, offset, length in zip(_SECTIONS, layout[::2], layout[1::2]):
+        if offset + length > len(view):
+            raise CSTFormatError(f'Section {name!r} is out of the binary CST file {file!r}.')
+        sections[name] = _view(view[offset:offset + length])
+
+    def _ints(name: str, typecode: str) -> Sequence[int]:
+        if len(sections[name]) % array(typecode).itemsize:
+            raise CSTFormatError(f'Invalid length of section {name!r} in binary CST file {file!r}.')
+        if not swap:
+            return _view(sections[name].cast(typecode))
+        else:  # pragma: no cover
+            arr = array(typecode, sections[name].tobytes())
+            arr.byteswap()
+            return arr
+
+    try:
+        class_names = bytes(sections['classes']).decode('utf-8').split('\n')
+    except UnicodeDecodeError as err:
+        raise CSTFormatError(f'Invalid class names in binary CST file {file!r}.') from err
+    classes = [_load_class(name) for name in class_names]
+    sections.update({name: _ints(name, typecode) for name, typecode in [
+        ('string_offsets', 'I'), ('atom_offsets', 'I'), ('atom_data', 'I'),
+        ('parents', 'I'), ('value_starts', 'I'), ('values', 'I'),
+    ]})
+    _check_layout(file, sections, len(classes))
+
+    string_data = sections['string_data']
+
+    def _decode_string(start: int, end: int) -> str:
+        if not start <= end <= len(string_data):
+            raise ValueError(f'range {start!r}-{end!r} is out of string data')
+        return str(string_data[start:end], 'utf-8')
+
+    strings = _LazyTable('string', file, sections['string_offsets'], _decode_string)
+
+    atom_data = sections['atom_data']
+    atoms: _LazyTable
+
+    def _decode_atom(start: int, end: int) -> Any:
+        if not start < end <= len(atom_data):
+            raise ValueError(f'range {start!r}-{end!r} is out of atom data')
+        atom_type, items = atom_data[start], atom_data[start + 1:end]
+        if atom_type == _ATOM_ENUM:
+            class_code, name = items
+            if not issubclass(classes[class_code], Enum):
+                raise CSTFormatError(f'Class {classes[class_code]!r} of enum atom is not an enum in {file!r}.')
+            return classes[class_code][strings[name]]
+        elif atom_type == _ATOM_QUALIFIED_NAME:
+            return QualifiedName(tuple(strings[item] for item in items))
+        elif atom_type == _ATOM_FEATURE_CHAIN:
+            return FeatureChain(tuple(atoms[item] for item in items))
+        else:
+            raise CSTFormatError(f'Unknown atom type {atom_type!r} in {file!r}.')
+
+    atoms = _LazyTable('atom', file, sections['atom_offsets'], _decode_atom)
+    return _MappedColumnarCST(
+        file, classes=classes, strings=strings, atoms=atoms,
+        kinds=sections['kinds'], parents=sections['parents'],
+        value_starts=sections['value_starts'], values=sections['values'],
+        on_close=on_close,
+    )
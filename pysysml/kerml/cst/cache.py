@@ -0,0 +1,217 @@
+"""
+On-disk cache of the compiled KerML lark parsers.
+
+Building the Earley parser over every start rule of ``syntax.lark`` takes a noticeable
+amount of time, so the compiled :class:`lark.Lark` object is pickled into a cache directory
+and reused by later processes. The cache entries are keyed by the SHA256 of the grammar file
+(the same value recorded in ``syntax.lark.sha256``), the installed lark version, the python
+version and the extra parser options, so a changed grammar or dependency never hits a stale entry.
+"""
+
+import hashlib
+import importlib
+import io
+import json
+import logging
+import os
+import pickle
+import platform
+import tempfile
+import types
+from typing import Optional, List, Any
+
+import lark
+from lark import Lark
+from lark.parsers import lalr_analysis
+
+from .base import _grammar_file
+from pysysml.utils import file_sha256
+
+_CACHE_MAGIC = b'PYSYSML-KERML-PARSER\n'
+_CACHE_SUFFIX = '.lark.pkl'
+
+
+def parser_cache_dir() -> str:
+    """
+    Get the directory of the KerML parser cache.
+
+    The directory can be assigned with the ``PYSYSML_CACHE_DIR`` environment variable,
+    otherwise ``$XDG_CACHE_HOME/pysysml`` (default ``~/.cache/pysysml``) is used.
+
+    :return: Path of the cache directory, it may not exist yet.
+    :rtype: str
+    """
+    if os.environ.get('PYSYSML_CACHE_DIR'):
+        return os.path.abspath(os.environ['PYSYSML_CACHE_DIR'])
+    else:
+        xdg_cache_dir = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        return os.path.abspath(os.path.join(xdg_cache_dir, 'pysysml'))
+
+
+def parser_cache_enabled() -> bool:
+    """
+    Check whether the on-disk parser cache is used when it is not specified (``use_cache=None``).
+
+    The cache is not used by default, so importing pysysml and parsing never writes files
+    silently. It is enabled with the ``PYSYSML_PARSER_CACHE`` environment variable (``1``,
+    ``true``, ``yes`` or ``on``), which is set by the ``pysysml`` CLI unless it is already given.
+    The variable is inherited by the worker processes as well.
+
+    :return: Use the cache or not.
+    :rtype: bool
+    """
+    return os.environ.get('PYSYSML_PARSER_CACHE', '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def grammar_sha256() -> str:
+    """
+    Get the SHA256 hash of the KerML grammar file.
+
+    :return: Hexadecimal hash, same as the one recorded in ``syntax.lark.sha256``.
+    :rtype: str
+    """
+    return file_sha256(_grammar_file)
+
+
+def parser_cache_key(start: Optional[List[str]] = None, **options: Any) -> str:
+    """
+    Get the cache key of the parser built with the given extra start rules and lark options.
+
+    :param start: Extra start rules, the same as the argument of :func:`open_kerml_lark_parser`.
+    :type start: Optional[List[str]]
+    :param options: Extra options which affect the built parser.
+
+    :return: Hexadecimal cache key.
+    :rtype: str
+    """
+    meta = {
+        'grammar': grammar_sha256(),
+        'lark': lark.__version__,
+        'python': platform.python_version(),
+        'start': sorted(set(start or [])),
+        'options': {key: repr(value) for key, value in sorted(options.items())},
+    }
+    return hashlib.sha256(json.dumps(meta, sort_keys=True).encode()).hexdigest()
+
+
+def _cache_file(key: str) -> str:
+    return os.path.join(parser_cache_dir(), f'kerml-{key}{_CACHE_SUFFIX}')
+
+
+class _LarkPickler(pickle.Pickler):
+    def reducer_override(self, obj):
+        # lark keeps references to the ``re`` module inside the lexer configuration
+        if isinstance(obj, types.ModuleType):
+            return importlib.import_module, (obj.__name__,)
+        # the LALR parse table compares actions by identity (``action is Shift``)
+        if isinstance(obj, lalr_analysis.Action):
+            return getattr, (lalr_analysis, obj.name)
+        return NotImplemented
+
+
+def _remove_quietly(file: str):
+    try:
+        os.remove(file)
+    except OSError:  # pragma: no cover
+        pass
+
+
+def _write_atomically(file: str, data: bytes):
+    os.makedirs(os.path.dirname(file), exist_ok=True)
+    fd, tmp_file = tempfile.mkstemp(prefix='.kerml-', suffix='.tmp', dir=os.path.dirname(file))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_file, file)
+    except BaseException:
+        _remove_quietly(tmp_file)
+        raise
+
+
+def load_cached_parser(key: str) -> Optional[Lark]:
+    """
+    Load the cached parser with the given key.
+
+    Corrupted or mismatched cache files are removed, and ``None`` is returned for them.
+
+    :param key: Cache key, see :func:`parser_cache_key`.
+    :type key: str
+
+    :return: Loaded parser, or ``None`` when not cached.
+    :rtype: Optional[Lark]
+    """
+    file = _cache_file(key)
+    if not os.path.isfile(file):
+        return None
+
+    try:
+        with open(file, 'rb') as f:
+            if f.readline() != _CACHE_MAGIC or f.readline().decode().strip() != key:
+                raise ValueError(f'Invalid header of parser cache {file!r}.')
+            parser = pickle.load(f)
+        if not isinstance(parser, Lark):
+            raise TypeError(f'Lark parser expected in parser cache {file!r}, but {parser!r} found.')
+    except Exception as err:
+        logging.warning(f'Parser cache {file!r} is broken, it will be removed - {err!r}')
+        _remove_quietly(file)
+        return None
+    else:
+        return parser
+
+
+def save_cached_parser(key: str, parser: Lark) -> Optional[str]:
+    """
+    Save the parser to cache with the given key.
+
+    The file is written atomically, and failures (such as read-only cache directory)
+    are logged and ignored.
+
+    :param key: Cache key, see :func:`parser_cache_key`.
+    :type key: str
+    :param parser: Parser to save.
+    :type parser: Lark
+
+    :return: Path of the saved cache file, or ``None`` when failed.
+    :rtype: Optional[str]
+    """
+    file = _cache_file(key)
+    try:
+        buffer = io.BytesIO()
+        buffer.write(_CACHE_MAGIC)
+        buffer.write(f'{key}\n'.encode())
+        _LarkPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(parser)
+        _write_atomically(file, buffer.getvalue())
+    except Exception as err:
+        logging.warning(f'Unable to save parser cache {file!r} - {err!r}')
+        return None
+    else:
+        return file
+
+
+def list_cached_parsers() -> List[str]:
+    """
+    List the parser cache files.
+
+    :return: Sorted paths of the cache files.
+    :rtype: List[str]
+    """
+    cache_dir = parser_cache_dir()
+    if not os.path.isdir(cache_dir):
+        return []
+    return sorted(
+        os.path.join(cache_dir, file) for file in os.listdir(cache_dir)
+        if file.startswith('kerml-') and file.endswith(_CACHE_SUFFIX)
+    )
+
+
+def clear_parser_cache() -> int:
+    """
+    Remove all the parser cache files.
+
+    :return: Number of removed files.
+    :rtype: int
+    """
+    files = list_cached_parsers()
+    for file in files:
+        _remove_quietly(file)
+    return len(files)
@@ -0,0 +1,458 @@
+"""
+Columnar (array-backed) representation of the KerML CSTs.
+
+Instead of one python object per node, the nodes are stored in flat arrays of the
+:mod:`array` module:
+
+* ``kinds`` - kind code of each node, which is the index of its class in ``classes``
+  (the model dataclasses, ``list`` and ``tuple``). The nodes are stored in post-order, so
+  the subtree of each node is a continuous range which ends with itself, and the root is
+  the last node.
+* ``parents`` - index of the parent node, the root node points to itself.
+* ``value_starts`` - range of the field values (or items of lists and tuples) of each node
+  in ``values``, the values of node ``i`` are ``values[value_starts[i]:value_starts[i + 1]]``.
+* ``values`` - tagged values. The lowest 3 bits are the tag (none, boolean, node, string,
+  atom, empty list, empty tuple), and the rest is the payload, such as the index of the node,
+  or the index of the string in the interned string table ``strings``.
+
+Enum members, qualified names and feature chains are immutable and repeated a lot, so they are
+not stored as nodes, but as atoms in the interned table ``atoms``.
+
+The model objects are only created when the nodes are accessed with :meth:`ColumnarCST.node`.
+"""
+
+import dataclasses
+import re
+from array import array
+from enum import Enum
+from typing import Any, Dict, List, Tuple, Iterator, Union, TextIO, Optional, Callable
+
+from .stream import iter_kerml_elements
+from .models import RootNamespace, QualifiedName, FeatureChain
+
+_TAG_BITS = 3
+_TAG_MASK = (1 << _TAG_BITS) - 1
+_TAG_NONE, _TAG_BOOL, _TAG_NODE, _TAG_STR, _TAG_ATOM, _TAG_EMPTY_LIST, _TAG_EMPTY_TUPLE = range(7)
+_ATOM_TYPES = (Enum, QualifiedName, FeatureChain)
+_MAX_PAYLOAD = (1 << (32 - _TAG_BITS)) - 1
+
+_NONE = _TAG_NONE
+_FALSE = (0 << _TAG_BITS) | _TAG_BOOL
+_TRUE = (1 << _TAG_BITS) | _TAG_BOOL
+_EMPTY_LIST = _TAG_EMPTY_LIST
+_EMPTY_TUPLE = _TAG_EMPTY_TUPLE
+
+
+def _init_fields(cls: type) -> Tuple[str, ...]:
+    return tuple(field.name for field in dataclasses.fields(cls) if field.init)
+
+
+def _is_node(value: Any) -> bool:
+    if isinstance(value, (list, tuple)):
+        return bool(value)
+    else:
+        return dataclasses.is_dataclass(value) and not isinstance(value, (type, *_ATOM_TYPES))
+
+
+class ColumnarCSTBuilder:
+    """
+    Builder of :class:`ColumnarCST`, the CST objects are added one by one.
+    """
+
+    def __init__(self):
+        self.classes: List[type] = [list, tuple]
+        self._class_codes: Dict[type, int] = {list: 0, tuple: 1}
+        self._fields: List[Tuple[str, ...]] = [(), ()]
+        self.strings: List[str] = []
+        self._string_codes: Dict[str, int] = {}
+        self.atoms: List[Any] = []
+        self._atom_codes: Dict[Any, int] = {}
+
+        self.kinds = array('B')
+        self.parents = array('I')
+        self.value_starts = array('I', [0])
+        self.values = array('I')
+
+    def _class_code(self, cls: type) -> int:
+        try:
+            return self._class_codes[cls]
+        except KeyError:
+            if len(self.classes) > 0xff:
+                raise OverflowError(f'Too many node classes for columnar CST, {cls!r} can not be added.')
+            code = self._class_codes[cls] = len(self.classes)
+            self.classes.append(cls)
+            self._fields.append(_init_fields(cls))
+            return code
+
+    def _payload(self, payload: int, tag: int) -> int:
+        if payload > _MAX_PAYLOAD:
+            raise OverflowError(f'Payload {payload!r} is too large for columnar CST.')
+        return (payload << _TAG_BITS) | tag
+
+    def _encode(self, value: Any) -> int:
+        # encode the leaf value, the child nodes are encoded in add
+        if value is None:
+            return _NONE
+        elif value is True:
+            return _TRUE
+        elif value is False:
+            return _FALSE
+        elif isinstance(value, str):
+            try:
+                code = self._string_codes[value]
+            except KeyError:
+                code = self._string_codes[value] = len(self.strings)
+                self.strings.append(value)
+            return self._payload(code, _TAG_STR)
+        elif isinstance(value, _ATOM_TYPES):
+            try:
+                code = self._atom_codes[value]
+            except KeyError:
+                code = self._atom_codes[value] = len(self.atoms)
+                self.atoms.append(value)
+            return self._payload(code, _TAG_ATOM)
+        elif isinstance(value, list) and not value:
+            return _EMPTY_LIST
+        elif isinstance(value, tuple) and not value:
+            return _EMPTY_TUPLE
+        else:
+            raise TypeError(f'Unsupported value in CST - {value!r}.')
+
+    def _items(self, node: Any) -> Tuple[int, List[Any]]:
+        if isinstance(node, (list, tuple)):
+            return self._class_code(type(node)), list(node)
+        else:
+            code = self._class_code(type(node))
+            return code, [getattr(node, name) for name in self._fields[code]]
+
+    def add(self, node: Any) -> int:
+        """
+        Add the node and all its descendants.
+
+        :param node: CST object, a model dataclass object, or a list or tuple of them.
+
+        :return: Index of the added node.
+        :rtype: int
+        """
+        if not _is_node(node):
+            raise TypeError(f'CST node expected, but {node!r} found.')
+
+        # post-order traversal with an explicit stack, so the depth of the tree is not limited
+        indices: List[int] = []
+        stack: List[Tuple[Any, Optional[Tuple[int, List[Any], List[bool]]]]] = [(node, None)]
+        while stack:
+            value, expanded = stack.pop()
+            if expanded is None:
+                code, items = self._items(value)
+                is_nodes = [_is_node(item) for item in items]
+                stack.append((value, (code, items, is_nodes)))
+                stack.extend([(item, None) for item, is_node in zip(reversed(items), reversed(is_nodes)) if is_node])
+            else:
+                code, items, is_nodes = expanded
+                count = sum(is_nodes)
+                children = iter(indices[len(indices) - count:])
+                del indices[len(indices) - count:]
+                encoded = [self._payload(next(children), _TAG_NODE) if is_node else self._encode(item)
+                           for item, is_node in zip(items, is_nodes)]
+                indices.append(self._append(code, encoded))
+
+        return indices[0]
+
+    def _append(self, code: int, encoded: List[int]) -> int:
+        index = len(self.kinds)
+        for value in encoded:
+            if value & _TAG_MASK == _TAG_NODE:
+                self.parents[value >> _TAG_BITS] = index
+        self.kinds.append(code)
+        self.parents.append(index)  # root points to itself
+        self.values.extend(encoded)
+        self.value_starts.append(len(self.values))
+        return index
+
+    def add_root(self, elements: List[int]) -> int:
+        """
+        Add the ``RootNamespace`` node of the already added top-level elements.
+
+        :param elements: Indices of the top-level elements.
+        :type elements: List[int]
+
+        :return: Index of the root node.
+        :rtype: int
+        """
+        body = self._append(self._class_code(list), [self._payload(index, _TAG_NODE) for index in elements])
+        return self._append(self._class_code(RootNamespace), [self._payload(body, _TAG_NODE)])
+
+    def build(self) -> 'ColumnarCST':
+        """
+        Build the columnar CST, the last added node is the root.
+
+        :return: Columnar CST.
+        :rtype: ColumnarCST
+        """
+        if not self.kinds:
+            raise ValueError('No node in the columnar CST builder.')
+        return ColumnarCST(
+            classes=self.classes, strings=self.strings, atoms=self.atoms,
+            kinds=self.kinds, parents=self.parents, value_starts=self.value_starts, values=self.values,
+        )
+
+
+class ColumnarCST:
+    """
+    Array-backed CST, see the module documentation for its layout.
+
+    Use :meth:`from_cst` or :func:`parse_kerml_columnar` to create it.
+
+    It can be used as a context manager, which calls :meth:`close` on exit.
+    """
+
+    def __init__(self, classes: List[type], strings: List[str], atoms: List[Any],
+                 kinds: array, parents: array, value_starts: array, values: array,
+                 on_close: Optional[Callable[[], None]] = None):
+        self.classes = classes
+        self.strings = strings
+        self.atoms = atoms
+        self.kinds = kinds
+        self.parents = parents
+        self.value_starts = value_starts
+        self.values = values
+        self._fields = [_init_fields(cls) if dataclasses.is_dataclass(cls) else () for cls in classes]
+        self._field_offsets = [{name: i for i, name in enumerate(fields)} for fields in self._fields]
+        self._string_codes: Optional[Dict[str, int]] = None
+        self._atom_codes: Optional[Dict[Any, int]] = None
+        self._on_close = on_close
+
+    @classmethod
+    def from_cst(cls, cst: Any) -> 'ColumnarCST':
+        """
+        Convert the CST objects to columnar CST.
+
+        :param cst: Root of the CST, usually a ``RootNamespace`` object.
+
+        :return: Columnar CST.
+        :rtype: ColumnarCST
+        """
+        builder = ColumnarCSTBuilder()
+        builder.add(cst)
+        return builder.build()
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def close(self):
+        """
+        Release the buffers of the arrays, such as the mapped file of
+        :func:`pysysml.kerml.cst.load_cst_binary`. The arrays of a loaded CST can not be
+        accessed after closing, and nothing is done for the CST built in memory.
+        """
+        on_close, self._on_close = self._on_close, None
+        if on_close is not None:
+            on_close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def root(self) -> int:
+        """
+        Index of the root node.
+        """
+        return len(self.kinds) - 1
+
+    def kind(self, index: int) -> type:
+        """
+        Get the class of the node.
+        """
+        return self.classes[self.kinds[index]]
+
+    def parent(self, index: int) -> Optional[int]:
+        """
+        Get the index of the parent node, ``None`` for the root node.
+        """
+        parent = self.parents[index]
+        return None if parent == index else parent
+
+    def subtree(self, index: int) -> range:
+        """
+        Get the indices of the nodes in the subtree of the given node, including itself.
+        """
+        first = index
+        while True:
+            children = self.children(first)
+            if not children:
+                break
+            first = children[0]  # the first child has the first subtree
+        return range(first, index + 1)
+
+    def children(self, index: int) -> List[int]:
+        """
+        Get the indices of the direct child nodes.
+        """
+        return [value >> _TAG_BITS
+                for value in self.values[self.value_starts[index]:self.value_starts[index + 1]]
+                if value & _TAG_MASK == _TAG_NODE]
+
+    def _decode(self, value: int) -> Any:
+        tag, payload = value & _TAG_MASK, value >> _TAG_BITS
+        if tag == _TAG_NODE:
+            return self.node(payload)
+        elif tag == _TAG_STR:
+            return self.strings[payload]
+        elif tag == _TAG_BOOL:
+            return bool(payload)
+        elif tag == _TAG_NONE:
+            return None
+        elif tag == _TAG_ATOM:
+            return self.atoms[payload]
+        elif tag == _TAG_EMPTY_LIST:
+            return []
+        else:
+            return ()
+
+    def field(self, index: int, name: str) -> Any:
+        """
+        Get the value of a field of the node, a child node is materialized as model object.
+
+        :param index: Index of the node.
+        :type index: int
+        :param name: Name of the field.
+        :type name: str
+
+        :return: Value of the field.
+        """
+        offset = self._field_offsets[self.kinds[index]][name]
+        return self._decode(self.values[self.value_starts[index] + offset])
+
+    def node(self, index: Optional[int] = None) -> Any:
+        """
+        Materialize the node (with its subtree) as the model objects.
+
+        :param index: Index of the node, default is the root node.
+        :type index: Optional[int]
+
+        :return: Model object, or list or tuple of them.
+        """
+        index = self.root if index is None else index
+        # the subtree is stored in post-order, so the children are always built before their parents
+        built: Dict[int, Any] = {}
+        kinds, values, value_starts = self.kinds, self.values, self.value_starts
+        for current in self.subtree(index):
+            code = kinds[current]
+            cls = self.classes[code]
+            items = [built.pop(value >> _TAG_BITS) if value & _TAG_MASK == _TAG_NODE else self._decode(value)
+                     for value in values[value_starts[current]:value_starts[current + 1]]]
+            if cls is list:
+                built[current] = items
+            elif cls is tuple:
+                built[current] = tuple(items)
+            else:
+                built[current] = cls(**dict(zip(self._fields[code], items)))
+        return built[index]
+
+    def _kind_codes(self, cls: Union[type, Tuple[type, ...]], exact: bool) -> List[int]:
+        classes = cls if isinstance(cls, tuple) else (cls,)
+        return [code for code, kind in enumerate(self.classes)
+                if (kind in classes if exact else issubclass(kind, classes))]
+
+    def _encode_condition(self, value: Any) -> Optional[int]:
+        if value is None:
+            return _NONE
+        elif value is True:
+            return _TRUE
+        elif value is False:
+            return _FALSE
+        elif isinstance(value, str):
+            if self._string_codes is None:
+                self._string_codes = {string: code for code, string in enumerate(self.strings)}
+            code = self._string_codes.get(value)
+            return None if code is None else (code << _TAG_BITS) | _TAG_STR
+        elif isinstance(value, _ATOM_TYPES):
+            if self._atom_codes is None:
+                self._atom_codes = {atom: code for code, atom in enumerate(self.atoms)}
+            code = self._atom_codes.get(value)
+            return None if code is None else (code << _TAG_BITS) | _TAG_ATOM
+        else:
+            raise TypeError(f'Only none, boolean, string, enum, qualified name and feature chain conditions '
+                            f'are supported, but {value!r} found.')
+
+    def find(self, cls: Union[type, Tuple[type, ...]], exact: bool = False, **conditions: Any) -> Iterator[int]:
+        """
+        Find the nodes of the given class, whose fields are equal to the given values.
+
+        The kind codes are scanned in C (with :mod:`re` over the buffer of ``kinds``), and the
+        conditions are checked on the encoded values, so no model object is created.
+
+        :param cls: Class (or tuple of classes) of the nodes.
+        :param exact: Only match the exact classes, not their subclasses. Default is ``False``.
+        :type exact: bool
+        :param conditions: Expected values of the fields, only none, boolean, string, enum,
+            qualified name and feature chain values are supported.
+
+        :return: Iterator of the node indices.
+        """
+        codes = self._kind_codes(cls, exact)
+        if not codes:
+            return
+        encoded_conditions = {name: self._encode_condition(value) for name, value in conditions.items()}
+        if any(value is None for value in encoded_conditions.values()):
+            return  # value never appeared
+
+        offsets = {}
+        for code in codes:
+            field_offsets = self._field_offsets[code]
+            if all(name in field_offsets for name in encoded_conditions):
+                offsets[code] = [(field_offsets[name], value) for name, value in encoded_conditions.items()]
+        if not offsets:
+            return
+
+        pattern = re.compile(b'[' + b''.join(re.escape(bytes([code])) for code in offsets) + b']')
+        kinds, values, value_starts = self.kinds, self.values, self.value_starts
+        for match in pattern.finditer(kinds):
+            index = match.start()
+            start = value_starts[index]
+            for offset, value in offsets[kinds[index]]:
+                if values[start + offset] != value:
+                    break
+            else:
+                yield index
+
+    def count(self, cls: Union[type, Tuple[type, ...]], exact: bool = False, **conditions: Any) -> int:
+        """
+        Count the nodes of the given class, whose fields are equal to the given values.
+        The arguments are the same as :meth:`find`.
+
+        :return: Number of the nodes.
+        :rtype: int
+        """
+        return sum(1 for _ in self.find(cls, exact, **conditions))
+
+    def nbytes(self) -> int:
+        """
+        Size of the arrays in bytes, the string table is not included.
+        """
+        return sum(arr.itemsize * len(arr) for arr in
+                   (self.kinds, self.parents, self.value_starts, self.values))
+
+
+def parse_kerml_columnar(stream: Union[str, TextIO], parser: str = 'auto') -> ColumnarCST:
+    """
+    Parse KerML text into columnar CST.
+
+    The top-level elements are parsed with :func:`iter_kerml_elements` and added to the arrays
+    one by one, so the model objects of only one element are alive at the same time.
+
+    :param stream: Text stream to read from, or the KerML text itself.
+    :type stream: Union[str, TextIO]
+    :param parser: Parser mode, the same as the argument of :func:`parse_kerml`.
+    :type parser: str
+
+    :return: Columnar CST, whose root node is the ``RootNamespace``.
+    :rtype: ColumnarCST
+    """
+    builder = ColumnarCSTBuilder()
+    elements = [builder.add(element) for element in iter_kerml_elements(stream, parser=parser)]
+    builder.add_root(elements)
+    return builder.build()
@@ -0,0 +1,300 @@
+"""
+Content-addressed on-disk cache of the parsed KerML CSTs.
+
+The ``RootNamespace`` of a KerML file only depends on its content, the grammar and the CST
+models, so it is pickled into a cache directory with a key made of the SHA256 of the file
+content (ignoring the line breaks, see :func:`pysysml.utils.text_sha256`), the SHA256 of
+the grammar, the pysysml version and the python version. The file is read only once, and
+the same bytes are hashed and parsed, so a file changed in between never hits a wrong entry.
+An unchanged file costs one hash and one load, instead of one full parse.
+
+The total size of the cache directory is bounded, the least recently used entries (by the
+modification time, which is refreshed on every hit) are evicted when it is exceeded. The sizes
+of the entries are tracked in memory, and the directory is only scanned again after as many
+saves as the entries found by the last scan (so the entries saved by the other processes are
+counted as well), which keeps the cost of each save constant on average.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import pickle
+import platform
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, List, Any, Tuple
+
+from .cache import parser_cache_dir, grammar_sha256, _write_atomically, _remove_quietly
+from .parse import parse_kerml
+from pysysml.config.meta import __VERSION__
+from pysysml.utils import text_sha256
+
+_CACHE_MAGIC = b'PYSYSML-KERML-CST\n'
+_CACHE_SUFFIX = '.cst.pkl'
+_CACHE_FORMAT = 3  # increase it when the pickled layout of the CST models is changed
+
+
+def _decode_text(data: bytes, encoding: str) -> str:
+    # the same as reading the file in text mode, with the universal newlines
+    return io.TextIOWrapper(io.BytesIO(data), encoding=encoding).read()
+
+
+@dataclass
+class CstCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class KerMLCstCache:
+    """
+    On-disk LRU cache of the CSTs of KerML files, keyed by the file content.
+
+    :param cache_dir: Directory of the cache, default is the ``cst`` directory
+        in :func:`parser_cache_dir`.
+    :type cache_dir: Optional[str]
+    :param max_bytes: Max total size of the cache files in bytes, ``None`` means no limit.
+        Default is ``256 MiB``.
+    :type max_bytes: Optional[int]
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = 256 << 20):
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError(f'Max size of CST cache should be positive, but {max_bytes!r} found.')
+
+        self.cache_dir = os.path.abspath(cache_dir or os.path.join(parser_cache_dir(), 'cst'))
+        self.max_bytes = max_bytes
+        self.stats = CstCacheStats()
+        self._grammar_sha256 = grammar_sha256()
+        self._lock = threading.RLock()
+
+        # sizes of the cache files in LRU order, None when the directory is not scanned yet
+        self._index: Optional['OrderedDict[str, int]'] = None
+        self._index_size = 0
+        self._saves_since_scan = 0
+
+    def key(self, file: str, encoding: str = 'utf-8') -> str:
+        """
+        Get the cache key of the given file.
+
+        :param file: Path of the KerML file.
+        :type file: str
+        :param encoding: Encoding of the file.
+        :type encoding: str
+
+        :return: Hexadecimal cache key.
+        :rtype: str
+        """
+        with open(file, 'rb') as f:
+            return self._key(f.read(), encoding)
+
+    def _key(self, data: bytes, encoding: str) -> str:
+        meta = {
+            'format': _CACHE_FORMAT,
+            'file': text_sha256(data),
+            'encoding': encoding,
+            'grammar': self._grammar_sha256,
+            'pysysml': __VERSION__,
+            'python': platform.python_version(),
+        }
+        return hashlib.sha256(json.dumps(meta, sort_keys=True).encode()).hexdigest()
+
+    def _cache_file(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f'{key}{_CACHE_SUFFIX}')
+
+    def load(self, key: str) -> Optional[Any]:
+        """
+        Load the cached CST with the given key.
+
+        Corrupted cache files are removed, and ``None`` is returned for them.
+
+        :param key: Cache key, see :meth:`key`.
+        :type key: str
+
+        :return: Loaded CST, or ``None`` when not cached.
+        """
+        file = self._cache_file(key)
+        try:
+            with open(file, 'rb') as f:
+                if f.readline() != _CACHE_MAGIC or f.readline().decode().strip() != key:
+                    raise ValueError(f'Invalid header of CST cache {file!r}.')
+                cst = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as err:
+            logging.warning(f'CST cache {file!r} is broken, it will be removed - {err!r}')
+            _remove_quietly(file)
+            return None
+
+        try:
+            os.utime(file)  # mark as recently used
+        except OSError:  # pragma: no cover
+            pass
+        with self._lock:
+            if self._index is not None and file in self._index:
+                self._index.move_to_end(file)
+        return cst
+
+    def save(self, key: str, cst: Any) -> Optional[str]:
+        """
+        Save the CST with the given key, and evict the least recently used entries when
+        the cache is too large. Failures are logged and ignored.
+
+        :param key: Cache key, see :meth:`key`.
+        :type key: str
+        :param cst: CST to save.
+
+        :return: Path of the saved cache file, or ``None`` when failed.
+        :rtype: Optional[str]
+        """
+        file = self._cache_file(key)
+        try:
+            data = b''.join([_CACHE_MAGIC, f'{key}\n'.encode(), pickle.dumps(cst, protocol=pickle.HIGHEST_PROTOCOL)])
+            _write_atomically(file, data)
+        except Exception as err:
+            logging.warning(f'Unable to save CST cache {file!r} - {err!r}')
+            return None
+
+        self._evict(keep=file, size=len(data))
+        return file
+
+    def _scan(self):
+        entries = []
+        for file in self.entries():
+            try:
+                stat = os.stat(file)
+            except OSError:  # pragma: no cover
+                continue
+            entries.append((stat.st_mtime_ns, file, stat.st_size))
+        entries.sort()
+
+        self._index = OrderedDict((file, size) for _, file, size in entries)
+        self._index_size = sum(size for _, _, size in entries)
+        self._saves_since_scan = 0
+
+    def _evict(self, keep: str, size: int):
+        if self.max_bytes is None:
+            return
+
+        with self._lock:
+            self._saves_since_scan += 1
+            if self._index is None or self._saves_since_scan > len(self._index):
+                self._scan()
+            else:
+                self._index_size += size - self._index.pop(keep, 0)
+                self._index[keep] = size
+            if keep in self._index:
+                self._index.move_to_end(keep)
+
+            while self._index_size > self.max_bytes and len(self._index) > 1:
+                file, file_size = self._index.popitem(last=False)
+                _remove_quietly(file)
+                self._index_size -= file_size
+                self.stats.evictions += 1
+
+    def parse_file(self, file: str, parser: str = 'auto', encoding: str = 'utf-8') -> Any:
+        """
+        Parse the KerML file, the CST is loaded from cache when the content of file is not changed.
+
+        :param file: Path of the KerML file.
+        :type file: str
+        :param parser: Parser mode, the same as the argument of :func:`parse_kerml`.
+        :type parser: str
+        :param encoding: Encoding of the file, default is ``utf-8``.
+        :type encoding: str
+
+        :return: Parsed CST, a ``RootNamespace`` object.
+        """
+        cst, _ = self.parse_file_cached(file, parser, encoding)
+        return cst
+
+    def parse_file_cached(self, file: str, parser: str = 'auto', encoding: str = 'utf-8') -> Tuple[Any, bool]:
+        """
+        Parse the KerML file like :meth:`parse_file`, and tell whether the CST is loaded from cache.
+
+        :param file: Path of the KerML file.
+        :type file: str
+        :param parser: Parser mode, the same as the argument of :func:`parse_kerml`.
+        :type parser: str
+        :param encoding: Encoding of the file, default is ``utf-8``.
+        :type encoding: str
+
+        :return: Parsed CST, and ``True`` when it is loaded from cache.
+        :rtype: Tuple[Any, bool]
+        """
+        with open(file, 'rb') as f:
+            data = f.read()
+        key = self._key(data, encoding)
+        cst = self.load(key)
+        if cst is not None:
+            with self._lock:
+                self.stats.hits += 1
+            return cst, True
+
+        with self._lock:
+            self.stats.misses += 1
+        cst = parse_kerml(_decode_text(data, encoding), parser=parser)
+        self.save(key, cst)
+        return cst, False
+
+    def entries(self) -> List[str]:
+        """
+        List the cache files.
+
+        :return: Sorted paths of the cache files.
+        :rtype: List[str]
+        """
+        if not os.path.isdir(self.cache_dir):
+            return []
+        return sorted(
+            os.path.join(self.cache_dir, file) for file in os.listdir(self.cache_dir)
+            if file.endswith(_CACHE_SUFFIX)
+        )
+
+    @property
+    def size(self) -> int:
+        """
+        Total size of the cache files in bytes.
+        """
+        total = 0
+        for file in self.entries():
+            try:
+                total += os.path.getsize(file)
+            except OSError:  # pragma: no cover
+                pass
+        return total
+
+    def clear(self) -> int:
+        """
+        Remove all the cache files.
+
+        :return: Number of removed files.
+        :rtype: int
+        """
+        files = self.entries()
+        for file in files:
+            _remove_quietly(file)
+        with self._lock:
+            self._index = None
+        return len(files)
+
+
+_DEFAULT_CACHE: Optional[KerMLCstCache] = None
+_DEFAULT_CACHE_LOCK = threading.Lock()
+
+
+def get_kerml_cst_cache() -> KerMLCstCache:
+    """
+    Get the process-wide default CST cache.
+
+    :return: Default CST cache.
+    :rtype: KerMLCstCache
+    """
+    global _DEFAULT_CACHE
+    with _DEFAULT_CACHE_LOCK:
+        if _DEFAULT_CACHE is None:
+            _DEFAULT_CACHE = KerMLCstCache()
+        return _DEFAULT_CACHE
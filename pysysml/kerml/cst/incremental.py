@@ -0,0 +1,170 @@
+"""
+Incremental parsing of KerML files.
+
+The top-level elements (``namespace_body_element`` of the ``root_namespace`` rule) are
+self-delimited, they always end with ``;``, ``}`` or a comment body. So when an edit falls
+inside one of them, only that element is parsed again with ``namespace_body_element`` as
+the start rule, and the new node is spliced into the existing ``RootNamespace.body``.
+Edits which cross element boundaries, edits between elements, and edits which turn one
+element into something else than exactly one element fall back to a full parse. An edit
+at the end of an element is treated as crossing its boundary, because the new text can
+change the text after it as well (such as a ``//`` note which comments out the next element).
+"""
+
+from functools import lru_cache
+from typing import List, Tuple, Optional, Any
+
+from lark import Lark, Tree
+from lark.exceptions import LarkError, UnexpectedInput
+
+from .lark import _open_lark_parser
+from .parse import _tree_to_cst
+
+_ELEMENT_RULE = 'namespace_body_element'
+
+
+@lru_cache(maxsize=8)
+def _positioned_parser(start: str, parser: str) -> Optional[Lark]:
+    try:
+        return _open_lark_parser(start=[start], parser=parser, all_starts=False, propagate_positions=True)
+    except LarkError:
+        if parser == 'lalr':
+            return None
+        raise  # pragma: no cover
+
+
+def _parse_positioned_tree(text: str, start: str) -> Tree:
+    lalr_parser = _positioned_parser(start, 'lalr')
+    if lalr_parser is not None:
+        try:
+            return lalr_parser.parse(text, start=start)
+        except UnexpectedInput:
+            pass
+    return _positioned_parser(start, 'earley').parse(text, start=start)
+
+
+def _common_prefix_length(a: str, b: str) -> int:
+    # binary search with the slices, so the characters are compared in C, O(n) in total
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[low:mid] == b[low:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def _common_suffix_length(a: str, b: str, limit: int) -> int:
+    # the same as _common_prefix_length, the suffix is not longer than the limit
+    low, high = 0, limit
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[len(a) - mid:len(a) - low] == b[len(b) - mid:len(b) - low]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+class IncrementalKerMLParser:
+    """
+    Parser which keeps the CST of a KerML file, and reparses only the changed top-level elements.
+
+    The CST after every edit is the same as the one of a full parse of the new text. When an edit
+    (or the full parse) fails, the error is raised and the state of this parser is not changed.
+
+    :param text: Initial text of the KerML file.
+    :type text: str
+    """
+
+    def __init__(self, text: str = ''):
+        self.text: str = ''
+        self.cst: Any = None
+        self.spans: List[Tuple[int, int]] = []
+        self.full_parses = 0
+        self.incremental_parses = 0
+        self.reparse(text)
+
+    def reparse(self, text: Optional[str] = None) -> Any:
+        """
+        Parse the whole text again.
+
+        :param text: New text, the current text is used when not given.
+        :type text: Optional[str]
+
+        :return: New CST, a ``RootNamespace`` object.
+        """
+        text = self.text if text is None else text
+        tree = _parse_positioned_tree(text, 'start')
+        cst = _tree_to_cst(tree)
+        root_tree, = tree.children
+        self.text = text
+        self.cst = cst
+        self.spans = [(item.meta.start_pos, item.meta.end_pos) for item in root_tree.children]
+        self.full_parses += 1
+        return self.cst
+
+    def _find_element(self, start: int, end: int) -> Optional[int]:
+        for index, (span_start, span_end) in enumerate(self.spans):
+            if span_start <= start and end < span_end:
+                return index
+            elif span_start > start:
+                break
+        return None
+
+    def edit(self, start: int, end: int, text: str) -> Any:
+        """
+        Replace ``self.text[start:end]`` with the given text.
+
+        :param start: Start position of the replaced text.
+        :type start: int
+        :param end: End position of the replaced text.
+        :type end: int
+        :param text: New text.
+        :type text: str
+
+        :return: Updated CST, the same ``RootNamespace`` object when only one element is reparsed.
+        """
+        if not 0 <= start <= end <= len(self.text):
+            raise ValueError(f'Invalid edit range [{start!r}, {end!r}) for text of length {len(self.text)!r}.')
+
+        if start == end and not text:
+            return self.cst
+
+        new_text = f'{self.text[:start]}{text}{self.text[end:]}'
+        delta = len(text) - (end - start)
+        index = self._find_element(start, end)
+        if index is not None:
+            span_start, span_end = self.spans[index]
+            segment = new_text[span_start:span_end + delta]
+            try:
+                tree = _parse_positioned_tree(segment, _ELEMENT_RULE)
+                node = _tree_to_cst(tree)
+            except LarkError:
+                pass  # the new segment is not exactly one element
+            else:
+                self.text = new_text
+                self.cst.body[index] = node
+                self.spans[index] = (span_start + tree.meta.start_pos, span_start + tree.meta.end_pos)
+                for i in range(index + 1, len(self.spans)):
+                    self.spans[i] = (self.spans[i][0] + delta, self.spans[i][1] + delta)
+                self.incremental_parses += 1
+                return self.cst
+
+        return self.reparse(new_text)
+
+    def update(self, text: str) -> Any:
+        """
+        Replace the whole text, only the changed range (between the common prefix and
+        the common suffix of the old and new text) is treated as the edit.
+
+        :param text: New text.
+        :type text: str
+
+        :return: Updated CST.
+        """
+        old_text = self.text
+        prefix = _common_prefix_length(old_text, text)
+        suffix = _common_suffix_length(old_text, text, min(len(old_text), len(text)) - prefix)
+        return self.edit(prefix, len(old_text) - suffix, text[prefix:len(text) - suffix])
@@ -1,16 +1,157 @@
+import logging
 import pathlib
-from typing import List, Optional
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Union
 
-from lark import Lark
+from lark import Lark, Tree
+from lark.exceptions import LarkError
 
-from .base import _grammar_file
-from pysysml.utils import list_rules_from_grammar
+from .base import _grammar_file, _lalr_grammar_file
+from .cache import parser_cache_key, load_cached_parser, save_cached_parser, parser_cache_enabled
+from pysysml.utils import list_rules_from_grammar, override_grammar_definitions, file_sha256
 
+_PARSER_MODES = ('earley', 'lalr', 'auto')
 
-def open_kerml_lark_parser(start: Optional[List[str]] = None) -> Lark:
-    grammar_code = pathlib.Path(_grammar_file).read_text()
-    rules = list_rules_from_grammar(grammar_code=grammar_code, show_alias=False)
-    starts = rules
+
+def _kerml_lalr_grammar_code() -> str:
+    return override_grammar_definitions(
+        grammar_code=pathlib.Path(_grammar_file).read_text(),
+        override_code=pathlib.Path(_lalr_grammar_file).read_text(),
+    )
+
+
+def _build_kerml_lark_parser(start: Optional[List[str]] = None, parser: str = 'earley',
+                             all_starts: bool = True, **options) -> Lark:
+    if all_starts:
+        grammar_code = pathlib.Path(_grammar_file).read_text()
+        starts = list_rules_from_grammar(grammar_code=grammar_code, show_alias=False)
+    else:
+        starts = []
     starts.extend(list(start or []))
     starts = sorted(set(starts))
-    return Lark.open(grammar_filename=_grammar_file, start=starts)
+    if parser == 'lalr':
+        return Lark(_kerml_lalr_grammar_code(), start=starts, parser='lalr', **options)
+    else:
+        return Lark.open(grammar_filename=_grammar_file, start=starts, **options)
+
+
+def _open_lark_parser(start: Optional[List[str]] = None, use_cache: Optional[bool] = None, parser: str = 'earley',
+                      all_starts: bool = True, **options) -> Lark:
+    if use_cache is None:
+        use_cache = parser_cache_enabled()
+    if use_cache:
+        key_options = dict(options)
+        if not all_starts:
+            key_options['all_starts'] = False
+        if parser == 'lalr':
+            key = parser_cache_key(start, parser=parser, lalr_grammar=file_sha256(_lalr_grammar_file), **key_options)
+        else:
+            key = parser_cache_key(start, **key_options)
+        lark_parser = load_cached_parser(key)
+        if lark_parser is None:
+            lark_parser = _build_kerml_lark_parser(start, parser=parser, all_starts=all_starts, **options)
+            save_cached_parser(key, lark_parser)
+        return lark_parser
+    else:
+        return _build_kerml_lark_parser(start, parser=parser, all_starts=all_starts, **options)
+
+
+@dataclass
+class ParsePathStats:
+    count: int = 0
+    seconds: float = 0.0
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+
+
+@dataclass
+class AutoParseReport:
+    lalr: ParsePathStats = field(default_factory=ParsePathStats)
+    fallback: ParsePathStats = field(default_factory=ParsePathStats)
+    failed: ParsePathStats = field(default_factory=ParsePathStats)
+
+    @property
+    def total(self) -> int:
+        return self.lalr.count + self.fallback.count + self.failed.count
+
+    def __str__(self):
+        lines = [f'{"Path":<10}{"Count":>10}{"Ratio":>10}{"Seconds":>12}{"Avg (ms)":>12}']
+        for name, stats in [('lalr', self.lalr), ('fallback', self.fallback), ('failed', self.failed)]:
+            ratio = stats.count / self.total if self.total else 0.0
+            avg_ms = stats.seconds / stats.count * 1000.0 if stats.count else 0.0
+            lines.append(f'{name:<10}{stats.count:>10}{ratio:>10.1%}{stats.seconds:>12.3f}{avg_ms:>12.3f}')
+        return '\n'.join(lines)
+
+
+class KerMLAutoParser:
+    """
+    KerML parser which tries the LALR parser first, and falls back to the Earley parser
+    when the LALR parser is not able to build or to parse the given text.
+
+    The count and time of each path are recorded in :attr:`report`. The fallback path
+    includes the time of the failed LALR attempt.
+    """
+
+    def __init__(self, start: Optional[List[str]] = None, use_cache: Optional[bool] = None, all_starts: bool = True):
+        self._start = list(start or [])
+        self._use_cache = use_cache
+        self._all_starts = all_starts
+        self._lalr_parser: Optional[Lark] = None
+        self._lalr_unavailable = False
+        self._earley_parser: Optional[Lark] = None
+        self.report = AutoParseReport()
+
+    @property
+    def lalr_parser(self) -> Optional[Lark]:
+        if self._lalr_parser is None and not self._lalr_unavailable:
+            try:
+                self._lalr_parser = _open_lark_parser(self._start, use_cache=self._use_cache,
+                                                      parser='lalr', all_starts=self._all_starts)
+            except LarkError as err:
+                logging.warning(f'Unable to build LALR parser for KerML, Earley parser will be used - {err!r}')
+                self._lalr_unavailable = True
+        return self._lalr_parser
+
+    @property
+    def earley_parser(self) -> Lark:
+        if self._earley_parser is None:
+            self._earley_parser = _open_lark_parser(self._start, use_cache=self._use_cache,
+                                                    parser='earley', all_starts=self._all_starts)
+        return self._earley_parser
+
+    def parse(self, text: str, start: Optional[str] = None) -> Tree:
+        lalr_seconds = 0.0
+        lalr_parser = self.lalr_parser
+        if lalr_parser is not None:
+            start_time = time.perf_counter()
+            try:
+                tree = lalr_parser.parse(text, start=start)
+            except LarkError:
+                lalr_seconds = time.perf_counter() - start_time
+            else:
+                self.report.lalr.add(time.perf_counter() - start_time)
+                return tree
+
+        earley_parser = self.earley_parser
+        start_time = time.perf_counter()
+        try:
+            tree = earley_parser.parse(text, start=start)
+        except BaseException:
+            self.report.failed.add(lalr_seconds + time.perf_counter() - start_time)
+            raise
+        else:
+            self.report.fallback.add(lalr_seconds + time.perf_counter() - start_time)
+            return tree
+
+
+def open_kerml_lark_parser(start: Optional[List[str]] = None, use_cache: Optional[bool] = None,
+                           parser: str = 'earley', all_starts: bool = True) -> Union[Lark, KerMLAutoParser]:
+    if parser == 'auto':
+        return KerMLAutoParser(start=start, use_cache=use_cache, all_starts=all_starts)
+    elif parser in _PARSER_MODES:
+        return _open_lark_parser(start=start, use_cache=use_cache, parser=parser, all_starts=all_starts)
+    else:
+        raise ValueError(f'Unknown parser mode, one of {_PARSER_MODES!r} expected but {parser!r} found.')
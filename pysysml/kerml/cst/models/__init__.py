@@ -12,7 +12,7 @@ from .kernel import Class, DataType, Struct, Association, AssociationStruct, Con
     MultiplicitySubset, MultiplicityRange, Metaclass, SuccessionItemFlow, Metadata, MetadataRedefine, \
     ElementFilter, Package, LibraryPackage, NullValue, MetadataAccessExpression, NamedArgument, InvocationExpression
 from .literal import InfValue, BoolValue, RealValue, StringValue, IntValue, LiteralValue
-from .name import name_escape, name_unescape, name_safe_repr, QualifiedName, Identification, FeatureChain
+from .name import name_escape, name_unescape, name_safe_repr, QualifiedName, Identification, FeatureChain, NameTable
 from .operators import ExtentOp, UnaryOp, BinOp, CondBinOp, IfTestOp, ClsTestOp, ClsCastOp, \
     MetaClsTestOp, MetaClsCastOp
 from .root import Comment, Dependency, Documentation, RelationshipBody, TextualRepresentation, Namespace, \
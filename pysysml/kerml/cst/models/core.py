@@ -1,47 +1,48 @@
-from dataclasses import dataclass
 from enum import unique, Enum
 from typing import List, Union, Optional, Any
 
+from pysysml.utils import slots_dataclass
+
 from .glob import MultiplicityBounds, PrefixMetadataAnnotation
 from .name import QualifiedName, Identification, FeatureChain
 
 
-@dataclass
+@slots_dataclass
 class SuperclassingPart:
     items: List[QualifiedName]
 
 
-@dataclass
+@slots_dataclass
 class SpecializationPart:
     items: List[QualifiedName]
 
 
-@dataclass
+@slots_dataclass
 class ConjugationPart:
     item: Union[FeatureChain, QualifiedName]
 
 
-@dataclass
+@slots_dataclass
 class DisjoiningPart:
     items: List[Union[FeatureChain, QualifiedName]]
 
 
-@dataclass
+@slots_dataclass
 class UnioningPart:
     items: List[Union[FeatureChain, QualifiedName]]
 
 
-@dataclass
+@slots_dataclass
 class IntersectingPart:
     items: List[Union[FeatureChain, QualifiedName]]
 
 
-@dataclass
+@slots_dataclass
 class DifferencingPart:
     items: List[Union[FeatureChain, QualifiedName]]
 
 
-@dataclass
+@slots_dataclass
 class Type:
     is_abstract: bool
     annotations: List[PrefixMetadataAnnotation]
@@ -54,37 +55,37 @@ class Type:
     body: List[Any]
 
 
-@dataclass
+@slots_dataclass
 class ChainingPart:
     item: Union[FeatureChain, QualifiedName]
 
 
-@dataclass
+@slots_dataclass
 class InvertingPart:
     item: Union[FeatureChain, QualifiedName]
 
 
-@dataclass
+@slots_dataclass
 class TypeFeaturingPart:
     items: List[QualifiedName]
 
 
-@dataclass
+@slots_dataclass
 class TypingsPart:
     items: List[Union[FeatureChain, QualifiedName]]
 
 
-@dataclass
+@slots_dataclass
 class SubsettingsPart:
     items: List[Union[FeatureChain, QualifiedName]]
 
 
-@dataclass
+@slots_dataclass
 class ReferencesPart:
     item: Union[FeatureChain, QualifiedName]
 
 
-@dataclass
+@slots_dataclass
 class RedefinitionsPart:
     items: List[Union[FeatureChain, QualifiedName]]
 
@@ -146,7 +147,7 @@ class FeatureValueType(Enum):
         return f'{self.__class__.__name__}.{self.name}'
 
 
-@dataclass
+@slots_dataclass
 class GenericFeature:
     direction: Optional[FeatureDirection]
     is_abstract: bool
@@ -168,14 +169,14 @@ class GenericFeature:
     body: List[Any]
 
 
-@dataclass
+@slots_dataclass
 class Feature(GenericFeature):
     is_default: bool
     value_type: Optional[FeatureValueType]
     value: Optional[Any]
 
 
-@dataclass
+@slots_dataclass
 class Specialization:
     identification: Optional[Identification]
     specific_type: Union[QualifiedName, FeatureChain]
@@ -183,7 +184,7 @@ class Specialization:
     body: List[Any]
 
 
-@dataclass
+@slots_dataclass
 class Conjugation:
     identification: Optional[Identification]
     conjugate_type: Union[QualifiedName, FeatureChain]
@@ -191,7 +192,7 @@ class Conjugation:
     body: List[Any]
 
 
-@dataclass
+@slots_dataclass
 class Disjoining:
     identification: Optional[Identification]
     disjoint_type: Union[QualifiedName, FeatureChain]
@@ -199,7 +200,7 @@ class Disjoining:
     body: List[Any]
 
 
-@dataclass
+@slots_dataclass
 class Classifier:
     is_abstract: bool
     annotations: List[PrefixMetadataAnnotation]
@@ -212,7 +213,7 @@ class Classifier:
     body: List[Any]
 
 
-@dataclass
+@slots_dataclass
 class Subclassification:
     identification: Optional[Identification]
     subclassifier: QualifiedName
@@ -220,7 +221,7 @@ class Subclassification:
     body: List[Any]
 
 
-@dataclass
+@slots_dataclass
 class FeatureTyping:
     identification: Optional[Identification]
     typed_entity: QualifiedName
@@ -228,7 +229,7 @@ class FeatureTyping:
     body: List[Any]
 
 
-@dataclass
+@slots_dataclass
 class Subsetting:
     identification: Optional[Identification]
     subset: Union[QualifiedName, FeatureChain]
@@ -236,7 +237,7 @@ class Subsetting:
     body: List[Any]
 
 
-@dataclass
+@slots_dataclass
 class Redefinition:
     identification: Optional[Identification]
     entity: Union[QualifiedName, FeatureChain]
@@ -244,7 +245,7 @@ class Redefinition:
     body: List[Any]
 
 
-@dataclass
+@slots_dataclass
 class FeatureInverting:
     identification: Optional[Identification]
     inverted: Union[QualifiedName, FeatureChain]
@@ -252,7 +253,7 @@ class FeatureInverting:
     body: List[Any]
 
 
-@dataclass
+@slots_dataclass
 class TypeFeaturing:
     identification: Optional[Identification]
     featured_entity: Union[QualifiedName, FeatureChain]
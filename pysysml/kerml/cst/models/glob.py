@@ -1,12 +1,13 @@
-from dataclasses import dataclass
 from enum import unique, Enum
 from typing import Optional, Union
 
+from pysysml.utils import slots_dataclass
+
 from .literal import LiteralValue
 from .name import QualifiedName, FeatureChain
 
 
-@dataclass
+@slots_dataclass
 class MultiplicityBounds:
     lower_bound: Optional[Union[LiteralValue, QualifiedName]]
     upper_bound: Union[LiteralValue, QualifiedName]
@@ -30,6 +31,6 @@ class Visibility(Enum):
         return f'{self.__class__.__name__}.{self.name}'
 
 
-@dataclass
+@slots_dataclass
 class PrefixMetadataAnnotation:
     feature: Union[QualifiedName, FeatureChain]
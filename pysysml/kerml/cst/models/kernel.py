@@ -1,39 +1,40 @@
-from dataclasses import dataclass
 from enum import unique, Enum
 from typing import Optional, Union, List, Any
 
+from pysysml.utils import slots_dataclass
+
 from .core import Classifier, FeatureSpecializationPart, FeatureValueType, Feature, GenericFeature
 from .glob import MultiplicityBounds, PrefixMetadataAnnotation
 from .name import QualifiedName, FeatureChain, Identification
 from .root import VisibleMember
 
 
-@dataclass
+@slots_dataclass
 class DataType(Classifier):
     pass
 
 
-@dataclass
+@slots_dataclass
 class Class(Classifier):
     pass
 
 
-@dataclass
+@slots_dataclass
 class Struct(Classifier):
     pass
 
 
-@dataclass
+@slots_dataclass
 class Association(Classifier):
     pass
 
 
-@dataclass
+@slots_dataclass
 class AssociationStruct(Classifier):
     pass
 
 
-@dataclass
+@slots_dataclass
 class ConnectorEnd:
     name: Optional[str]
     reference: Union[QualifiedName, FeatureChain]
@@ -58,125 +59,125 @@ class ConnectorType(Enum):
         return f'{self.__class__.__name__}.{self.name}'
 
 
-@dataclass
+@slots_dataclass
 class Connector(Feature):
     type: ConnectorType
     is_all_connect: bool
     ends: Optional[List[ConnectorEnd]]
 
 
-@dataclass
+@slots_dataclass
 class BindingConnector(GenericFeature):
     is_all_binding: bool
     bind_entity: Optional[ConnectorEnd]
     bind_to: Optional[ConnectorEnd]
 
 
-@dataclass
+@slots_dataclass
 class Succession(GenericFeature):
     is_all_succession: bool
     first: Optional[ConnectorEnd]
     then: Optional[ConnectorEnd]
 
 
-@dataclass
+@slots_dataclass
 class Behavior(Classifier):
     pass
 
 
-@dataclass
+@slots_dataclass
 class Step(Feature):
     pass
 
 
-@dataclass
+@slots_dataclass
 class Return(VisibleMember):
     feature: Feature
 
 
-@dataclass
+@slots_dataclass
 class Result(VisibleMember):
     expression: Any
 
 
-@dataclass
+@slots_dataclass
 class Function(Behavior):
     pass
 
 
-@dataclass
+@slots_dataclass
 class Expression(Step):
     pass
 
 
-@dataclass
+@slots_dataclass
 class Predicate(Function):
     pass
 
 
-@dataclass
+@slots_dataclass
 class BooleanExpression(Expression):
     pass
 
 
-@dataclass
+@slots_dataclass
 class Invariant(BooleanExpression):
     asserted: Optional[bool]
 
 
-@dataclass
+@slots_dataclass
 class IndexExpression:
     entity: Any
     sequence: List[Any]
 
 
-@dataclass
+@slots_dataclass
 class SequenceExpression:
     sequence: List[Any]
 
 
-@dataclass
+@slots_dataclass
 class FeatureChainExpression:
     entity: Any
     member: Union[QualifiedName, FeatureChain]
 
 
-@dataclass
+@slots_dataclass
 class CollectExpression:
     entity: Any
     body: List[Any]
 
 
-@dataclass
+@slots_dataclass
 class SelectExpression:
     entity: Any
     body: List[Any]
 
 
-@dataclass
+@slots_dataclass
 class BodyExpression:
     body: List[Any]
 
 
-@dataclass
+@slots_dataclass
 class FunctionOperationExpression:
     entity: Any
     name: QualifiedName
     arguments: List[Any]
 
 
-@dataclass
+@slots_dataclass
 class Interaction(Behavior):
     pass
 
 
-@dataclass
+@slots_dataclass
 class ItemFlowEnd:
     owned: Optional[Union[QualifiedName, FeatureChain]]
     member: QualifiedName
 
 
-@dataclass
+@slots_dataclass
 class ItemFeature:
     identification: Optional[Identification]
     specializations: List[FeatureSpecializationPart]
@@ -190,7 +191,7 @@ class ItemFeature:
     value: Optional[Any]
 
 
-@dataclass
+@slots_dataclass
 class ItemFlow(Feature):
     is_all_flow: bool
     end_from: Optional[ItemFlowEnd]
@@ -198,31 +199,31 @@ class ItemFlow(Feature):
     item_feature: Optional[ItemFeature]
 
 
-@dataclass
+@slots_dataclass
 class SuccessionItemFlow(ItemFlow):
     pass
 
 
-@dataclass
+@slots_dataclass
 class MultiplicitySubset:
     identification: Identification
     superset: Union[QualifiedName, FeatureChain]
     body: List[Any]
 
 
-@dataclass
+@slots_dataclass
 class MultiplicityRange:
     identification: Identification
     multiplicity: MultiplicityBounds
     body: List[Any]
 
 
-@dataclass
+@slots_dataclass
 class Metaclass(Struct):
     pass
 
 
-@dataclass
+@slots_dataclass
 class Metadata:
     annotations: List[PrefixMetadataAnnotation]
     identification: Optional[Identification]
@@ -231,7 +232,7 @@ class Metadata:
     body: List[Any]
 
 
-@dataclass
+@slots_dataclass
 class MetadataRedefine:
     name: Union[QualifiedName, FeatureChain]
 
@@ -247,24 +248,24 @@ class MetadataRedefine:
     body: List[Any]
 
 
-@dataclass
+@slots_dataclass
 class ElementFilter(VisibleMember):
     expression: Any
 
 
-@dataclass
+@slots_dataclass
 class Package:
     annotations: List[PrefixMetadataAnnotation]
     identification: Identification
     body: List[Any]
 
 
-@dataclass
+@slots_dataclass
 class LibraryPackage(Package):
     is_standard: bool
 
 
-@dataclass
+@slots_dataclass
 class NullValue:
     @property
     def repr(self):
@@ -275,18 +276,18 @@ class NullValue:
         return None
 
 
-@dataclass
+@slots_dataclass
 class MetadataAccessExpression:
     qualified_name: QualifiedName
 
 
-@dataclass
+@slots_dataclass
 class NamedArgument:
     name: QualifiedName
     value: Any  # TODO: use a proper typing schema
 
 
-@dataclass
+@slots_dataclass
 class InvocationExpression:
     name: Union[FeatureChain, QualifiedName]
     arguments: List[Any]
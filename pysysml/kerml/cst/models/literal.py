@@ -1,10 +1,11 @@
 import json
 import math
-from dataclasses import dataclass
 from typing import Union
 
+from pysysml.utils import slots_dataclass
 
-@dataclass
+
+@slots_dataclass
 class IntValue:
     raw: str
 
@@ -17,7 +18,7 @@ class IntValue:
         return int(self.raw.lstrip('0') or '0')
 
 
-@dataclass
+@slots_dataclass
 class RealValue:
     raw: str
 
@@ -30,7 +31,7 @@ class RealValue:
         return float(self.raw)
 
 
-@dataclass
+@slots_dataclass
 class BoolValue:
     raw: str
 
@@ -43,7 +44,7 @@ class BoolValue:
         return self.raw.lower() == 'true'
 
 
-@dataclass
+@slots_dataclass
 class StringValue:
     raw: str
 
@@ -56,7 +57,7 @@ class StringValue:
         return json.loads(self.raw)
 
 
-@dataclass
+@slots_dataclass
 class InfValue:
 
     @property
@@ -1,12 +1,15 @@
-import dataclasses
+import ast
 import re
-from dataclasses import dataclass
-from typing import List, Optional
+import sys
+import threading
+from typing import Optional, Tuple, Iterable, Dict, Any
+
+from pysysml.utils import slots_dataclass
 
 
 def name_unescape(name: str):
     if name.startswith('\''):
-        return eval(name)
+        return ast.literal_eval(name)
     else:
         return name
 
@@ -22,25 +25,36 @@ def name_safe_repr(name: str):
         return name_escape(name)
 
 
-@dataclass
+@slots_dataclass(frozen=True)
 class QualifiedName:
-    names: List[str]
+    # immutable, and names are kept in a tuple, so the hash can be calculated only once
+    __slots__ = ('_hash',)
+    names: Tuple[str, ...]
+
+    def __post_init__(self):
+        object.__setattr__(self, 'names', tuple(self.names))
+        object.__setattr__(self, '_hash', hash(self.names))
 
     @property
     def repr(self):
         return '::'.join(map(name_safe_repr, self.names))
 
     def _value(self):
-        return tuple(self.names)
+        return self.names
 
     def __hash__(self):
-        return hash(self._value())
+        return self._hash
 
     def __eq__(self, other):
-        return isinstance(other, QualifiedName) and self._value() == other._value()
+        return self is other or (isinstance(other, QualifiedName) and
+                                 self._hash == other._hash and self.names == other.names)
 
+    def __reduce__(self):
+        # hash of str is different in other processes, so it should not be pickled
+        return type(self), (self.names,)
 
-@dataclass
+
+@slots_dataclass
 class Identification:
     short_name: Optional[str]
     name: Optional[str]
@@ -49,19 +63,112 @@ class Identification:
         return bool(self.short_name is not None or self.name is not None)
 
 
-@dataclasses.dataclass
+@slots_dataclass(frozen=True)
 class FeatureChain:
-    items: List[QualifiedName]
+    __slots__ = ('_hash',)
+    items: Tuple[QualifiedName, ...]
+
+    def __post_init__(self):
+        object.__setattr__(self, 'items', tuple(self.items))
+        object.__setattr__(self, '_hash', hash(self.items))
 
     @property
     def repr(self):
         return '.'.join(map(lambda x: x.repr, self.items))
 
     def _value(self):
-        return tuple(self.items)
+        return self.items
 
     def __hash__(self):
-        return hash(self._value())
+        return self._hash
 
     def __eq__(self, other):
-        return isinstance(other, FeatureChain) and self._value() == other._value()
+        return self is other or (isinstance(other, FeatureChain) and
+                                 self._hash == other._hash and self.items == other.items)
+
+    def __reduce__(self):
+        return type(self), (self.items,)
+
+
+class NameTable:
+    """
+    Table of the interned names, qualified names and feature chains.
+
+    Identical qualified names (and feature chains) got from the same table are the same
+    object, so they are compared by identity, and their hashes are calculated only once.
+    The raw names (such as ``'name with space'``) are unescaped only once as well.
+    The returned objects are immutable, so they can be shared.
+
+    The table can be used by multiple threads at the same time (such as the one of the cached
+    fused parsers), the lookups of the interned objects are not locked, and the new objects
+    are added with a lock held, so concurrent lookups of the same key still get the same object.
+
+    :param max_size: Max number of the interned objects, the table is cleared when it is full,
+        so a long-lived table (such as the one of the cached parsers) does not grow forever.
+        The objects got before are still valid, they are just not shared with the later ones.
+        ``None`` means no limit, which is the default.
+    :type max_size: Optional[int]
+    """
+
+    def __init__(self, max_size: Optional[int] = None):
+        if max_size is not None and max_size <= 0:
+            raise ValueError(f'Max size of name table should be positive, but {max_size!r} found.')
+        self.max_size = max_size
+        self._names: Dict[str, str] = {}
+        self._qualified_names: Dict[Tuple[str, ...], QualifiedName] = {}
+        self._feature_chains: Dict[Tuple[QualifiedName, ...], FeatureChain] = {}
+        self._lock = threading.Lock()
+
+    def _add(self, table: Dict[Any, Any], key: Any, value: Any) -> Any:
+        # another thread may have added the same key, then its object is returned
+        with self._lock:
+            self._make_room()
+            return table.setdefault(key, value)
+
+    def name(self, raw: str) -> str:
+        """
+        Get the unescaped name of the raw name in the source code.
+        """
+        try:
+            return self._names[raw]
+        except KeyError:
+            return self._add(self._names, raw, sys.intern(name_unescape(raw)))
+
+    def qualified_name(self, raw_names: Iterable[str]) -> QualifiedName:
+        """
+        Get the interned qualified name of the raw names in the source code.
+        """
+        key = tuple(raw_names)
+        try:
+            return self._qualified_names[key]
+        except KeyError:
+            return self._add(self._qualified_names, key, QualifiedName(tuple(map(self.name, key))))
+
+    def feature_chain(self, items: Iterable[QualifiedName]) -> FeatureChain:
+        """
+        Get the interned feature chain of the given qualified names.
+        """
+        key = tuple(items)
+        try:
+            return self._feature_chains[key]
+        except KeyError:
+            return self._add(self._feature_chains, key, FeatureChain(key))
+
+    def _make_room(self):
+        if self.max_size is not None and len(self) >= self.max_size:
+            self._clear()
+
+    def __len__(self):
+        return len(self._names) + len(self._qualified_names) + len(self._feature_chains)
+
+    def _clear(self):
+        self._names.clear()
+        self._qualified_names.clear()
+        self._feature_chains.clear()
+
+    def clear(self):
+        """
+        Remove all the interned objects.
+        """
+        with self._lock:
+            self._clear()
@@ -1,62 +1,63 @@
-from dataclasses import dataclass
 from typing import Any, Optional
 
+from pysysml.utils import slots_dataclass
+
 from .name import QualifiedName
 
 
-@dataclass
+@slots_dataclass
 class ExtentOp:
     x: Any
 
 
-@dataclass
+@slots_dataclass
 class UnaryOp:
     op: str
     x: Any
 
 
-@dataclass
+@slots_dataclass
 class BinOp:
     op: str
     x: Any
     y: Any
 
 
-@dataclass
+@slots_dataclass
 class CondBinOp:
     op: str
     x: Any
     y: Any
 
 
-@dataclass
+@slots_dataclass
 class IfTestOp:
     condition: Any
     if_true: Any
     if_false: Any
 
 
-@dataclass
+@slots_dataclass
 class ClsTestOp:
     op: str
     x: Optional[Any]
     y: QualifiedName
 
 
-@dataclass
+@slots_dataclass
 class ClsCastOp:
     x: Optional[Any]
     y: QualifiedName
 
 
-@dataclass
+@slots_dataclass
 class MetaClsTestOp:
     op: str
     x: Optional[Any]
     y: QualifiedName
 
 
-@dataclass
+@slots_dataclass
 class MetaClsCastOp:
     x: Optional[Any]
     y: QualifiedName
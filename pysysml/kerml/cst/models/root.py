@@ -1,11 +1,12 @@
-from dataclasses import dataclass
 from typing import List, Optional, Any
 
+from pysysml.utils import slots_dataclass
+
 from .glob import PrefixMetadataAnnotation, Visibility
 from .name import Identification, QualifiedName
 
 
-@dataclass
+@slots_dataclass
 class Dependency:
     annotations: List[PrefixMetadataAnnotation]
     identification: Optional[Identification]
@@ -14,73 +15,73 @@ class Dependency:
     body: List[Any]
 
 
-@dataclass
+@slots_dataclass
 class IRegularComment:
     comment: str
 
 
-@dataclass
+@slots_dataclass
 class Comment(IRegularComment):
     identification: Optional[Identification]
     about_list: Optional[List[QualifiedName]]
     locale: Optional[str]
 
 
-@dataclass
+@slots_dataclass
 class Documentation(IRegularComment):
     identification: Identification
     locale: Optional[str]
 
 
-@dataclass
+@slots_dataclass
 class TextualRepresentation(IRegularComment):
     identification: Optional[Identification]
     language: str
 
 
-@dataclass
+@slots_dataclass
 class RelationshipBody:
     elements: List[Any]
 
 
-@dataclass
+@slots_dataclass
 class Namespace:
     annotations: List[PrefixMetadataAnnotation]
     identification: Optional[Identification]
     body: List[Any]
 
 
-@dataclass
+@slots_dataclass
 class RootNamespace:
     body: List[Any]
 
 
-@dataclass
+@slots_dataclass
 class VisibleMember:
     visibility: Optional[Visibility]
 
 
-@dataclass
+@slots_dataclass
 class NonFeatureMember(VisibleMember):
     element: Any
 
 
-@dataclass
+@slots_dataclass
 class OwnedFeatureMember(VisibleMember):
     element: Any
 
 
-@dataclass
+@slots_dataclass
 class TypeFeatureMember(VisibleMember):
     element: Any
 
 
-@dataclass
+@slots_dataclass
 class NamespaceFeatureMember(VisibleMember):
     element: Any
 
 
-@dataclass
+@slots_dataclass
 class Import(VisibleMember):
     is_all: bool
     is_recursive: bool
@@ -90,7 +91,7 @@ class Import(VisibleMember):
     body: List[Any]
 
 
-@dataclass
+@slots_dataclass
 class Alias(VisibleMember):
     identification: Identification
     name: QualifiedName
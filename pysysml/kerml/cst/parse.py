@@ -0,0 +1,119 @@
+"""
+Parse KerML text into CST directly.
+
+With the LALR parser, :class:`KerMLTableTransformer` (the generated table-driven version of
+:class:`KerMLTransformer`) is embedded into the parser (the ``transformer`` option of lark),
+so the CST nodes are built while reducing, and the full lark tree is never materialized. The Earley
+parser does not support embedded transformers, so it still builds the tree and transforms it afterwards.
+"""
+
+import logging
+import threading
+from functools import lru_cache
+from typing import Any, Optional, Tuple
+
+from lark import Lark, Tree
+from lark.exceptions import LarkError, UnexpectedInput, VisitError
+from lark.grammar import Rule
+from lark.lexer import TerminalDef
+
+from .lark import _open_lark_parser, _PARSER_MODES
+from .pool import get_kerml_parser_pool
+from .models import NameTable
+from .transforms import KerMLTableTransformer, RuleCoverage, tree_to_kerml_cst
+
+# the fused parsers are cached for the whole process, so their tables of the interned names are bounded,
+# and shared by all the threads, which is safe since NameTable adds the new objects with a lock held
+_NAME_TABLE_MAX_SIZE = 1 << 16
+
+
+def _load_fused_lalr_parser(start: str, transformer: KerMLTableTransformer) -> Lark:
+    # the compiled parse table is loaded from the parser cache, only the callbacks are rebuilt
+    lalr_parser = _open_lark_parser(start=[start], parser='lalr', all_starts=False)
+    data, memo = lalr_parser.memo_serialize([TerminalDef, Rule])
+    return Lark._load_from_dict(data, memo, transformer=transformer)
+
+
+@lru_cache(maxsize=32)
+def _fused_lalr_parser(start: str) -> Lark:
+    return _load_fused_lalr_parser(start, KerMLTableTransformer(name_table=NameTable(_NAME_TABLE_MAX_SIZE)))
+
+
+@lru_cache(maxsize=32)
+def _counting_lalr_parser(start: str) -> Tuple[Lark, RuleCoverage, threading.Lock]:
+    # the hits are counted into the coverage object of this parser, then added to the given one,
+    # the coverage object is shared by the threads, so it is only used with the lock held
+    # (building a new parser for each call is several hundred times slower than parsing a small text)
+    coverage = RuleCoverage()
+    transformer = KerMLTableTransformer(name_table=NameTable(_NAME_TABLE_MAX_SIZE), coverage=coverage)
+    return _load_fused_lalr_parser(start, transformer), coverage, threading.Lock()
+
+
+def _tree_to_cst(tree: Tree, coverage: Optional[RuleCoverage] = None) -> Any:
+    try:
+        if coverage is None:
+            return tree_to_kerml_cst(tree)
+        else:
+            return KerMLTableTransformer(coverage=coverage).transform(tree)
+    except VisitError as err:
+        raise err.orig_exc from err
+
+
+def _parse_with_earley(text: str, start: str, coverage: Optional[RuleCoverage] = None) -> Any:
+    return _tree_to_cst(get_kerml_parser_pool().parse(text, start=start), coverage)
+
+
+def _parse_with_lalr(text: str, start: str, coverage: Optional[RuleCoverage] = None) -> Any:
+    if coverage is None:
+        return _fused_lalr_parser(start).parse(text, start=start)
+    else:
+        fused_parser, parser_coverage, lock = _counting_lalr_parser(start)
+        with lock:
+            parser_coverage.clear()
+            cst = fused_parser.parse(text, start=start)
+            # the hits of the failed parsing are not added
+            coverage.merge(parser_coverage)
+        return cst
+
+
+def parse_kerml(text: str, start: str = 'start', parser: str = 'auto',
+                coverage: Optional[RuleCoverage] = None) -> Any:
+    """
+    Parse KerML text into CST.
+
+    :param text: KerML text.
+    :type text: str
+    :param start: Start rule, default is ``start`` which means a whole KerML file.
+    :type start: str
+    :param parser: Parser mode. ``lalr`` means fused LALR parsing, ``earley`` means Earley parsing
+        and then transforming, ``auto`` means fused LALR parsing, and fall back to Earley parsing when
+        the text can not be parsed by the LALR parser. Default is ``auto``.
+    :type parser: str
+    :param coverage: Count the hits of the grammar rules into this object, see :class:`RuleCoverage`.
+        Default is ``None``, which means the hits are not counted.
+    :type coverage: Optional[RuleCoverage]
+
+    :return: Parsed CST node, :class:`pysysml.kerml.cst.models.RootNamespace` for the ``start`` rule.
+
+    .. note::
+        Errors raised by the transformer are raised as they are, they are not wrapped
+        into :class:`lark.exceptions.VisitError`.
+    """
+    if parser not in _PARSER_MODES:
+        raise ValueError(f'Unknown parser mode, one of {_PARSER_MODES!r} expected but {parser!r} found.')
+
+    if parser == 'earley':
+        return _parse_with_earley(text, start, coverage)
+    elif parser == 'lalr':
+        return _parse_with_lalr(text, start, coverage)
+    else:
+        try:
+            _fused_lalr_parser(start)
+        except LarkError as err:
+            logging.warning(f'Unable to build LALR parser for KerML, Earley parser will be used - {err!r}')
+            return _parse_with_earley(text, start, coverage)
+
+        try:
+            return _parse_with_lalr(text, start, coverage)
+        except UnexpectedInput:
+            return _parse_with_earley(text, start, coverage)
@@ -0,0 +1,131 @@
+"""
+Pool of KerML lark parsers built per start rule.
+
+The parser returned by :func:`open_kerml_lark_parser` accepts every rule of the grammar as
+its start rule, which makes it the most expensive one to build and to keep in memory. Most
+callers only use a few entry points (``start`` for whole files, ``qualified_name`` or
+``owned_expression`` for snippets), so :class:`KerMLParserPool` builds one parser for each
+start rule on its first use, and keeps at most ``max_size`` of them alive.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Union, List
+
+from lark import Lark, Tree
+
+from .lark import open_kerml_lark_parser, KerMLAutoParser, _PARSER_MODES
+
+
+@dataclass
+class ParserPoolStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class KerMLParserPool:
+    """
+    LRU pool of the KerML parsers, each of them only accepts one start rule.
+
+    :param max_size: Max number of the parsers kept in this pool, ``None`` means no limit.
+    :type max_size: Optional[int]
+    :param parser: Parser mode, the same as the argument of :func:`open_kerml_lark_parser`.
+    :type parser: str
+    :param use_cache: Use the on-disk parser cache or not, default is ``None`` which means
+        :func:`parser_cache_enabled` decides it.
+    :type use_cache: Optional[bool]
+    """
+
+    def __init__(self, max_size: Optional[int] = 32, parser: str = 'earley', use_cache: Optional[bool] = None):
+        if max_size is not None and max_size <= 0:
+            raise ValueError(f'Max size of parser pool should be positive, but {max_size!r} found.')
+        if parser not in _PARSER_MODES:
+            raise ValueError(f'Unknown parser mode, one of {_PARSER_MODES!r} expected but {parser!r} found.')
+
+        self.max_size = max_size
+        self.parser = parser
+        self.use_cache = use_cache
+        self.stats = ParserPoolStats()
+        self._parsers: 'OrderedDict[str, Union[Lark, KerMLAutoParser]]' = OrderedDict()
+        self._lock = threading.RLock()
+
+    @property
+    def rules(self) -> List[str]:
+        """
+        Start rules of the alive parsers, from the least recently used one.
+        """
+        with self._lock:
+            return list(self._parsers.keys())
+
+    def __len__(self):
+        with self._lock:
+            return len(self._parsers)
+
+    def __contains__(self, rule: str):
+        with self._lock:
+            return rule in self._parsers
+
+    def get(self, rule: str = 'start') -> Union[Lark, KerMLAutoParser]:
+        """
+        Get the parser of the given start rule, it will be built when not in the pool.
+
+        :param rule: Start rule.
+        :type rule: str
+
+        :return: Parser which accepts the given start rule.
+        """
+        with self._lock:
+            if rule in self._parsers:
+                self.stats.hits += 1
+                self._parsers.move_to_end(rule)
+                return self._parsers[rule]
+
+            self.stats.misses += 1
+            parser = open_kerml_lark_parser(start=[rule], use_cache=self.use_cache,
+                                            parser=self.parser, all_starts=False)
+            self._parsers[rule] = parser
+            while self.max_size is not None and len(self._parsers) > self.max_size:
+                self._parsers.popitem(last=False)
+                self.stats.evictions += 1
+            return parser
+
+    def parse(self, text: str, start: str = 'start') -> Tree:
+        """
+        Parse the text with the given start rule.
+
+        :param text: Text to parse.
+        :type text: str
+        :param start: Start rule, default is ``start``.
+        :type start: str
+
+        :return: Parsed lark tree.
+        :rtype: Tree
+        """
+        return self.get(start).parse(text, start=start)
+
+    def clear(self):
+        """
+        Remove all the parsers from this pool.
+        """
+        with self._lock:
+            self._parsers.clear()
+
+
+_DEFAULT_POOL: Optional[KerMLParserPool] = None
+_DEFAULT_POOL_LOCK = threading.Lock()
+
+
+def get_kerml_parser_pool() -> KerMLParserPool:
+    """
+    Get the process-wide default parser pool.
+
+    :return: Default parser pool.
+    :rtype: KerMLParserPool
+    """
+    global _DEFAULT_POOL
+    with _DEFAULT_POOL_LOCK:
+        if _DEFAULT_POOL is None:
+            _DEFAULT_POOL = KerMLParserPool()
+        return _DEFAULT_POOL
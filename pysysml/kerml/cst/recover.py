@@ -0,0 +1,253 @@
+"""
+Error-recovering parsing of KerML files.
+
+The text is split into the top-level elements in the same way as :func:`iter_kerml_elements`.
+When an element fails to parse, the member around the error is located by the braces, ``;``
+and comment bodies of the element text, which are the ends of the members in the bodies of
+namespaces, types and relationships (``namespace_body_element``, ``type_body``,
+``relationship_body``, etc). That member is blanked out with spaces, so the positions of
+the rest are not changed, and the element is parsed again. Missing ``}`` at the end of the
+text are inserted. Every error is recorded as a :class:`SyntaxDiagnostic`, and the elements
+which are still valid after the recovery are kept in the partial ``RootNamespace``.
+"""
+
+import io
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Any, Tuple
+
+from lark.exceptions import UnexpectedInput, UnexpectedCharacters, UnexpectedToken
+
+from .models import RootNamespace
+from .parse import parse_kerml
+from .stream import _TopLevelSplitter, _is_eof_error
+
+_ELEMENT_RULE = 'namespace_body_element'
+
+_STRUCTURE_PATTERN = re.compile(
+    r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|//\*.*?\*/|//[^\n]*|/\*.*?\*/|[{};]",
+    re.DOTALL,
+)
+
+
+@dataclass
+class SyntaxDiagnostic:
+    """
+    Syntax error found in the recovering parsing.
+
+    :param line: Line number of the error, starts from 1.
+    :param column: Column number of the error, starts from 1.
+    :param pos: Position of the error in the text, starts from 0.
+    :param error_type: Name of the lark error type, such as ``UnexpectedToken``.
+    :param message: Short description of the error.
+    :param expected: Names of the expected terminals, may be empty.
+    """
+    line: int
+    column: int
+    pos: int
+    error_type: str
+    message: str
+    expected: List[str] = field(default_factory=list)
+
+    def __str__(self):
+        return f'{self.line}:{self.column}: {self.message}'
+
+
+@dataclass
+class RecoveryResult:
+    """
+    Result of :func:`parse_kerml_recovering`.
+
+    :param cst: Partial ``RootNamespace``, which contains the valid top-level elements.
+    :param diagnostics: All the syntax errors, in the order of their positions.
+    """
+    cst: RootNamespace
+    diagnostics: List[SyntaxDiagnostic]
+
+    @property
+    def ok(self) -> bool:
+        return not self.diagnostics
+
+
+def _structure(text: str) -> List[Tuple[int, int, str]]:
+    # (start, end, kind) of the braces, ';' and comment bodies, kind is '{', '}' or ';'
+    items = []
+    for match in _STRUCTURE_PATTERN.finditer(text):
+        token = match.group()
+        if len(token) == 1:
+            items.append((match.start(), match.end(), token))
+        elif token.startswith('/*'):
+            items.append((match.start(), match.end(), ';'))
+    return items
+
+
+def _member_span(text: str, pos: int) -> Tuple[int, int]:
+    # span of the member (in the innermost body) which contains the given position
+    items = _structure(text)
+    starts = [0]
+    index = 0
+    for index, (start, end, kind) in enumerate(items):
+        if start >= pos:
+            break
+        if kind == '{':
+            starts.append(end)
+        elif kind == '}' and len(starts) > 1:
+            starts.pop()
+            starts[-1] = end
+        else:
+            starts[-1] = end
+    else:
+        index = len(items)
+
+    depth, member_end = 0, len(text)
+    for start, end, kind in items[index:]:
+        if kind == '{':
+            depth += 1
+        elif kind == '}':
+            if depth == 0:
+                member_end = start  # closing brace of the body, keep it
+                break
+            depth -= 1
+            if depth == 0:
+                member_end = end
+                break
+        elif depth == 0:
+            member_end = end
+            break
+
+    return starts[-1], member_end
+
+
+def _unclosed_braces(text: str) -> int:
+    depth = 0
+    for _, _, kind in _structure(text):
+        if kind == '{':
+            depth += 1
+        elif kind == '}':
+            depth = max(depth - 1, 0)
+    return depth
+
+
+def _blank(text: str, start: int, end: int) -> str:
+    return text[:start] + re.sub(r'[^\n]', ' ', text[start:end]) + text[end:]
+
+
+def _error_span(err: UnexpectedInput, text: str) -> Tuple[int, int]:
+    # span of the unexpected token or character
+    if isinstance(err, UnexpectedToken) and err.token.type != '$END':
+        start = err.token.start_pos
+        end = err.token.end_pos if err.token.end_pos is not None else start + len(err.token)
+        return start, max(end, start + 1)
+    elif isinstance(err, UnexpectedCharacters):
+        return err.pos_in_stream, err.pos_in_stream + 1
+    else:
+        end = len(text.rstrip())
+        return end, end
+
+
+def _describe(err: UnexpectedInput, text: str, start: int) -> Tuple[str, List[str]]:
+    expected = sorted(set(getattr(err, 'expected', None) or getattr(err, 'allowed', None) or []))
+    if _is_eof_error(err):
+        message = 'Unexpected end of input'
+    elif isinstance(err, UnexpectedToken):
+        message = f'Unexpected token {err.token.value!r}'
+    else:
+        message = f'Unexpected character {text[start:start + 1]!r}'
+    return message, expected
+
+
+class _Recoverer:
+    def __init__(self, text: str, parser: str):
+        self.text = text
+        self.parser = parser
+        self.diagnostics: List[SyntaxDiagnostic] = []
+
+    def _report(self, err: UnexpectedInput, text: str, offset: int, pos: int):
+        message, expected = _describe(err, text, pos)
+        pos += offset
+        line = self.text.count('\n', 0, pos) + 1
+        column = pos - (self.text.rfind('\n', 0, pos) + 1) + 1
+        self.diagnostics.append(SyntaxDiagnostic(
+            line=line, column=column, pos=pos,
+            error_type=type(err).__name__, message=message, expected=expected,
+        ))
+
+    def parse_element(self, text: str, offset: int) -> Optional[Any]:
+        inserted = 0
+        reported = False
+        while True:
+            if not text.strip():
+                return None
+
+            try:
+                return parse_kerml(text + '}' * inserted, start=_ELEMENT_RULE, parser=self.parser)
+            except UnexpectedInput as err:
+                if _is_eof_error(err):
+                    if inserted < _unclosed_braces(text):
+                        self._report(err, text, offset, _error_span(err, text)[0])
+                        inserted += 1
+                        continue
+                    if not reported:
+                        self._report(err, text, offset, _error_span(err, text)[0])
+                    return None
+
+                error_start, error_end = _error_span(err, text)
+                self._report(err, text, offset, error_start)
+                reported = True
+                member_start, member_end = _member_span(text, error_start)
+                if not text[member_start:member_end].strip():
+                    member_start, member_end = error_start, error_end
+                if not text[member_start:member_end].strip():
+                    return None  # pragma: no cover
+                text = _blank(text, member_start, member_end)
+
+    def parse(self) -> RecoveryResult:
+        elements = []
+        offset, pending = 0, ''
+        for segment, has_content in _TopLevelSplitter(io.StringIO(self.text), 1 << 16):
+            text = pending + segment
+            if not has_content and not pending:
+                offset += len(text)
+                continue
+
+            try:
+                element = parse_kerml(text, start=_ELEMENT_RULE, parser=self.parser)
+            except UnexpectedInput as err:
+                if _is_eof_error(err):
+                    pending = text  # ended too early, try again with the next segment
+                    continue
+                element = self.parse_element(text, offset)
+
+            pending = ''
+            offset += len(text)
+            if element is not None:
+                elements.append(element)
+
+        if pending:
+            element = self.parse_element(pending, offset)
+            if element is not None:
+                elements.append(element)
+
+        return RecoveryResult(cst=RootNamespace(body=elements), diagnostics=self.diagnostics)
+
+
+def parse_kerml_recovering(text: str, parser: str = 'auto') -> RecoveryResult:
+    """
+    Parse KerML text, and report all the syntax errors in one pass instead of raising the first one.
+
+    After each error, the parsing resynchronizes at the end of the member which contains the
+    error (the ``;``, ``}`` or comment body which ends it), so the following members and
+    elements are still parsed and checked.
+
+    :param text: KerML text.
+    :type text: str
+    :param parser: Parser mode, the same as the argument of :func:`parse_kerml`.
+    :type parser: str
+
+    :return: Partial ``RootNamespace`` of the valid parts, and the diagnostics.
+    :rtype: RecoveryResult
+
+    .. note::
+        When the text has no syntax error, the CST is the same as the result of :func:`parse_kerml`.
+    """
+    return _Recoverer(text, parser).parse()
@@ -0,0 +1,223 @@
+"""
+Streaming parsing of KerML files.
+
+The text is read chunk by chunk, and split at the candidate ends of the top-level elements,
+which are ``;``, ``}`` and comment bodies (``/* ... */``) outside any braces, names, strings
+and notes. Every segment is parsed with ``namespace_body_element`` as the start rule and
+yielded at once, so only the text of the current element is kept in memory. When a segment
+ends too early (the parser reaches the end of it), it is merged with the next one.
+"""
+
+import io
+import re
+from typing import Iterator, Any, Union, TextIO, Tuple
+
+from lark.exceptions import UnexpectedInput, UnexpectedEOF, UnexpectedToken
+
+from .parse import parse_kerml
+
+_ELEMENT_RULE = 'namespace_body_element'
+
+_NORMAL_PATTERN = re.compile(r'[{};\'"/]')
+_SPACE_PATTERN = re.compile(r'\s*')
+_QUOTE_PATTERNS = {
+    '\'': re.compile(r'[\'\\]'),
+    '"': re.compile(r'["\\]'),
+}
+
+
+class _TopLevelSplitter:
+    def __init__(self, stream: TextIO, chunk_size: int):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.eof = False
+        self.pos = 0
+        self.depth = 0
+        self.content = False  # anything except spaces and notes in current segment
+
+    def _read(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.stream.read(self.chunk_size)
+        if chunk:
+            self.buffer += chunk
+            return True
+        else:
+            self.eof = True
+            return False
+
+    def _need(self, length: int) -> bool:
+        # make sure buffer[pos:pos+length] is available, False when EOF is reached before that
+        while len(self.buffer) < self.pos + length:
+            if not self._read():
+                return False
+        return True
+
+    def _find(self, pattern, start: int):
+        while True:
+            match = pattern.search(self.buffer, start)
+            if match:
+                return match.start()
+            start = len(self.buffer)
+            if not self._read():
+                return None
+
+    def _find_str(self, s: str, start: int):
+        while True:
+            index = self.buffer.find(s, start)
+            if index >= 0:
+                return index
+            start = max(len(self.buffer) - len(s) + 1, 0)
+            if not self._read():
+                return None
+
+    def _skip_quoted(self, quote: str):
+        # self.pos is at the opening quote
+        pos = self.pos + 1
+        while True:
+            index = self._find(_QUOTE_PATTERNS[quote], pos)
+            if index is None:
+                self.pos = len(self.buffer)
+                return
+            elif self.buffer[index] == '\\':
+                pos = index + 2
+            else:
+                self.pos = index + 1
+                return
+
+    def _skip_until(self, end: str, start: int):
+        index = self._find_str(end, start)
+        self.pos = len(self.buffer) if index is None else index + len(end)
+
+    def _cut(self) -> str:
+        segment, self.buffer = self.buffer[:self.pos], self.buffer[self.pos:]
+        self.pos = 0
+        self.content = False
+        return segment
+
+    def __iter__(self) -> Iterator[Tuple[str, bool]]:
+        # yields (segment, has_content)
+        while True:
+            match_pos = self._find(_NORMAL_PATTERN, self.pos)
+            if match_pos is None:
+                if not self.content:
+                    space = _SPACE_PATTERN.match(self.buffer, self.pos)
+                    self.content = space.end() < len(self.buffer)
+                self.pos = len(self.buffer)
+                content = self.content
+                segment = self._cut()
+                if segment:
+                    yield segment, content
+                return
+
+            if not self.content and _SPACE_PATTERN.match(self.buffer, self.pos).end() < match_pos:
+                self.content = True
+            self.pos = match_pos
+            char = self.buffer[match_pos]
+            if char == '/':
+                self._need(3)
+                if self.buffer.startswith('//*', self.pos):
+                    self._skip_until('*/', self.pos + 3)
+                elif self.buffer.startswith('//', self.pos):
+                    self._skip_until('\n', self.pos + 2)
+                elif self.buffer.startswith('/*', self.pos):
+                    self.content = True
+                    self._skip_until('*/', self.pos + 2)
+                    if self.depth == 0:
+                        yield self._cut(), True
+                else:
+                    self.content = True
+                    self.pos += 1
+            elif char in '\'"':
+                self.content = True
+                self._skip_quoted(char)
+            else:
+                self.content = True
+                self.pos += 1
+                if char == '{':
+                    self.depth += 1
+                elif char == '}':
+                    self.depth = max(self.depth - 1, 0)
+                    if self.depth == 0:
+                        yield self._cut(), True
+                elif self.depth == 0:  # ';'
+                    yield self._cut(), True
+
+
+def _shift_error(err: UnexpectedInput, offset: int, line_offset: int, column_offset: int):
+    # positions of the error are relative to the segment, make them relative to the whole stream
+    if getattr(err, 'line', None) is not None and err.line > 0:
+        if err.line == 1 and getattr(err, 'column', None) is not None and err.column > 0:
+            err.column += column_offset
+        err.line += line_offset
+    if getattr(err, 'pos_in_stream', None) is not None and err.pos_in_stream >= 0:
+        err.pos_in_stream += offset
+
+
+def _is_eof_error(err: UnexpectedInput) -> bool:
+    return isinstance(err, UnexpectedEOF) or (isinstance(err, UnexpectedToken) and err.token.type == '$END')
+
+
+def iter_kerml_elements(stream: Union[str, TextIO], parser: str = 'auto',
+                        chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """
+    Parse KerML text from the stream, and yield the top-level elements one by one.
+
+    The yielded elements are the same as the items in ``parse_kerml(text).body``, each of them
+    is yielded as soon as its text is read and parsed.
+
+    :param stream: Text stream to read from, or the KerML text itself.
+    :type stream: Union[str, TextIO]
+    :param parser: Parser mode, the same as the argument of :func:`parse_kerml`.
+    :type parser: str
+    :param chunk_size: Size of each reading from the stream, default is ``65536``.
+    :type chunk_size: int
+
+    :return: Iterator of the top-level elements.
+
+    .. note::
+        Syntax errors are raised when the broken element is reached, and the positions in the
+        errors are relative to the whole stream.
+    """
+    if isinstance(stream, str):
+        stream = io.StringIO(stream)
+
+    offset, line_offset, column_offset = 0, 0, 0
+    pending = ''
+    for segment, has_content in _TopLevelSplitter(stream, chunk_size):
+        text = pending + segment
+        if not has_content and not pending:
+            offset, line_offset, column_offset = _advance(text, offset, line_offset, column_offset)
+            continue
+
+        try:
+            element = parse_kerml(text, start=_ELEMENT_RULE, parser=parser)
+        except UnexpectedInput as err:
+            if _is_eof_error(err):
+                pending = text  # ended too early, try again with the next segment
+                continue
+            _shift_error(err, offset, line_offset, column_offset)
+            raise
+        else:
+            pending = ''
+            offset, line_offset, column_offset = _advance(text, offset, line_offset, column_offset)
+            yield element
+
+    if pending:
+        try:
+            element = parse_kerml(pending, start=_ELEMENT_RULE, parser=parser)
+        except UnexpectedInput as err:
+            _shift_error(err, offset, line_offset, column_offset)
+            raise
+        else:
+            yield element  # pragma: no cover
+
+
+def _advance(text: str, offset: int, line_offset: int, column_offset: int) -> Tuple[int, int, int]:
+    lines = text.count('\n')
+    if lines:
+        column_offset = len(text) - text.rindex('\n') - 1
+    else:
+        column_offset += len(text)
+    return offset + len(text), line_offset + lines, column_offset
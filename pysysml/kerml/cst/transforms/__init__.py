@@ -1,3 +1,5 @@
 from .convert import KerMLTransformer, tree_to_kerml_cst
+from .coverage import RuleCoverage
 from .recorder import KerMLTransRecorder
+from .table import KerMLTableTransformer, KERML_TABLE_RULES, KERML_TABLE_SOURCE_SHA256
 from .template import KerMLTransTemplate
@@ -1,11 +1,10 @@
 import json
 import typing
 
-from lark import v_args, Tree, Token, GrammarError
+from lark import v_args, Tree, Token
 
 from .template import KerMLTransTemplate
-from ..base import is_reserved_word
-from ..models import BoolValue, IntValue, RealValue, StringValue, InfValue, NullValue, QualifiedName, name_unescape, \
+from ..models import BoolValue, IntValue, RealValue, StringValue, InfValue, NullValue, QualifiedName, NameTable, \
     MetadataAccessExpression, NamedArgument, InvocationExpression, Visibility, FeatureChain, PrefixMetadataAnnotation, \
     Identification, Dependency, Comment, Documentation, TextualRepresentation, Namespace, NonFeatureMember, \
     DisjoiningPart, UnioningPart, IntersectingPart, DifferencingPart, MultiplicityBounds, ConjugationPart, \
@@ -23,11 +22,11 @@ from ..models import BoolValue, IntValue, RealValue, StringValue, InfValue, Null
 
 # noinspection PyPep8Naming
 class KerMLTransformer(KerMLTransTemplate):
-    @v_args(tree=True)
-    def NAME(self, token: Token):
-        if not token.value.startswith('\'') and is_reserved_word(token.value):
-            raise GrammarError(f'Do not use reserved word {token.value!r} as name in KerML.')
-        return token
+    # reserved words are rejected by the NAME terminal, so no token needs to be visited
+    def __init__(self, visit_tokens: bool = False, name_table: typing.Optional[NameTable] = None):
+        KerMLTransTemplate.__init__(self, visit_tokens=visit_tokens)
+        # identical names share one object, see NameTable
+        self.name_table = name_table if name_table is not None else NameTable()
 
     @v_args(tree=True)
     def literal_boolean(self, tree: Tree):
@@ -64,7 +63,7 @@ class KerMLTransformer(KerMLTransTemplate):
     @v_args(tree=True)
     def qualified_name(self, tree: Tree):
         assert len(tree.children) > 0
-        return QualifiedName([name_unescape(item.value) for item in tree.children])
+        return self.name_table.qualified_name([item.value for item in tree.children])
 
     @v_args(tree=True)
     def metadata_access_expression(self, tree: Tree):
@@ -112,7 +111,7 @@ class KerMLTransformer(KerMLTransTemplate):
 
     @v_args(tree=True)
     def feature_chain(self, tree: Tree):
-        return FeatureChain(tree.children)
+        return self.name_table.feature_chain(tree.children)
 
     @v_args(tree=True)
     def prefix_metadata_annotation(self, tree: Tree):
@@ -147,8 +146,8 @@ class KerMLTransformer(KerMLTransTemplate):
     def identification(self, tree: Tree):
         assert len(tree.children) == 2
         return Identification(
-            short_name=name_unescape(tree.children[0].value) if tree.children[0] is not None else None,
-            name=name_unescape(tree.children[1].value) if tree.children[1] is not None else None,
+            short_name=self.name_table.name(tree.children[0].value) if tree.children[0] is not None else None,
+            name=self.name_table.name(tree.children[1].value) if tree.children[1] is not None else None,
         )
 
     @v_args(tree=True)
@@ -205,7 +204,7 @@ class KerMLTransformer(KerMLTransTemplate):
         assert len(tree.children) == 3
         return TextualRepresentation(
             identification=tree.children[0],
-            language=name_unescape(tree.children[1].value) if tree.children[1] is not None else None,
+            language=self.name_table.name(tree.children[1].value) if tree.children[1] is not None else None,
             comment=tree.children[2].value,
         )
 
@@ -374,15 +373,15 @@ class KerMLTransformer(KerMLTransTemplate):
         assert len(tree.children) == 1
         return Identification(
             short_name=None,
-            name=name_unescape(tree.children[0].value) if tree.children[0] is not None else None,
+            name=self.name_table.name(tree.children[0].value) if tree.children[0] is not None else None,
         )
 
     @v_args(tree=True)
     def explicit_identification_with_short(self, tree: Tree):
         assert len(tree.children) == 2
         return Identification(
-            short_name=name_unescape(tree.children[0].value),
-            name=name_unescape(tree.children[1].value) if tree.children[1] is not None else None,
+            short_name=self.name_table.name(tree.children[0].value),
+            name=self.name_table.name(tree.children[1].value) if tree.children[1] is not None else None,
         )
 
     @v_args(tree=True)
@@ -671,19 +670,19 @@ class KerMLTransformer(KerMLTransTemplate):
             **extra_values,
         )
 
-    def _classifier_like(self, tree: Tree, type_cls: typing.Type[Classifier], **extra_values):
-        assert len(tree.children) == 3
+    def _classifier_like(self, children: list, type_cls: typing.Type[Classifier], **extra_values):
+        assert len(children) == 3
         return self._classifier_custom(
-            prefix=tree.children[0],
-            declaration=tree.children[1],
-            body=tree.children[2],
+            prefix=children[0],
+            declaration=children[1],
+            body=children[2],
             type_cls=type_cls,
             **extra_values,
         )
 
     @v_args(tree=True)
     def classifier(self, tree: Tree):
-        return self._classifier_like(tree, type_cls=Classifier)
+        return self._classifier_like(tree.children, type_cls=Classifier)
 
     @v_args(tree=True)
     def subclassification(self, tree: Tree):
@@ -897,23 +896,23 @@ class KerMLTransformer(KerMLTransTemplate):
 
     @v_args(tree=True)
     def data_type(self, tree: Tree):
-        return self._classifier_like(tree, type_cls=DataType)
+        return self._classifier_like(tree.children, type_cls=DataType)
 
     @v_args(tree=True)
     def class_statement(self, tree: Tree):
-        return self._classifier_like(tree, type_cls=Class)
+        return self._classifier_like(tree.children, type_cls=Class)
 
     @v_args(tree=True)
     def structure(self, tree: Tree):
-        return self._classifier_like(tree, type_cls=Struct)
+        return self._classifier_like(tree.children, type_cls=Struct)
 
     @v_args(tree=True)
     def association(self, tree: Tree):
-        return self._classifier_like(tree, type_cls=Association)
+        return self._classifier_like(tree.children, type_cls=Association)
 
     @v_args(tree=True)
     def association_structure(self, tree: Tree):
-        return self._classifier_like(tree, type_cls=AssociationStruct)
+        return self._classifier_like(tree.children, type_cls=AssociationStruct)
 
     @v_args(inline=True)
     def connector_end_name(self, token: Token):
@@ -1124,7 +1123,7 @@ class KerMLTransformer(KerMLTransTemplate):
 
     @v_args(tree=True)
     def behavior(self, tree: Tree):
-        return self._classifier_like(tree, type_cls=Behavior)
+        return self._classifier_like(tree.children, type_cls=Behavior)
 
     @v_args(inline=True)
     def step(self, prefix, declaration, value_part, type_body):
@@ -1192,7 +1191,7 @@ class KerMLTransformer(KerMLTransTemplate):
 
     @v_args(tree=True)
     def function(self, tree: Tree):
-        return self._classifier_like(tree=tree, type_cls=Function)
+        return self._classifier_like(tree.children, type_cls=Function)
 
     @v_args(inline=True)
     def expression(self, prefix, declaration, value_part, body):
@@ -1234,7 +1233,7 @@ class KerMLTransformer(KerMLTransTemplate):
 
     @v_args(tree=True)
     def predicate(self, tree: Tree):
-        return self._classifier_like(tree=tree, type_cls=Predicate)
+        return self._classifier_like(tree.children, type_cls=Predicate)
 
     @v_args(inline=True)
     def boolean_expression(self, prefix, declaration, value_part, body):
@@ -1394,7 +1393,7 @@ class KerMLTransformer(KerMLTransTemplate):
 
     @v_args(tree=True)
     def interaction(self, tree: Tree):
-        return self._classifier_like(tree, type_cls=Interaction)
+        return self._classifier_like(tree.children, type_cls=Interaction)
 
     @v_args(inline=True)
     def item_flow_end(self, owned, member):
@@ -1553,7 +1552,7 @@ class KerMLTransformer(KerMLTransTemplate):
 
     @v_args(tree=True)
     def metaclass(self, tree: Tree):
-        return self._classifier_like(tree, type_cls=Metaclass)
+        return self._classifier_like(tree.children, type_cls=Metaclass)
 
     @v_args(tree=True)
     def metadata_body(self, tree: Tree):
@@ -1660,5 +1659,7 @@ class KerMLTransformer(KerMLTransTemplate):
 
 
 def tree_to_kerml_cst(tree: Tree):
-    trans = KerMLTransformer()
+    # the generated table-driven transformer is used, it depends on this module
+    from .table import KerMLTableTransformer
+    trans = KerMLTableTransformer()
     return trans.transform(tree)
@@ -0,0 +1,123 @@
+"""
+Hit counters of the KerML grammar rules, collected by :class:`KerMLTableTransformer`.
+
+The counters are kept in a preallocated array indexed by the rule ids, so counting a rule
+is one array increment. The transformer only wraps its rule methods when a coverage object
+is given, so nothing is paid when the coverage is not collected. The objects are picklable,
+and the counters collected in different processes can be merged with :meth:`RuleCoverage.merge`.
+"""
+
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence
+
+
+class RuleCoverage:
+    """
+    Hit counters of the grammar rules.
+
+    :param rules: Names of the rules, the rule id is the position in it. Default is all the rules
+        of the KerML grammar (``KERML_TABLE_RULES``).
+    :type rules: Optional[Sequence[str]]
+    """
+
+    def __init__(self, rules: Optional[Sequence[str]] = None):
+        if rules is None:
+            from .table import KERML_TABLE_RULES
+            rules = KERML_TABLE_RULES
+        self.rules = tuple(rules)
+        self.rule_ids: Dict[str, int] = {rule: rule_id for rule_id, rule in enumerate(self.rules)}
+        if len(self.rule_ids) != len(self.rules):
+            raise ValueError(f'Duplicated rules in {self.rules!r}.')
+        self.counts = array('Q', [0]) * len(self.rules)
+
+    def __len__(self):
+        return len(self.rules)
+
+    def __getitem__(self, rule: str) -> int:
+        """
+        Get the hits of the rule.
+        """
+        return self.counts[self.rule_ids[rule]]
+
+    @property
+    def total(self) -> int:
+        """
+        Total hits of all the rules.
+        """
+        return sum(self.counts)
+
+    @property
+    def covered(self) -> List[str]:
+        """
+        Rules which are hit at least once, in the order of the rule ids.
+        """
+        return [rule for rule, count in zip(self.rules, self.counts) if count]
+
+    @property
+    def uncovered(self) -> List[str]:
+        """
+        Rules which are never hit, in the order of the rule ids.
+        """
+        return [rule for rule, count in zip(self.rules, self.counts) if not count]
+
+    @property
+    def ratio(self) -> float:
+        """
+        Ratio of the covered rules, ``0.0`` when there is no rule.
+        """
+        return len(self.covered) / len(self.rules) if self.rules else 0.0
+
+    def merge(self, *others: 'RuleCoverage') -> 'RuleCoverage':
+        """
+        Add the counters of the other coverage objects into this one.
+
+        When the rules are the same, the counter arrays are added by the rule ids. Otherwise, the
+        counters are added by the rule names, and the rules which are not in this object are
+        ignored.
+
+        :param others: Other coverage objects, such as the ones collected in the worker processes.
+
+        :return: This object.
+        :rtype: RuleCoverage
+        """
+        for other in others:
+            if other.rules == self.rules:
+                for rule_id, count in enumerate(other.counts):
+                    if count:
+                        self.counts[rule_id] += count
+            else:
+                for rule, count in zip(other.rules, other.counts):
+                    rule_id = self.rule_ids.get(rule)
+                    if count and rule_id is not None:
+                        self.counts[rule_id] += count
+        return self
+
+    @classmethod
+    def merged(cls, coverages: Iterable['RuleCoverage'], rules: Optional[Sequence[str]] = None) -> 'RuleCoverage':
+        """
+        Create a new coverage object with the sum of the given ones.
+
+        :param coverages: Coverage objects to merge, ``None`` items are skipped.
+        :param rules: Rules of the new object, default is all the rules of the KerML grammar.
+        :type rules: Optional[Sequence[str]]
+
+        :return: Merged coverage object.
+        :rtype: RuleCoverage
+        """
+        return cls(rules).merge(*(coverage for coverage in coverages if coverage is not None))
+
+    def clear(self):
+        """
+        Reset all the counters to zero.
+        """
+        # reset in place, the instrumented transformers keep the counter array
+        self.counts[:] = array('Q', [0]) * len(self.rules)
+
+    def as_dict(self) -> Dict[str, int]:
+        """
+        Get the hits of all the rules as a dict.
+        """
+        return dict(zip(self.rules, self.counts))
+
+    def __repr__(self):
+        return f'<{type(self).__name__} {len(self.covered)}/{len(self.rules)} rules, {self.total} hits>'
@@ -0,0 +1,1586 @@
+import json
+import typing
+from array import array
+
+from lark.exceptions import GrammarError, VisitError
+from lark import Tree, Token
+
+from .convert import KerMLTransformer
+from .coverage import RuleCoverage
+from ..models import BoolValue, IntValue, RealValue, StringValue, InfValue, NullValue, NameTable, \
+    MetadataAccessExpression, NamedArgument, InvocationExpression, Visibility, PrefixMetadataAnnotation, \
+    Identification, Dependency, Comment, Documentation, TextualRepresentation, Namespace, NonFeatureMember, \
+    DisjoiningPart, UnioningPart, IntersectingPart, DifferencingPart, MultiplicityBounds, ConjugationPart, \
+    SuperclassingPart, Class, Import, SpecializationPart, Type, ChainingPart, InvertingPart, TypeFeaturingPart, \
+    TypingsPart, SubsettingsPart, RedefinitionsPart, ReferencesPart, FeatureDirection, FeatureRelationshipType, \
+    FeatureValueType, Feature, OwnedFeatureMember, TypeFeatureMember, Alias, NamespaceFeatureMember, Specialization, \
+    Conjugation, Disjoining, Classifier, Subclassification, FeatureTyping, Subsetting, Redefinition, FeatureInverting, \
+    TypeFeaturing, ExtentOp, UnaryOp, IfTestOp, CondBinOp, BinOp, ClsCastOp, ClsTestOp, MetaClsCastOp, MetaClsTestOp, \
+    DataType, Struct, Association, AssociationStruct, ConnectorEnd, Connector, ConnectorType, BindingConnector, \
+    Succession, Behavior, Step, Return, Result, Function, Predicate, Expression, BooleanExpression, Invariant, \
+    IndexExpression, SequenceExpression, FeatureChainExpression, CollectExpression, SelectExpression, BodyExpression, \
+    FunctionOperationExpression, Interaction, ItemFlowEnd, ItemFlow, ItemFeature, MultiplicitySubset, \
+    MultiplicityRange, Metaclass, SuccessionItemFlow, Metadata, MetadataRedefine, ElementFilter, Package, \
+    LibraryPackage, RootNamespace
+
+# sha256 of convert.py, to find out whether this module is out of date
+KERML_TABLE_SOURCE_SHA256 = 'e7312b07063552037e39ee2e42ebc0aa79f0dff8ddc43997298a012037c23188'
+
+# all the rules of the grammar, the positions are the rule ids in RuleCoverage
+KERML_TABLE_RULES = (
+    'explicit_identification_with_short', 'explicit_identification_plain', 'non_recursive_membership_import',
+    'recursive_membership_import', 'non_recursive_namespace_import', 'recursive_namespace_import',
+    'abstract_type_prefix', 'non_abstract_type_prefix', 'all_classifier_declaration', 'non_all_classifier_declaration',
+    'feature_declaration_idx', 'feature_declaration_spc', 'feature_declaration_coj', 'all_binary_connector_declaration',
+    'non_all_binary_connector_declaration', 'sequence_expression_list_standalone',
+    'function_operation_expression_standalone', 'function_operation_expression_arglist', 'item_flow_declaration_dec',
+    'item_flow_declaration_simple', 'item_feature_idx', 'item_feature_ft', 'item_feature_m', 'fv_bind', 'fv_initial',
+    'fv_default_bind', 'fv_default_initial', 'start', 'identification', 'relationship_body', 'dependency',
+    'dependency_annotation_list', 'dependency_list', 'comment', 'comment_prefix', 'comment_about_list', 'documentation',
+    'locale', 'textual_representation', 'textual_representation_rep', 'root_namespace', 'namespace',
+    'namespace_declaration', 'namespace_body', 'member_prefix', 'visibility_indicator', 'non_feature_member',
+    'namespace_feature_member', 'alias_member', 'qualified_name', 'import_statement', 'import_declaration',
+    'filter_package_list', 'type', 'type_declaration', 'specialization_part', 'conjugation_part', 'disjoining_part',
+    'unioning_part', 'intersecting_part', 'differencing_part', 'type_body', 'specialization', 'conjugation',
+    'disjoining', 'type_feature_member', 'owned_feature_member', 'classifier', 'superclassing_part',
+    'subclassification', 'feature', 'feature_prefix', 'feature_direction', 'feature_relationship_type',
+    'feature_declaration', 'chaining_part', 'inverting_part', 'type_featuring_part', 'feature_specialization_part',
+    'multiplicity_part', 'typings', 'typed_by', 'subsettings', 'subsets', 'references', 'redefinitions', 'redefines',
+    'feature_typing', 'subsetting', 'redefinition', 'feature_chain', 'feature_inverting', 'type_featuring', 'data_type',
+    'class_statement', 'structure', 'association', 'association_structure', 'connector', 'value_connector_declaration',
+    'nary_connector_declaration', 'connector_end', 'connector_end_to', 'connector_end_name', 'binding_connector',
+    'non_declare_binding_connector_declaration', 'declare_binding_connector_declaration', 'succession',
+    'non_declare_succession_declaration', 'declare_succession_declaration', 'behavior', 'step', 'function',
+    'function_body', 'function_body_part', 'return_feature_member', 'result_expression_member', 'expression',
+    'predicate', 'boolean_expression', 'invariant', 'invariant_bool', 'conditional_expression',
+    'conditional_binary_l14_operator_expression', 'conditional_binary_l14_operator',
+    'conditional_binary_l13_operator_expression', 'conditional_binary_l13_operator',
+    'conditional_binary_l12_operator_expression', 'conditional_binary_l12_operator', 'binary_l12_operator_expression',
+    'binary_l12_operator', 'binary_l11_operator_expression', 'binary_l11_operator',
+    'conditional_binary_l10_operator_expression', 'conditional_binary_l10_operator', 'binary_l10_operator_expression',
+    'binary_l10_operator', 'binary_l9_operator_expression', 'binary_l9_operator', 'classification_expression',
+    'classification_test_operator', 'cast_operator', 'metaclassification_expression',
+    'meta_classification_test_operator', 'meta_cast_operator', 'binary_l7_operator_expression', 'binary_l7_operator',
+    'binary_l6_operator_expression', 'binary_l6_operator', 'binary_l5_operator_expression', 'binary_l5_operator',
+    'binary_l4_operator_expression', 'binary_l4_operator', 'exp_operator_expression', 'unary_operator_expression',
+    'unary_operator', 'extent_expression', 'bracket_expression', 'index_expression', 'sequence_expression',
+    'sequence_operator_expression', 'feature_chain_expression', 'collect_expression', 'select_expression',
+    'null_expression', 'metadata_access_expression', 'invocation_expression', 'argument_list',
+    'positional_argument_list', 'named_argument_list', 'named_argument', 'body_expression', 'expression_body',
+    'literal_boolean', 'literal_string', 'literal_integer', 'literal_real', 'literal_infinity', 'interaction',
+    'item_flow', 'succession_item_flow', 'item_feature_specialization_part', 'item_flow_end', 'feature_value',
+    'multiplicity_subset', 'multiplicity_range', 'multiplicity_bounds', 'metaclass', 'prefix_metadata_annotation',
+    'prefix_metadata_member', 'metadata_feature', 'metadata_feature_about', 'metadata_feature_declaration',
+    'metadata_body', 'metadata_body_feature', 'package', 'library_package', 'package_declaration', 'package_body',
+    'element_filter_member',
+)
+
+
+def _counted(method: typing.Callable[[list], typing.Any], counts: array, rule_id: int):
+    def _callback(children: list):
+        counts[rule_id] += 1
+        return method(children)
+
+    return _callback
+
+
+class KerMLTableTransformer(KerMLTransformer):
+    """
+    Table-driven version of :class:`KerMLTransformer`, generated by ``tools/kerml/generate.py``.
+
+    Each rule method takes the list of the children directly, without the ``v_args``
+    wrappers and the temporary trees, and :meth:`transform` dispatches the rules with a
+    precomputed table of the bound methods. Do not edit this file, change
+    :class:`KerMLTransformer` and regenerate it instead.
+
+    :param visit_tokens: Visit the tokens, default is ``False``.
+    :type visit_tokens: bool
+    :param name_table: Table of the interned names, see :class:`KerMLTransformer`.
+    :type name_table: Optional[NameTable]
+    :param coverage: Count the hits of the rules into this object, see :class:`RuleCoverage`.
+        Default is ``None``, which means the hits are not counted.
+    :type coverage: Optional[RuleCoverage]
+    """
+
+    def __init__(self, visit_tokens: bool = False, name_table: typing.Optional[NameTable] = None,
+                 coverage: typing.Optional[RuleCoverage] = None):
+        KerMLTransformer.__init__(self, visit_tokens=visit_tokens, name_table=name_table)
+        self.coverage = coverage
+        if coverage is not None:
+            # the rule methods are wrapped only when the coverage is collected
+            for name in KERML_TABLE_RULES:
+                if name in coverage.rule_ids:
+                    setattr(self, name, _counted(getattr(self, name), coverage.counts, coverage.rule_ids[name]))
+        self._callbacks: typing.Dict[str, typing.Callable[[list], typing.Any]] = {
+            name: getattr(self, name) for name in KERML_TABLE_RULES
+        }
+
+    def transform(self, tree: Tree):
+        # post-order without recursion, the same as Transformer_NonRecursive.transform
+        rev_postfix = []
+        queue = [tree]
+        while queue:
+            item = queue.pop()
+            rev_postfix.append(item)
+            if isinstance(item, Tree):
+                queue += item.children
+
+        callbacks = self._callbacks
+        stack = []
+        for item in reversed(rev_postfix):
+            if isinstance(item, Tree):
+                size = len(item.children)
+                if size:
+                    children = stack[-size:]
+                    del stack[-size:]
+                else:
+                    children = []
+
+                callback = callbacks.get(item.data)
+                if callback is None:
+                    # rules which are not in the KerML grammar
+                    stack.append(self._call_userfunc(item, children))
+                    continue
+                try:
+                    stack.append(callback(children))
+                except GrammarError:
+                    raise
+                except Exception as err:
+                    raise VisitError(item.data, item, err)
+            elif self.__visit_tokens__ and isinstance(item, Token):
+                stack.append(self._call_userfunc_token(item))
+            else:
+                stack.append(item)
+
+        result, = stack
+        return result
+
+    def explicit_identification_with_short(self, children: list):
+        assert len(children) == 2
+        return Identification(
+            short_name=self.name_table.name(children[0].value),
+            name=self.name_table.name(children[1].value) if children[1] is not None else None,
+        )
+
+    def explicit_identification_plain(self, children: list):
+        assert len(children) == 1
+        return Identification(
+            short_name=None,
+            name=self.name_table.name(children[0].value) if children[0] is not None else None,
+        )
+
+    def non_recursive_membership_import(self, children: list):
+        assert len(children) == 1
+        return False, False, children[0]
+
+    def recursive_membership_import(self, children: list):
+        assert len(children) == 1
+        return True, False, children[0]
+
+    def non_recursive_namespace_import(self, children: list):
+        assert len(children) == 1
+        return False, True, children[0]
+
+    def recursive_namespace_import(self, children: list):
+        assert len(children) == 1
+        return True, True, children[0]
+
+    def abstract_type_prefix(self, children: list):
+        return True, children
+
+    def non_abstract_type_prefix(self, children: list):
+        return False, children
+
+    def all_classifier_declaration(self, children: list):
+        return True, children[0], children[1], children[2], children[3:]
+
+    def non_all_classifier_declaration(self, children: list):
+        return False, children[0], children[1], children[2], children[3:]
+
+    def feature_declaration_idx(self, children: list):
+        assert len(children) == 2
+        if isinstance(children[1], ConjugationPart):
+            return children[0], None, children[1]
+        else:
+            return children[0], children[1], None
+
+    def feature_declaration_spc(self, children: list):
+        assert len(children) == 1
+        return None, children[0], None
+
+    def feature_declaration_coj(self, children: list):
+        assert len(children) == 1
+        return None, None, children[0]
+
+    def all_binary_connector_declaration(self, children: list):
+        end1, end2 = children
+        return 'binary', True, None, (end1, end2)
+
+    def non_all_binary_connector_declaration(self, children: list):
+        declaration, end1, end2 = children
+        return 'binary', False, declaration, (end1, end2)
+
+    def sequence_expression_list_standalone(self, children: list):
+        expression, = children
+        return [expression]
+
+    def function_operation_expression_standalone(self, children: list):
+        entity, func_name, arg = children
+        return FunctionOperationExpression(
+            entity=entity,
+            name=func_name,
+            arguments=[arg],
+        )
+
+    def function_operation_expression_arglist(self, children: list):
+        entity, func_name, args = children
+        return FunctionOperationExpression(
+            entity=entity,
+            name=func_name,
+            arguments=args,
+        )
+
+    def item_flow_declaration_dec(self, children: list):
+        declaration, value_part, item_feat = children[:3]
+        ends = tuple(children[3:])
+        if ends:
+            end1, end2 = ends
+        else:
+            end1, end2 = None, None
+        is_all_flow = False
+        return declaration, value_part, item_feat, is_all_flow, end1, end2
+
+    def item_flow_declaration_simple(self, children: list):
+        all_token, end1, end2 = children
+        is_all_flow = bool(all_token)
+        return None, None, None, is_all_flow, end1, end2
+
+    def item_feature_idx(self, children: list):
+        identification, spc, value_part = children
+        specs, multiplicity, is_ordered, is_nonunique = spc
+        if value_part is not None:
+            is_default, value_type, v = value_part
+        else:
+            is_default, value_type, v = False, None, None
+        return ItemFeature(
+            identification=identification,
+            specializations=specs,
+            multiplicity=multiplicity,
+            is_ordered=is_ordered,
+            is_nonunique=is_nonunique,
+            feature_typing=None,
+            is_default=is_default,
+            value_type=value_type,
+            value=v,
+        )
+
+    def item_feature_ft(self, children: list):
+        feature_typing, multiplicity = children
+        return ItemFeature(
+            identification=None,
+            specializations=[],
+            multiplicity=multiplicity,
+            is_ordered=False,
+            is_nonunique=False,
+            feature_typing=feature_typing,
+            is_default=False,
+            value_type=None,
+            value=None
+        )
+
+    def item_feature_m(self, children: list):
+        multiplicity, feature_typing = children
+        return ItemFeature(
+            identification=None,
+            specializations=[],
+            multiplicity=multiplicity,
+            is_ordered=False,
+            is_nonunique=False,
+            feature_typing=feature_typing,
+            is_default=False,
+            value_type=None,
+            value=None
+        )
+
+    def fv_bind(self, children: list):
+        return False, FeatureValueType.BIND
+
+    def fv_initial(self, children: list):
+        return False, FeatureValueType.INITIAL
+
+    def fv_default_bind(self, children: list):
+        return True, FeatureValueType.BIND
+
+    def fv_default_initial(self, children: list):
+        return True, FeatureValueType.INITIAL
+
+    def start(self, children: list):
+        namespace, = children
+        return namespace
+
+    def identification(self, children: list):
+        assert len(children) == 2
+        return Identification(
+            short_name=self.name_table.name(children[0].value) if children[0] is not None else None,
+            name=self.name_table.name(children[1].value) if children[1] is not None else None,
+        )
+
+    def relationship_body(self, children: list):
+        return children
+
+    def dependency(self, children: list):
+        assert len(children) == 5
+        return Dependency(
+            annotations=children[0],
+            identification=children[1],
+            from_list=children[2],
+            to_list=children[3],
+            body=children[4],
+        )
+
+    def dependency_annotation_list(self, children: list):
+        return children
+
+    def dependency_list(self, children: list):
+        return children
+
+    def comment(self, children: list):
+        assert len(children) == 3
+        if children[0]:
+            identification, about_list = children[0]
+        else:
+            identification, about_list = None, None
+
+        return Comment(
+            identification=identification,
+            about_list=about_list,
+            locale=children[1],
+            comment=children[2].value,
+        )
+
+    def comment_prefix(self, children: list):
+        assert len(children) == 2
+        identification, about_list = children
+        return identification, about_list
+
+    def comment_about_list(self, children: list):
+        return children
+
+    def documentation(self, children: list):
+        assert len(children) == 3
+        return Documentation(
+            identification=children[0],
+            locale=children[1],
+            comment=children[2].value,
+        )
+
+    def locale(self, children: list):
+        assert len(children) == 1
+        token: Token = children[0]
+        return json.loads(token.value)
+
+    def textual_representation(self, children: list):
+        assert len(children) == 3
+        return TextualRepresentation(
+            identification=children[0],
+            language=self.name_table.name(children[1].value) if children[1] is not None else None,
+            comment=children[2].value,
+        )
+
+    def textual_representation_rep(self, children: list):
+        assert len(children) == 1
+        return children[0]
+
+    def root_namespace(self, children: list):
+        return RootNamespace(
+            body=children,
+        )
+
+    def namespace(self, children: list):
+        assert len(children) >= 2
+        return Namespace(
+            annotations=children[:-2],
+            identification=children[-2],
+            body=children[-1],
+        )
+
+    def namespace_declaration(self, children: list):
+        assert len(children) == 1
+        return children[0]
+
+    def namespace_body(self, children: list):
+        return children
+
+    def member_prefix(self, children: list):
+        if children:
+            return children[0]
+        else:
+            return None
+
+    def visibility_indicator(self, children: list):
+        return Visibility.load(children[0])
+
+    def non_feature_member(self, children: list):
+        assert len(children) == 2
+        return NonFeatureMember(
+            visibility=children[0],
+            element=children[1],
+        )
+
+    def namespace_feature_member(self, children: list):
+        assert len(children) == 2
+        return NamespaceFeatureMember(
+            visibility=children[0],
+            element=children[1],
+        )
+
+    def alias_member(self, children: list):
+        assert len(children) == 4
+        return Alias(
+            visibility=children[0],
+            identification=children[1],
+            name=children[2],
+            body=children[3],
+        )
+
+    def qualified_name(self, children: list):
+        assert len(children) > 0
+        return self.name_table.qualified_name([item.value for item in children])
+
+    def import_statement(self, children: list):
+        assert len(children) == 4
+        visibility, is_all, ((is_recursive, is_namespace, import_name), filter_list), body = children
+        return Import(
+            visibility=visibility,
+            is_all=bool(is_all),
+            is_recursive=is_recursive,
+            is_namespace=is_namespace,
+            name=import_name,
+            filters=filter_list,
+            body=body,
+        )
+
+    def import_declaration(self, children: list):
+        return children
+
+    def filter_package_list(self, children: list):
+        return children
+
+    def type(self, children: list):
+        assert len(children) == 3
+        (is_abstract, annotations), (is_all, identification, multiplicity_bounds,
+                                     spx, type_relationship_parts), body = children
+        if spx is None:
+            conjugation, specialization = None, None
+        elif isinstance(spx, SpecializationPart):
+            conjugation, specialization = None, spx
+        elif isinstance(spx, ConjugationPart):
+            conjugation, specialization = spx, None
+        else:
+            assert False, "Should not reach this line"  # pragma: no cover
+
+        return Type(
+            is_abstract=is_abstract,
+            annotations=annotations,
+            is_all=is_all,
+            identification=identification,
+            multiplicity_bounds=multiplicity_bounds,
+            conjugation=conjugation,
+            specialization=specialization,
+            relationships=type_relationship_parts,
+            body=children[2],
+        )
+
+    def type_declaration(self, children: list):
+        return bool(children[0]), children[1], children[2], children[3], children[4:]
+
+    def specialization_part(self, children: list):
+        assert len(children) > 1
+        assert children[0].type == 'SPECIALIZES'
+        return SpecializationPart(items=children[1:])
+
+    def conjugation_part(self, children: list):
+        assert len(children) == 2
+        assert children[0].type == 'CONJUGATES'
+        return ConjugationPart(item=children[1])
+
+    def disjoining_part(self, children: list):
+        return DisjoiningPart(items=children)
+
+    def unioning_part(self, children: list):
+        return UnioningPart(items=children)
+
+    def intersecting_part(self, children: list):
+        return IntersectingPart(items=children)
+
+    def differencing_part(self, children: list):
+        return DifferencingPart(items=children)
+
+    def type_body(self, children: list):
+        return children
+
+    def specialization(self, children: list):
+        assert len(children) == 5
+        return Specialization(
+            identification=children[0],
+            specific_type=children[1],
+            general_type=children[3],
+            body=children[4],
+        )
+
+    def conjugation(self, children: list):
+        assert len(children) == 5
+        return Conjugation(
+            identification=children[0],
+            conjugate_type=children[1],
+            conjugated_type=children[3],
+            body=children[4],
+        )
+
+    def disjoining(self, children: list):
+        assert len(children) == 4
+        return Disjoining(
+            identification=children[0],
+            disjoint_type=children[1],
+            separated_type=children[2],
+            body=children[3],
+        )
+
+    def type_feature_member(self, children: list):
+        assert len(children) == 2
+        return TypeFeatureMember(
+            visibility=children[0],
+            element=children[1],
+        )
+
+    def owned_feature_member(self, children: list):
+        assert len(children) == 2
+        return OwnedFeatureMember(
+            visibility=children[0],
+            element=children[1],
+        )
+
+    def classifier(self, children: list):
+        return self._classifier_like(children, type_cls=Classifier)
+
+    def superclassing_part(self, children: list):
+        assert len(children) > 1
+        assert children[0].type == 'SPECIALIZES'
+        return SuperclassingPart(items=children[1:])
+
+    def subclassification(self, children: list):
+        assert len(children) == 5
+        return Subclassification(
+            identification=children[0],
+            subclassifier=children[1],
+            superclassifier=children[3],
+            body=children[4],
+        )
+
+    def feature(self, children: list):
+        assert len(children) == 4
+        prefix, declaration, value, body = children
+        direction, is_abstract, relationship_type, is_readonly, is_derived, is_end, annotations = prefix
+        is_all, identification, specs, (multiplicity, is_ordered, is_nonunique), conj, relationships = declaration
+        if value is not None:
+            is_default, value_type, v = value
+        else:
+            is_default, value_type, v = False, None, None
+
+        return Feature(
+            direction=direction,
+            is_abstract=is_abstract,
+            relationship_type=relationship_type,
+            is_readonly=is_readonly,
+            is_derived=is_derived,
+            is_end=is_end,
+            annotations=annotations,
+
+            is_all=is_all,
+            identification=identification,
+            specializations=specs,
+            multiplicity=multiplicity,
+            is_ordered=is_ordered,
+            is_nonunique=is_nonunique,
+            conjugation=conj,
+            relationships=relationships,
+
+            is_default=is_default,
+            value_type=value_type,
+            value=v,
+
+            body=body,
+        )
+
+    def feature_prefix(self, children: list):
+        direction = None
+        is_abstract = False
+        relationship_type = None
+        is_readonly, is_derived, is_end = False, False, False
+        annotations = []
+        for item in children:
+            if isinstance(item, FeatureDirection):
+                direction = item
+            elif item == 'abstract':
+                is_abstract = True
+            elif isinstance(item, FeatureRelationshipType):
+                relationship_type = item
+            elif item == "readonly":
+                is_readonly = True
+            elif item == "derived":
+                is_derived = True
+            elif item == "end":
+                is_end = True
+            elif isinstance(item, PrefixMetadataAnnotation):
+                annotations.append(item)
+            else:
+                assert False, 'Should not reach this line'  # pragma: no cover
+
+        return direction, is_abstract, relationship_type, is_readonly, is_derived, is_end, annotations
+
+    def feature_direction(self, children: list):
+        assert len(children) == 1
+        return FeatureDirection.load(children[0].type)
+
+    def feature_relationship_type(self, children: list):
+        assert len(children) == 1
+        return FeatureRelationshipType.load(children[0].type)
+
+    def feature_declaration(self, children: list):
+        assert len(children) >= 2
+        is_all = bool(children[0])
+        identification, spc, conj = children[1]
+        specs, multiplicity, is_ordered, is_nonunique = ([], None, False, False) if spc is None else spc
+        relationships = children[2:]
+        return is_all, identification, specs, (multiplicity, is_ordered, is_nonunique), conj, relationships
+
+    def chaining_part(self, children: list):
+        assert len(children) == 1
+        return ChainingPart(item=children[0])
+
+    def inverting_part(self, children: list):
+        assert len(children) == 1
+        return InvertingPart(item=children[0])
+
+    def type_featuring_part(self, children: list):
+        return TypeFeaturingPart(items=children)
+
+    def feature_specialization_part(self, children: list):
+        items = []
+        multiplicity, is_ordered, is_nonunique = None, False, False
+        for item in children:
+            if isinstance(item, tuple):
+                multiplicity, is_ordered, is_nonunique = item
+            else:
+                items.append(item)
+
+        return items, multiplicity, is_ordered, is_nonunique
+
+    def multiplicity_part(self, children: list):
+        multiplicity = None
+        is_ordered, is_nonunique = False, False
+        for item in children:
+            if isinstance(item, MultiplicityBounds):
+                multiplicity = item
+            elif item == 'ordered':
+                is_ordered = True
+            elif item == 'nonunique':
+                is_nonunique = True
+            else:
+                assert False, 'Should not reach this line.'  # pragma: no cover
+
+        return multiplicity, is_ordered, is_nonunique
+
+    def typings(self, children: list):
+        return TypingsPart(items=children)
+
+    def typed_by(self, children: list):
+        assert len(children) == 2
+        return children[1]
+
+    def subsettings(self, children: list):
+        return SubsettingsPart(items=children)
+
+    def subsets(self, children: list):
+        assert len(children) == 2
+        return children[1]
+
+    def references(self, children: list):
+        assert len(children) == 2
+        return ReferencesPart(item=children[1])
+
+    def redefinitions(self, children: list):
+        return RedefinitionsPart(items=children)
+
+    def redefines(self, children: list):
+        assert len(children) == 2
+        return children[1]
+
+    def feature_typing(self, children: list):
+        assert len(children) == 5
+        return FeatureTyping(
+            identification=children[0],
+            typed_entity=children[1],
+            typing_type=children[3],
+            body=children[4],
+        )
+
+    def subsetting(self, children: list):
+        assert len(children) == 5
+        return Subsetting(
+            identification=children[0],
+            subset=children[1],
+            superset=children[3],
+            body=children[4],
+        )
+
+    def redefinition(self, children: list):
+        assert len(children) == 5
+        return Redefinition(
+            identification=children[0],
+            entity=children[1],
+            redefined_to=children[3],
+            body=children[4],
+        )
+
+    def feature_chain(self, children: list):
+        return self.name_table.feature_chain(children)
+
+    def feature_inverting(self, children: list):
+        assert len(children) == 4
+        return FeatureInverting(
+            identification=children[0],
+            inverted=children[1],
+            target=children[2],
+            body=children[3],
+        )
+
+    def type_featuring(self, children: list):
+        assert len(children) == 4
+        return TypeFeaturing(
+            identification=children[0],
+            featured_entity=children[1],
+            feature_provider=children[2],
+            body=children[3],
+        )
+
+    def data_type(self, children: list):
+        return self._classifier_like(children, type_cls=DataType)
+
+    def class_statement(self, children: list):
+        return self._classifier_like(children, type_cls=Class)
+
+    def structure(self, children: list):
+        return self._classifier_like(children, type_cls=Struct)
+
+    def association(self, children: list):
+        return self._classifier_like(children, type_cls=Association)
+
+    def association_structure(self, children: list):
+        return self._classifier_like(children, type_cls=AssociationStruct)
+
+    def connector(self, children: list):
+        prefix, connector_declaration, type_body = children
+        connector_type = connector_declaration[0]
+        is_all_connect = False
+        declaration, value_part, end1, end2, ends = None, None, None, None, None
+        if connector_type == 'value':
+            _, declaration, value_part = connector_declaration
+        elif connector_type == 'binary':
+            _, is_all_connect, declaration, (end1, end2) = connector_declaration
+            ends = [end1, end2]
+        elif connector_type == 'nary':
+            _, declaration, ends = connector_declaration
+            ends = list(ends)
+        else:
+            assert False, 'Should not reach this line'  # pragma: no cover
+
+        direction, is_abstract, relationship_type, is_readonly, is_derived, is_end, annotations = prefix
+        if declaration:
+            is_all, identification, specs, (multiplicity, is_ordered, is_nonunique), conj, relationships = declaration
+        else:
+            is_all, identification, specs, (multiplicity, is_ordered, is_nonunique), conj, relationships = \
+                (False, None, [], (None, False, False), None, [])
+
+        if value_part is not None:
+            is_default, value_type, v = value_part
+        else:
+            is_default, value_type, v = False, None, None
+
+        return Connector(
+            # for prefix
+            direction=direction,
+            is_abstract=is_abstract,
+            relationship_type=relationship_type,
+            is_readonly=is_readonly,
+            is_derived=is_derived,
+            is_end=is_end,
+            annotations=annotations,
+
+            # for declaration
+            is_all=is_all,
+            identification=identification,
+            specializations=specs,
+            multiplicity=multiplicity,
+            is_ordered=is_ordered,
+            is_nonunique=is_nonunique,
+            conjugation=conj,
+            relationships=relationships,
+
+            # for type
+            type=ConnectorType.load(connector_type),
+
+            # for type - value
+            is_default=is_default,
+            value_type=value_type,
+            value=v,
+
+            # for type - binary &
+            is_all_connect=is_all_connect,
+            ends=ends,
+
+            # body part
+            body=type_body,
+        )
+
+    def value_connector_declaration(self, children: list):
+        declaration, value_part = children
+        return 'value', declaration, value_part
+
+    def nary_connector_declaration(self, children: list):
+        declaration, = children[:1]
+        ends = tuple(children[1:])
+        return 'nary', declaration, ends
+
+    def connector_end(self, children: list):
+        name, reference, multiplicity = children
+        return ConnectorEnd(
+            name=name,
+            reference=reference,
+            multiplicity=multiplicity,
+        )
+
+    def connector_end_to(self, children: list):
+        name, _ = children
+        return name
+
+    def connector_end_name(self, children: list):
+        token, = children
+        return token.value
+
+    def binding_connector(self, children: list):
+        prefix, binding_connector_declaration, type_body = children
+        direction, is_abstract, relationship_type, is_readonly, is_derived, is_end, annotations = prefix
+        is_all_binding, declaration, bind_entity, bind_to = binding_connector_declaration
+        if declaration:
+            is_all, identification, specs, (multiplicity, is_ordered, is_nonunique), conj, relationships = declaration
+        else:
+            is_all, identification, specs, (multiplicity, is_ordered, is_nonunique), conj, relationships = \
+                (False, None, [], (None, False, False), None, [])
+
+        return BindingConnector(
+            # for prefix
+            direction=direction,
+            is_abstract=is_abstract,
+            relationship_type=relationship_type,
+            is_readonly=is_readonly,
+            is_derived=is_derived,
+            is_end=is_end,
+            annotations=annotations,
+
+            # for declaration
+            is_all=is_all,
+            identification=identification,
+            specializations=specs,
+            multiplicity=multiplicity,
+            is_ordered=is_ordered,
+            is_nonunique=is_nonunique,
+            conjugation=conj,
+            relationships=relationships,
+
+            is_all_binding=is_all_binding,
+            bind_entity=bind_entity,
+            bind_to=bind_to,
+
+            # body part
+            body=type_body,
+        )
+
+    def non_declare_binding_connector_declaration(self, children: list):
+        all_token, = children[:1]
+        members = tuple(children[1:])
+        is_all_binding = bool(all_token)
+        if members:
+            bind_entity, bind_to = members
+        else:
+            bind_entity, bind_to = None, None
+        return is_all_binding, None, bind_entity, bind_to
+
+    def declare_binding_connector_declaration(self, children: list):
+        declaration, = children[:1]
+        members = tuple(children[1:])
+        if members:
+            bind_entity, bind_to = members
+        else:
+            bind_entity, bind_to = None, None
+        return False, declaration, bind_entity, bind_to
+
+    def succession(self, children: list):
+        prefix, succession_declaration, type_body = children
+        direction, is_abstract, relationship_type, is_readonly, is_derived, is_end, annotations = prefix
+        is_all_succession, declaration, first, then = succession_declaration
+        if declaration:
+            is_all, identification, specs, (multiplicity, is_ordered, is_nonunique), conj, relationships = declaration
+        else:
+            is_all, identification, specs, (multiplicity, is_ordered, is_nonunique), conj, relationships = \
+                (False, None, [], (None, False, False), None, [])
+
+        return Succession(
+            # for prefix
+            direction=direction,
+            is_abstract=is_abstract,
+            relationship_type=relationship_type,
+            is_readonly=is_readonly,
+            is_derived=is_derived,
+            is_end=is_end,
+            annotations=annotations,
+
+            # for declaration
+            is_all=is_all,
+            identification=identification,
+            specializations=specs,
+            multiplicity=multiplicity,
+            is_ordered=is_ordered,
+            is_nonunique=is_nonunique,
+            conjugation=conj,
+            relationships=relationships,
+
+            is_all_succession=is_all_succession,
+            first=first,
+            then=then,
+
+            # body part
+            body=type_body,
+        )
+
+    def non_declare_succession_declaration(self, children: list):
+        all_token, = children[:1]
+        members = tuple(children[1:])
+        is_all_succession = bool(all_token)
+        if members:
+            first, then = members
+        else:
+            first, then = None, None
+        return is_all_succession, None, first, then
+
+    def declare_succession_declaration(self, children: list):
+        declaration, = children[:1]
+        members = tuple(children[1:])
+        if members:
+            first, then = members
+        else:
+            first, then = None, None
+        return False, declaration, first, then
+
+    def behavior(self, children: list):
+        return self._classifier_like(children, type_cls=Behavior)
+
+    def step(self, children: list):
+        prefix, declaration, value_part, type_body = children
+        direction, is_abstract, relationship_type, is_readonly, is_derived, is_end, annotations = prefix
+        is_all, identification, specs, (multiplicity, is_ordered, is_nonunique), conj, relationships = declaration
+
+        if value_part is not None:
+            is_default, value_type, v = value_part
+        else:
+            is_default, value_type, v = False, None, None
+
+        return Step(
+            # for prefix
+            direction=direction,
+            is_abstract=is_abstract,
+            relationship_type=relationship_type,
+            is_readonly=is_readonly,
+            is_derived=is_derived,
+            is_end=is_end,
+            annotations=annotations,
+
+            # for declaration
+            is_all=is_all,
+            identification=identification,
+            specializations=specs,
+            multiplicity=multiplicity,
+            is_ordered=is_ordered,
+            is_nonunique=is_nonunique,
+            conjugation=conj,
+            relationships=relationships,
+
+            # for type - value
+            is_default=is_default,
+            value_type=value_type,
+            value=v,
+
+            # body part
+            body=type_body,
+        )
+
+    def function(self, children: list):
+        return self._classifier_like(children, type_cls=Function)
+
+    def function_body(self, children: list):
+        args = tuple(children)
+        if args:
+            return args[0]
+        else:
+            return []
+
+    def function_body_part(self, children: list):
+        return children
+
+    def return_feature_member(self, children: list):
+        visibility, feature = children
+        return Return(
+            visibility=visibility,
+            feature=feature,
+        )
+
+    def result_expression_member(self, children: list):
+        visibility, expression = children
+        return Result(
+            visibility=visibility,
+            expression=expression,
+        )
+
+    def expression(self, children: list):
+        prefix, declaration, value_part, body = children
+        direction, is_abstract, relationship_type, is_readonly, is_derived, is_end, annotations = prefix
+        is_all, identification, specs, (multiplicity, is_ordered, is_nonunique), conj, relationships = declaration
+        if value_part is not None:
+            is_default, value_type, v = value_part
+        else:
+            is_default, value_type, v = False, None, None
+
+        return Expression(
+            # for prefix
+            direction=direction,
+            is_abstract=is_abstract,
+            relationship_type=relationship_type,
+            is_readonly=is_readonly,
+            is_derived=is_derived,
+            is_end=is_end,
+            annotations=annotations,
+
+            # for declaration
+            is_all=is_all,
+            identification=identification,
+            specializations=specs,
+            multiplicity=multiplicity,
+            is_ordered=is_ordered,
+            is_nonunique=is_nonunique,
+            conjugation=conj,
+            relationships=relationships,
+
+            # for type - value
+            is_default=is_default,
+            value_type=value_type,
+            value=v,
+
+            # body part
+            body=body,
+        )
+
+    def predicate(self, children: list):
+        return self._classifier_like(children, type_cls=Predicate)
+
+    def boolean_expression(self, children: list):
+        prefix, declaration, value_part, body = children
+        direction, is_abstract, relationship_type, is_readonly, is_derived, is_end, annotations = prefix
+        is_all, identification, specs, (multiplicity, is_ordered, is_nonunique), conj, relationships = declaration
+        if value_part is not None:
+            is_default, value_type, v = value_part
+        else:
+            is_default, value_type, v = False, None, None
+
+        return BooleanExpression(
+            # for prefix
+            direction=direction,
+            is_abstract=is_abstract,
+            relationship_type=relationship_type,
+            is_readonly=is_readonly,
+            is_derived=is_derived,
+            is_end=is_end,
+            annotations=annotations,
+
+            # for declaration
+            is_all=is_all,
+            identification=identification,
+            specializations=specs,
+            multiplicity=multiplicity,
+            is_ordered=is_ordered,
+            is_nonunique=is_nonunique,
+            conjugation=conj,
+            relationships=relationships,
+
+            # for type - value
+            is_default=is_default,
+            value_type=value_type,
+            value=v,
+
+            # body part
+            body=body,
+        )
+
+    def invariant(self, children: list):
+        prefix, invariant_bool, declaration, value_part, body = children
+        direction, is_abstract, relationship_type, is_readonly, is_derived, is_end, annotations = prefix
+        if invariant_bool is None:
+            invariant_bool = True
+        if declaration:
+            is_all, identification, specs, (multiplicity, is_ordered, is_nonunique), conj, relationships = declaration
+        else:
+            is_all, identification, specs, (multiplicity, is_ordered, is_nonunique), conj, relationships = \
+                (False, None, [], (None, False, False), None, [])
+        if value_part is not None:
+            is_default, value_type, v = value_part
+        else:
+            is_default, value_type, v = False, None, None
+
+        return Invariant(
+            # for prefix
+            direction=direction,
+            is_abstract=is_abstract,
+            relationship_type=relationship_type,
+            is_readonly=is_readonly,
+            is_derived=is_derived,
+            is_end=is_end,
+            annotations=annotations,
+
+            asserted=invariant_bool,
+
+            # for declaration
+            is_all=is_all,
+            identification=identification,
+            specializations=specs,
+            multiplicity=multiplicity,
+            is_ordered=is_ordered,
+            is_nonunique=is_nonunique,
+            conjugation=conj,
+            relationships=relationships,
+
+            # for type - value
+            is_default=is_default,
+            value_type=value_type,
+            value=v,
+
+            # body part
+            body=body,
+        )
+
+    def invariant_bool(self, children: list):
+        token, = children
+        return json.loads(token.value)
+
+    def conditional_expression(self, children: list):
+        condition_element, true_element, false_element = children
+        return IfTestOp(
+            condition=condition_element,
+            if_true=true_element,
+            if_false=false_element,
+        )
+
+    def conditional_binary_l14_operator_expression(self, children: list):
+        x, op, y = children
+        return CondBinOp(op=op, x=x, y=y)
+
+    def conditional_binary_l14_operator(self, children: list):
+        op_token, = children
+        return op_token.value
+
+    def conditional_binary_l13_operator_expression(self, children: list):
+        x, op, y = children
+        return CondBinOp(op=op, x=x, y=y)
+
+    def conditional_binary_l13_operator(self, children: list):
+        op_token, = children
+        return op_token.value
+
+    def conditional_binary_l12_operator_expression(self, children: list):
+        x, op, y = children
+        return CondBinOp(op=op, x=x, y=y)
+
+    def conditional_binary_l12_operator(self, children: list):
+        op_token, = children
+        return op_token.value
+
+    def binary_l12_operator_expression(self, children: list):
+        x, op, y = children
+        return BinOp(op=op, x=x, y=y)
+
+    def binary_l12_operator(self, children: list):
+        op_token, = children
+        return op_token.value
+
+    def binary_l11_operator_expression(self, children: list):
+        x, op, y = children
+        return BinOp(op=op, x=x, y=y)
+
+    def binary_l11_operator(self, children: list):
+        op_token, = children
+        return op_token.value
+
+    def conditional_binary_l10_operator_expression(self, children: list):
+        x, op, y = children
+        return CondBinOp(op=op, x=x, y=y)
+
+    def conditional_binary_l10_operator(self, children: list):
+        op_token, = children
+        return op_token.value
+
+    def binary_l10_operator_expression(self, children: list):
+        x, op, y = children
+        return BinOp(op=op, x=x, y=y)
+
+    def binary_l10_operator(self, children: list):
+        op_token, = children
+        return op_token.value
+
+    def binary_l9_operator_expression(self, children: list):
+        x, op, y = children
+        return BinOp(op=op, x=x, y=y)
+
+    def binary_l9_operator(self, children: list):
+        op_token, = children
+        return op_token.value
+
+    def classification_expression(self, children: list):
+        x, op, y = children
+        if op == 'as':
+            return ClsCastOp(x=x, y=y)
+        else:
+            return ClsTestOp(op=op, x=x, y=y)
+
+    def classification_test_operator(self, children: list):
+        op_token, = children
+        return op_token.value
+
+    def cast_operator(self, children: list):
+        op_token, = children
+        return op_token.value
+
+    def metaclassification_expression(self, children: list):
+        x, op, y = children
+        if op == 'meta':
+            return MetaClsCastOp(x=x, y=y)
+        else:
+            return MetaClsTestOp(op=op, x=x, y=y)
+
+    def meta_classification_test_operator(self, children: list):
+        op_token, = children
+        return op_token.value
+
+    def meta_cast_operator(self, children: list):
+        op_token, = children
+        return op_token.value
+
+    def binary_l7_operator_expression(self, children: list):
+        x, op, y = children
+        return BinOp(op=op, x=x, y=y)
+
+    def binary_l7_operator(self, children: list):
+        op_token, = children
+        return op_token.value
+
+    def binary_l6_operator_expression(self, children: list):
+        x, op, y = children
+        return BinOp(op=op, x=x, y=y)
+
+    def binary_l6_operator(self, children: list):
+        op_token, = children
+        return op_token.value
+
+    def binary_l5_operator_expression(self, children: list):
+        x, op, y = children
+        return BinOp(op=op, x=x, y=y)
+
+    def binary_l5_operator(self, children: list):
+        op_token, = children
+        return op_token.value
+
+    def binary_l4_operator_expression(self, children: list):
+        x, op, y = children
+        return BinOp(op=op, x=x, y=y)
+
+    def binary_l4_operator(self, children: list):
+        op_token, = children
+        return op_token.value
+
+    def exp_operator_expression(self, children: list):
+        x, op, y = children
+        return BinOp(op='^', x=x, y=y)
+
+    def unary_operator_expression(self, children: list):
+        op, element = children
+        return UnaryOp(op=op, x=element)
+
+    def unary_operator(self, children: list):
+        op_token, = children
+        return op_token.value
+
+    def extent_expression(self, children: list):
+        element, = children
+        return ExtentOp(x=element)
+
+    def bracket_expression(self, children: list):
+        return Tree('bracket_expression', children)
+
+    def index_expression(self, children: list):
+        entity, sequence = children
+        return IndexExpression(
+            entity=entity,
+            sequence=sequence
+        )
+
+    def sequence_expression(self, children: list):
+        sequence, = children
+        return SequenceExpression(sequence=sequence)
+
+    def sequence_operator_expression(self, children: list):
+        exp1, exps = children
+        return [exp1, *exps]
+
+    def feature_chain_expression(self, children: list):
+        entity, member = children
+        return FeatureChainExpression(
+            entity=entity,
+            member=member,
+        )
+
+    def collect_expression(self, children: list):
+        entity, body = children
+        return CollectExpression(
+            entity=entity,
+            body=body,
+        )
+
+    def select_expression(self, children: list):
+        entity, body = children
+        return SelectExpression(
+            entity=entity,
+            body=body,
+        )
+
+    def null_expression(self, children: list):
+        return NullValue()
+
+    def metadata_access_expression(self, children: list):
+        assert len(children) == 1
+        return MetadataAccessExpression(children[0])
+
+    def invocation_expression(self, children: list):
+        assert len(children) == 2
+        return InvocationExpression(
+            name=children[0],
+            arguments=children[1],
+        )
+
+    def argument_list(self, children: list):
+        if children:
+            return children[0]
+        else:
+            return []
+
+    def positional_argument_list(self, children: list):
+        return children
+
+    def named_argument_list(self, children: list):
+        return children
+
+    def named_argument(self, children: list):
+        assert len(children) == 2
+        return NamedArgument(name=children[0], value=children[1])
+
+    def body_expression(self, children: list):
+        body, = children
+        return BodyExpression(body=body)
+
+    def expression_body(self, children: list):
+        body, = children
+        return body
+
+    def literal_boolean(self, children: list):
+        assert len(children) == 1
+        token: Token = children[0]
+        return BoolValue(token.value)
+
+    def literal_string(self, children: list):
+        assert len(children) == 1
+        token: Token = children[0]
+        return StringValue(token.value)
+
+    def literal_integer(self, children: list):
+        assert len(children) == 1
+        token: Token = children[0]
+        return IntValue(token.value)
+
+    def literal_real(self, children: list):
+        assert len(children) == 1
+        token: Token = children[0]
+        return RealValue(token.value)
+
+    def literal_infinity(self, children: list):
+        return InfValue()
+
+    def interaction(self, children: list):
+        return self._classifier_like(children, type_cls=Interaction)
+
+    def item_flow(self, children: list):
+        prefix, item_flow_declaration, type_body = children
+        return self._item_flow_like(prefix, item_flow_declaration, type_body, type_cls=ItemFlow)
+
+    def succession_item_flow(self, children: list):
+        prefix, item_flow_declaration, type_body = children
+        return self._item_flow_like(prefix, item_flow_declaration, type_body, type_cls=SuccessionItemFlow)
+
+    def item_feature_specialization_part(self, children: list):
+        items = []
+        multiplicity, is_ordered, is_nonunique = None, False, False
+        for item in children:
+            if isinstance(item, tuple):
+                multiplicity, is_ordered, is_nonunique = item
+            else:
+                items.append(item)
+
+        return items, multiplicity, is_ordered, is_nonunique
+
+    def item_flow_end(self, children: list):
+        owned, member = children
+        return ItemFlowEnd(
+            owned=owned,
+            member=member,
+        )
+
+    def feature_value(self, children: list):
+        assert len(children) == 2
+        is_default, value_type = children[0]
+        return is_default, value_type, children[1]
+
+    def multiplicity_subset(self, children: list):
+        identification, superset, type_body = children
+        return MultiplicitySubset(
+            identification=identification,
+            superset=superset,
+            body=type_body,
+        )
+
+    def multiplicity_range(self, children: list):
+        identification, multiplicity, type_body = children
+        return MultiplicityRange(
+            identification=identification,
+            multiplicity=multiplicity,
+            body=type_body,
+        )
+
+    def multiplicity_bounds(self, children: list):
+        assert len(children) == 2
+        return MultiplicityBounds(
+            lower_bound=children[0],
+            upper_bound=children[1],
+        )
+
+    def metaclass(self, children: list):
+        return self._classifier_like(children, type_cls=Metaclass)
+
+    def prefix_metadata_annotation(self, children: list):
+        assert len(children) == 1
+        return PrefixMetadataAnnotation(children[0])
+
+    def prefix_metadata_member(self, children: list):
+        assert len(children) == 1
+        return PrefixMetadataAnnotation(children[0])
+
+    def metadata_feature(self, children: list):
+        annotations: typing.List[PrefixMetadataAnnotation] = children[:-3]
+        identification, superclass = children[-3]
+        about = children[-2] or []
+        body = children[-1]
+        return Metadata(
+            annotations=annotations,
+            identification=identification,
+            superclass=superclass,
+            about=about,
+            body=body,
+        )
+
+    def metadata_feature_about(self, children: list):
+        return children
+
+    def metadata_feature_declaration(self, children: list):
+        identification, feature_typing = children
+        return identification, feature_typing
+
+    def metadata_body(self, children: list):
+        return children
+
+    def metadata_body_feature(self, children: list):
+        owned_redefinition, feature_specialization_part, value_part, metadata_body = children
+        if feature_specialization_part:
+            specs, multiplicity, is_ordered, is_nonunique = feature_specialization_part
+        else:
+            specs, multiplicity, is_ordered, is_nonunique = [], None, False, False
+        if value_part is not None:
+            is_default, value_type, v = value_part
+        else:
+            is_default, value_type, v = False, None, None
+
+        return MetadataRedefine(
+            name=owned_redefinition,
+
+            specializations=specs,
+            multiplicity=multiplicity,
+            is_ordered=is_ordered,
+            is_nonunique=is_nonunique,
+
+            is_default=is_default,
+            value_type=value_type,
+            value=v,
+
+            body=metadata_body,
+        )
+
+    def package(self, children: list):
+        annotations = children[:-2]
+        identification = children[-2]
+        body = children[-1]
+
+        return Package(
+            annotations=annotations,
+            identification=identification,
+            body=body,
+        )
+
+    def library_package(self, children: list):
+        standard_token = children[0]
+        annotations = children[1:-2]
+        identification = children[-2]
+        body = children[-1]
+
+        return LibraryPackage(
+            is_standard=bool(standard_token),
+            annotations=annotations,
+            identification=identification,
+            body=body,
+        )
+
+    def package_declaration(self, children: list):
+        identification, = children
+        return identification
+
+    def package_body(self, children: list):
+        return children
+
+    def element_filter_member(self, children: list):
+        visibility, expression = children
+        return ElementFilter(
+            visibility=visibility,
+            expression=expression,
+        )
@@ -1,7 +1,7 @@
-from lark import Transformer, v_args, Tree
+from lark import Transformer_NonRecursive, v_args, Tree
 
 
-class KerMLTransTemplate(Transformer):
+class KerMLTransTemplate(Transformer_NonRecursive):
     @v_args(tree=True)
     def explicit_identification_with_short(self, tree: Tree):
         return tree
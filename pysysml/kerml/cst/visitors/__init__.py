@@ -0,0 +1,2 @@
+from .base import walk, CSTVisitor, CSTTransformer
+from .fields import CST_NODE_FIELDS, CST_NODE_METHODS
@@ -0,0 +1,208 @@
+"""
+Iterative walker, visitor and transformer of the KerML CST objects.
+
+The traversals use explicit stacks instead of recursion, so the CSTs of any depth (such as
+long chains of binary operators or deeply nested packages) can be processed without raising
+the recursion limit. Only the fields which may contain CST nodes are scanned (see
+:data:`CST_NODE_FIELDS`, generated by ``tools/kerml/generate.py``), and the visiting methods
+are dispatched with a per-class table, so no method is looked up by name for each node.
+"""
+
+import dataclasses
+import operator
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .fields import CST_NODE_FIELDS, CST_NODE_METHODS
+
+_CONTAINER = ('<container>',)  # lists and tuples, their items are scanned but they are not nodes
+_UNKNOWN = ('<unknown>',)
+_NODE_FIELDS: Dict[type, Optional[Tuple[str, ...]]] = {
+    **CST_NODE_FIELDS,
+    list: _CONTAINER, tuple: _CONTAINER,
+    type(None): None, str: None, bool: None,
+}
+
+
+def _node_fields(cls: type) -> Optional[Tuple[str, ...]]:
+    try:
+        return _NODE_FIELDS[cls]
+    except KeyError:
+        if issubclass(cls, (list, tuple)):
+            fields = _CONTAINER
+        elif dataclasses.is_dataclass(cls):
+            # classes not in the generated table, all the fields are scanned
+            fields = tuple(field.name for field in dataclasses.fields(cls) if field.init)
+        else:
+            fields = None
+        _NODE_FIELDS[cls] = fields
+        return fields
+
+
+class _Expanded:
+    # marker of the node whose children are already pushed into the stack
+    __slots__ = ('value', 'fields', 'items')
+
+    def __init__(self, value: Any, fields: Tuple[str, ...], items: Optional[List[Any]]):
+        self.value = value
+        self.fields = fields
+        self.items = items
+
+
+def walk(node: Any, topdown: bool = True) -> Iterator[Any]:
+    """
+    Iterate over the CST nodes (the model objects) in the tree, including the given node.
+    Lists and tuples are not yielded, but their items are.
+
+    :param node: Root of the tree, a model object, or a list or tuple of them.
+    :param topdown: Yield the parent nodes before their children (pre-order) if ``True``,
+        otherwise after them (post-order). Default is ``True``. The children are yielded in
+        the order of the fields. When ``topdown`` is ``True``, the fields of a node are read
+        after it is yielded, so its children can be replaced before they are walked.
+    :type topdown: bool
+
+    :return: Iterator of the CST nodes.
+    """
+    get_fields = _NODE_FIELDS.get
+    stack: List[Any] = [node]
+    pop = stack.pop
+    while stack:
+        value = pop()
+        if type(value) is _Expanded:
+            yield value.value
+            continue
+
+        fields = get_fields(type(value), _UNKNOWN)
+        if fields is _UNKNOWN:
+            fields = _node_fields(type(value))
+        if fields is None:
+            continue
+        elif fields is _CONTAINER:
+            stack.extend(reversed(value))
+        elif topdown:
+            yield value
+            stack.extend([getattr(value, name) for name in reversed(fields)])
+        else:
+            stack.append(_Expanded(value, fields, None))
+            stack.extend([getattr(value, name) for name in reversed(fields)])
+
+
+class _Handlers(dict):
+    # node class -> bound visiting method, resolved on the first node of each class
+    def __init__(self, visitor: Any):
+        dict.__init__(self)
+        self._visitor = visitor
+
+    def __missing__(self, cls: type) -> Callable[[Any], Any]:
+        handler = None
+        for base in cls.__mro__:
+            name = CST_NODE_METHODS.get(base)
+            if name is not None:
+                handler = getattr(self._visitor, name, None)
+                if handler is not None:
+                    break
+        if handler is None:
+            handler = self._visitor.__default__
+        self[cls] = handler
+        return handler
+
+
+class CSTVisitor:
+    """
+    Visitor of the CST nodes, the tree is not changed.
+
+    The visiting method of a node is named after its class in snake case (such as ``bin_op``
+    for :class:`pysysml.kerml.cst.models.BinOp`, with a trailing ``_`` for Python keywords,
+    such as ``class_`` and ``import_``, see :data:`CST_NODE_METHODS`). When the method of the
+    class is not defined, the method of its nearest base class is used, and :meth:`__default__`
+    is used for the classes without any method.
+    """
+
+    def visit(self, node: Any) -> Any:
+        """
+        Visit the nodes bottom-up, the children are visited before their parents.
+
+        :param node: Root of the tree.
+
+        :return: The given root.
+        """
+        handlers = _Handlers(self)
+        for item in walk(node, topdown=False):
+            handlers[type(item)](item)
+        return node
+
+    def visit_topdown(self, node: Any) -> Any:
+        """
+        Visit the nodes top-down, the parents are visited before their children.
+
+        :param node: Root of the tree.
+
+        :return: The given root.
+        """
+        handlers = _Handlers(self)
+        for item in walk(node, topdown=True):
+            handlers[type(item)](item)
+        return node
+
+    def __default__(self, node: Any):
+        """
+        Visiting method of the nodes without their own method, does nothing by default.
+        """
+        pass
+
+
+class CSTTransformer:
+    """
+    Transformer of the CST nodes, which builds a new tree bottom-up.
+
+    The visiting methods are named and dispatched in the same way as :class:`CSTVisitor`.
+    Each method is called with the node whose children are already transformed, and its
+    return value replaces the node in the new tree. The nodes (and lists) whose children are
+    not changed are not copied, so the unchanged subtrees are shared with the original tree.
+    """
+
+    def transform(self, node: Any) -> Any:
+        """
+        Transform the tree.
+
+        :param node: Root of the tree, a model object, or a list or tuple of them.
+
+        :return: The transformed tree.
+        """
+        handlers = _Handlers(self)
+        get_fields = _NODE_FIELDS.get
+        results = []
+        stack: List[Any] = [node]
+        pop = stack.pop
+        while stack:
+            value = pop()
+            if type(value) is _Expanded:
+                value, fields, items = value.value, value.fields, value.items
+                new_items = results[len(results) - len(items):]
+                del results[len(results) - len(items):]
+                changed = any(map(operator.is_not, new_items, items))
+                if fields is _CONTAINER:
+                    results.append(type(value)(new_items) if changed else value)
+                else:
+                    if changed:
+                        value = dataclasses.replace(value, **dict(zip(fields, new_items)))
+                    results.append(handlers[type(value)](value))
+                continue
+
+            fields = get_fields(type(value), _UNKNOWN)
+            if fields is _UNKNOWN:
+                fields = _node_fields(type(value))
+            if fields is None:
+                results.append(value)
+            else:
+                # the original items are kept, to find out the changed ones
+                items = list(value) if fields is _CONTAINER else [getattr(value, name) for name in fields]
+                stack.append(_Expanded(value, fields, items))
+                stack.extend(reversed(items))
+
+        return results[0]
+
+    def __default__(self, node: Any) -> Any:
+        """
+        Visiting method of the nodes without their own method, returns the node as it is.
+        """
+        return node
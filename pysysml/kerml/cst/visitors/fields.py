@@ -0,0 +1,284 @@
+from typing import Dict, Tuple
+
+from ..models import Alias, Association, AssociationStruct, Behavior, BinOp, BindingConnector, BodyExpression, \
+    BoolValue, BooleanExpression, ChainingPart, Class, Classifier, ClsCastOp, ClsTestOp, CollectExpression, Comment, \
+    CondBinOp, Conjugation, ConjugationPart, Connector, ConnectorEnd, DataType, Dependency, DifferencingPart, \
+    Disjoining, DisjoiningPart, Documentation, ElementFilter, Expression, ExtentOp, Feature, FeatureChain, \
+    FeatureChainExpression, FeatureInverting, FeatureTyping, Function, FunctionOperationExpression, GenericFeature, \
+    Identification, IfTestOp, Import, IndexExpression, InfValue, IntValue, Interaction, IntersectingPart, Invariant, \
+    InvertingPart, InvocationExpression, ItemFeature, ItemFlow, ItemFlowEnd, LibraryPackage, MetaClsCastOp, \
+    MetaClsTestOp, Metaclass, Metadata, MetadataAccessExpression, MetadataRedefine, MultiplicityBounds, \
+    MultiplicityRange, MultiplicitySubset, NamedArgument, Namespace, NamespaceFeatureMember, NonFeatureMember, \
+    NullValue, OwnedFeatureMember, Package, Predicate, PrefixMetadataAnnotation, QualifiedName, RealValue, \
+    Redefinition, RedefinitionsPart, ReferencesPart, RelationshipBody, Result, Return, RootNamespace, \
+    SelectExpression, SequenceExpression, Specialization, SpecializationPart, Step, StringValue, Struct, \
+    Subclassification, Subsetting, SubsettingsPart, Succession, SuccessionItemFlow, SuperclassingPart, \
+    TextualRepresentation, Type, TypeFeatureMember, TypeFeaturing, TypeFeaturingPart, TypingsPart, UnaryOp, \
+    UnioningPart
+
+# fields which may contain CST nodes, the fields of strings, booleans and enums are excluded
+CST_NODE_FIELDS: Dict[type, Tuple[str, ...]] = {
+    Alias: ('identification', 'name', 'body'),
+    Association: (
+        'annotations', 'identification', 'multiplicity_bounds', 'conjugation', 'superclassing', 'relationships', 'body',
+    ),
+    AssociationStruct: (
+        'annotations', 'identification', 'multiplicity_bounds', 'conjugation', 'superclassing', 'relationships', 'body',
+    ),
+    Behavior: (
+        'annotations', 'identification', 'multiplicity_bounds', 'conjugation', 'superclassing', 'relationships', 'body',
+    ),
+    BinOp: ('x', 'y'),
+    BindingConnector: (
+        'annotations', 'identification', 'specializations', 'multiplicity', 'conjugation', 'relationships', 'body',
+        'bind_entity', 'bind_to',
+    ),
+    BodyExpression: ('body',),
+    BoolValue: (),
+    BooleanExpression: (
+        'annotations', 'identification', 'specializations', 'multiplicity', 'conjugation', 'relationships', 'body',
+        'value',
+    ),
+    ChainingPart: ('item',),
+    Class: (
+        'annotations', 'identification', 'multiplicity_bounds', 'conjugation', 'superclassing', 'relationships', 'body',
+    ),
+    Classifier: (
+        'annotations', 'identification', 'multiplicity_bounds', 'conjugation', 'superclassing', 'relationships', 'body',
+    ),
+    ClsCastOp: ('x', 'y'),
+    ClsTestOp: ('x', 'y'),
+    CollectExpression: ('entity', 'body'),
+    Comment: ('identification', 'about_list'),
+    CondBinOp: ('x', 'y'),
+    Conjugation: ('identification', 'conjugate_type', 'conjugated_type', 'body'),
+    ConjugationPart: ('item',),
+    Connector: (
+        'annotations', 'identification', 'specializations', 'multiplicity', 'conjugation', 'relationships', 'body',
+        'value', 'ends',
+    ),
+    ConnectorEnd: ('reference', 'multiplicity'),
+    DataType: (
+        'annotations', 'identification', 'multiplicity_bounds', 'conjugation', 'superclassing', 'relationships', 'body',
+    ),
+    Dependency: ('annotations', 'identification', 'from_list', 'to_list', 'body'),
+    DifferencingPart: ('items',),
+    Disjoining: ('identification', 'disjoint_type', 'separated_type', 'body'),
+    DisjoiningPart: ('items',),
+    Documentation: ('identification',),
+    ElementFilter: ('expression',),
+    Expression: (
+        'annotations', 'identification', 'specializations', 'multiplicity', 'conjugation', 'relationships', 'body',
+        'value',
+    ),
+    ExtentOp: ('x',),
+    Feature: (
+        'annotations', 'identification', 'specializations', 'multiplicity', 'conjugation', 'relationships', 'body',
+        'value',
+    ),
+    FeatureChain: ('items',),
+    FeatureChainExpression: ('entity', 'member'),
+    FeatureInverting: ('identification', 'inverted', 'target', 'body'),
+    FeatureTyping: ('identification', 'typed_entity', 'typing_type', 'body'),
+    Function: (
+        'annotations', 'identification', 'multiplicity_bounds', 'conjugation', 'superclassing', 'relationships', 'body',
+    ),
+    FunctionOperationExpression: ('entity', 'name', 'arguments'),
+    GenericFeature: (
+        'annotations', 'identification', 'specializations', 'multiplicity', 'conjugation', 'relationships', 'body',
+    ),
+    Identification: (),
+    IfTestOp: ('condition', 'if_true', 'if_false'),
+    Import: ('name', 'filters', 'body'),
+    IndexExpression: ('entity', 'sequence'),
+    InfValue: (),
+    IntValue: (),
+    Interaction: (
+        'annotations', 'identification', 'multiplicity_bounds', 'conjugation', 'superclassing', 'relationships', 'body',
+    ),
+    IntersectingPart: ('items',),
+    Invariant: (
+        'annotations', 'identification', 'specializations', 'multiplicity', 'conjugation', 'relationships', 'body',
+        'value',
+    ),
+    InvertingPart: ('item',),
+    InvocationExpression: ('name', 'arguments'),
+    ItemFeature: ('identification', 'specializations', 'multiplicity', 'feature_typing', 'value'),
+    ItemFlow: (
+        'annotations', 'identification', 'specializations', 'multiplicity', 'conjugation', 'relationships', 'body',
+        'value', 'end_from', 'end_to', 'item_feature',
+    ),
+    ItemFlowEnd: ('owned', 'member'),
+    LibraryPackage: ('annotations', 'identification', 'body'),
+    MetaClsCastOp: ('x', 'y'),
+    MetaClsTestOp: ('x', 'y'),
+    Metaclass: (
+        'annotations', 'identification', 'multiplicity_bounds', 'conjugation', 'superclassing', 'relationships', 'body',
+    ),
+    Metadata: ('annotations', 'identification', 'superclass', 'about', 'body'),
+    MetadataAccessExpression: ('qualified_name',),
+    MetadataRedefine: ('name', 'specializations', 'multiplicity', 'value', 'body'),
+    MultiplicityBounds: ('lower_bound', 'upper_bound'),
+    MultiplicityRange: ('identification', 'multiplicity', 'body'),
+    MultiplicitySubset: ('identification', 'superset', 'body'),
+    NamedArgument: ('name', 'value'),
+    Namespace: ('annotations', 'identification', 'body'),
+    NamespaceFeatureMember: ('element',),
+    NonFeatureMember: ('element',),
+    NullValue: (),
+    OwnedFeatureMember: ('element',),
+    Package: ('annotations', 'identification', 'body'),
+    Predicate: (
+        'annotations', 'identification', 'multiplicity_bounds', 'conjugation', 'superclassing', 'relationships', 'body',
+    ),
+    PrefixMetadataAnnotation: ('feature',),
+    QualifiedName: (),
+    RealValue: (),
+    Redefinition: ('identification', 'entity', 'redefined_to', 'body'),
+    RedefinitionsPart: ('items',),
+    ReferencesPart: ('item',),
+    RelationshipBody: ('elements',),
+    Result: ('expression',),
+    Return: ('feature',),
+    RootNamespace: ('body',),
+    SelectExpression: ('entity', 'body'),
+    SequenceExpression: ('sequence',),
+    Specialization: ('identification', 'specific_type', 'general_type', 'body'),
+    SpecializationPart: ('items',),
+    Step: (
+        'annotations', 'identification', 'specializations', 'multiplicity', 'conjugation', 'relationships', 'body',
+        'value',
+    ),
+    StringValue: (),
+    Struct: (
+        'annotations', 'identification', 'multiplicity_bounds', 'conjugation', 'superclassing', 'relationships', 'body',
+    ),
+    Subclassification: ('identification', 'subclassifier', 'superclassifier', 'body'),
+    Subsetting: ('identification', 'subset', 'superset', 'body'),
+    SubsettingsPart: ('items',),
+    Succession: (
+        'annotations', 'identification', 'specializations', 'multiplicity', 'conjugation', 'relationships', 'body',
+        'first', 'then',
+    ),
+    SuccessionItemFlow: (
+        'annotations', 'identification', 'specializations', 'multiplicity', 'conjugation', 'relationships', 'body',
+        'value', 'end_from', 'end_to', 'item_feature',
+    ),
+    SuperclassingPart: ('items',),
+    TextualRepresentation: ('identification',),
+    Type: (
+        'annotations', 'identification', 'multiplicity_bounds', 'conjugation', 'specialization', 'relationships',
+        'body',
+    ),
+    TypeFeatureMember: ('element',),
+    TypeFeaturing: ('identification', 'featured_entity', 'feature_provider', 'body'),
+    TypeFeaturingPart: ('items',),
+    TypingsPart: ('items',),
+    UnaryOp: ('x',),
+    UnioningPart: ('items',),
+}
+
+# names of the visiting methods
+CST_NODE_METHODS: Dict[type, str] = {
+    Alias: 'alias',
+    Association: 'association',
+    AssociationStruct: 'association_struct',
+    Behavior: 'behavior',
+    BinOp: 'bin_op',
+    BindingConnector: 'binding_connector',
+    BodyExpression: 'body_expression',
+    BoolValue: 'bool_value',
+    BooleanExpression: 'boolean_expression',
+    ChainingPart: 'chaining_part',
+    Class: 'class_',
+    Classifier: 'classifier',
+    ClsCastOp: 'cls_cast_op',
+    ClsTestOp: 'cls_test_op',
+    CollectExpression: 'collect_expression',
+    Comment: 'comment',
+    CondBinOp: 'cond_bin_op',
+    Conjugation: 'conjugation',
+    ConjugationPart: 'conjugation_part',
+    Connector: 'connector',
+    ConnectorEnd: 'connector_end',
+    DataType: 'data_type',
+    Dependency: 'dependency',
+    DifferencingPart: 'differencing_part',
+    Disjoining: 'disjoining',
+    DisjoiningPart: 'disjoining_part',
+    Documentation: 'documentation',
+    ElementFilter: 'element_filter',
+    Expression: 'expression',
+    ExtentOp: 'extent_op',
+    Feature: 'feature',
+    FeatureChain: 'feature_chain',
+    FeatureChainExpression: 'feature_chain_expression',
+    FeatureInverting: 'feature_inverting',
+    FeatureTyping: 'feature_typing',
+    Function: 'function',
+    FunctionOperationExpression: 'function_operation_expression',
+    GenericFeature: 'generic_feature',
+    Identification: 'identification',
+    IfTestOp: 'if_test_op',
+    Import: 'import_',
+    IndexExpression: 'index_expression',
+    InfValue: 'inf_value',
+    IntValue: 'int_value',
+    Interaction: 'interaction',
+    IntersectingPart: 'intersecting_part',
+    Invariant: 'invariant',
+    InvertingPart: 'inverting_part',
+    InvocationExpression: 'invocation_expression',
+    ItemFeature: 'item_feature',
+    ItemFlow: 'item_flow',
+    ItemFlowEnd: 'item_flow_end',
+    LibraryPackage: 'library_package',
+    MetaClsCastOp: 'meta_cls_cast_op',
+    MetaClsTestOp: 'meta_cls_test_op',
+    Metaclass: 'metaclass',
+    Metadata: 'metadata',
+    MetadataAccessExpression: 'metadata_access_expression',
+    MetadataRedefine: 'metadata_redefine',
+    MultiplicityBounds: 'multiplicity_bounds',
+    MultiplicityRange: 'multiplicity_range',
+    MultiplicitySubset: 'multiplicity_subset',
+    NamedArgument: 'named_argument',
+    Namespace: 'namespace',
+    NamespaceFeatureMember: 'namespace_feature_member',
+    NonFeatureMember: 'non_feature_member',
+    NullValue: 'null_value',
+    OwnedFeatureMember: 'owned_feature_member',
+    Package: 'package',
+    Predicate: 'predicate',
+    PrefixMetadataAnnotation: 'prefix_metadata_annotation',
+    QualifiedName: 'qualified_name',
+    RealValue: 'real_value',
+    Redefinition: 'redefinition',
+    RedefinitionsPart: 'redefinitions_part',
+    ReferencesPart: 'references_part',
+    RelationshipBody: 'relationship_body',
+    Result: 'result',
+    Return: 'return_',
+    RootNamespace: 'root_namespace',
+    SelectExpression: 'select_expression',
+    SequenceExpression: 'sequence_expression',
+    Specialization: 'specialization',
+    SpecializationPart: 'specialization_part',
+    Step: 'step',
+    StringValue: 'string_value',
+    Struct: 'struct',
+    Subclassification: 'subclassification',
+    Subsetting: 'subsetting',
+    SubsettingsPart: 'subsettings_part',
+    Succession: 'succession',
+    SuccessionItemFlow: 'succession_item_flow',
+    SuperclassingPart: 'superclassing_part',
+    TextualRepresentation: 'textual_representation',
+    Type: 'type',
+    TypeFeatureMember: 'type_feature_member',
+    TypeFeaturing: 'type_featuring',
+    TypeFeaturingPart: 'type_featuring_part',
+    TypingsPart: 'typings_part',
+    UnaryOp: 'unary_op',
+    UnioningPart: 'unioning_part',
+}
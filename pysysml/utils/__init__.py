@@ -1,3 +1,5 @@
-from .hash import file_sha256
+from .hash import file_sha256, text_sha256
 from .health import file_health_check, FileHashNotMatchError, HashFileNotFoundError
-from .lark import list_rules_from_grammar
+from .lark import list_rules_from_grammar, override_grammar_definitions
+from .regex import words_regex
+from .slots import slots_dataclass
@@ -35,12 +35,30 @@ def _binary_file_sha256(file: str, chunk_size: int = 1 << 20) -> str:
     return file_sha.hexdigest()
 
 
+def text_sha256(data: bytes) -> str:
+    """
+    Calculate the SHA256 hash of the content of a text file, ignoring line wrapping.
+
+    A newline character is added after each line to standardize line endings, so the hash
+    is the same as :func:`file_sha256` of a text file with this content.
+
+    :param data: Content of the text file.
+    :type data: bytes
+
+    :return: Hexadecimal representation of the SHA256 hash.
+    :rtype: str
+    """
+    file_sha = hashlib.sha256()
+    for line in data.splitlines(keepends=False):
+        file_sha.update(line + b'\n')
+    return file_sha.hexdigest()
+
+
 def _text_file_sha256(file: str) -> str:
     """
     Calculate the SHA256 hash of a text file, ignoring line wrapping.
 
-    This function reads the file line by line, adding a newline character
-    after each line to standardize line endings.
+    See :func:`text_sha256` for the details.
 
     :param file: Path to the text file.
     :type file: str
@@ -48,11 +66,8 @@ def _text_file_sha256(file: str) -> str:
     :return: Hexadecimal representation of the SHA256 hash.
     :rtype: str
     """
-    file_sha = hashlib.sha256()
     with open(file, 'rb') as f:
-        for line in f.read().splitlines(keepends=False):
-            file_sha.update(line + b'\n')
-    return file_sha.hexdigest()
+        return text_sha256(f.read())
 
 
 def file_sha256(file: str, ignore_linewrap: bool = True) -> str:
@@ -1,5 +1,6 @@
 import os.path
-from typing import List, Dict
+import re
+from typing import List, Dict, Optional, Tuple
 
 import lark
 from lark import Visitor, Tree
@@ -62,3 +63,51 @@ def list_rules_from_grammar(grammar_code: str, show_inner: bool = False, show_co
             result.append(rule_name)
 
     return result
+
+
+_DEFINITION_PATTERN = re.compile(r'^[?!]?(?P<name>[A-Za-z_][A-Za-z\d_]*)(\.-?\d+)?\s*:')
+
+
+def _split_definitions(grammar_code: str) -> List[Tuple[Optional[str], List[str]]]:
+    blocks: List[Tuple[Optional[str], List[str]]] = []
+    for line in grammar_code.splitlines():
+        matching = _DEFINITION_PATTERN.match(line)
+        if matching:
+            blocks.append((matching.group('name'), [line]))
+        elif line[:1].isspace() and line.strip() and blocks and blocks[-1][0] is not None:
+            blocks[-1][1].append(line)
+        else:
+            blocks.append((None, [line]))
+    return blocks
+
+
+def override_grammar_definitions(grammar_code: str, override_code: str) -> str:
+    """
+    Replace the rule and terminal definitions in lark grammar code.
+
+    Each definition in ``override_code`` replaces the definition with the same name
+    (priority and ``?``/``!`` prefixes are ignored when matching) in ``grammar_code``,
+    the definitions which are not found in ``grammar_code`` are appended to the end.
+    The continuation lines of a definition should be indented.
+
+    :param grammar_code: Original grammar code.
+    :type grammar_code: str
+    :param override_code: Grammar code of the overriding definitions.
+    :type override_code: str
+
+    :return: Merged grammar code.
+    :rtype: str
+    """
+    overrides = {name: lines for name, lines in _split_definitions(override_code) if name is not None}
+    used_names = set()
+    result = []
+    for name, lines in _split_definitions(grammar_code):
+        if name is not None and name in overrides:
+            result.extend(overrides[name])
+            used_names.add(name)
+        else:
+            result.extend(lines)
+    for name, lines in overrides.items():
+        if name not in used_names:
+            result.extend(lines)
+    return '\n'.join(result) + '\n'
@@ -0,0 +1,45 @@
+"""
+This module provides utilities for building regular expressions.
+"""
+
+import re
+from typing import Iterable
+
+
+def words_regex(words: Iterable[str]) -> str:
+    """
+    Build a regular expression which matches any of the given words.
+
+    The words are merged into a prefix tree, so the expression does not try every word
+    one by one like a plain ``word1|word2|...`` alternation, which makes a great difference
+    when it is used in a lookahead at every position of a lexer.
+
+    :param words: Words to match, should not be empty.
+    :type words: Iterable[str]
+
+    :return: Regular expression, without anchors or word boundaries.
+    :rtype: str
+    """
+    trie = {}
+    for word in words:
+        if not word:
+            raise ValueError(f'Empty word is not supported, but {word!r} found.')
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+    if not trie:
+        raise ValueError('At least one word expected, but none found.')
+
+    def _build(node) -> str:
+        alternatives = [re.escape(ch) + _build(child) for ch, child in sorted(node.items()) if ch]
+        if not alternatives:
+            return ''
+        is_end = '' in node
+        if len(alternatives) == 1 and not (is_end and len(alternatives[0]) > 1):
+            body = alternatives[0]
+        else:
+            body = f'(?:{"|".join(alternatives)})'
+        return f'{body}?' if is_end else body
+
+    return _build(trie) if len(trie) > 1 else f'(?:{_build(trie)})'
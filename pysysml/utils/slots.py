@@ -0,0 +1,90 @@
+"""
+This module provides a dataclass decorator which adds ``__slots__`` to the classes.
+
+``dataclass(slots=True)`` is only available since python 3.10, so the same rebuilding of
+the class is done here for the older versions.
+"""
+
+import dataclasses
+from typing import Type, TypeVar, Optional
+
+_ClassType = TypeVar('_ClassType', bound=type)
+
+
+def _inherited_slots(cls: type) -> set:
+    slots = set()
+    for base in cls.__mro__[1:-1]:
+        base_slots = base.__dict__.get('__slots__', ())
+        slots.update((base_slots,) if isinstance(base_slots, str) else base_slots)
+    return slots
+
+
+def _frozen_setattr(self, name, value):
+    raise dataclasses.FrozenInstanceError(f'cannot assign to field {name!r}')
+
+
+def _frozen_delattr(self, name):
+    raise dataclasses.FrozenInstanceError(f'cannot delete field {name!r}')
+
+
+def _frozen_setstate(self, state):
+    # state of the objects with slots is a tuple of the dict (always None here) and the slots
+    for part in (state if isinstance(state, tuple) else (state,)):
+        for name, value in (part or {}).items():
+            object.__setattr__(self, name, value)
+
+
+def slots_dataclass(cls: Optional[Type[_ClassType]] = None, *, frozen: bool = False):
+    """
+    Create a dataclass with ``__slots__``, so its instances have no ``__dict__``.
+
+    The generated ``__init__``, ``__eq__`` and ``__repr__`` are the same as the ones of
+    ``@dataclass``. Only the fields which are not in the ``__slots__`` of the base classes
+    are added to ``__slots__`` of the new class, so the base classes should also be created
+    with this decorator (or have ``__slots__``) to get rid of ``__dict__``. The names in the
+    ``__slots__`` declared in the class body are kept as well, they are attributes but not
+    fields of the dataclass.
+
+    :param cls: Class to decorate, default values of the fields are not supported.
+    :type cls: type
+    :param frozen: Create a frozen dataclass, the same as ``@dataclass(frozen=True)``, so the
+        attributes can only be set with ``object.__setattr__`` (such as in ``__post_init__``).
+        Default is ``False``.
+    :type frozen: bool
+
+    :return: New dataclass with ``__slots__``, or the decorator when ``cls`` is not given.
+    :rtype: type
+
+    Examples::
+        >>> @slots_dataclass(frozen=True)
+        ... class Point:
+        ...     x: int
+        ...     y: int
+    """
+    if cls is None:
+        return lambda cls_: slots_dataclass(cls_, frozen=frozen)
+
+    declared = cls.__dict__.get('__slots__', ())
+    declared = (declared,) if isinstance(declared, str) else tuple(declared)
+    cls = dataclasses.dataclass(cls, frozen=frozen)
+    field_names = tuple(field.name for field in dataclasses.fields(cls))
+    inherited = _inherited_slots(cls)
+
+    cls_dict = dict(cls.__dict__)
+    for name in declared:
+        cls_dict.pop(name, None)  # descriptors of the declared slots are created again in the new class
+    cls_dict['__slots__'] = tuple(name for name in (*field_names, *declared) if name not in inherited)
+    for name in field_names:
+        if name in cls_dict:
+            raise TypeError(f'Default value of field {name!r} is not supported in slots dataclass {cls!r}.')
+    cls_dict.pop('__dict__', None)
+    cls_dict.pop('__weakref__', None)
+    if frozen:
+        # the generated ones refer to the class before rebuilding, which is not the class of the instances
+        cls_dict['__setattr__'] = _frozen_setattr
+        cls_dict['__delattr__'] = _frozen_delattr
+        cls_dict.setdefault('__setstate__', _frozen_setstate)
+
+    new_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    new_cls.__qualname__ = cls.__qualname__
+    return new_cls
@@ -0,0 +1,13 @@
+import os
+
+import pytest
+
+
+@pytest.fixture(scope='session', autouse=True)
+def _parser_cache(tmp_path_factory):
+    # the parsers are cached in a temporary directory, so the tests never write to the cache of the user,
+    # and they are built only once in the whole session
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv('PYSYSML_CACHE_DIR', str(tmp_path_factory.mktemp('pysysml-cache')))
+        monkeypatch.setenv('PYSYSML_PARSER_CACHE', '1')
+        yield os.environ['PYSYSML_CACHE_DIR']
@@ -0,0 +1,41 @@
+import os
+
+import pytest
+from hbutils.testing import simulate_entry
+
+from pysysml.entry import pysysmlcli
+from pysysml.kerml.cst import list_cached_parsers
+
+
+@pytest.fixture()
+def cache_dir(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / 'cache')
+    monkeypatch.setenv('PYSYSML_CACHE_DIR', cache_dir)
+    return cache_dir
+
+
+@pytest.mark.unittest
+class TestEntryCache:
+    def test_warm_and_clear(self, cache_dir):
+        result = simulate_entry(pysysmlcli, ['pysysml', 'cache', 'warm'])
+        assert result.exitcode == 0
+        assert len(list_cached_parsers()) == 1
+
+        result = simulate_entry(pysysmlcli, ['pysysml', 'cache', 'warm', '--force'])
+        assert result.exitcode == 0
+        assert len(list_cached_parsers()) == 1
+
+        result = simulate_entry(pysysmlcli, ['pysysml', 'cache', 'clear'])
+        assert result.exitcode == 0
+        assert '1 cached parser(s) removed' in result.stdout
+        assert list_cached_parsers() == []
+
+    @pytest.mark.parametrize(['value', 'expected'], [(None, '1'), ('0', '0')])
+    def test_parser_cache_enabled_by_cli(self, cache_dir, monkeypatch, value, expected):
+        if value is None:
+            monkeypatch.delenv('PYSYSML_PARSER_CACHE', raising=False)
+        else:
+            monkeypatch.setenv('PYSYSML_PARSER_CACHE', value)
+        result = simulate_entry(pysysmlcli, ['pysysml', 'cache', 'clear'])
+        assert result.exitcode == 0
+        assert os.environ['PYSYSML_PARSER_CACHE'] == expected
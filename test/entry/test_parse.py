@@ -0,0 +1,61 @@
+import pytest
+from hbutils.testing import simulate_entry
+
+from pysysml.entry import pysysmlcli
+
+
+@pytest.fixture()
+def kerml_dir(tmp_path):
+    (tmp_path / 'a.kerml').write_text('package A;\n')
+    (tmp_path / 'b.kerml').write_text('package B { feature x : A [1]; }\n')
+    return tmp_path
+
+
+@pytest.mark.unittest
+class TestEntryParse:
+    @pytest.mark.parametrize(['jobs'], [('1',), ('2',)])
+    def test_parse(self, kerml_dir, jobs):
+        result = simulate_entry(pysysmlcli, ['pysysml', 'parse', str(kerml_dir), '--jobs', jobs])
+        assert result.exitcode == 0
+        assert '2 file(s) parsed, 0 failed.' in result.stdout
+
+    def test_parse_failed(self, kerml_dir):
+        (kerml_dir / 'c.kerml').write_text('package C { feature }\n')
+        result = simulate_entry(pysysmlcli, ['pysysml', 'parse', str(kerml_dir), '-j', '2', '--unordered'])
+        assert result.exitcode != 0
+        assert '3 file(s) parsed, 1 failed.' in result.stdout
+        assert 'c.kerml' in result.stderr
+
+    def test_parse_recover(self, kerml_dir):
+        (kerml_dir / 'c.kerml').write_text('package C {\n  feature x : ;\n  feature }\n')
+        result = simulate_entry(pysysmlcli, ['pysysml', 'parse', str(kerml_dir), '-j', '1', '--recover'])
+        assert result.exitcode != 0
+        assert '3 file(s) parsed, 1 failed.' in result.stdout
+        assert '2 syntax error(s)' in result.stderr
+        assert 'c.kerml:2:15: ' in result.stderr
+        assert 'c.kerml:3:11: ' in result.stderr
+
+    def test_parse_cache(self, kerml_dir, tmp_path, monkeypatch):
+        from pysysml.kerml.cst import cstcache
+        monkeypatch.setattr(cstcache, '_DEFAULT_CACHE', cstcache.KerMLCstCache(str(tmp_path / 'cst')))
+        result = simulate_entry(pysysmlcli, ['pysysml', 'parse', str(kerml_dir), '-j', '1', '--cache'])
+        assert result.exitcode == 0
+        assert '0 file(s) loaded from cache.' in result.stdout
+        result = simulate_entry(pysysmlcli, ['pysysml', 'parse', str(kerml_dir), '-j', '1', '--cache'])
+        assert result.exitcode == 0
+        assert '2 file(s) loaded from cache.' in result.stdout
+
+    @pytest.mark.parametrize(['jobs'], [('1',), ('2',)])
+    def test_parse_coverage(self, kerml_dir, jobs):
+        result = simulate_entry(pysysmlcli, ['pysysml', 'parse', str(kerml_dir), '-j', jobs, '--coverage'])
+        assert result.exitcode == 0
+        assert 'Grammar coverage: ' in result.stdout
+        assert '/200 rule(s) (' in result.stdout
+
+    def test_parse_coverage_recover(self, kerml_dir):
+        result = simulate_entry(pysysmlcli, ['pysysml', 'parse', str(kerml_dir), '--coverage', '--recover'])
+        assert result.exitcode != 0
+
+    def test_parse_invalid_jobs(self, kerml_dir):
+        result = simulate_entry(pysysmlcli, ['pysysml', 'parse', str(kerml_dir), '-j', '0'])
+        assert result.exitcode != 0
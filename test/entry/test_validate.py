@@ -0,0 +1,70 @@
+import pytest
+from hbutils.testing import simulate_entry
+
+from pysysml.entry import pysysmlcli
+from pysysml.kerml.ast import Env, Namespace, OwningMembership, Dependency, save_env
+
+
+@pytest.fixture()
+def snapshot(tmp_path):
+    env = Env()
+    root = Namespace(env)
+    for name in ['A', 'B', 'C']:
+        namespace = Namespace(env, declared_name=name)
+        membership = OwningMembership(env, owning_related_element=root, owned_related_elements=[namespace],
+                                      member_elements=[namespace])
+        membership.sources.add(root)
+    file = tmp_path / 'model.snapshot'
+    save_env(env, file)
+    return env, file
+
+
+@pytest.mark.unittest
+class TestEntryValidate:
+    @pytest.mark.parametrize(['jobs'], [('1',), ('2',)])
+    def test_validate(self, snapshot, jobs):
+        env, file = snapshot
+        result = simulate_entry(pysysmlcli, ['pysysml', 'validate', str(file), '--jobs', jobs])
+        assert result.exitcode == 0
+        assert f'{len(env)} element(s) validated in ' in result.stdout
+        assert '0 violation(s).' in result.stdout
+
+    @pytest.mark.parametrize(['jobs'], [('1',), ('2',)])
+    def test_validate_failed(self, snapshot, jobs):
+        env, file = snapshot
+        dependency = Dependency(env, clients=[], suppliers=[])
+        save_env(env, file)
+        result = simulate_entry(pysysmlcli, ['pysysml', 'validate', str(file), '-j', jobs])
+        assert result.exitcode != 0
+        assert '2 violation(s).' in result.stdout
+        assert f'{dependency.element_id!r} num_of_clients: ' in result.stderr
+        assert result.stderr.index('num_of_clients') < result.stderr.index('num_of_suppliers')
+
+    def test_validate_empty(self, tmp_path):
+        file = tmp_path / 'empty.snapshot'
+        save_env(Env(), file)
+        result = simulate_entry(pysysmlcli, ['pysysml', 'validate', str(file)])
+        assert result.exitcode == 0
+        assert '0 element(s) validated in ' in result.stdout
+        assert '0 violation(s).' in result.stdout
+
+    def test_validate_invalid(self, tmp_path):
+        file = tmp_path / 'invalid.snapshot'
+        file.write_bytes(b'invalid')
+        result = simulate_entry(pysysmlcli, ['pysysml', 'validate', str(file)])
+        assert result.exitcode != 0
+        assert 'Invalid snapshot' in result.stderr
+
+    def test_validate_corrupted(self, snapshot):
+        _, file = snapshot
+        data = file.read_bytes()
+        file.write_bytes(data[:len(data) // 2])
+        result = simulate_entry(pysysmlcli, ['pysysml', 'validate', str(file)])
+        assert result.exitcode != 0
+        assert 'Invalid snapshot' in result.stderr
+        assert 'Unexpected error' not in result.stderr
+
+    def test_validate_invalid_jobs(self, snapshot):
+        _, file = snapshot
+        result = simulate_entry(pysysmlcli, ['pysysml', 'validate', str(file), '-j', '0'])
+        assert result.exitcode != 0
@@ -45,8 +45,9 @@ def element3(env):
 class TestKerMLAstRootBaseElement:
     def test_simple_element1(self, element1, env):
         assert element1.env is env
-        assert element1.element_id is not None
-        assert is_valid_uuid4(element1.element_id)
+        assert isinstance(element1.element_id, int)
+        assert is_valid_uuid4(element1.export_id)
+        assert element1.export_id == env.export_id(element1)
         assert element1.name == 'this_is_name'
         assert element1.declared_name == 'this_is_name'
         assert element1.short_name == '+-*/\''
@@ -58,6 +59,7 @@ class TestKerMLAstRootBaseElement:
     def test_simple_element2(self, element2, env):
         assert element2.env is env
         assert element2.element_id == 'element_2'
+        assert element2.export_id == 'element_2'
         assert element2.name is None
         assert element2.declared_name is None
         assert element2.short_name == '+'
@@ -68,8 +70,9 @@ class TestKerMLAstRootBaseElement:
 
     def test_simple_element3(self, element3, env):
         assert element3.env is env
-        assert element3.element_id is not None
-        assert is_valid_uuid4(element3.element_id)
+        assert isinstance(element3.element_id, int)
+        assert is_valid_uuid4(element3.export_id)
+        assert element3.export_id == env.export_id(element3)
         assert element3.name is None
         assert element3.declared_name is None
         assert element3.short_name is None
@@ -206,3 +209,171 @@ class TestKerMLAstRootBaseRelationship:
         assert r2.related_elements == [e1, e2, e3]
         assert r2.owning_related_element is None
         assert r2.owned_related_elements == []
+
+
+@pytest.mark.unittest
+class TestKerMLAstRootBaseDerivedCache:
+    def test_qualified_name(self, env):
+        from pysysml.kerml.ast import Namespace, OwningMembership
+        root = Namespace(env, declared_name='Root')
+        a = Namespace(env, declared_name='A')
+        b = Namespace(env, declared_name='B')
+        m1 = OwningMembership(env, owning_related_element=root, owned_related_elements=[a])
+        m2 = OwningMembership(env, owning_related_element=a, owned_related_elements=[b])
+        assert (root.qualified_name, a.qualified_name, b.qualified_name) == (None, 'A', 'A::B')
+        assert b.owning_namespace is a
+        assert b.owner is a
+        assert 'qualified_name' in b._derived
+
+        a.declared_name = 'a b'
+        assert b.qualified_name == "'a b'::B"
+
+        c = Namespace(env, declared_name='C')
+        OwningMembership(env, owning_related_element=root, owned_related_elements=[c])
+        m2.owning_related_element = c
+        assert b.owning_namespace is c
+        assert b.qualified_name == 'C::B'
+        assert a.owned_elements == []
+        assert c.owned_elements == [b]
+
+        m1.owned_related_elements.remove(a)
+        assert a.qualified_name is None
+        assert root.owned_elements == [c]
+        for element in (root, a, b, c):
+            element.check_constraints()
+
+    def test_owned_elements(self, env, element1):
+        from pysysml.kerml.ast import Documentation
+        relationship = Relationship(env, owning_related_element=element1)
+        assert element1.owned_elements == []
+        assert element1.documentations == []
+
+        documentation = Documentation(env)
+        relationship.owned_related_elements.add(documentation)
+        assert element1.owned_elements == [documentation]
+        assert element1.documentations == [documentation]
+
+        element1.owned_elements.clear()
+        assert element1.owned_elements == [documentation]
+
+        with env.batch():
+            documentation.owning_relationship = None
+            assert element1.owned_elements == [documentation]
+        assert element1.owned_elements == []
+        assert element1.documentations == []
+        element1.check_constraints()
+
+    def test_lookup(self, env):
+        from pysysml.kerml.ast import Namespace, OwningMembership
+        root = Namespace(env)
+        a = Namespace(env, declared_name='A', declared_short_name='+')
+        b = Namespace(env, declared_name='b c')
+        OwningMembership(env, owning_related_element=root, owned_related_elements=[a])
+        mb = OwningMembership(env, owning_related_element=a, owned_related_elements=[b])
+        assert env.lookup('A') is a
+        assert env.lookup("'+'") is a
+        assert env.lookup("A::'b c'") is b
+        assert env.lookup("'+'::'b c'") is None
+        assert env.lookup('X') is None
+
+        a.declared_name = 'X'
+        assert env.lookup('A') is None
+        assert env.lookup('X') is a
+        assert env.lookup("X::'b c'") is b
+
+        c = Namespace(env, declared_name='C')
+        OwningMembership(env, owning_related_element=root, owned_related_elements=[c])
+        mb.owning_related_element = c
+        assert env.lookup("X::'b c'") is None
+        assert env.lookup("C::'b c'") is b
+
+        b2 = Namespace(env, declared_name='b c')
+        OwningMembership(env, owning_related_element=c, owned_related_elements=[b2])
+        assert env.lookup_all("C::'b c'") == [b, b2]
+        del env[b]
+        assert env.lookup_all("C::'b c'") == [b2]
+
+    def test_validate(self, env):
+        from pysysml.kerml.ast import Annotation, Dependency
+        e1, e2 = Element(env), Element(env)
+        d = Dependency(env, clients=[e1], suppliers=[], owning_related_element=e1)
+        assert [(v.element_id, v.constraint) for v in env.validate()] == [
+            (d.element_id, 'num_of_suppliers'),
+        ]
+        assert 'supplier' in env.validate(incremental=False)[0].message
+        assert not env._dirty_constraints
+
+        a = Annotation(env, annotated_elements=[e2], owning_related_element=e1)
+        assert set(env._dirty_constraints) == {e1.element_id, a.element_id}
+        violations = env.validate()
+        assert {(v.element_id, v.constraint) for v in violations} == {
+            (d.element_id, 'num_of_suppliers'),
+            (e1.element_id, 'derive_element_owned_annotation'),
+            (a.element_id, 'consistence_of_owning_related_element'),
+        }
+        with pytest.raises(ConstraintsError):
+            e1.check_constraints()
+
+        d.suppliers.add(e2)
+        assert set(env._dirty_constraints) == {d.element_id, e1.element_id}
+        a.annotated_element = e1
+        assert set(env._dirty_constraints) == {d.element_id, a.element_id, e1.element_id}
+        assert env.validate() == []
+        assert env.validate(incremental=False) == []
+        e1.check_constraints()
+
+        d.suppliers.clear()
+        d.owning_related_element = None
+        assert len(env.validate()) == 1
+        del env[d]
+        assert env.validate() == []
+
+    def test_relationships_of(self, env):
+        from pysysml.kerml.ast import Annotation, Dependency
+        x, y, z = Element(env), Element(env), Element(env)
+        d1 = Dependency(env, clients=[x], suppliers=[y])
+        d2 = Dependency(env, clients=[x, z], suppliers=[z], no_conj_when_init=True)
+        a1 = Annotation(env, annotated_elements=[y], owning_related_element=x)
+        r1 = Relationship(env, sources=[y], targets=[x])
+        assert env.elements_of_type(Dependency) == [d1, d2]
+        assert env.elements_of_type(Relationship) == [d1, d2, a1, r1]
+
+        assert env.relationships_of(x, 'source', Dependency) == [d1, d2]
+        assert env.relationships_of(x, 'source') == [d1, d2]
+        assert env.relationships_of(x.element_id, 'target') == [r1]
+        assert env.relationships_of(y, 'target', Annotation) == [a1]
+        assert env.relationships_of(y, 'target', Relationship) == [d1, a1]
+        assert env.relationships_of(z, 'target', Dependency) == [d2]
+        assert env.relationships_of(z, 'target', Annotation) == []
+        with pytest.raises(ValueError):
+            env.relationships_of(x, 'owner')
+
+        with env.batch():
+            d1.clients.clear()
+            a1.annotated_element = z
+            assert env.relationships_of(x, 'source', Dependency) == [d2]
+            assert env.relationships_of(y, 'target', Annotation) == []
+            assert env.relationships_of(z, 'target', Annotation) == [a1]
+        d1.clients.add(z)
+        assert env.relationships_of(z, 'source') == [d2, d1]
+
+        del env[d2]
+        assert env.relationships_of(x, 'source') == []
+        assert env.relationships_of(z, 'source') == [d1]
+        assert env.relationships_of(z, 'target') == [a1]
+
+    def test_relationships_of_replaced(self, env):
+        from pysysml.kerml.ast import Dependency
+        p, q = Element(env), Element(env)
+        d = Dependency(env, clients=[p], suppliers=[q])
+        d2 = Dependency(env, clients=[q], suppliers=[p], element_id=d.element_id)
+        assert env[d.element_id] is d2
+        assert env.relationships_of(p, 'source') == []
+        assert env.relationships_of(q, 'target') == []
+        assert env.relationships_of(q, 'source') == [d2]
+        assert env.relationships_of(p, 'target') == [d2]
+        assert env.elements_of_type(Dependency) == [d2]
+
+        env.add(d2)
+        assert env.relationships_of(q, 'source') == [d2]
+        assert env.relationships_of(p, 'target') == [d2]
@@ -0,0 +1,243 @@
+import random
+
+import pytest
+
+from pysysml.kerml.ast import Env, Namespace, Membership, OwningMembership, NamespaceImport, MembershipImport, \
+    VisibilityKind, Element
+from pysysml.kerml.ast.root.namespace import _RESOLUTION_MEMO
+
+
+@pytest.fixture()
+def env():
+    return Env()
+
+
+def _own(env, namespace, element, visibility=VisibilityKind.PUBLIC):
+    return OwningMembership(env, owning_related_element=namespace, owned_related_elements=[element],
+                            visibility=visibility)
+
+
+@pytest.fixture()
+def model(env):
+    root = Namespace(env)
+    a = Namespace(env, declared_name='A')
+    b = Namespace(env, declared_name='B')
+    _own(env, root, a)
+    _own(env, root, b)
+
+    x = Element(env, declared_name='x', declared_short_name='xs')
+    y = Element(env, declared_name='y')
+    z = Element(env, declared_name='z z')
+    mx = _own(env, a, x)
+    my = _own(env, a, y, visibility=VisibilityKind.PRIVATE)
+    inner = Namespace(env, declared_name='Inner')
+    mi = _own(env, a, inner)
+    mz = _own(env, inner, z)
+    return root, a, b, inner, x, y, z, mx, my, mi, mz
+
+
+@pytest.mark.unittest
+class TestKerMLAstRootNamespace:
+    def test_owned(self, model):
+        root, a, b, inner, x, y, z, mx, my, mi, mz = model
+        assert a.owned_memberships == [mx, my, mi]
+        assert a.owned_members == [x, y, inner]
+        assert a.owned_imports == []
+        assert a.visible_memberships() == [mx, mi]
+        assert a.visible_memberships(include_all=True) == [mx, my, mi]
+        assert a.visible_memberships(is_recursive=True) == [mx, mi, mz]
+        assert a.memberships() == [mx, my, mi]
+
+    def test_resolve(self, model):
+        root, a, b, inner, x, y, z, mx, my, mi, mz = model
+        assert b.resolve('A::x') is mx
+        assert b.resolve('A::xs') is mx
+        assert b.resolve(['A', 'Inner', 'z z']) is mz
+        assert b.resolve("A::Inner::'z z'") is mz
+        assert b.resolve('A::y') is None
+        assert inner.resolve('A::y') is my
+        assert inner.resolve('x') is mx
+        assert b.resolve('x') is None
+        assert b.resolve('A::x::q') is None
+        with pytest.raises(ValueError):
+            b.resolve('A::')
+
+    def test_namespace_import(self, env, model):
+        root, a, b, inner, x, y, z, mx, my, mi, mz = model
+        imp = NamespaceImport(env, owning_related_element=b, imported_elements=[a])
+        assert imp.imported_namespace is a
+        assert imp.imported_memberships() == [mx, mi]
+        assert b.imported_memberships() == [mx, mi]
+        assert b.visible_memberships() == [mx, mi]
+        assert b.resolve('x') is mx
+        assert b.resolve('y') is None
+
+        imp.visibility = VisibilityKind.PRIVATE
+        assert b.visible_memberships() == []
+        assert b.resolve('x') is mx
+        assert root.resolve('B::x') is None
+
+        imp.is_import_all = True
+        assert b.resolve('y') is my
+        imp.is_recursive = True
+        assert b.imported_memberships() == [mx, my, mi, mz]
+        assert b.resolve(['z z']) is mz
+
+    def test_membership_import_and_alias(self, env, model):
+        root, a, b, inner, x, y, z, mx, my, mi, mz = model
+        alias = Membership(env, owning_related_element=b, member_elements=[z], member_name='zz')
+        assert alias.member_element is z
+        assert root.resolve('B::zz') is alias
+        assert root.resolve('B::zz').member_element is z
+
+        imp = MembershipImport(env, owning_related_element=b, imported_elements=[mi], is_recursive=True)
+        assert imp.imported_membership is mi
+        assert b.visible_memberships() == [alias, mi, mz]
+        assert root.resolve("B::Inner::'z z'") is mz
+
+        alias.member_name = 'renamed'
+        assert root.resolve('B::zz') is None
+        assert root.resolve('B::renamed') is alias
+
+    def test_owned_hides_imported(self, env, model):
+        root, a, b, inner, x, y, z, mx, my, mi, mz = model
+        x2 = Element(env, declared_name='x')
+        mx2 = _own(env, b, x2)
+        NamespaceImport(env, owning_related_element=b, imported_elements=[a])
+        assert b.resolve('x') is mx2
+        assert b.visible_memberships() == [mx2, mx, mi]
+
+    def test_import_cycle(self, env):
+        namespaces = [Namespace(env, declared_name=f'N{i}') for i in range(4)]
+        memberships = []
+        for i, namespace in enumerate(namespaces):
+            memberships.append(_own(env, namespace, Element(env, declared_name=f'e{i}')))
+        for i, namespace in enumerate(namespaces):
+            NamespaceImport(env, owning_related_element=namespace,
+                            imported_elements=[namespaces[(i + 1) % len(namespaces)]])
+            NamespaceImport(env, owning_related_element=namespace, imported_elements=[namespace],
+                            is_recursive=True)
+
+        for i, namespace in enumerate(namespaces):
+            assert set(namespace.visible_memberships()) == set(memberships)
+            assert namespace.visible_memberships()[0] is memberships[i]
+            for j in range(len(namespaces)):
+                assert namespace.resolve(f'e{j}') is memberships[j]
+
+        # the memberships of the cycle, and the table of their names, are shared by all the namespaces in it
+        components = {id(namespace._names_table('visible')[1]) for namespace in namespaces}
+        assert len(components) == 1
+
+    def test_memo_invalidation(self, env, model):
+        root, a, b, inner, x, y, z, mx, my, mi, mz = model
+        NamespaceImport(env, owning_related_element=b, imported_elements=[a])
+        assert b.resolve('x') is mx
+        resolution = env.incremental_memo[_RESOLUTION_MEMO]
+        assert resolution.solved
+        version = env.version
+
+        x.declared_name = 'w'
+        assert env.version > version
+        assert not env.incremental_memo[_RESOLUTION_MEMO].solved
+        assert env.incremental_memo[_RESOLUTION_MEMO] is resolution
+        assert b.resolve('x') is None
+        assert b.resolve('w') is mx
+
+        mx.owning_related_element = inner
+        assert b.resolve('w') is None
+        assert root.resolve('A::Inner::w') is mx
+
+    def test_replaced(self, env, model):
+        root, a, b, inner, x, y, z, mx, my, mi, mz = model
+        assert x.owning_namespace is a
+        assert env.lookup('A::x') is x
+        assert root.resolve('A::x') is mx
+
+        c = Namespace(env, declared_name='C', element_id=a.element_id)
+        assert env[a.element_id] is c
+        assert root.owned_members == [c, b]
+        assert c.owning_membership is a.owning_membership
+        assert c.owned_memberships == [mx, my, mi]
+        assert x.owning_namespace is c
+        assert mx.owning_related_element is c
+        assert x.qualified_name == 'C::x'
+        assert env.lookup('A::x') is None
+        assert env.lookup('C::x') is x
+        assert env.lookup("C::Inner::'z z'") is z
+        assert root.resolve('A::x') is None
+        assert root.resolve('C::x') is mx
+
+        assert x.owning_membership is mx
+        mx2 = OwningMembership(env, element_id=mx.element_id, visibility=VisibilityKind.PRIVATE)
+        assert x.owning_membership is mx2
+        assert c.owned_memberships == [mx2, my, mi]
+        assert c.visible_memberships() == [mi]
+        assert root.resolve('C::x') is None
+        assert env.lookup('C::x') is x
+
+    def test_memo_targeted_invalidation(self, env, model):
+        root, a, b, inner, x, y, z, mx, my, mi, mz = model
+        c = Namespace(env, declared_name='C')
+        _own(env, root, c)
+        w = Element(env, declared_name='w')
+        mw = _own(env, c, w)
+        NamespaceImport(env, owning_related_element=b, imported_elements=[a])
+        assert b.resolve('x') is mx
+        assert c.resolve('w') is mw
+        solved = env.incremental_memo[_RESOLUTION_MEMO].solved
+        c_solution = solved[('imported', c, True)]
+
+        # the namespaces which do not read the renamed element, or depend on the ones reading it, are kept
+        x.declared_name = 'x2'
+        solved = env.incremental_memo[_RESOLUTION_MEMO].solved
+        assert solved[('imported', c, True)] is c_solution
+        assert ('visible', a, False) not in solved
+        assert ('imported', b, True) not in solved
+        assert b.resolve('x') is None
+        assert b.resolve('x2') is mx
+        assert c.resolve('w') is mw
+
+        mw.visibility = VisibilityKind.PRIVATE
+        assert root.resolve('C::w') is None
+        assert c.resolve('w') is mw
+        env.incremental_memo[_RESOLUTION_MEMO].invalidate([])
+
+        del env[w.element_id]
+        assert ('imported', c, True) not in env.incremental_memo[_RESOLUTION_MEMO].solved
+
+    def test_memo_random_edits(self, env):
+        # the incrementally invalidated resolution is the same as the one solved from scratch
+        rnd = random.Random(42)
+        namespaces = [Namespace(env, declared_name=f'N{i}') for i in range(12)]
+        for i, namespace in enumerate(namespaces[1:], start=1):
+            _own(env, namespaces[rnd.randrange(i)], namespace)
+        memberships = [_own(env, rnd.choice(namespaces), Element(env, declared_name=f'e{i % 5}'))
+                       for i in range(20)]
+        imports = [NamespaceImport(env, owning_related_element=rnd.choice(namespaces),
+                                   imported_elements=[rnd.choice(namespaces)], is_recursive=rnd.random() < 0.5)
+                   for _ in range(15)]
+        names = [f'e{i}' for i in range(6)] + [f'N{i}' for i in range(12)]
+
+        def _state():
+            return [(namespace.resolve_local(name), namespace.resolve_visible(name))
+                    for namespace in namespaces for name in names] + \
+                [namespace.visible_memberships(is_recursive=True) for namespace in namespaces]
+
+        for step in range(60):
+            op = rnd.randrange(5)
+            if op == 0:
+                rnd.choice(memberships).owned_member_element.declared_name = f'e{rnd.randrange(6)}'
+            elif op == 1:
+                rnd.choice(memberships).visibility = rnd.choice(list(VisibilityKind))
+            elif op == 2:
+                import_ = rnd.choice(imports)
+                import_.imported_element = rnd.choice(namespaces)
+                import_.is_recursive = not import_.is_recursive
+            elif op == 3:
+                rnd.choice(imports).visibility = rnd.choice(list(VisibilityKind))
+            else:
+                rnd.choice(memberships).owning_related_element = rnd.choice(namespaces)
+
+            incremental = _state()
+            env.incremental_memo.clear()
+            assert _state() == incremental, step
@@ -2,7 +2,8 @@ import uuid
 
 import pytest
 
-from pysysml.kerml.ast import Env, IElementID, ElementNotFoundError, ConstraintsError
+from pysysml.kerml.ast import Env, IElementID, ElementNotFoundError, ConstraintsError, SequentialIDAllocator, \
+    uuid_id_allocator
 from pysysml.kerml.ast.base import EConn
 
 
@@ -58,6 +59,10 @@ class TestEnvAndElementID:
         assert mock_element.element_id not in env
         assert mock_element not in env
 
+    def test_env_lookup(self, env, mock_element):
+        assert env.lookup('mock') is None
+        assert env.lookup_all('mock') == []
+
     def test_env_errors(self, env, mock_element):
         with pytest.raises(ElementNotFoundError) as exc_info:
             env["non_existent"]
@@ -67,11 +72,46 @@ class TestEnvAndElementID:
         with pytest.raises(TypeError):
             env["invalid"] = "not an IElementID"
 
-    def test_element_id_init(self, env, mock_uuid):
+    def test_element_id_init(self, env):
+        e1, e2 = IElementID(env), IElementID(env)
+        assert (e1.element_id, e2.element_id) == (1, 2)
+        assert e1.env == env
+        assert env[1] is e1
+
+    def test_element_id_uuid(self, mock_uuid):
+        env = Env(id_allocator=uuid_id_allocator)
         element = IElementID(env)
         assert element.element_id == mock_uuid
+        assert element.export_id == mock_uuid
         assert element.env == env
 
+    def test_element_id_allocator(self):
+        env = Env(id_allocator=SequentialIDAllocator(100))
+        custom = IElementID(env, element_id=101)
+        assert [IElementID(env).element_id for _ in range(3)] == [100, 102, 103]
+        assert env[101] is custom
+        assert env.allocate_id() == 104
+
+    def test_element_id_zero(self):
+        env = Env(id_allocator=SequentialIDAllocator(0))
+        zero = IElementID(env, element_id=0)
+        assert zero.element_id == 0
+        assert env[0] is zero
+        assert len(env) == 1
+
+        replaced = IElementID(env, element_id=0)
+        assert env[0] is replaced
+        assert len(env) == 1
+
+    def test_element_id_export(self, env):
+        e1, e2 = IElementID(env), IElementID(env, element_id='custom-id')
+        export_id = e1.export_id
+        assert isinstance(export_id, str) and len(export_id) == 36
+        assert e1.export_id == export_id
+        assert env.export_id(e1.element_id) == export_id
+        assert e2.export_id == 'custom-id'
+        assert IElementID(Env()).export_id != export_id
+
     def test_element_id_custom_id(self, env):
         custom_id = "custom-id"
         element = IElementID(env, element_id=custom_id)
@@ -527,3 +567,80 @@ class TestEConn:
         assert c2.is_superset([e1])
         assert c2.is_superset([e2])
         assert c2.is_superset([e1, e2])
+
+    def test_update_many(self, env):
+        addings = []
+        e1, e2, e3 = MockElement(env), MockElement(env), MockElement(env)
+        conn = EConn(env, type_=MockElement, initial=[e1], fn_add_conj=addings.append)
+        assert conn.update_many([e2, e1, e2.element_id, e3]) is conn
+        assert list(conn) == [e1, e2, e3]
+        assert addings == [e1, e2, e3]
+
+        e4 = MockElement(env)
+        with pytest.raises(TypeError):
+            conn.update_many([e4, AnotherTypeElement(env)])
+        with pytest.raises(ElementNotFoundError):
+            conn.update_many([e4, 'xxxx'])
+        assert list(conn) == [e1, e2, e3]
+
+        conn.update_many([e4], no_conj=True)
+        assert list(conn) == [e1, e2, e3, e4]
+        assert addings == [e1, e2, e3]
+
+    def test_batch(self, env):
+        calls = []
+        e1, e2, e3 = MockElement(env), MockElement(env), MockElement(env)
+        conn = EConn(env, type_=MockElement, initial=[e1],
+                     fn_add_conj=lambda e: calls.append(('add', e)),
+                     fn_remove_conj=lambda e: calls.append(('remove', e)))
+        calls.clear()
+        with env.batch() as batch_env:
+            assert batch_env is env
+            conn.update_many([e2, e3])
+            conn.remove(e1)
+            with env.batch():
+                conn.remove(e3)
+                conn.add(e1)
+            assert calls == []
+            assert list(conn) == [e2, e1]
+        # adding e3 and removing e1 are reverted later, so their callbacks are skipped
+        assert calls == [('add', e2), ('remove', e3), ('add', e1)]
+
+        calls.clear()
+        with pytest.raises(ValueError):
+            with env.batch():
+                conn.clear()
+                raise ValueError
+        assert calls == [('remove', e2), ('remove', e1)]
+        assert not conn
+
+    def test_added_and_removed(self, env):
+        calls = []
+        e1, e2, e3 = MockElement(env), MockElement(env), MockElement(env)
+        conn = EConn(env, type_=MockElement, initial=[e1], no_conj_when_init=True,
+                     fn_added=lambda e: calls.append(('added', e)),
+                     fn_removed=lambda e: calls.append(('removed', e)))
+        assert calls == [('added', e1)]
+
+        calls.clear()
+        with env.batch():
+            conn.update_many([e2, e3])
+            conn.remove(e1, no_conj=True)
+            assert calls == [('added', e2), ('added', e3), ('removed', e1)]
+        conn.set_to(e3)
+        assert calls == [('added', e2), ('added', e3), ('removed', e1), ('removed', e2)]
+
+    def test_env_elements_of_type(self, env):
+        e1, a1, e2 = MockElement(env), AnotherTypeElement(env), MockElement(env)
+        assert env.elements_of_type(MockElement) == [e1, e2]
+        assert env.elements_of_type(AnotherTypeElement) == [a1]
+        assert env.elements_of_type(IElementID) == [e1, e2, a1]
+
+        class SubElement(MockElement):
+            pass
+
+        s1 = SubElement(env)
+        assert env.elements_of_type(MockElement) == [e1, e2, s1]
+        assert env.elements_of_type(SubElement) == [s1]
+        del env[e1]
+        assert env.elements_of_type(MockElement) == [e2, s1]
@@ -165,3 +165,20 @@ class TestKerMLAstEConnRelations:
         assert p2.children == []
         assert c.parent is None
         assert c.children == []
+
+    def test_batch(self, env):
+        p1, p2 = TreeNode(env), TreeNode(env)
+        children = [TreeNode(env) for _ in range(5)]
+        with env.batch():
+            p1.children.update_many(children)
+            assert all(c.parent is None for c in children)
+        assert p1.children == children
+        assert all(c.parent is p1 for c in children)
+
+        with env.batch():
+            for c in children:
+                c.parent = p2
+            assert p1.children == children
+        assert p1.children == []
+        assert p2.children == children
+        assert all(c.parent is p2 for c in children)
@@ -0,0 +1,64 @@
+import pytest
+
+from pysysml.kerml.ast import Env, Namespace, OwningMembership, Dependency, Element, dumps_env, loads_env, \
+    save_env, load_env, uuid_id_allocator
+from pysysml.kerml.ast.snapshot import _SNAPSHOT_FORMAT
+
+
+@pytest.fixture()
+def env():
+    env = Env()
+    root = Namespace(env)
+    a = Namespace(env, declared_name='A')
+    OwningMembership(env, owning_related_element=root, owned_related_elements=[a])
+    x = Element(env, declared_name='x')
+    OwningMembership(env, owning_related_element=a, owned_related_elements=[x])
+    Dependency(env, clients=[a], suppliers=[x])
+    return env
+
+
+@pytest.mark.unittest
+class TestKerMLAstSnapshot:
+    def test_dumps_loads(self, env):
+        assert env.lookup('A::x') is not None
+        loaded = loads_env(dumps_env(env))
+        assert loaded is not env
+        assert len(loaded) == len(env)
+        assert list(loaded._elements) == list(env._elements)
+
+        x = loaded.lookup('A::x')
+        assert x.env is loaded
+        assert x.qualified_name == 'A::x'
+        assert x.owning_namespace is loaded.lookup('A')
+        assert x.owning_namespace.owned_members == [x]
+        assert [v.constraint for v in loaded.validate(incremental=False)] == \
+               [v.constraint for v in env.validate(incremental=False)]
+
+        # the connections and the ID allocator keep working after loading
+        y = Element(loaded, declared_name='y')
+        assert y.element_id == max(env._elements) + 1
+        OwningMembership(loaded, owning_related_element=x.owning_namespace, owned_related_elements=[y])
+        assert loaded.lookup('A::y') is y
+        assert env.lookup('A::y') is None
+
+    def test_save_load(self, env, tmp_path):
+        file = tmp_path / 'model.snapshot'
+        save_env(env, file)
+        assert len(load_env(file)) == len(env)
+
+    def test_uuid_ids(self):
+        env = Env(id_allocator=uuid_id_allocator)
+        Namespace(env, declared_name='A')
+        loaded = loads_env(dumps_env(env))
+        assert list(loaded._elements) == list(env._elements)
+
+    def test_invalid(self, env):
+        data = dumps_env(env)
+        with pytest.raises(ValueError):
+            loads_env(b'not a snapshot\n1\n')
+        with pytest.raises(ValueError):
+            loads_env(data.replace(f'\n{_SNAPSHOT_FORMAT}\n'.encode(), b'\n999\n', 1))
+        with pytest.raises(ValueError):
+            loads_env(data[:len(data) // 2])
+        with pytest.raises(ValueError):
+            loads_env(data[:len(data) - len(data) // 3] + b'garbage')
@@ -0,0 +1,76 @@
+import pytest
+
+from pysysml.kerml.ast import Env, Namespace, OwningMembership, Dependency, Element, validate_parallel, \
+    partition_env
+
+
+def _tree(env: Env, depth: int, width: int):
+    root = Namespace(env, declared_name='Root')
+    level = [root]
+    for i in range(depth):
+        next_level = []
+        for parent in level:
+            for j in range(width):
+                child = Namespace(env, declared_name=f'N{i}_{j}')
+                membership = OwningMembership(env, owning_related_element=parent, owned_related_elements=[child],
+                                              member_elements=[child])
+                membership.sources.add(parent)
+                next_level.append(child)
+        level = next_level
+    return root, level
+
+
+@pytest.fixture()
+def env():
+    env = Env()
+    _, leaves = _tree(env, 3, 3)
+    Dependency(env, clients=[leaves[0]], suppliers=[], owning_related_element=leaves[0])
+    Dependency(env, clients=[], suppliers=[leaves[-1]])
+    return env
+
+
+@pytest.mark.unittest
+class TestKerMLAstValidate:
+    @pytest.mark.parametrize(['parts'], [(1,), (3,), (8,), (1000,)])
+    def test_partition_env(self, env, parts):
+        partitions = partition_env(env, parts)
+        assert 1 <= len(partitions) <= parts
+        keys = [key for partition in partitions for key in partition]
+        assert sorted(keys) == sorted(env._elements)
+
+    def test_partition_env_balanced(self, env):
+        partitions = partition_env(env, 3)
+        sizes = [len(partition) for partition in partitions]
+        assert max(sizes) - min(sizes) <= len(env) // 3
+
+    def test_partition_env_invalid(self, env):
+        with pytest.raises(ValueError):
+            partition_env(env, 0)
+
+    @pytest.mark.parametrize(['jobs'], [(1,), (2,), (3,)])
+    def test_validate_parallel(self, env, jobs):
+        report = validate_parallel(env, jobs=jobs)
+        assert report.elements == len(env)
+        assert not report.ok
+        assert [(v.constraint, v.message) for v in report.violations] == [
+            (v.constraint, v.message) for v in env.validate(incremental=False)
+        ]
+        assert [v.constraint for v in report.violations] == [
+            'num_of_suppliers', 'num_of_clients',
+        ]
+
+    def test_validate_parallel_ok(self):
+        env = Env()
+        _tree(env, 2, 2)
+        Element(env)
+        assert validate_parallel(env, jobs=2).ok
+
+    @pytest.mark.parametrize(['jobs'], [(1,), (2,), (None,)])
+    def test_validate_parallel_empty(self, jobs):
+        report = validate_parallel(Env(), jobs=jobs)
+        assert report.ok
+        assert report.elements == 0
+
+    def test_validate_parallel_invalid_jobs(self, env):
+        with pytest.raises(ValueError):
+            validate_parallel(env, jobs=0)
@@ -1,6 +1,17 @@
+import pathlib
+
 import pytest
+from lark import UnexpectedInput
+
+from pysysml.kerml.cst import list_reserved_words, is_reserved_word, resource_health_check, __grammar_file__, \
+    KerMLParserPool
+from pysysml.utils import words_regex
+
 
-from pysysml.kerml.cst import list_reserved_words, is_reserved_word, resource_health_check
+@pytest.fixture(scope='module')
+def name_parser():
+    pool = KerMLParserPool(parser='earley')
+    return lambda x: pool.parse(x, start='qualified_name')
 
 
 @pytest.mark.unittest
@@ -218,3 +229,16 @@ class TestKermlBase:
 
     def test_resource_health_check(self):
         resource_health_check()
+
+    def test_reserved_words_in_grammar(self):
+        reserved = words_regex(sorted(set(list_reserved_words())))
+        assert f'BASIC_NAME: /(?!{reserved}(?![a-zA-Z0-9_]))/' in pathlib.Path(__grammar_file__).read_text(), \
+            'Reserved words in grammar is outdated, please run "python -m tools.kerml.reserved".'
+
+    def test_reserved_words_lexing(self, name_parser):
+        for word in list_reserved_words():
+            with pytest.raises(UnexpectedInput):
+                name_parser(word)
+            assert name_parser(f"'{word}'").children[0].value == f"'{word}'"
+            assert name_parser(f'{word}_x').children[0].value == f'{word}_x'
+            assert name_parser(f'{word}1').children[0].value == f'{word}1'
@@ -0,0 +1,122 @@
+import os
+
+import pytest
+
+from pysysml.kerml.cst import parse_many, list_kerml_files, parse_kerml, ParseResult, RuleCoverage, batch
+
+_origin_parse_file = batch._parse_file
+
+
+def _crashing_parse_file(path, *args):
+    # the worker process dies on this file, like it is killed for running out of memory
+    if path.endswith('crash.kerml'):
+        os._exit(1)
+    return _origin_parse_file(path, *args)
+
+
+def _failing_init_worker(parser):
+    raise RuntimeError('warm-up failed')
+
+
+@pytest.fixture()
+def kerml_dir(tmp_path):
+    (tmp_path / 'sub').mkdir()
+    (tmp_path / 'a.kerml').write_text('package A;\n')
+    (tmp_path / 'sub' / 'b.kerml').write_text('package B { feature x : A [1] :> y = 1 + 2; }\n')
+    (tmp_path / 'c.kerml').write_text('package C { feature }\n')
+    (tmp_path / 'd.txt').write_text('not a kerml file\n')
+    return str(tmp_path)
+
+
+@pytest.mark.unittest
+class TestKerMLCstBatch:
+    def test_list_kerml_files(self, kerml_dir):
+        assert list_kerml_files([kerml_dir, os.path.join(kerml_dir, 'd.txt')]) == [
+            os.path.join(kerml_dir, 'a.kerml'),
+            os.path.join(kerml_dir, 'c.kerml'),
+            os.path.join(kerml_dir, 'sub', 'b.kerml'),
+            os.path.join(kerml_dir, 'd.txt'),
+        ]
+
+    @pytest.mark.parametrize(['jobs'], [(1,), (2,)])
+    def test_parse_many(self, kerml_dir, jobs):
+        files = list_kerml_files([kerml_dir])
+        files.append(os.path.join(kerml_dir, 'not_exist.kerml'))
+        results = list(parse_many(files, jobs=jobs))
+        assert [result.path for result in results] == files
+        assert all(isinstance(result, ParseResult) for result in results)
+        assert [result.ok for result in results] == [True, False, True, False]
+
+        assert results[0].cst == parse_kerml('package A;\n')
+        assert results[2].cst == parse_kerml('package B { feature x : A [1] :> y = 1 + 2; }\n')
+        assert results[1].cst is None
+        assert results[1].error_type == 'UnexpectedCharacters'
+        assert 'feature' in results[1].error
+        assert results[3].error_type == 'FileNotFoundError'
+
+    @pytest.mark.parametrize(['ordered'], [(True,), (False,)])
+    def test_parse_many_worker_died(self, kerml_dir, monkeypatch, ordered):
+        monkeypatch.setattr(batch, '_parse_file', _crashing_parse_file)
+        files = [os.path.join(kerml_dir, 'crash.kerml'), *list_kerml_files([kerml_dir])]
+        results = list(parse_many(files, jobs=2, ordered=ordered))
+        assert sorted(result.path for result in results) == sorted(files)
+        results = {result.path: result for result in results}
+        assert results[files[0]].error_type == 'BrokenProcessPool'
+        for result in results.values():
+            assert result.ok or result.error_type in ('BrokenProcessPool', 'UnexpectedCharacters')
+
+    def test_parse_many_init_failed(self, kerml_dir, monkeypatch):
+        monkeypatch.setattr(batch, '_init_worker', _failing_init_worker)
+        files = list_kerml_files([kerml_dir])
+        results = list(parse_many(files, jobs=2))
+        assert [result.path for result in results] == files
+        assert [result.error_type for result in results] == ['BrokenProcessPool'] * len(files)
+
+    @pytest.mark.parametrize(['jobs'], [(1,), (2,)])
+    def test_parse_many_recover(self, kerml_dir, jobs):
+        files = list_kerml_files([kerml_dir])
+        results = list(parse_many(files, jobs=jobs, recover=True))
+        assert [result.ok for result in results] == [True, False, True]
+        assert results[1].cst == parse_kerml('package C { }\n')
+        assert results[1].error_type is None
+        assert [(d.line, d.column) for d in results[1].diagnostics] == [(1, 21)]
+
+    def test_parse_many_cache(self, kerml_dir, tmp_path, monkeypatch):
+        from pysysml.kerml.cst import cstcache
+        monkeypatch.setattr(cstcache, '_DEFAULT_CACHE', cstcache.KerMLCstCache(str(tmp_path / 'cst')))
+        files = list_kerml_files([kerml_dir])
+        results = list(parse_many(files, jobs=1, use_cache=True))
+        assert [(result.ok, result.cached) for result in results] == [(True, False), (False, False), (True, False)]
+        results = list(parse_many(files, jobs=1, use_cache=True))
+        assert [(result.ok, result.cached) for result in results] == [(True, True), (False, False), (True, True)]
+        assert results[2].cst == parse_kerml('package B { feature x : A [1] :> y = 1 + 2; }\n')
+
+    def test_parse_many_unordered(self, kerml_dir):
+        files = list_kerml_files([kerml_dir])
+        results = list(parse_many(files, jobs=2, ordered=False, parser='lalr'))
+        assert sorted(result.path for result in results) == sorted(files)
+        assert sum(1 for result in results if result.ok) == 2
+
+    @pytest.mark.parametrize(['jobs'], [(1,), (2,)])
+    def test_parse_many_coverage(self, kerml_dir, jobs):
+        files = list_kerml_files([kerml_dir])
+        results = list(parse_many(files, jobs=jobs, coverage=True))
+        assert [result.coverage is None for result in results] == [False, True, False]
+        assert results[0].coverage['feature'] == 0
+        assert results[2].coverage['feature'] == 1
+        coverage = RuleCoverage.merged(result.coverage for result in results)
+        assert coverage['package'] == 2
+        assert coverage.total == results[0].coverage.total + results[2].coverage.total
+
+        assert all(result.coverage is None for result in parse_many(files, jobs=jobs))
+
+    def test_parse_many_empty(self):
+        assert list(parse_many([], jobs=4)) == []
+
+    def test_parse_many_invalid(self):
+        with pytest.raises(ValueError):
+            list(parse_many([], jobs=0))
+        with pytest.raises(ValueError):
+            list(parse_many([], parser='cyk'))
+        with pytest.raises(ValueError):
+            list(parse_many([], coverage=True, recover=True))
@@ -0,0 +1,178 @@
+import mmap
+import pathlib
+import struct
+from dataclasses import dataclass
+
+import pytest
+
+from pysysml.kerml.cst import dump_cst_binary, load_cst_binary, CSTFormatError, ColumnarCST, parse_kerml, \
+    parse_kerml_columnar
+from pysysml.kerml.cst.binary import _HEADER, _MAGIC, _SECTIONS
+from pysysml.kerml.cst.models import Feature, Classifier, Import, Visibility, FeatureChain
+
+_TEXT = """
+package P1 {
+    private import ScalarValues::*;
+    public import 'Other Lib'::*;
+    abstract classifier Base;
+    classifier C specializes Base {
+        feature x : Real [1] = 1.0 + 2.0 * 3.0;
+        derived feature y[0..*] ordered :> x;
+        feature z : ScalarValues::Real = a.b.c;
+        feature w chains a.b;
+    }
+    comment about C /* comment of C, with unicode ✓ */
+}
+"""
+
+
+@pytest.mark.unittest
+class TestKerMLCstBinary:
+    def test_round_trip(self, tmp_path):
+        file = str(tmp_path / 'model.kcst')
+        cst = parse_kerml(_TEXT)
+        dump_cst_binary(cst, file)
+        loaded = load_cst_binary(file)
+        assert isinstance(loaded, ColumnarCST)
+        assert isinstance(loaded.kinds, memoryview)
+        assert isinstance(loaded.values, memoryview)
+        assert len(loaded) == len(ColumnarCST.from_cst(cst))
+        assert loaded.node() == cst
+
+    def test_query(self, tmp_path):
+        file = str(tmp_path / 'model.kcst')
+        dump_cst_binary(parse_kerml_columnar(_TEXT), file)
+        loaded = load_cst_binary(file)
+        assert loaded.count(Classifier, is_abstract=True) == 1
+        assert loaded.count(Feature, is_derived=True) == 1
+        assert loaded.count(Import, visibility=Visibility.PRIVATE) == 1
+        assert loaded.count(Import, visibility=Visibility.PUBLIC) == 1
+        assert any(isinstance(atom, FeatureChain) for atom in loaded.atoms)
+
+        feature = next(loaded.find(Feature, is_derived=True))
+        assert loaded.field(feature, 'identification').name == 'y'
+        expected = ColumnarCST.from_cst(parse_kerml(_TEXT))
+        assert loaded.node(feature) == expected.node(next(expected.find(Feature, is_derived=True)))
+
+    def test_lazy_strings(self, tmp_path):
+        file = str(tmp_path / 'model.kcst')
+        dump_cst_binary(parse_kerml(_TEXT), file)
+        loaded = load_cst_binary(file)
+        assert not loaded.strings._items
+        feature = next(loaded.find(Feature, is_derived=True))
+        loaded.field(feature, 'identification')
+        assert len(loaded.strings._items) == 1
+
+    def test_invalid_file(self, tmp_path):
+        file = tmp_path / 'model.kcst'
+        file.write_bytes(b'')
+        with pytest.raises(CSTFormatError):
+            load_cst_binary(str(file))
+
+        file.write_bytes(b'not a binary cst file' * 20)
+        with pytest.raises(CSTFormatError):
+            load_cst_binary(str(file))
+
+        dump_cst_binary(parse_kerml('package P;'), str(file))
+        data = file.read_bytes()
+        file.write_bytes(data[:len(data) // 2])
+        with pytest.raises(CSTFormatError):
+            load_cst_binary(str(file))
+
+    def test_invalid_class(self, tmp_path):
+        @dataclass
+        class NotModel:
+            x: str
+
+        with pytest.raises(TypeError):
+            dump_cst_binary(NotModel('x'), str(tmp_path / 'model.kcst'))
+
+        file = tmp_path / 'model.kcst'
+        dump_cst_binary(parse_kerml('package P;'), str(file))
+        data = file.read_bytes().replace(b'RootNamespace', b'os.system\0\0\0\0')
+        file.write_bytes(data)
+        with pytest.raises(CSTFormatError):
+            load_cst_binary(str(file))
+
+    def test_empty(self, tmp_path):
+        file = pathlib.Path(tmp_path / 'model.kcst')
+        dump_cst_binary(parse_kerml(''), str(file))
+        assert load_cst_binary(str(file)).node() == parse_kerml('')
+
+    def test_close(self, tmp_path):
+        file = str(tmp_path / 'model.kcst')
+        dump_cst_binary(parse_kerml(_TEXT), file)
+        with load_cst_binary(file) as loaded:
+            assert loaded.node() == parse_kerml(_TEXT)
+        with pytest.raises(ValueError):
+            _ = loaded.kinds[0]
+        loaded.close()
+
+        cst = parse_kerml_columnar(_TEXT)
+        with cst:
+            pass
+        assert cst.node() == parse_kerml(_TEXT)
+
+    def test_close_invalid_file(self, tmp_path, monkeypatch):
+        buffers = []
+
+        class _RecordedMmap(mmap.mmap):
+            def __init__(self, *args, **kwargs):
+                buffers.append(self)
+
+        monkeypatch.setattr(mmap, 'mmap', _RecordedMmap)
+        file = tmp_path / 'model.kcst'
+        file.write_bytes(b'not a binary cst file' * 20)
+        with pytest.raises(CSTFormatError):
+            load_cst_binary(str(file))
+        assert len(buffers) == 1
+        assert buffers[0].closed
+
+    @staticmethod
+    def _corrupt(file, section: str, offset: int, value: int, typecode: str = 'I'):
+        data = bytearray(file.read_bytes())
+        layout = _HEADER.unpack_from(data, len(_MAGIC))[2:]
+        start, length = layout[_SECTIONS.index(section) * 2:_SECTIONS.index(section) * 2 + 2]
+        offset %= length // struct.calcsize(typecode)
+        struct.pack_into('<' + typecode, data, start + offset * struct.calcsize(typecode), value)
+        file.write_bytes(bytes(data))
+
+    @pytest.mark.parametrize(['section', 'offset', 'value'], [
+        ('string_offsets', 1, 0xffff),
+        ('atom_data', 0, 9),
+        ('atom_data', 1, 0xffff),
+        ('values', 0, (0xffff << 3) | 3),
+        ('values', 0, (0xffff << 3) | 2),
+        ('value_starts', 1, 0),
+    ])
+    def test_invalid_values(self, tmp_path, section, offset, value):
+        file = tmp_path / 'model.kcst'
+        dump_cst_binary(parse_kerml(_TEXT), str(file))
+        self._corrupt(file, section, offset, value)
+        with load_cst_binary(str(file)) as loaded, pytest.raises(CSTFormatError):
+            list(loaded.atoms)
+            list(loaded.strings)
+            loaded.node()
+
+    def test_invalid_layout(self, tmp_path):
+        file = tmp_path / 'model.kcst'
+        dump_cst_binary(parse_kerml(_TEXT), str(file))
+        self._corrupt(file, 'kinds', 0, 0xff, 'B')
+        with pytest.raises(CSTFormatError):
+            load_cst_binary(str(file))
+
+        dump_cst_binary(parse_kerml(_TEXT), str(file))
+        self._corrupt(file, 'value_starts', -1, 0xffffff)
+        with pytest.raises(CSTFormatError):
+            load_cst_binary(str(file))
+
+    def test_invalid_index(self, tmp_path):
+        file = str(tmp_path / 'model.kcst')
+        dump_cst_binary(parse_kerml(_TEXT), file)
+        with load_cst_binary(file) as loaded:
+            with pytest.raises(IndexError):
+                loaded.node(len(loaded))
+            with pytest.raises(KeyError):
+                loaded.field(loaded.root, 'no_such_field')
+            with pytest.raises(CSTFormatError):
+                _ = loaded.strings[len(loaded.strings)]
@@ -0,0 +1,134 @@
+import os.path
+import pathlib
+
+import pytest
+from lark import Lark
+
+from pysysml.kerml.cst import open_kerml_lark_parser, parser_cache_dir, list_cached_parsers, clear_parser_cache, \
+    grammar_sha256, __grammar_file__, parser_cache_enabled, KerMLParserPool
+from pysysml.kerml.cst.cache import parser_cache_key, load_cached_parser, save_cached_parser
+
+
+@pytest.fixture()
+def cache_dir(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / 'cache')
+    monkeypatch.setenv('PYSYSML_CACHE_DIR', cache_dir)
+    return cache_dir
+
+
+@pytest.mark.unittest
+class TestKerMLCstCache:
+    def test_parser_cache_dir(self, cache_dir):
+        assert parser_cache_dir() == os.path.abspath(cache_dir)
+
+    def test_parser_cache_dir_default(self, tmp_path, monkeypatch):
+        monkeypatch.delenv('PYSYSML_CACHE_DIR', raising=False)
+        monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+        assert parser_cache_dir() == os.path.abspath(str(tmp_path / 'pysysml'))
+
+    def test_grammar_sha256(self):
+        assert grammar_sha256() == pathlib.Path(f'{__grammar_file__}.sha256').read_text().strip()
+
+    def test_parser_cache_key(self):
+        assert parser_cache_key() == parser_cache_key([])
+        assert parser_cache_key(['start', 'package']) == parser_cache_key(['package', 'start', 'package'])
+        assert parser_cache_key() != parser_cache_key(['start'])
+        assert parser_cache_key() != parser_cache_key(parser='lalr')
+
+    def test_open_with_cache(self, cache_dir):
+        assert list_cached_parsers() == []
+        parser = open_kerml_lark_parser()
+        assert len(list_cached_parsers()) == 1
+
+        cached = open_kerml_lark_parser()
+        assert cached is not parser
+        assert len(list_cached_parsers()) == 1
+        assert cached.parse('package P;', start='start') == parser.parse('package P;', start='start')
+
+    def test_open_lalr_with_cache(self, cache_dir):
+        parser = open_kerml_lark_parser(parser='lalr')
+        assert len(list_cached_parsers()) == 1
+
+        cached = open_kerml_lark_parser(parser='lalr')
+        assert cached is not parser
+        assert len(list_cached_parsers()) == 1
+        text = 'package P { feature x : A [1] :> y = 1 + 2 * 3; }'
+        assert cached.parse(text, start='start') == parser.parse(text, start='start')
+
+    def test_open_without_cache(self, cache_dir):
+        parser = open_kerml_lark_parser(use_cache=False)
+        assert isinstance(parser, Lark)
+        assert list_cached_parsers() == []
+
+    @pytest.mark.parametrize(['value', 'enabled'], [
+        (None, False),
+        ('', False),
+        ('0', False),
+        ('false', False),
+        ('1', True),
+        ('True', True),
+        (' yes ', True),
+        ('on', True),
+    ])
+    def test_parser_cache_enabled(self, monkeypatch, value, enabled):
+        if value is None:
+            monkeypatch.delenv('PYSYSML_PARSER_CACHE', raising=False)
+        else:
+            monkeypatch.setenv('PYSYSML_PARSER_CACHE', value)
+        assert parser_cache_enabled() == enabled
+
+    def test_open_default_without_cache(self, cache_dir, monkeypatch):
+        # the library never writes the cache silently
+        monkeypatch.delenv('PYSYSML_PARSER_CACHE', raising=False)
+        parser = open_kerml_lark_parser(start=['package'], all_starts=False)
+        assert isinstance(parser, Lark)
+        KerMLParserPool().parse('package P;', start='package')
+        assert list_cached_parsers() == []
+
+        open_kerml_lark_parser(start=['package'], all_starts=False, use_cache=True)
+        assert len(list_cached_parsers()) == 1
+
+    @pytest.mark.parametrize(['content'], [
+        (b'',),
+        (b'not a cache file at all',),
+        (b'PYSYSML-KERML-PARSER\nother_key\n',),
+    ])
+    def test_broken_cache(self, cache_dir, content):
+        key = parser_cache_key()
+        parser = open_kerml_lark_parser()
+        file, = list_cached_parsers()
+        with open(file, 'wb') as f:
+            f.write(content)
+
+        assert load_cached_parser(key) is None
+        assert not os.path.exists(file)
+
+        assert save_cached_parser(key, parser) == file
+        assert isinstance(load_cached_parser(key), Lark)
+
+    def test_truncated_cache(self, cache_dir):
+        key = parser_cache_key()
+        open_kerml_lark_parser()
+        file, = list_cached_parsers()
+        data = pathlib.Path(file).read_bytes()
+        pathlib.Path(file).write_bytes(data[:len(data) // 2])
+
+        parser = open_kerml_lark_parser()
+        assert parser.parse('package P;', start='start')
+        assert load_cached_parser(key) is not None
+
+    def test_save_failed(self, tmp_path, monkeypatch):
+        blocker = tmp_path / 'blocker'
+        blocker.write_text('this is a file')
+        monkeypatch.setenv('PYSYSML_CACHE_DIR', str(blocker / 'cache'))
+        parser = open_kerml_lark_parser()
+        assert parser.parse('package P;', start='start')
+        assert list_cached_parsers() == []
+
+    def test_clear_parser_cache(self, cache_dir):
+        assert clear_parser_cache() == 0
+        open_kerml_lark_parser()
+        open_kerml_lark_parser(start=['start'])
+        assert len(list_cached_parsers()) == 2
+        assert clear_parser_cache() == 2
+        assert list_cached_parsers() == []
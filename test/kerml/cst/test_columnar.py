@@ -0,0 +1,89 @@
+import io
+from array import array
+
+import pytest
+
+from pysysml.kerml.cst import ColumnarCST, ColumnarCSTBuilder, parse_kerml_columnar, parse_kerml
+from pysysml.kerml.cst.models import Feature, Classifier, Package, RootNamespace, QualifiedName, Visibility, \
+    NonFeatureMember, Identification
+
+_TEXT = """
+package P1 {
+    private import ScalarValues::*;
+    abstract classifier Base;
+    classifier C specializes Base {
+        feature x : Real [1] = 1.0 + 2.0 * 3.0;
+        derived feature y[0..*] ordered :> x;
+        feature 'z w' : ScalarValues::Real;
+    }
+    comment about C /* comment of C */
+}
+package P2 { derived feature d : ScalarValues::Real; }
+"""
+
+
+@pytest.mark.unittest
+class TestKerMLCstColumnar:
+    def test_from_cst(self):
+        cst = parse_kerml(_TEXT)
+        columnar = ColumnarCST.from_cst(cst)
+        assert columnar.node() == cst
+        assert columnar.kind(columnar.root) is RootNamespace
+        assert columnar.parent(columnar.root) is None
+        assert isinstance(columnar.kinds, array)
+        assert columnar.nbytes() > 0
+
+    @pytest.mark.parametrize(['parser'], [('auto',), ('lalr',)])
+    def test_parse_kerml_columnar(self, parser):
+        columnar = parse_kerml_columnar(io.StringIO(_TEXT), parser=parser)
+        assert columnar.node() == parse_kerml(_TEXT)
+        assert parse_kerml_columnar('').node() == parse_kerml('')
+
+    def test_navigation(self):
+        columnar = parse_kerml_columnar(_TEXT)
+        packages = list(columnar.find(Package))
+        assert len(packages) == 2
+        p1, p2 = packages
+        assert columnar.field(p1, 'identification') == Identification(short_name=None, name='P1')
+        assert columnar.node(p2) == parse_kerml(_TEXT).body[1].element
+
+        member = columnar.parent(p1)
+        assert columnar.kind(member) is NonFeatureMember
+        assert columnar.children(member) == [p1]
+        assert columnar.field(member, 'visibility') is None
+
+        for index in columnar.subtree(p1):
+            node = index
+            while node != p1:
+                node = columnar.parent(node)
+                assert node is not None
+        assert set(columnar.subtree(columnar.root)) == set(range(len(columnar)))
+
+    def test_find_and_count(self):
+        columnar = parse_kerml_columnar(_TEXT)
+        assert columnar.count(Feature) == 4
+        assert columnar.count(Feature, is_derived=True) == 2
+        assert columnar.count(Feature, exact=True, is_derived=False) == 2
+        assert columnar.count(Classifier, is_abstract=True) == 1
+        assert columnar.count((Classifier, Package)) == 4
+        assert columnar.count(Feature, value_type=None, is_derived=True) == 2
+        assert columnar.count(Visibility) == 0
+
+        real = QualifiedName(['ScalarValues', 'Real'])
+        typed, = columnar.find(Feature, is_derived=True, is_ordered=False)
+        assert columnar.field(typed, 'identification').name == 'd'
+        assert columnar.count(Identification, name='z w') == 1
+        assert columnar.count(Identification, name='not exist') == 0
+        assert columnar.count(Feature, not_a_field=True) == 0
+        assert real in columnar.atoms
+        with pytest.raises(TypeError):
+            columnar.count(Feature, body=[])
+
+    def test_builder(self):
+        builder = ColumnarCSTBuilder()
+        with pytest.raises(ValueError):
+            builder.build()
+        with pytest.raises(TypeError):
+            builder.add('not a node')
+        with pytest.raises(TypeError):
+            builder.add([1.5])
@@ -0,0 +1,171 @@
+import io
+import os
+import pathlib
+import time
+
+import pytest
+
+from pysysml.kerml.cst import KerMLCstCache, CstCacheStats, get_kerml_cst_cache, parse_kerml, parser_cache_dir
+
+_TEXT = 'package P { classifier C specializes A { feature x : Real [1] = 1.0 + 2.0; } }\n'
+
+
+@pytest.fixture()
+def cache_dir(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / 'cache')
+    monkeypatch.setenv('PYSYSML_CACHE_DIR', cache_dir)
+    return cache_dir
+
+
+@pytest.fixture()
+def kerml_file(tmp_path):
+    file = tmp_path / 'model.kerml'
+    file.write_text(_TEXT)
+    return str(file)
+
+
+@pytest.mark.unittest
+class TestKerMLCstCstCache:
+    def test_parse_file(self, cache_dir, kerml_file):
+        cache = KerMLCstCache()
+        assert cache.cache_dir == os.path.join(parser_cache_dir(), 'cst')
+        assert cache.entries() == []
+
+        cst = cache.parse_file(kerml_file)
+        assert cst == parse_kerml(_TEXT)
+        assert cache.stats == CstCacheStats(hits=0, misses=1, evictions=0)
+        assert len(cache.entries()) == 1
+        assert cache.size > 0
+
+        cached = KerMLCstCache().parse_file(kerml_file)
+        assert cached == cst
+        assert cached is not cst
+        assert cache.parse_file(kerml_file) == cst
+        assert cache.stats == CstCacheStats(hits=1, misses=1, evictions=0)
+
+    def test_parse_file_cached(self, tmp_path, kerml_file):
+        cache = KerMLCstCache(str(tmp_path / 'cst'))
+        cst, hit = cache.parse_file_cached(kerml_file)
+        assert (cst, hit) == (parse_kerml(_TEXT), False)
+        cst, hit = cache.parse_file_cached(kerml_file)
+        assert (cst, hit) == (parse_kerml(_TEXT), True)
+        assert cache.stats == CstCacheStats(hits=1, misses=1, evictions=0)
+
+    def test_content_changed(self, cache_dir, kerml_file):
+        cache = KerMLCstCache()
+        key = cache.key(kerml_file)
+        cache.parse_file(kerml_file)
+
+        pathlib.Path(kerml_file).write_text('package Q;\n')
+        assert cache.key(kerml_file) != key
+        assert cache.parse_file(kerml_file) == parse_kerml('package Q;\n')
+        assert cache.stats.misses == 2
+        assert len(cache.entries()) == 2
+
+        pathlib.Path(kerml_file).write_text(_TEXT.replace('\n', '\r\n'))
+        assert cache.key(kerml_file) == key
+        assert cache.key(kerml_file, encoding='latin-1') != key
+
+    def test_lru_eviction(self, tmp_path):
+        cache = KerMLCstCache(str(tmp_path / 'cst'))
+        files = []
+        for i in range(4):
+            file = tmp_path / f'm{i}.kerml'
+            file.write_text(f'package P{i} {{ feature x{i}; }}\n')
+            files.append(str(file))
+        for file in files[:3]:
+            cache.parse_file(file)
+            time.sleep(0.01)
+        entry_size = os.path.getsize(cache.entries()[0])
+
+        cache.parse_file(files[0])  # used recently, should be kept
+        time.sleep(0.01)
+        cache.max_bytes = entry_size * 2
+        cache.parse_file(files[3])
+        assert cache.stats == CstCacheStats(hits=1, misses=4, evictions=2)
+        assert len(cache.entries()) == 2
+        assert cache.size <= cache.max_bytes
+
+        assert cache.parse_file(files[0]) == parse_kerml(pathlib.Path(files[0]).read_text())
+        assert cache.parse_file(files[3]) == parse_kerml(pathlib.Path(files[3]).read_text())
+        assert cache.stats.hits == 3
+
+    def test_eviction_scans(self, tmp_path, monkeypatch):
+        cache = KerMLCstCache(str(tmp_path / 'cst'))
+        scans = []
+        entries = cache.entries
+        monkeypatch.setattr(cache, 'entries', lambda: scans.append(1) or entries())
+
+        for i in range(32):
+            file = tmp_path / f'm{i}.kerml'
+            file.write_text(f'package P{i:02d};\n')
+            cache.parse_file(str(file))
+        assert len(scans) <= 6
+        assert len(entries()) == 32
+
+        scans.clear()
+        cache.max_bytes = os.path.getsize(entries()[0]) * 4
+        for i in range(32, 64):
+            file = tmp_path / f'm{i}.kerml'
+            file.write_text(f'package P{i:02d};\n')
+            cache.parse_file(str(file))
+            assert sum(os.path.getsize(entry) for entry in entries()) <= cache.max_bytes
+        assert len(scans) <= 12
+        assert len(entries()) == 4
+        assert cache.stats.evictions == 60
+
+    def test_read_once(self, tmp_path, kerml_file, monkeypatch):
+        # the file is changed right after it is read, the CST of the read content is cached
+        cache = KerMLCstCache(str(tmp_path / 'cst'))
+        builtin_open = open
+
+        def _open(file, *args, **kwargs):
+            f = builtin_open(file, *args, **kwargs)
+            if file == kerml_file:
+                data = f.read()
+                f.close()
+                pathlib.Path(kerml_file).write_text('package Q;\n')
+                return io.BytesIO(data)
+            return f
+
+        monkeypatch.setattr('builtins.open', _open)
+        assert cache.parse_file(kerml_file) == parse_kerml(_TEXT)
+        monkeypatch.undo()
+
+        pathlib.Path(kerml_file).write_text(_TEXT)
+        assert cache.parse_file(kerml_file) == parse_kerml(_TEXT)
+        assert cache.stats == CstCacheStats(hits=1, misses=1, evictions=0)
+
+    def test_broken_cache(self, tmp_path, kerml_file):
+        cache = KerMLCstCache(str(tmp_path / 'cst'))
+        cache.parse_file(kerml_file)
+        file, = cache.entries()
+        pathlib.Path(file).write_bytes(b'PYSYSML-KERML-CST\nbroken')
+
+        assert cache.load(cache.key(kerml_file)) is None
+        assert cache.entries() == []
+        assert cache.parse_file(kerml_file) == parse_kerml(_TEXT)
+        assert len(cache.entries()) == 1
+
+    def test_save_failed(self, tmp_path, kerml_file):
+        blocker = tmp_path / 'blocker'
+        blocker.write_text('this is a file')
+        cache = KerMLCstCache(str(blocker / 'cst'))
+        assert cache.parse_file(kerml_file) == parse_kerml(_TEXT)
+        assert cache.entries() == []
+
+    def test_clear(self, tmp_path, kerml_file):
+        cache = KerMLCstCache(str(tmp_path / 'cst'))
+        assert cache.clear() == 0
+        cache.parse_file(kerml_file)
+        assert cache.clear() == 1
+        assert cache.entries() == []
+        assert cache.size == 0
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            KerMLCstCache(max_bytes=0)
+
+    def test_get_kerml_cst_cache(self):
+        assert isinstance(get_kerml_cst_cache(), KerMLCstCache)
+        assert get_kerml_cst_cache() is get_kerml_cst_cache()
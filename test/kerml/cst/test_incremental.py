@@ -0,0 +1,162 @@
+import pytest
+
+from pysysml.kerml.cst import IncrementalKerMLParser, parse_kerml
+from pysysml.kerml.cst.incremental import _common_prefix_length, _common_suffix_length
+
+_TEXT = """
+package P1 {
+    classifier C specializes A { feature x : Real [1] = 1.0 + 2.0; }
+}
+
+#M datatype D { feature v : Boolean = true; }
+comment about D /* comment of D */
+public import P1::*;
+"""
+
+
+@pytest.fixture()
+def parser():
+    return IncrementalKerMLParser(_TEXT)
+
+
+@pytest.mark.unittest
+class TestKerMLCstIncremental:
+    def test_init(self, parser):
+        assert parser.cst == parse_kerml(_TEXT)
+        assert [_TEXT[start:end] for start, end in parser.spans] == [
+            'package P1 {\n    classifier C specializes A { feature x : Real [1] = 1.0 + 2.0; }\n}',
+            '#M datatype D { feature v : Boolean = true; }',
+            'comment about D /* comment of D */',
+            'public import P1::*;',
+        ]
+        assert parser.full_parses == 1
+        assert parser.incremental_parses == 0
+
+    def test_empty(self):
+        parser = IncrementalKerMLParser()
+        assert parser.cst == parse_kerml('')
+        assert parser.spans == []
+        parser.edit(0, 0, 'package P;')
+        assert parser.cst == parse_kerml('package P;')
+        assert parser.full_parses == 2
+
+    @pytest.mark.parametrize(['old', 'new'], [
+        ('1.0 + 2.0', '3.0 * 4.0'),
+        ('specializes A', 'specializes A, B'),
+        ('true', 'false'),
+        ('#M ', ''),
+        ('comment of D', 'new comment'),
+        ('P1::*', 'P2::**'),
+        ('classifier C', ' classifier C2'),
+    ])
+    def test_edit_incremental(self, parser, old, new):
+        body = parser.cst.body
+        start = _TEXT.index(old)
+        cst = parser.edit(start, start + len(old), new)
+        text = _TEXT.replace(old, new, 1)
+        assert parser.text == text
+        assert cst is parser.cst
+        assert cst.body is body
+        assert cst == parse_kerml(text)
+        assert (parser.full_parses, parser.incremental_parses) == (1, 1)
+        assert parser.spans == IncrementalKerMLParser(text).spans
+
+    @pytest.mark.parametrize(['old', 'new'], [
+        ('}\n\n#M', '}\npackage P2;\n#M'),  # crosses the boundary
+        ('\n\n#M', '\nclassifier X;\n#M'),  # between elements
+        ('comment about D /* comment of D */', 'package A; package B;'),  # becomes 2 elements
+        ('comment of D */\npublic', 'x */\nprivate'),
+    ])
+    def test_edit_fallback(self, parser, old, new):
+        start = _TEXT.index(old)
+        parser.edit(start, start + len(old), new)
+        text = _TEXT.replace(old, new, 1)
+        assert parser.cst == parse_kerml(text)
+        assert (parser.full_parses, parser.incremental_parses) == (2, 0)
+        assert parser.spans == IncrementalKerMLParser(text).spans
+
+    @pytest.mark.parametrize(['text', 'start', 'end', 'new'], [
+        ('package P; package Q;', 10, 10, '//'),
+        ('package P; package Q;', 9, 10, '; //'),
+        ('package P;\npackage Q;', 10, 10, ' // note'),
+        ('package P {}package Q;', 12, 12, ' /* c */'),
+    ])
+    def test_edit_end_boundary(self, text, start, end, new):
+        parser = IncrementalKerMLParser(text)
+        parser.edit(start, end, new)
+        new_text = f'{text[:start]}{new}{text[end:]}'
+        assert parser.text == new_text
+        assert parser.cst == parse_kerml(new_text)
+        assert (parser.full_parses, parser.incremental_parses) == (2, 0)
+        assert parser.spans == IncrementalKerMLParser(new_text).spans
+
+    def test_edit_sequence(self, parser):
+        text = _TEXT
+        for old, new in [('true', 'false'), ('= false', ''), ('P1', 'P3'), ('D /*', 'D, C /*'), ('Real', 'Integer')]:
+            start = text.index(old)
+            parser.edit(start, start + len(old), new)
+            text = text.replace(old, new, 1)
+            assert parser.cst == parse_kerml(text)
+            assert parser.spans == IncrementalKerMLParser(text).spans
+        assert parser.incremental_parses == 5
+
+    def test_edit_error(self, parser):
+        start = _TEXT.index('feature x')
+        with pytest.raises(Exception):
+            parser.edit(start, start + len('feature x'), 'feature }')
+        assert parser.text == _TEXT
+        assert parser.cst == parse_kerml(_TEXT)
+
+        with pytest.raises(ValueError):
+            parser.edit(10, 5, '')
+        with pytest.raises(ValueError):
+            parser.edit(0, len(_TEXT) + 1, '')
+
+    def test_edit_transformer_error(self, parser, monkeypatch):
+        # only the parsing errors fall back to a full parse, the bugs of the transformer are raised
+        def _tree_to_cst(tree):
+            raise TypeError('bug of transformer')
+
+        monkeypatch.setattr('pysysml.kerml.cst.incremental._tree_to_cst', _tree_to_cst)
+        start = _TEXT.index('true')
+        with pytest.raises(TypeError):
+            parser.edit(start, start + len('true'), 'false')
+        assert parser.text == _TEXT
+        assert parser.full_parses == 1
+
+    @pytest.mark.parametrize(['a', 'b'], [
+        ('', ''),
+        ('abc', ''),
+        ('abc', 'abc'),
+        ('abc', 'abd'),
+        ('abc', 'xbc'),
+        ('abcabc', 'abc'),
+        ('aaaa', 'aa'),
+        ('package P; package Q;', 'package P; // package Q;'),
+        ('x' * 1000 + 'y' + 'x' * 777, 'x' * 1000 + 'zz' + 'x' * 777),
+    ])
+    def test_common_prefix_and_suffix(self, a, b):
+        for a, b in [(a, b), (b, a)]:
+            prefix = 0
+            while prefix < min(len(a), len(b)) and a[prefix] == b[prefix]:
+                prefix += 1
+            limit = min(len(a), len(b)) - prefix
+            suffix = 0
+            while suffix < limit and a[-suffix - 1] == b[-suffix - 1]:
+                suffix += 1
+            assert _common_prefix_length(a, b) == prefix
+            assert _common_suffix_length(a, b, limit) == suffix
+
+    def test_update(self, parser):
+        text = _TEXT.replace('true', 'false')
+        parser.update(text)
+        assert parser.text == text
+        assert parser.cst == parse_kerml(text)
+        assert parser.incremental_parses == 1
+
+        parser.update(text)
+        assert parser.incremental_parses == 1
+        assert parser.full_parses == 1
+
+        parser.update('package X;')
+        assert parser.cst == parse_kerml('package X;')
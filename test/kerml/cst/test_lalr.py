@@ -0,0 +1,92 @@
+import pytest
+from lark import Lark
+from lark.exceptions import GrammarError, LarkError
+
+from pysysml.kerml.cst import open_kerml_lark_parser, tree_to_kerml_cst, KerMLAutoParser, AutoParseReport, \
+    ParsePathStats
+from pysysml.kerml.cst import lark as kerml_lark
+
+
+@pytest.fixture(scope='module')
+def earley_parser():
+    return open_kerml_lark_parser(start=['owned_expression'], parser='earley')
+
+
+@pytest.fixture(scope='module')
+def lalr_parser():
+    return open_kerml_lark_parser(start=['owned_expression'], parser='lalr')
+
+
+@pytest.mark.unittest
+class TestKerMLCstLALR:
+    def test_lalr_parser(self, lalr_parser):
+        assert isinstance(lalr_parser, Lark)
+        assert lalr_parser.options.parser == 'lalr'
+
+    @pytest.mark.parametrize(['rule', 'text'], [
+        ('package', 'package P { feature x : A [1] :> y = 1 + 2 * 3; }'),
+        ('package', 'package P { import X::*; import N8::*::**; private import A::B::**; }'),
+        ('metadata_access_expression', 'x.metadata'),
+        ('owned_expression', '(a, b, c)'),
+        ('owned_expression', 'if x > 0 ? true else false'),
+        ('feature', 'feature a : A[0..*] ordered :> b redefines c;'),
+        ('classifier', 'classifier C specializes A, B { feature f typed by T; }'),
+        ('metadata_feature', 'metadata m : M about x;'),
+        ('connector', 'connector c : C from a to b;'),
+        ('qualified_name', "A::'b c'::D"),
+    ])
+    def test_lalr_same_as_earley(self, earley_parser, lalr_parser, rule, text):
+        earley_cst = tree_to_kerml_cst(earley_parser.parse(text, start=rule))
+        lalr_cst = tree_to_kerml_cst(lalr_parser.parse(text, start=rule))
+        assert lalr_cst == earley_cst
+
+    def test_auto_parser(self):
+        parser = open_kerml_lark_parser(start=['item_flow'], parser='auto')
+        assert isinstance(parser, KerMLAutoParser)
+        assert parser.report.total == 0
+
+        parser.parse('package P;', start='package')
+        assert parser.report.lalr.count == 1
+        assert parser.report.fallback.count == 0
+
+        tree = parser.parse('flow fuelTank.fuelOut to engine.fuelIn;', start='item_flow')
+        assert tree_to_kerml_cst(tree) == tree_to_kerml_cst(
+            parser.earley_parser.parse('flow fuelTank.fuelOut to engine.fuelIn;', start='item_flow'))
+        assert parser.report.lalr.count == 1
+        assert parser.report.fallback.count == 1
+
+        with pytest.raises(LarkError):
+            parser.parse('package P { feature }', start='package')
+        assert parser.report.failed.count == 1
+        assert parser.report.total == 3
+
+    def test_auto_parser_lalr_unavailable(self, monkeypatch):
+        origin = kerml_lark._open_lark_parser
+
+        def _open_lark_parser(start=None, use_cache=True, parser='earley', all_starts=True):
+            if parser == 'lalr':
+                raise GrammarError('LALR is not supported.')
+            return origin(start, use_cache, parser, all_starts)
+
+        monkeypatch.setattr(kerml_lark, '_open_lark_parser', _open_lark_parser)
+        parser = open_kerml_lark_parser(parser='auto')
+        assert parser.lalr_parser is None
+        parser.parse('package P;', start='package')
+        assert parser.report.lalr.count == 0
+        assert parser.report.fallback.count == 1
+
+    def test_auto_parse_report(self):
+        report = AutoParseReport(
+            lalr=ParsePathStats(count=3, seconds=0.003),
+            fallback=ParsePathStats(count=1, seconds=0.5),
+        )
+        assert report.total == 4
+        lines = str(report).splitlines()
+        assert len(lines) == 4
+        assert lines[1].split() == ['lalr', '3', '75.0%', '0.003', '1.000']
+        assert lines[2].split() == ['fallback', '1', '25.0%', '0.500', '500.000']
+        assert lines[3].split() == ['failed', '0', '0.0%', '0.000', '0.000']
+
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError):
+            open_kerml_lark_parser(parser='cyk')
@@ -0,0 +1,117 @@
+import copy
+import dataclasses
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pysysml.kerml.cst import models, parse_kerml
+from pysysml.kerml.cst.models import QualifiedName, FeatureChain, NameTable
+
+
+@pytest.mark.unittest
+class TestKerMLCstModels:
+    def test_slots(self):
+        for name in dir(models):
+            cls = getattr(models, name)
+            if isinstance(cls, type) and hasattr(cls, '__dataclass_fields__'):
+                assert '__slots__' in cls.__dict__, cls
+                assert '__dict__' not in dir(cls), cls
+
+    def test_pickle(self):
+        cst = parse_kerml('package P { feature x : A [1] = 1 + 2; /* c */ }')
+        assert pickle.loads(pickle.dumps(cst)) == cst
+
+    def test_qualified_name(self):
+        name = QualifiedName(['A', 'B'])
+        assert name.names == ('A', 'B')
+        assert name == QualifiedName(('A', 'B'))
+        assert name != QualifiedName(['A'])
+        assert name != ('A', 'B')
+        assert hash(name) == hash(QualifiedName(['A', 'B']))
+        assert repr(name) == "QualifiedName(names=('A', 'B'))"
+
+        loaded = pickle.loads(pickle.dumps(name))
+        assert loaded == name
+        assert hash(loaded) == hash(name)
+        assert copy.deepcopy(name) == name
+
+    @pytest.mark.parametrize('value', [
+        QualifiedName(['A', 'B']),
+        FeatureChain([QualifiedName(['a']), QualifiedName(['b', 'c'])]),
+    ])
+    def test_immutable(self, value):
+        field, = dataclasses.fields(value)
+        assert field.name in {'names', 'items'}
+        assert dataclasses.asdict(value).keys() == {field.name}
+        for name in (field.name, '_hash', 'other'):
+            with pytest.raises(dataclasses.FrozenInstanceError):
+                setattr(value, name, ())
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            delattr(value, field.name)
+        assert hash(value) == hash(getattr(value, field.name))
+
+    def test_feature_chain(self):
+        chain = FeatureChain([QualifiedName(['a']), QualifiedName(['b', 'c'])])
+        assert chain.items == (QualifiedName(['a']), QualifiedName(['b', 'c']))
+        assert chain == FeatureChain((QualifiedName(['a']), QualifiedName(['b', 'c'])))
+        assert chain != FeatureChain([QualifiedName(['a'])])
+        assert chain.repr == 'a.b::c'
+        assert pickle.loads(pickle.dumps(chain)) == chain
+
+    def test_name_table(self):
+        table = NameTable()
+        name = table.qualified_name(['ScalarValues', 'Real'])
+        assert name == QualifiedName(['ScalarValues', 'Real'])
+        assert table.qualified_name(('ScalarValues', 'Real')) is name
+        assert table.qualified_name(["'ScalarValues'", 'Real']) == name
+        assert table.name("'a b\\'c'") == "a b'c"
+        assert table.qualified_name(['A']) is not table.qualified_name(['B'])
+
+        chain = table.feature_chain([name, table.qualified_name(['x'])])
+        assert table.feature_chain([table.qualified_name(['ScalarValues', 'Real']), table.qualified_name(['x'])]) is chain
+        assert len(table) > 0
+        table.clear()
+        assert len(table) == 0
+        assert table.qualified_name(['ScalarValues', 'Real']) is not name
+
+    def test_name_table_max_size(self):
+        table = NameTable(max_size=3)
+        a = table.qualified_name(['A'])
+        assert len(table) == 2
+        assert table.qualified_name(['A']) is a
+        b = table.qualified_name(['B'])  # full after the name B is interned
+        assert len(table) == 1
+        assert table.qualified_name(['A']) is not a
+        assert table.qualified_name(['A']) == a
+        assert table.qualified_name(['B']) == b
+        for i in range(10):
+            table.name(f'n{i}')
+            assert len(table) <= 3
+
+        with pytest.raises(ValueError):
+            NameTable(max_size=0)
+
+    @pytest.mark.parametrize('max_size', [None, 7])
+    def test_name_table_threads(self, max_size):
+        table = NameTable(max_size=max_size)
+
+        def _intern(index: int):
+            names = [table.qualified_name(['P', f'n{(index + i) % 13}']) for i in range(200)]
+            return names, table.feature_chain(names[:2])
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(_intern, range(64)))
+        for index, (names, chain) in enumerate(results):
+            assert names == [QualifiedName(['P', f'n{(index + i) % 13}']) for i in range(200)]
+            assert chain == FeatureChain(names[:2])
+            if max_size is not None:
+                assert len(table) <= max_size
+        if max_size is None:
+            assert len({id(name) for names, _ in results for name in names}) == 13
+
+    def test_interned_in_cst(self):
+        cst = parse_kerml('package P { feature x : ScalarValues::Real; feature y : ScalarValues::Real; }')
+        x, y = (member.element for member in cst.body[0].element.body)
+        assert x.specializations == y.specializations
+        assert x.specializations[0].items[0] is y.specializations[0].items[0]
@@ -0,0 +1,124 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from lark.exceptions import UnexpectedInput
+
+from pysysml.kerml.cst import parse_kerml, open_kerml_lark_parser, tree_to_kerml_cst, walk, RuleCoverage
+from pysysml.kerml.cst.models import RootNamespace, BinOp
+
+
+@pytest.fixture(scope='module')
+def earley_parser():
+    return open_kerml_lark_parser()
+
+
+@pytest.mark.unittest
+class TestKerMLCstParse:
+    @pytest.mark.parametrize(['parser'], [('auto',), ('lalr',), ('earley',)])
+    @pytest.mark.parametrize(['text'], [
+        ('package P;',),
+        ('package P { feature x : A [1] :> y = 1 + 2 * 3; }',),
+        ('package P { import X::*; classifier C specializes A, B { feature f typed by T; } }\n'
+         'datatype D { feature v : Boolean = true; }',),
+        ('connector c : C from a to b;\ncomment about C /* comment */',),
+    ])
+    def test_parse_kerml(self, earley_parser, text, parser):
+        cst = parse_kerml(text, parser=parser)
+        assert isinstance(cst, RootNamespace)
+        assert cst == tree_to_kerml_cst(earley_parser.parse(text, start='start'))
+
+    @pytest.mark.parametrize(['parser'], [('auto',), ('earley',)])
+    def test_parse_kerml_fallback(self, earley_parser, parser):
+        text = 'flow fuelTank.fuelOut to engine.fuelIn;'
+        assert parse_kerml(text, start='item_flow', parser=parser) == \
+               tree_to_kerml_cst(earley_parser.parse(text, start='item_flow'))
+
+    def test_parse_kerml_fallback_lalr(self):
+        with pytest.raises(UnexpectedInput):
+            parse_kerml('flow fuelTank.fuelOut to engine.fuelIn;', start='item_flow', parser='lalr')
+
+    def test_parse_kerml_snippet(self, earley_parser):
+        assert parse_kerml("A::'b c'::D", start='qualified_name') == \
+               tree_to_kerml_cst(earley_parser.parse("A::'b c'::D", start='qualified_name'))
+
+    @pytest.mark.parametrize(['parser'], [('auto',), ('lalr',), ('earley',)])
+    def test_parse_kerml_error(self, parser):
+        with pytest.raises(UnexpectedInput):
+            parse_kerml('package P { feature }', parser=parser)
+        with pytest.raises(UnexpectedInput):
+            parse_kerml('package about;', parser=parser)
+
+    @pytest.mark.parametrize(['parser'], [('lalr',), ('earley',)])
+    def test_parse_kerml_deep(self, parser):
+        # the tree is transformed without recursion, so the depth is not limited by the recursion limit
+        depth = sys.getrecursionlimit() + 100
+        cst = parse_kerml('package P { feature x = ' + ' + '.join(['1'] * depth) + '; }', parser=parser)
+        assert sum(isinstance(node, BinOp) for node in walk(cst)) == depth - 1
+
+    def test_parse_kerml_invalid_mode(self):
+        with pytest.raises(ValueError):
+            parse_kerml('package P;', parser='cyk')
+
+    @pytest.mark.parametrize(['parser'], [('auto',), ('lalr',), ('earley',)])
+    def test_parse_kerml_coverage(self, parser):
+        coverage = RuleCoverage()
+        text = 'package P { feature x : A [1] = 1 + 2; }'
+        assert parse_kerml(text, parser=parser, coverage=coverage) == parse_kerml(text)
+        assert coverage['package'] == 1
+        assert coverage['feature'] == 1
+        assert coverage['classifier'] == 0
+        hits = coverage.total
+
+        parse_kerml(text, parser=parser, coverage=coverage)
+        assert coverage.total == hits * 2
+        with pytest.raises(UnexpectedInput):
+            parse_kerml('package P { classifier C; feature }', parser=parser, coverage=coverage)
+        if parser != 'earley':
+            # hits of the failed LALR parsing are dropped
+            assert coverage.total == hits * 2
+            assert coverage['classifier'] == 0
+
+    def test_parse_kerml_coverage_fallback(self):
+        coverage = RuleCoverage()
+        parse_kerml('flow fuelTank.fuelOut to engine.fuelIn;', start='item_flow', coverage=coverage)
+        assert coverage['item_flow'] == 1
+
+    def test_parse_kerml_coverage_threads(self):
+        text = 'package P { classifier C; feature x : C [1] = 1 + 2 * 3; }'
+        expected = RuleCoverage()
+        parse_kerml(text, parser='lalr', coverage=expected)
+
+        def _parse(_):
+            coverage = RuleCoverage()
+            for _ in range(20):
+                parse_kerml(text, parser='lalr', coverage=coverage)
+            return coverage
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            coverages = list(executor.map(_parse, range(8)))
+        for coverage in coverages:
+            assert list(coverage.counts) == [count * 20 for count in expected.counts]
+
+    def test_parse_kerml_name_table_bounded(self):
+        from pysysml.kerml.cst.parse import _fused_lalr_parser, _counting_lalr_parser, _NAME_TABLE_MAX_SIZE
+        parse_kerml('package P { feature x : ScalarValues::Real; }', parser='lalr')
+        name_table = _fused_lalr_parser('start').options.transformer.name_table
+        assert 0 < len(name_table) <= name_table.max_size == _NAME_TABLE_MAX_SIZE
+        fused_parser, _, _ = _counting_lalr_parser('start')
+        assert fused_parser.options.transformer.name_table.max_size == _NAME_TABLE_MAX_SIZE
+
+    def test_parse_kerml_threads(self, monkeypatch):
+        from pysysml.kerml.cst.parse import _fused_lalr_parser
+        # a tiny table is cleared while the other threads are interning the names
+        monkeypatch.setattr(_fused_lalr_parser('start').options.transformer.name_table, 'max_size', 5)
+        texts = [f'package P{i} {{ feature x{i % 7} : A{i % 3}::B [1]; feature y :> x{i % 7}.z; }}' for i in range(16)]
+        expected = [parse_kerml(text, parser='earley') for text in texts]
+
+        def _parse(index: int):
+            return [parse_kerml(texts[(index + i) % len(texts)], parser='lalr') for i in range(50)]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(_parse, range(8)))
+        for index, csts in enumerate(results):
+            assert csts == [expected[(index + i) % len(texts)] for i in range(50)]
@@ -0,0 +1,75 @@
+import pytest
+from lark import Lark
+from lark.exceptions import ConfigurationError
+
+from pysysml.kerml.cst import KerMLParserPool, get_kerml_parser_pool, KerMLAutoParser, list_cached_parsers, \
+    open_kerml_lark_parser
+
+
+@pytest.fixture()
+def cache_dir(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / 'cache')
+    monkeypatch.setenv('PYSYSML_CACHE_DIR', cache_dir)
+    return cache_dir
+
+
+@pytest.mark.unittest
+class TestKerMLCstPool:
+    def test_parse(self):
+        pool = KerMLParserPool(max_size=4)
+        assert len(pool) == 0
+        tree = pool.parse('A::B', start='qualified_name')
+        assert tree == open_kerml_lark_parser().parse('A::B', start='qualified_name')
+        assert pool.rules == ['qualified_name']
+        assert 'qualified_name' in pool
+        assert (pool.stats.hits, pool.stats.misses, pool.stats.evictions) == (0, 1, 0)
+
+        pool.parse('A::C', start='qualified_name')
+        assert (pool.stats.hits, pool.stats.misses, pool.stats.evictions) == (1, 1, 0)
+
+    def test_single_start(self):
+        pool = KerMLParserPool()
+        parser = pool.get('qualified_name')
+        assert isinstance(parser, Lark)
+        assert parser.options.start == ['qualified_name']
+        with pytest.raises(ConfigurationError):
+            parser.parse('package P;', start='start')
+
+    def test_lru_eviction(self):
+        pool = KerMLParserPool(max_size=2)
+        first = pool.get('qualified_name')
+        pool.get('literal_integer')
+        assert pool.get('qualified_name') is first
+        pool.get('literal_boolean')
+        assert pool.rules == ['qualified_name', 'literal_boolean']
+        assert pool.stats.evictions == 1
+        assert 'literal_integer' not in pool
+
+        pool.clear()
+        assert len(pool) == 0
+
+    def test_modes(self):
+        pool = KerMLParserPool(parser='lalr')
+        assert pool.get('qualified_name').options.parser == 'lalr'
+        pool = KerMLParserPool(parser='auto')
+        assert isinstance(pool.get('qualified_name'), KerMLAutoParser)
+        assert pool.parse('A::B', start='qualified_name')
+        assert pool.get('qualified_name').report.lalr.count == 1
+
+    def test_disk_cache(self, cache_dir):
+        KerMLParserPool().get('qualified_name')
+        assert len(list_cached_parsers()) == 1
+        KerMLParserPool().get('qualified_name')
+        assert len(list_cached_parsers()) == 1
+        open_kerml_lark_parser(start=['qualified_name'])
+        assert len(list_cached_parsers()) == 2
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            KerMLParserPool(max_size=0)
+        with pytest.raises(ValueError):
+            KerMLParserPool(parser='cyk')
+
+    def test_default_pool(self):
+        assert isinstance(get_kerml_parser_pool(), KerMLParserPool)
+        assert get_kerml_parser_pool() is get_kerml_parser_pool()
@@ -0,0 +1,68 @@
+import pytest
+
+from pysysml.kerml.cst import parse_kerml_recovering, parse_kerml, RecoveryResult, SyntaxDiagnostic
+
+_BROKEN_TEXT = """package A;
+package B {
+    feature x : ;
+    feature y;
+    classifier C { feature z = ; feature w; }
+    connector c from a to b;
+}
+package C;
+"""
+
+_FIXED_TEXT = """package A;
+package B {
+    feature y;
+    classifier C { feature w; }
+    connector c from a to b;
+}
+package C;
+"""
+
+
+@pytest.mark.unittest
+class TestKerMLCstRecover:
+    @pytest.mark.parametrize(['parser'], [('auto',), ('lalr',), ('earley',)])
+    def test_parse_kerml_recovering(self, parser):
+        result = parse_kerml_recovering(_BROKEN_TEXT, parser=parser)
+        assert isinstance(result, RecoveryResult)
+        assert not result.ok
+        assert [(d.line, d.column) for d in result.diagnostics] == [(3, 17), (5, 32)]
+        assert all(isinstance(d, SyntaxDiagnostic) for d in result.diagnostics)
+        assert [_BROKEN_TEXT[d.pos] for d in result.diagnostics] == [';', ';']
+        assert str(result.diagnostics[0]).startswith('3:17: Unexpected ')
+        assert result.cst == parse_kerml(_FIXED_TEXT)
+
+    def test_parse_kerml_recovering_valid(self):
+        text = 'package A { feature x : Real [1] = 1.0; }\ncomment /* c */\n'
+        result = parse_kerml_recovering(text)
+        assert result.ok
+        assert result.diagnostics == []
+        assert result.cst == parse_kerml(text)
+        assert parse_kerml_recovering('').cst == parse_kerml('')
+
+    @pytest.mark.parametrize(['text', 'positions', 'fixed_text'], [
+        ('package A { feature x;', [(1, 23)], 'package A { feature x; }'),
+        ('package A { package B { feature x;\n', [(1, 35), (1, 35)], 'package A { package B { feature x; } }'),
+        ('package A; package B', [(1, 21)], 'package A;'),
+        ('package A { feature x } package B;', [(1, 23)], 'package A { } package B;'),
+        ('} package A;', [(1, 1)], 'package A;'),
+        ('pakage A { feature x; }\npackage B;', [(1, 8)], 'package B;'),
+        ('package A { feature $x; feature y; }', [(1, 21)], 'package A { feature y; }'),
+        ('package A { feature x :> ; /* c */ feature y; }', [(1, 26)], 'package A { /* c */ feature y; }'),
+    ])
+    def test_parse_kerml_recovering_cases(self, text, positions, fixed_text):
+        result = parse_kerml_recovering(text)
+        assert [(d.line, d.column) for d in result.diagnostics] == positions
+        assert result.cst == parse_kerml(fixed_text)
+
+    def test_parse_kerml_recovering_eof(self):
+        diagnostic, = parse_kerml_recovering('package A { feature x;').diagnostics
+        assert diagnostic.message == 'Unexpected end of input'
+        assert diagnostic.pos == 22
+
+    def test_parse_kerml_recovering_invalid(self):
+        with pytest.raises(ValueError):
+            parse_kerml_recovering('package A;', parser='cyk')
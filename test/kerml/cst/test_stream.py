@@ -0,0 +1,66 @@
+import io
+import types
+
+import pytest
+from lark.exceptions import UnexpectedInput
+
+from pysysml.kerml.cst import iter_kerml_elements, parse_kerml
+
+_TEXT = """// leading note
+package P1 {
+    classifier C specializes A { feature x : Real [1] = 1.0 + 2.0; }
+    feature s = "a string with ; and } inside";
+}
+#M datatype 'D; }' { feature v : Boolean = true; }
+comment about D /* comment with ; { and } */
+//* multiline note with ; and {
+*/
+doc /* doc */
+public import P1::*;
+feature f = 1 / 2;
+// trailing note
+"""
+
+
+@pytest.mark.unittest
+class TestKerMLCstStream:
+    @pytest.mark.parametrize(['parser'], [('auto',), ('lalr',)])
+    @pytest.mark.parametrize(['chunk_size'], [(1,), (3,), (16,), (1 << 16,)])
+    def test_iter_kerml_elements(self, parser, chunk_size):
+        elements = iter_kerml_elements(io.StringIO(_TEXT), parser=parser, chunk_size=chunk_size)
+        assert isinstance(elements, types.GeneratorType)
+        assert list(elements) == parse_kerml(_TEXT).body
+
+    def test_iter_kerml_elements_text(self):
+        assert list(iter_kerml_elements(_TEXT)) == parse_kerml(_TEXT).body
+        assert list(iter_kerml_elements('')) == []
+        assert list(iter_kerml_elements('  // only a note\n  ')) == []
+
+    def test_iter_kerml_elements_lazy(self):
+        class _Stream(io.StringIO):
+            def read(self, size=-1):
+                self.reads = getattr(self, 'reads', 0) + 1
+                return super().read(size)
+
+        stream = _Stream('package A;\n' * 100)
+        elements = iter_kerml_elements(stream, chunk_size=16)
+        assert next(elements) == parse_kerml('package A;').body[0]
+        assert stream.reads == 1
+
+    @pytest.mark.parametrize(['parser'], [('auto',), ('lalr',)])
+    def test_iter_kerml_elements_error(self, parser):
+        text = 'package A;\npackage B {\n  feature x : ;\n}\npackage C;'
+        elements = iter_kerml_elements(text, parser=parser)
+        assert next(elements) == parse_kerml('package A;').body[0]
+        with pytest.raises(UnexpectedInput) as ei:
+            next(elements)
+        assert (ei.value.line, ei.value.column) == (3, 15)
+
+    @pytest.mark.parametrize(['text'], [
+        ('package A { feature x;',),
+        ('package A; package B',),
+        ('package A; comment /* not closed',),
+    ])
+    def test_iter_kerml_elements_incomplete(self, text):
+        with pytest.raises(UnexpectedInput):
+            list(iter_kerml_elements(text))
@@ -1,6 +1,6 @@
 from functools import lru_cache
 
-from pysysml.kerml.cst import open_kerml_lark_parser, tree_to_kerml_cst, KerMLTransRecorder
+from pysysml.kerml.cst import open_kerml_lark_parser, KerMLTableTransformer, RuleCoverage
 
 
 @lru_cache()
@@ -9,8 +9,8 @@ def _parser_for_rule(rule_name, no_previous_starts: bool = False):
 
     def _parse(x):
         tree = lark.parse(x, start=rule_name)
-        recorder = KerMLTransRecorder()
-        recorder.transform(tree)
-        return tree_to_kerml_cst(tree), recorder.rules
+        coverage = RuleCoverage()
+        cst = KerMLTableTransformer(coverage=coverage).transform(tree)
+        return cst, coverage.covered
 
     return _parse
@@ -0,0 +1,77 @@
+import pickle
+
+import pytest
+
+from pysysml.kerml.cst import open_kerml_lark_parser, KerMLTableTransformer, RuleCoverage
+from pysysml.kerml.cst.transforms import KERML_TABLE_RULES
+
+_TEXT = 'package P { classifier C; feature x : C [1] = 1 + 2 * 3; feature y; }'
+
+
+@pytest.fixture(scope='module')
+def tree():
+    return open_kerml_lark_parser(start=['start'], parser='lalr', all_starts=False).parse(_TEXT, start='start')
+
+
+@pytest.mark.unittest
+class TestKerMLTransformsCoverage:
+    def test_rules(self):
+        coverage = RuleCoverage()
+        assert coverage.rules == KERML_TABLE_RULES
+        assert len(coverage) == len(KERML_TABLE_RULES)
+        assert coverage.total == 0
+        assert coverage.covered == []
+        assert coverage.uncovered == list(KERML_TABLE_RULES)
+        assert coverage.ratio == 0.0
+        assert RuleCoverage([]).ratio == 0.0
+        with pytest.raises(ValueError):
+            RuleCoverage(['a', 'b', 'a'])
+
+    def test_transform(self, tree):
+        coverage = RuleCoverage()
+        transformer = KerMLTableTransformer(coverage=coverage)
+        assert transformer.transform(tree) == KerMLTableTransformer().transform(tree)
+        assert coverage['package'] == 1
+        assert coverage['classifier'] == 1
+        assert coverage['feature'] == 2
+        assert coverage['data_type'] == 0
+        assert coverage.total == sum(1 for _ in tree.iter_subtrees())
+        assert set(coverage.covered) == {subtree.data for subtree in tree.iter_subtrees()}
+        assert f'/{len(KERML_TABLE_RULES)} rules' in repr(coverage)
+
+        transformer.transform(tree)
+        assert coverage['feature'] == 4
+
+    def test_disabled(self):
+        transformer = KerMLTableTransformer()
+        assert transformer.coverage is None
+        # the rule methods are not wrapped, so nothing is paid when the coverage is not collected
+        assert all(callback.__name__ == name for name, callback in transformer._callbacks.items())
+        assert all(callback.__name__ == '_callback'
+                   for callback in KerMLTableTransformer(coverage=RuleCoverage())._callbacks.values())
+
+    def test_merge(self, tree):
+        c1, c2 = RuleCoverage(), RuleCoverage()
+        KerMLTableTransformer(coverage=c1).transform(tree)
+        KerMLTableTransformer(coverage=c2).transform(tree)
+        merged = RuleCoverage.merged([c1, None, c2])
+        assert merged['feature'] == 4
+        assert merged.total == c1.total * 2
+
+        partial = RuleCoverage(['feature', 'not_a_rule'])
+        partial.merge(c1)
+        assert partial.as_dict() == {'feature': 2, 'not_a_rule': 0}
+        c1.merge(partial)
+        assert c1['feature'] == 4
+
+    def test_pickle_and_clear(self, tree):
+        coverage = RuleCoverage()
+        transformer = KerMLTableTransformer(coverage=coverage)
+        transformer.transform(tree)
+        loaded = pickle.loads(pickle.dumps(coverage))
+        assert loaded.as_dict() == coverage.as_dict()
+
+        coverage.clear()
+        assert coverage.total == 0
+        transformer.transform(tree)
+        assert coverage.as_dict() == loaded.as_dict()
@@ -0,0 +1,80 @@
+import sys
+
+import pytest
+from lark import Tree
+from lark.exceptions import VisitError
+
+from pysysml.kerml.cst import open_kerml_lark_parser, KerMLTransformer, KerMLTableTransformer, tree_to_kerml_cst
+from pysysml.kerml.cst.models import BinOp, NameTable
+from pysysml.kerml.cst.transforms import KERML_TABLE_RULES, KERML_TABLE_SOURCE_SHA256, convert
+from pysysml.utils import file_sha256
+
+_TEXT = """
+package P {
+    private import ScalarValues::*;
+    abstract classifier Base;
+    classifier C specializes Base {
+        feature x : Real [1] = (1.0 + 2.0) * 3.0;
+        derived feature y[0..*] ordered :> x;
+        feature z : Integer = if y > 0 ? 1 else 2;
+    }
+    datatype D { feature v : Boolean = true; }
+    connector c : C from a to b;
+    connector n : C (a, b, c);
+    binding x = y;
+    succession first a then b;
+    function F { in a; return r = a.b; }
+    comment about C /* comment of C */
+}
+library package L { metaclass M; }
+"""
+
+
+@pytest.fixture(scope='module')
+def earley_parser():
+    return open_kerml_lark_parser()
+
+
+@pytest.mark.unittest
+class TestKerMLTransformsTable:
+    def test_source_sha256(self):
+        # run `make kerml` (tools/kerml/generate.py) when KerMLTransformer is changed
+        assert KERML_TABLE_SOURCE_SHA256 == file_sha256(convert.__file__)
+
+    def test_rules(self):
+        for rule in KERML_TABLE_RULES:
+            assert not hasattr(getattr(KerMLTableTransformer, rule), 'visit_wrapper')
+            assert hasattr(getattr(KerMLTransformer, rule), 'visit_wrapper')
+
+    def test_same_as_transformer(self, earley_parser):
+        tree = earley_parser.parse(_TEXT, start='start')
+        expected = KerMLTransformer().transform(tree)
+        assert KerMLTableTransformer().transform(tree) == expected
+        assert tree_to_kerml_cst(tree) == expected
+
+    def test_bracket_expression(self, earley_parser):
+        tree = earley_parser.parse('package P { feature x = (1 + 2) * (3); }', start='start')
+        assert KerMLTableTransformer().transform(tree) == KerMLTransformer().transform(tree)
+
+    def test_name_table(self, earley_parser):
+        name_table = NameTable()
+        tree = earley_parser.parse(_TEXT, start='start')
+        KerMLTableTransformer(name_table=name_table).transform(tree)
+        assert name_table.name('C') == 'C'
+        assert len(name_table) > 0
+
+    def test_visit_error(self):
+        tree = Tree('literal_integer', [])
+        with pytest.raises(VisitError):
+            KerMLTableTransformer().transform(tree)
+
+    def test_deep_tree(self, earley_parser):
+        depth = sys.getrecursionlimit() + 100
+        tree = earley_parser.parse('feature x = ' + ' + '.join(['1'] * depth) + ';', start='start')
+        cst = KerMLTableTransformer().transform(tree)
+        feature = cst.body[0].element
+        count = 0
+        value = feature.value
+        while isinstance(value, BinOp):
+            value, count = value.x, count + 1
+        assert count == depth - 1
@@ -3,7 +3,7 @@ from functools import lru_cache
 
 import pytest
 from hbutils.random import random_sha1_with_timestamp
-from lark import Lark, GrammarError, UnexpectedCharacters, Token, UnexpectedEOF
+from lark import Lark, UnexpectedCharacters, Token, UnexpectedEOF
 
 from pysysml.kerml.cst.transforms import tree_to_kerml_cst
 
@@ -122,17 +122,17 @@ class TestKerMLTransformsTokens:
         ("'\\n\\r\\b\\t\\f\\'\\\"'*10", UnexpectedCharacters),  # Invalid because it ends with an unescaped single quote
 
         # preserved words
-        ('about', GrammarError),
-        ('abstract', GrammarError),
-        ('alias', GrammarError),
-        ('all', GrammarError),
-        ('and', GrammarError),
-        ('as', GrammarError),
-        ('assoc', GrammarError),
-        ('behavior', GrammarError),
-        ('binding', GrammarError),
-        ('bool', GrammarError),
-        ('by', GrammarError),
+        ('about', UnexpectedCharacters),
+        ('abstract', UnexpectedCharacters),
+        ('alias', UnexpectedCharacters),
+        ('all', UnexpectedCharacters),
+        ('and', UnexpectedCharacters),
+        ('as', UnexpectedCharacters),
+        ('assoc', UnexpectedCharacters),
+        ('behavior', UnexpectedCharacters),
+        ('binding', UnexpectedCharacters),
+        ('bool', UnexpectedCharacters),
+        ('by', UnexpectedCharacters),
 
     ])
     def test_name(self, text: str, expected):
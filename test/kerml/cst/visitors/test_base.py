@@ -0,0 +1,177 @@
+import dataclasses
+import sys
+
+import pytest
+
+from pysysml.kerml.cst import parse_kerml, walk, CSTVisitor, CSTTransformer, ColumnarCST
+from pysysml.kerml.cst import models
+from pysysml.kerml.cst.models import BinOp, IntValue, Feature, Classifier, Package, QualifiedName, Identification, \
+    Step, Class, RootNamespace
+from pysysml.kerml.cst.visitors import CST_NODE_FIELDS, CST_NODE_METHODS
+
+_TEXT = """
+package P {
+    classifier C specializes Base {
+        feature x : Real [1] = 1 + 2 * 3;
+        step s;
+    }
+    class K;
+}
+"""
+
+
+def _deep_expression(depth: int) -> str:
+    return 'package P { feature x = ' + ' + '.join(['1'] * depth) + '; }'
+
+
+def _deep_packages(depth: int) -> str:
+    return 'package P { ' * depth + '}' * depth
+
+
+@pytest.mark.unittest
+class TestKerMLCstVisitorsBase:
+    def test_tables(self):
+        all_models = [value for value in vars(models).values()
+                      if isinstance(value, type) and dataclasses.is_dataclass(value)]
+        assert set(CST_NODE_FIELDS) == set(all_models)
+        assert set(CST_NODE_METHODS) == set(all_models)
+        for cls, fields in CST_NODE_FIELDS.items():
+            assert set(fields) <= {field.name for field in dataclasses.fields(cls) if field.init}
+        assert CST_NODE_FIELDS[BinOp] == ('x', 'y')
+        assert CST_NODE_FIELDS[QualifiedName] == ()
+        assert CST_NODE_METHODS[BinOp] == 'bin_op'
+        assert CST_NODE_METHODS[Class] == 'class_'
+
+    def test_walk(self):
+        cst = parse_kerml(_TEXT)
+        nodes = list(walk(cst))
+        assert nodes[0] is cst
+        assert [node.identification.name for node in nodes if isinstance(node, Feature)] == ['x', 's']
+        assert [node.value for node in nodes if isinstance(node, IntValue)] == [1, 1, 2, 3]
+        assert any(isinstance(node, QualifiedName) for node in nodes)
+
+        post_nodes = list(walk(cst, topdown=False))
+        assert post_nodes[-1] is cst
+        assert len(post_nodes) == len(nodes)
+        assert [node.value for node in post_nodes if isinstance(node, IntValue)] == [1, 1, 2, 3]
+        assert post_nodes.index(nodes[1]) > post_nodes.index(nodes[2])
+
+        assert list(walk([cst, 'x', None])) == nodes
+        assert list(walk('x')) == []
+
+    def test_walk_unknown_dataclass(self):
+        @dataclasses.dataclass
+        class Wrapper:
+            name: str
+            inner: object
+
+        node = Wrapper('w', [IntValue('1'), Wrapper('v', IntValue('2'))])
+        assert [type(item).__name__ for item in walk(node)] == ['Wrapper', 'IntValue', 'Wrapper', 'IntValue']
+
+    def test_visitor(self):
+        class _Visitor(CSTVisitor):
+            def __init__(self):
+                self.visited = []
+
+            def feature(self, node):
+                self.visited.append(('feature', node.identification.name))
+
+            def class_(self, node):
+                self.visited.append(('class', node.identification.name))
+
+            def classifier(self, node):
+                self.visited.append(('classifier', node.identification.name))
+
+            def package(self, node):
+                self.visited.append(('package', node.identification.name))
+
+        cst = parse_kerml(_TEXT)
+        visitor = _Visitor()
+        assert visitor.visit(cst) is cst
+        # step is dispatched to the method of its base class feature
+        assert visitor.visited == [('feature', 'x'), ('feature', 's'), ('classifier', 'C'), ('class', 'K'),
+                                   ('package', 'P')]
+
+        visitor = _Visitor()
+        visitor.visit_topdown(cst)
+        assert visitor.visited == [('package', 'P'), ('classifier', 'C'), ('feature', 'x'), ('feature', 's'),
+                                   ('class', 'K')]
+
+    def test_visitor_default(self):
+        class _Visitor(CSTVisitor):
+            def __init__(self):
+                self.count = 0
+
+            def __default__(self, node):
+                self.count += 1
+
+        cst = parse_kerml(_TEXT)
+        visitor = _Visitor()
+        visitor.visit(cst)
+        assert visitor.count == len(list(walk(cst)))
+
+    def test_transformer(self):
+        class _Transformer(CSTTransformer):
+            def int_value(self, node):
+                return IntValue(str(node.value * 10))
+
+            def step(self, node):
+                return dataclasses.replace(node, identification=Identification(short_name=None, name='t'))
+
+        cst = parse_kerml(_TEXT)
+        original = parse_kerml(_TEXT)
+        result = _Transformer().transform(cst)
+        assert cst == original
+        assert [node.value for node in walk(result) if isinstance(node, IntValue)] == [10, 10, 20, 30]
+        assert [node.identification.name for node in walk(result) if isinstance(node, Step)] == ['t']
+        assert [node.identification.name for node in walk(result) if isinstance(node, Classifier)] == ['C', 'K']
+
+        # the unchanged subtrees are shared
+        class_k = result.body[0].element.body[1]
+        assert class_k is cst.body[0].element.body[1]
+        assert result.body[0] is not cst.body[0]
+
+    def test_transformer_unchanged(self):
+        cst = parse_kerml(_TEXT)
+        assert CSTTransformer().transform(cst) is cst
+        assert CSTTransformer().transform('x') == 'x'
+
+    def test_transformer_replace_root(self):
+        class _Transformer(CSTTransformer):
+            def root_namespace(self, node):
+                return len(node.body)
+
+        assert _Transformer().transform(parse_kerml(_TEXT)) == 1
+
+    @pytest.mark.parametrize(['text', 'cls', 'count'], [
+        (_deep_expression(sys.getrecursionlimit() * 2), BinOp, sys.getrecursionlimit() * 2 - 1),
+        (_deep_packages(sys.getrecursionlimit()), Package, sys.getrecursionlimit()),
+    ])
+    def test_deep_tree(self, text, cls, count):
+        cst = parse_kerml(text, parser='lalr')
+        assert sum(isinstance(node, cls) for node in walk(cst)) == count
+        assert sum(isinstance(node, cls) for node in walk(cst, topdown=False)) == count
+
+        class _Counter(CSTVisitor):
+            def __init__(self):
+                self.count = 0
+
+            def __default__(self, node):
+                if isinstance(node, cls):
+                    self.count += 1
+
+        counter = _Counter()
+        counter.visit(cst)
+        assert counter.count == count
+
+        class _Transformer(CSTTransformer):
+            def int_value(self, node):
+                return IntValue('2')
+
+        result = _Transformer().transform(cst)
+        assert isinstance(result, RootNamespace)
+        assert sum(isinstance(node, cls) for node in walk(result)) == count
+
+        columnar = ColumnarCST.from_cst(cst)
+        assert columnar.count(cls) == count
+        assert isinstance(columnar.node(), RootNamespace)
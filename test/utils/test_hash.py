@@ -1,6 +1,6 @@
 import pytest
 
-from pysysml.utils import file_sha256
+from pysysml.utils import file_sha256, text_sha256
 from ..testings import get_testfile
 
 
@@ -25,3 +25,15 @@ class TestUtilsHash:
     ])
     def test_file_sha256(self, file, sha256_hash):
         assert file_sha256(file) == sha256_hash
+
+    @pytest.mark.parametrize(['file'], [
+        (get_testfile('requirements-where.txt'),),
+        (get_testfile('korean.txt'),),
+        (get_testfile('empty'),),
+        (get_testfile('english.txt'),),
+    ])
+    def test_text_sha256(self, file):
+        with open(file, 'rb') as f:
+            data = f.read()
+        assert text_sha256(data) == file_sha256(file)
+        assert text_sha256(data.replace(b'\n', b'\r\n')) == file_sha256(file)
@@ -1,9 +1,10 @@
 import os.path
+import textwrap
 
 import lark
 import pytest
 
-from pysysml.utils import list_rules_from_grammar
+from pysysml.utils import list_rules_from_grammar, override_grammar_definitions
 
 
 @pytest.fixture()
@@ -123,3 +124,38 @@ class TestUtilsLark:
                    'expansions', 'alias', 'expansion', 'expr', 'atom', 'value',
                    'item',
                }
+
+
+@pytest.mark.unittest
+class TestUtilsLarkOverride:
+    def test_override_grammar_definitions(self):
+        grammar_code = textwrap.dedent("""
+            # comment line
+            start: item+
+            ?item: NAME
+                 | NUMBER -> number_item
+            NAME: /[a-z]+/
+            NUMBER: /[0-9]+/
+            %ignore " "
+        """).lstrip()
+        override_code = textwrap.dedent("""
+            // override the item
+            ?item.2: NAME
+                   | "-"? NUMBER -> number_item
+            NUMBER.3: /[0-9]+(\\.[0-9]+)?/
+            extra: NAME
+        """).lstrip()
+
+        assert override_grammar_definitions(grammar_code, override_code) == textwrap.dedent("""
+            # comment line
+            start: item+
+            ?item.2: NAME
+                   | "-"? NUMBER -> number_item
+            NAME: /[a-z]+/
+            NUMBER.3: /[0-9]+(\\.[0-9]+)?/
+            %ignore " "
+            extra: NAME
+        """).lstrip()
+
+    def test_override_grammar_definitions_empty(self, lark_lark_code):
+        assert override_grammar_definitions(lark_lark_code, '').splitlines() == lark_lark_code.splitlines()
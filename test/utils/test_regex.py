@@ -0,0 +1,36 @@
+import re
+
+import pytest
+
+from pysysml.utils import words_regex
+
+
+@pytest.mark.unittest
+class TestUtilsRegex:
+    @pytest.mark.parametrize(['words', 'regex'], [
+        (['a'], '(?:a)'),
+        (['a', 'ab'], '(?:ab?)'),
+        (['abc', 'abd'], '(?:ab(?:c|d))'),
+        (['in', 'inout', 'inv', 'out'], '(?:in(?:out|v)?|out)'),
+        (['a.b', 'a+'], r'(?:a(?:\+|\.b))'),
+    ])
+    def test_words_regex(self, words, regex):
+        assert words_regex(words) == regex
+
+    @pytest.mark.parametrize(['words'], [
+        (['in', 'inout', 'inv', 'out', 'o'],),
+        (['abstract', 'about', 'a', 'ab', 'abs', 'all', 'alias'],),
+        (['x', 'xy', 'xyz', 'y', 'yz', 'z'],),
+    ])
+    def test_words_regex_match(self, words):
+        pattern = re.compile(words_regex(words))
+        candidates = {word[:i] for word in words for i in range(len(word) + 1)} | \
+                     {f'{word}_' for word in words} | {'', 'q', 'inn', 'abst'}
+        for candidate in candidates:
+            assert bool(pattern.fullmatch(candidate)) == (candidate in words), candidate
+
+    def test_words_regex_invalid(self):
+        with pytest.raises(ValueError):
+            words_regex([])
+        with pytest.raises(ValueError):
+            words_regex(['a', ''])
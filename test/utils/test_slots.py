@@ -0,0 +1,81 @@
+import copy
+import dataclasses
+import pickle
+from typing import List, Optional
+
+import pytest
+
+from pysysml.utils import slots_dataclass
+
+
+@slots_dataclass
+class _Base:
+    name: str
+
+
+@slots_dataclass
+class _Child(_Base):
+    items: List[int]
+    parent: Optional[_Base]
+
+    @property
+    def size(self):
+        return len(self.items)
+
+
+@slots_dataclass(frozen=True)
+class _Frozen:
+    __slots__ = ('_total',)
+    x: int
+    y: int
+
+    def __post_init__(self):
+        object.__setattr__(self, '_total', self.x + self.y)
+
+
+@pytest.mark.unittest
+class TestUtilsSlots:
+    def test_slots_dataclass(self):
+        assert _Base.__slots__ == ('name',)
+        assert _Child.__slots__ == ('items', 'parent')
+        assert _Child.__name__ == '_Child'
+        assert _Child.__qualname__ == '_Child'
+
+        child = _Child('c', [1, 2], _Base('b'))
+        assert not hasattr(child, '__dict__')
+        assert child.size == 2
+        assert child == _Child(name='c', items=[1, 2], parent=_Base('b'))
+        assert child != _Child('c', [1], None)
+        assert repr(child) == "_Child(name='c', items=[1, 2], parent=_Base(name='b'))"
+        with pytest.raises(AttributeError):
+            child.other = 1
+
+    def test_slots_dataclass_copy(self):
+        child = _Child('c', [1, 2], _Base('b'))
+        assert pickle.loads(pickle.dumps(child)) == child
+        assert copy.deepcopy(child) == child
+        assert copy.copy(child).items is child.items
+
+    def test_slots_dataclass_default(self):
+        with pytest.raises(TypeError):
+            @slots_dataclass
+            class _WithDefault:
+                x: int = 1
+
+    def test_slots_dataclass_frozen(self):
+        assert _Frozen.__slots__ == ('x', 'y', '_total')
+        assert [field.name for field in dataclasses.fields(_Frozen)] == ['x', 'y']
+
+        value = _Frozen(1, 2)
+        assert not hasattr(value, '__dict__')
+        assert value._total == 3
+        assert value == _Frozen(1, 2)
+        assert hash(value) == hash(_Frozen(1, 2))
+        assert repr(value) == '_Frozen(x=1, y=2)'
+        for name in ('x', '_total', 'other'):
+            with pytest.raises(dataclasses.FrozenInstanceError):
+                setattr(value, name, 0)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            del value.x
+        assert dataclasses.replace(value, y=5)._total == 6
+        assert pickle.loads(pickle.dumps(value))._total == 3
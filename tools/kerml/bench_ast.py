@@ -0,0 +1,164 @@
+"""
+Benchmark of the cached derived properties of the KerML AST elements.
+
+A synthetic tree of namespaces (owned by ``OwningMembership`` relationships) is built, then the
+tree-wide queries (the qualified names and the owned elements of all the elements) are measured
+with the uncached derivations (the ones before the cache was introduced), with a cold cache and
+with a warm cache. The lookups by qualified names are measured with a scan of all the elements
+and with :meth:`Env.lookup`. The constraints of all the elements are checked with
+:meth:`Env.validate`, then again incrementally after renaming one namespace. At last, each
+namespace recursively imports its next sibling (so the siblings form import cycles), and the
+name of each element is resolved from its former sibling with :meth:`Namespace.resolve`, cold
+and again after renaming one namespace. The best time of several runs is reported.
+Usage: ``python -m tools.kerml.bench_ast [-d DEPTH] [-w WIDTH] [-r REPEAT] [-l LOOKUPS]``.
+"""
+
+import argparse
+import gc
+import time
+from typing import Callable, List, Optional
+
+from pysysml.kerml.ast import Env, Element, Namespace, OwningMembership, NamespaceImport
+
+
+def synthetic_tree(env: Env, depth: int, width: int) -> List[Element]:
+    root = Namespace(env, declared_name='Root')
+    elements, level = [root], [root]
+    for i in range(depth):
+        next_level = []
+        for parent in level:
+            for j in range(width):
+                child = Namespace(env, declared_name=f'N{i}_{j}')
+                OwningMembership(env, owning_related_element=parent, owned_related_elements=[child])
+                next_level.append(child)
+        elements.extend(next_level)
+        level = next_level
+    return elements
+
+
+def import_siblings(env: Env, elements: List[Element]):
+    for element in elements[1:]:
+        siblings = element.owning_namespace.owned_members
+        sibling = siblings[(siblings.index(element) + 1) % len(siblings)]
+        NamespaceImport(env, owning_related_element=element, imported_elements=[sibling], is_recursive=True)
+
+
+def _uncached_owner(element: Element) -> Optional[Element]:
+    owning_relationship = element.owning_relationship
+    return owning_relationship.owning_related_element if owning_relationship else None
+
+
+def _uncached_owning_namespace(element: Element) -> Optional[Namespace]:
+    owning_relationship = element.owning_relationship
+    if isinstance(owning_relationship, OwningMembership):
+        return owning_relationship.membership_owning_namespace
+    return None
+
+
+def _uncached_qualified_name(element: Element) -> Optional[str]:
+    if not _uncached_owning_namespace(element):
+        return None
+    if _uncached_owner(_uncached_owning_namespace(element)) is None:
+        return element.escaped_name()
+    if _uncached_qualified_name(_uncached_owning_namespace(element)) is None or element.escaped_name() is None:
+        return None
+    return f"{_uncached_qualified_name(_uncached_owning_namespace(element))}::{element.escaped_name()}"
+
+
+def _uncached_owned_elements(element: Element) -> List[Element]:
+    retval = []
+    for relationship in element.owned_relationships:
+        retval.extend(relationship.owned_related_elements)
+    return retval
+
+
+def _scan_lookup(env: Env, name: str) -> Optional[Element]:
+    for element in env._elements.values():
+        if isinstance(element, Element) and element.qualified_name == name:
+            return element
+    return None
+
+
+def _clear_caches(elements: List[Element]):
+    for element in elements:
+        element._derived.clear()
+        for relationship in element.owned_relationships:
+            relationship._derived.clear()
+
+
+def _best_time(fn: Callable[[], object], repeat: int, setup: Optional[Callable[[], object]] = None) -> float:
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        gc.collect()
+        start_time = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start_time)
+    return min(times)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('-d', '--depth', type=int, default=6, help='Depth of the namespace tree.')
+    arg_parser.add_argument('-w', '--width', type=int, default=5, help='Owned namespaces of each namespace.')
+    arg_parser.add_argument('-r', '--repeat', type=int, default=3, help='Runs of each measurement.')
+    arg_parser.add_argument('-l', '--lookups', type=int, default=100, help='Qualified names to look up.')
+    args = arg_parser.parse_args()
+
+    env = Env()
+    elements = synthetic_tree(env, args.depth, args.width)
+    print(f'Elements: {len(env)}, namespaces: {len(elements)}, depth: {args.depth}, width: {args.width}.')
+    assert [_uncached_qualified_name(e) for e in elements] == [e.qualified_name for e in elements]
+
+    queries = [
+        ('qualified_name', _uncached_qualified_name, lambda e: e.qualified_name),
+        ('owned_elements', _uncached_owned_elements, lambda e: e.owned_elements),
+    ]
+    print(f'{"Query":<16}{"Uncached (s)":>14}{"Cold (s)":>12}{"Warm (s)":>12}{"Speedup":>10}')
+    for name, uncached_fn, cached_fn in queries:
+        uncached_time = _best_time(lambda: [uncached_fn(e) for e in elements], args.repeat)
+        cold_time = _best_time(lambda: [cached_fn(e) for e in elements], args.repeat,
+                               setup=lambda: _clear_caches(elements))
+        warm_time = _best_time(lambda: [cached_fn(e) for e in elements], args.repeat)
+        print(f'{name:<16}{uncached_time:>14.3f}{cold_time:>12.3f}{warm_time:>12.3f}'
+              f'{uncached_time / warm_time:>9.1f}x')
+
+    names = [element.qualified_name for element in elements[1::max(len(elements) // args.lookups, 1)]]
+    index_time = _best_time(lambda: env.lookup(''), 1)  # the index is built on the first lookup
+    scan_time = _best_time(lambda: [_scan_lookup(env, name) for name in names], args.repeat)
+    lookup_time = _best_time(lambda: [env.lookup(name) for name in names], args.repeat)
+    print(f'Lookup of {len(names)} qualified names: scan {scan_time:.3f}s, index {lookup_time:.6f}s '
+          f'({scan_time / lookup_time:.1f}x), building the index {index_time:.3f}s.')
+
+    full_time = _best_time(lambda: env.validate(incremental=False), args.repeat)
+    renamed = elements[len(elements) // 2]
+
+    def _rename_and_validate():
+        renamed.declared_name = f'{renamed.declared_name}_'
+        env.validate()
+
+    incremental_time = _best_time(_rename_and_validate, args.repeat)
+    print(f'Validation of {len(env)} elements: full {full_time:.3f}s, '
+          f'incremental after a rename {incremental_time:.6f}s.')
+
+    import_siblings(env, elements)
+    pairs = [(element.owning_namespace.owned_members[i - 1], element)
+             for element in elements[1:] for i in [element.owning_namespace.owned_members.index(element)]]
+    assert all(namespace.resolve([element.name]) is element.owning_membership for namespace, element in pairs)
+    resolve_time = _best_time(lambda: [namespace.resolve([element.name]) for namespace, element in pairs],
+                              args.repeat, setup=lambda: env.incremental_memo.clear())
+    tables = sum(len(namespace.imported_memberships()) for namespace, _ in pairs)
+    print(f'Resolution of {len(pairs)} names with recursive import cycles: {resolve_time:.3f}s cold, '
+          f'{tables} imported memberships in total.')
+
+    def _rename_and_resolve():
+        renamed.declared_name = f'{renamed.declared_name}_'
+        return [namespace.resolve([element.name]) for namespace, element in pairs]
+
+    edit_time = _best_time(_rename_and_resolve, args.repeat)
+    print(f'Resolution of {len(pairs)} names again after a rename: {edit_time:.3f}s.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Memory benchmark of the KerML CST models.
+
+The CST of a synthetic model is rebuilt under ``tracemalloc`` with the model classes of
+:mod:`pysysml.kerml.cst.models`, with plain dataclass twins of them (the same fields, with
+per-instance ``__dict__``), and converted to :class:`ColumnarCST`, so the bytes per node of
+these layouts are measured in the same process. The strings are shared with the original
+CST, so they are not counted in any layout.
+Usage: ``python -m tools.kerml.bench_memory [-n PACKAGES]``.
+"""
+
+import argparse
+import dataclasses
+import gc
+import tracemalloc
+from typing import Any, Callable, Dict
+
+from pysysml.kerml.cst import parse_kerml, ColumnarCST
+from tools.kerml.bench_parse import synthetic_model
+
+
+def _rebuild(node: Any, factory: Callable[[type], type], memo: Dict[int, Any]) -> Any:
+    # shared objects (such as the interned names) are kept shared
+    if id(node) in memo:
+        return memo[id(node)]
+    if dataclasses.is_dataclass(node):
+        new_node = factory(type(node))(**{
+            field.name: _rebuild(getattr(node, field.name), factory, memo)
+            for field in dataclasses.fields(node) if field.init
+        })
+    elif isinstance(node, (list, tuple)):
+        new_node = type(node)(_rebuild(item, factory, memo) for item in node)
+    else:
+        return node
+    memo[id(node)] = new_node
+    return new_node
+
+
+def _count_nodes(node: Any) -> int:
+    if dataclasses.is_dataclass(node):
+        return 1 + sum(_count_nodes(getattr(node, field.name)) for field in dataclasses.fields(node))
+    elif isinstance(node, (list, tuple)):
+        return sum(_count_nodes(item) for item in node)
+    else:
+        return 0
+
+
+def _dict_twin_factory() -> Callable[[type], type]:
+    twins: Dict[type, type] = {}
+
+    def _factory(cls: type) -> type:
+        if cls not in twins:
+            twins[cls] = dataclasses.make_dataclass(
+                cls.__name__, [(field.name, field.type) for field in dataclasses.fields(cls) if field.init], eq=False)
+        return twins[cls]
+
+    return _factory
+
+
+def _objects(factory: Callable[[type], type]) -> Callable[[Any], Any]:
+    def _build(cst: Any) -> Any:
+        memo = {}
+        result = _rebuild(cst, factory, memo)
+        memo.clear()
+        return result
+
+    return _build
+
+
+def _columnar(cst: Any) -> Any:
+    return ColumnarCST.from_cst(_objects(lambda cls: cls)(cst))
+
+
+def _measure(cst: Any, build: Callable[[Any], Any]) -> int:
+    build(cst)  # create the twin classes before measuring
+
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    result = build(cst)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current - base
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('-n', '--packages', type=int, default=500, help='Packages in the synthetic model.')
+    args = arg_parser.parse_args()
+
+    text = synthetic_model(args.packages)
+    cst = parse_kerml(text, parser='lalr')
+    nodes = _count_nodes(cst)
+    print(f'Text size: {len(text)} chars, {len(text.splitlines())} lines, {nodes} CST nodes.')
+
+    print(f'{"Layout":<12}{"Total (MiB)":>14}{"Bytes per node":>18}')
+    layouts = [
+        ('__dict__', _objects(_dict_twin_factory())),
+        ('models', _objects(lambda cls: cls)),
+        ('columnar', _columnar),
+    ]
+    for name, build in layouts:
+        size = _measure(cst, build)
+        print(f'{name:<12}{size / 1048576:>14.2f}{size / nodes:>18.1f}')
+
+
+if __name__ == '__main__':
+    main()
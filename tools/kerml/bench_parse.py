@@ -0,0 +1,116 @@
+"""
+Benchmark of the two-pass (parse, then transform), the fused and the streaming KerML parsing.
+
+Each mode is measured in a fresh process, so the peak RSS values are comparable.
+Usage: ``python -m tools.kerml.bench_parse [-n PACKAGES] [files ...]``, a synthetic
+model is generated when no file is given.
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+import tracemalloc
+
+from pysysml.kerml.cst import open_kerml_lark_parser, tree_to_kerml_cst, parse_kerml, iter_kerml_elements
+
+_PACKAGE_TEMPLATE = """
+package P{i} {{
+    import ScalarValues::*;
+    abstract classifier Base{i};
+    classifier C{i} specializes Base{i} {{
+        feature x : Real [1] = 1.0 + 2.0 * 3.0;
+        feature y[0..*] ordered :> x;
+        feature z : Integer = if y > 0 ? 1 else 2;
+    }}
+    datatype D{i} {{ feature v : Boolean = true; }}
+    connector c{i} : C{i} from a{i} to b{i};
+    comment about C{i} /* comment of C{i} */
+}}
+"""
+
+
+def synthetic_model(packages: int) -> str:
+    return ''.join(_PACKAGE_TEMPLATE.format(i=i) for i in range(packages))
+
+
+def _two_pass(file: str):
+    with open(file, 'r', encoding='utf-8') as f:
+        text = f.read()
+    tree = open_kerml_lark_parser(start=['start'], parser='lalr', all_starts=False).parse(text, start='start')
+    return tree_to_kerml_cst(tree)
+
+
+def _fused(file: str):
+    with open(file, 'r', encoding='utf-8') as f:
+        text = f.read()
+    return parse_kerml(text, parser='lalr')
+
+
+def _stream(file: str):
+    with open(file, 'r', encoding='utf-8') as f:
+        for _ in iter_kerml_elements(f, parser='lalr'):
+            pass
+
+
+_MODES = {'two-pass': _two_pass, 'fused': _fused, 'stream': _stream}
+
+
+def _measure(mode: str, file: str, warmup_file: str, queue):
+    fn = _MODES[mode]
+    fn(warmup_file)  # parser building and loading is not measured
+    base_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    fn(file)
+    seconds = time.perf_counter() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # run again without tracemalloc, which slows the allocations down
+    start_time = time.perf_counter()
+    fn(file)
+    seconds = min(seconds, time.perf_counter() - start_time)
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((seconds, peak, rss_kb - base_rss_kb))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('-n', '--packages', type=int, default=500, help='Packages in the synthetic model.')
+    arg_parser.add_argument('files', nargs='*', help='KerML files to parse.')
+    args = arg_parser.parse_args()
+
+    if args.files:
+        texts = []
+        for file in args.files:
+            with open(file, 'r', encoding='utf-8') as f:
+                texts.append(f.read())
+        text = '\n'.join(texts)
+    else:
+        text = synthetic_model(args.packages)
+    print(f'Text size: {len(text)} chars, {len(text.splitlines())} lines.')
+
+    with tempfile.TemporaryDirectory() as td:
+        file, warmup_file = os.path.join(td, 'model.kerml'), os.path.join(td, 'warmup.kerml')
+        with open(file, 'w', encoding='utf-8') as f:
+            f.write(text)
+        with open(warmup_file, 'w', encoding='utf-8') as f:
+            f.write('package Warmup;')
+
+        ctx = multiprocessing.get_context('spawn')
+        print(f'{"Mode":<10}{"Seconds":>10}{"Peak alloc (MiB)":>18}{"Peak RSS growth (MiB)":>24}')
+        for mode in _MODES:
+            queue = ctx.Queue()
+            process = ctx.Process(target=_measure, args=(mode, file, warmup_file, queue))
+            process.start()
+            seconds, peak, rss_kb = queue.get()
+            process.join()
+            print(f'{mode:<10}{seconds:>10.3f}{peak / 1048576:>18.2f}{rss_kb / 1024:>24.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark of the transformers from the lark tree to the KerML CST.
+
+:class:`KerMLTransformer` (with the ``v_args`` wrappers) and the generated
+:class:`KerMLTableTransformer` are measured on the same lark tree, and embedded into the
+fused LALR parser on the same text. The best time of several runs is reported.
+Usage: ``python -m tools.kerml.bench_transform [-n NODES] [-r REPEAT]``.
+"""
+
+import argparse
+import gc
+import time
+from typing import Callable
+
+from lark import Lark, Tree
+from lark.grammar import Rule
+from lark.lexer import TerminalDef
+
+from pysysml.kerml.cst import open_kerml_lark_parser, KerMLTransformer, KerMLTableTransformer
+from tools.kerml.bench_parse import synthetic_model
+
+
+def _count_tree_nodes(tree: Tree) -> int:
+    return sum(1 for _ in tree.iter_subtrees())
+
+
+def _best_time(fn: Callable[[], object], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start_time = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start_time)
+    return min(times)
+
+
+def _fused_parser(transformer) -> Lark:
+    lalr_parser = open_kerml_lark_parser(start=['start'], parser='lalr', all_starts=False)
+    data, memo = lalr_parser.memo_serialize([TerminalDef, Rule])
+    return Lark._load_from_dict(data, memo, transformer=transformer)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('-n', '--nodes', type=int, default=100000, help='Minimal nodes of the lark tree.')
+    arg_parser.add_argument('-r', '--repeat', type=int, default=5, help='Runs of each measurement.')
+    args = arg_parser.parse_args()
+
+    lalr_parser = open_kerml_lark_parser(start=['start'], parser='lalr', all_starts=False)
+    nodes_per_package = _count_tree_nodes(lalr_parser.parse(synthetic_model(2), start='start')) - \
+                        _count_tree_nodes(lalr_parser.parse(synthetic_model(1), start='start'))
+    text = synthetic_model(-(-args.nodes // nodes_per_package))
+    tree = lalr_parser.parse(text, start='start')
+    print(f'Text size: {len(text)} chars, {len(text.splitlines())} lines, {_count_tree_nodes(tree)} tree nodes.')
+
+    transformers = [('v_args', KerMLTransformer), ('table', KerMLTableTransformer)]
+    assert KerMLTransformer().transform(tree) == KerMLTableTransformer().transform(tree)
+    print(f'{"Transformer":<14}{"Transform (s)":>16}{"Fused parse (s)":>18}')
+    for name, transformer_cls in transformers:
+        transform_time = _best_time(lambda: transformer_cls().transform(tree), args.repeat)
+        fused_parser = _fused_parser(transformer_cls())
+        fused_time = _best_time(lambda: fused_parser.parse(text, start='start'), args.repeat)
+        print(f'{name:<14}{transform_time:>16.3f}{fused_time:>18.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,14 @@
+import ast
+import dataclasses
+import keyword
 import os.path
 import pathlib
+import re
+import textwrap
+import typing
+from enum import Enum
 
-from pysysml.utils import list_rules_from_grammar
+from pysysml.utils import list_rules_from_grammar, file_sha256
 
 
 def _get_all_starts():
@@ -10,16 +17,236 @@ def _get_all_starts():
     return list_rules_from_grammar(grammar_code=grammar_code, show_alias=True)
 
 
+def _get_all_models():
+    from pysysml.kerml.cst import models
+    return sorted(
+        (getattr(models, name) for name in dir(models)
+         if isinstance(getattr(models, name), type) and dataclasses.is_dataclass(getattr(models, name))),
+        key=lambda cls: cls.__name__,
+    )
+
+
+def _is_leaf_type(tp) -> bool:
+    # the values of leaf types never contain any CST node
+    if tp in (str, bool, int, float, type(None)):
+        return True
+    elif isinstance(tp, type) and issubclass(tp, Enum):
+        return True
+    elif typing.get_origin(tp) in (typing.Union, tuple, list):
+        return all(_is_leaf_type(arg) for arg in typing.get_args(tp) if arg is not Ellipsis)
+    else:
+        return False
+
+
+def _node_fields(cls: type) -> typing.Tuple[str, ...]:
+    hints = typing.get_type_hints(cls)
+    return tuple(field.name for field in dataclasses.fields(cls) if field.init and not _is_leaf_type(hints[field.name]))
+
+
+def _method_name(cls: type) -> str:
+    name = re.sub(r'(?<=[a-z\d])([A-Z])', r'_\1', cls.__name__).lower()
+    return f'{name}_' if keyword.iskeyword(name) else name
+
+
+def _wrapped_tuple(prefix: str, items: typing.Tuple[str, ...]) -> str:
+    line = f'{prefix}{items!r},'
+    if len(line) <= 120:
+        return line
+    else:
+        body = textwrap.fill(', '.join(map(repr, items)) + ',', width=120,
+                             initial_indent=' ' * 8, subsequent_indent=' ' * 8)
+        return f'{prefix}(\n{body}\n    ),'
+
+
+_TABLE_TRANSFORMER_HEAD = '''
+
+def _counted(method: typing.Callable[[list], typing.Any], counts: array, rule_id: int):
+    def _callback(children: list):
+        counts[rule_id] += 1
+        return method(children)
+
+    return _callback
+
+
+class KerMLTableTransformer(KerMLTransformer):
+    """
+    Table-driven version of :class:`KerMLTransformer`, generated by ``tools/kerml/generate.py``.
+
+    Each rule method takes the list of the children directly, without the ``v_args``
+    wrappers and the temporary trees, and :meth:`transform` dispatches the rules with a
+    precomputed table of the bound methods. Do not edit this file, change
+    :class:`KerMLTransformer` and regenerate it instead.
+
+    :param visit_tokens: Visit the tokens, default is ``False``.
+    :type visit_tokens: bool
+    :param name_table: Table of the interned names, see :class:`KerMLTransformer`.
+    :type name_table: Optional[NameTable]
+    :param coverage: Count the hits of the rules into this object, see :class:`RuleCoverage`.
+        Default is ``None``, which means the hits are not counted.
+    :type coverage: Optional[RuleCoverage]
+    """
+
+    def __init__(self, visit_tokens: bool = False, name_table: typing.Optional[NameTable] = None,
+                 coverage: typing.Optional[RuleCoverage] = None):
+        KerMLTransformer.__init__(self, visit_tokens=visit_tokens, name_table=name_table)
+        self.coverage = coverage
+        if coverage is not None:
+            # the rule methods are wrapped only when the coverage is collected
+            for name in KERML_TABLE_RULES:
+                if name in coverage.rule_ids:
+                    setattr(self, name, _counted(getattr(self, name), coverage.counts, coverage.rule_ids[name]))
+        self._callbacks: typing.Dict[str, typing.Callable[[list], typing.Any]] = {
+            name: getattr(self, name) for name in KERML_TABLE_RULES
+        }
+
+    def transform(self, tree: Tree):
+        # post-order without recursion, the same as Transformer_NonRecursive.transform
+        rev_postfix = []
+        queue = [tree]
+        while queue:
+            item = queue.pop()
+            rev_postfix.append(item)
+            if isinstance(item, Tree):
+                queue += item.children
+
+        callbacks = self._callbacks
+        stack = []
+        for item in reversed(rev_postfix):
+            if isinstance(item, Tree):
+                size = len(item.children)
+                if size:
+                    children = stack[-size:]
+                    del stack[-size:]
+                else:
+                    children = []
+
+                callback = callbacks.get(item.data)
+                if callback is None:
+                    # rules which are not in the KerML grammar
+                    stack.append(self._call_userfunc(item, children))
+                    continue
+                try:
+                    stack.append(callback(children))
+                except GrammarError:
+                    raise
+                except Exception as err:
+                    raise VisitError(item.data, item, err)
+            elif self.__visit_tokens__ and isinstance(item, Token):
+                stack.append(self._call_userfunc_token(item))
+            else:
+                stack.append(item)
+
+        result, = stack
+        return result
+'''
+
+
+def _table_method(func: ast.FunctionDef, source: str) -> str:
+    # the rule method with v_args is rewritten to the method which takes the children directly,
+    # the source code of its body is kept as it is, except for the children of the tree
+    if any(isinstance(node, ast.Name) and node.id == 'children' for node in ast.walk(func)):
+        raise ValueError(f'Name \'children\' is already used in rule method {func.name!r}.')
+    body = '\n'.join(source.splitlines()[func.body[0].lineno - 1:func.end_lineno])
+    # ast.unparse is not available in python 3.8, the source code of the decorators is used without spaces
+    decorators = [re.sub(r'\s+', '', ast.get_source_segment(source, decorator)) for decorator in func.decorator_list]
+    if decorators == ['v_args(tree=True)']:
+        tree_arg = func.args.args[1].arg
+        body = re.sub(rf'\b{tree_arg}\.children\b', 'children', body)
+        lines = []
+    elif decorators == ['v_args(inline=True)']:
+        tree_arg = None
+        if func.args.kwonlyargs or func.args.kwarg or func.args.defaults:
+            raise ValueError(f'Unsupported arguments of inline rule method {func.name!r}.')
+        names = [arg.arg for arg in func.args.args[1:]]
+        targets = ', '.join(names) + (',' if len(names) == 1 else '')
+        lines = []
+        if func.args.vararg and names:
+            lines.append(f'{targets} = children[:{len(names)}]')
+            lines.append(f'{func.args.vararg.arg} = tuple(children[{len(names)}:])')
+        elif func.args.vararg:
+            lines.append(f'{func.args.vararg.arg} = tuple(children)')
+        elif names:
+            lines.append(f'{targets} = children')
+    else:
+        raise ValueError(f'Unsupported decorators of rule method {func.name!r} - {decorators!r}.')
+
+    code = '\n'.join([f'    def {func.name}(self, children: list):', *(' ' * 8 + line for line in lines), body])
+    new_func, = ast.parse(textwrap.dedent(code)).body
+    if tree_arg is not None and any(isinstance(node, ast.Name) and node.id == tree_arg for node in ast.walk(new_func)):
+        raise ValueError(f'Only {tree_arg}.children can be used in the table transformer, '
+                         f'but {tree_arg!r} is used in rule method {func.name!r}.')
+    return code
+
+
+def _table_transformer_code(all_starts) -> str:
+    from pysysml.kerml.cst.transforms import convert
+
+    source = pathlib.Path(convert.__file__).read_text()
+    module = ast.parse(source)
+    cls, = [node for node in module.body if isinstance(node, ast.ClassDef) and node.name == 'KerMLTransformer']
+    funcs = {node.name: node for node in cls.body if isinstance(node, ast.FunctionDef) and node.name in all_starts}
+    methods = []
+    for rule in all_starts:
+        if rule in funcs:
+            methods.append(_table_method(funcs[rule], source))
+        else:
+            # the same as KerMLTransTemplate, the tree is kept
+            methods.append(f'    def {rule}(self, children: list):\n        return Tree({rule!r}, children)')
+
+    # only the imported names used in the generated code are imported
+    used_names = {node.id for method in methods for node in ast.walk(ast.parse(textwrap.dedent(method)))
+                  if isinstance(node, ast.Name)}
+    used_names |= {'typing', 'Tree', 'Token', 'NameTable'}
+    imports = []
+    for node in module.body:
+        if isinstance(node, ast.Import):
+            aliases = [alias for alias in node.names if (alias.asname or alias.name) in used_names]
+            if aliases:
+                imports.append(f'import {", ".join(alias.name for alias in aliases)}')
+        elif isinstance(node, ast.ImportFrom):
+            aliases = [alias.name for alias in node.names if (alias.asname or alias.name) in used_names]
+            if aliases:
+                imports.append(' \\\n'.join(textwrap.wrap(
+                    f'from {"." * node.level}{node.module} import {", ".join(aliases)}',
+                    width=118, subsequent_indent=' ' * 4, break_long_words=False,
+                )))
+
+    rules = tuple(all_starts)
+    return '\n'.join([
+        *[line for line in imports if line.startswith('import ')],
+        'from array import array',
+        '',
+        'from lark.exceptions import GrammarError, VisitError',
+        *[line for line in imports if line.startswith('from lark')],
+        '',
+        'from .convert import KerMLTransformer',
+        'from .coverage import RuleCoverage',
+        *[line for line in imports if line.startswith('from .')],
+        '',
+        '# sha256 of convert.py, to find out whether this module is out of date',
+        f'KERML_TABLE_SOURCE_SHA256 = {file_sha256(convert.__file__)!r}',
+        '',
+        '# all the rules of the grammar, the positions are the rule ids in RuleCoverage',
+        f'KERML_TABLE_RULES = (',
+        textwrap.fill(', '.join(map(repr, rules)) + ',', width=120,
+                      initial_indent=' ' * 4, subsequent_indent=' ' * 4),
+        ')',
+        _TABLE_TRANSFORMER_HEAD,
+        '\n\n'.join(methods),
+        '',
+    ])
+
+
 def main():
     all_starts = _get_all_starts()
     from pysysml.kerml.cst.transforms import __file__ as _template_file
 
     template_file = os.path.normpath(os.path.join(_template_file, '..', 'template.py'))
     with open(template_file, 'w') as f:
-        print(f'from lark import Transformer, v_args, Tree', file=f)
+        print(f'from lark import Transformer_NonRecursive, v_args, Tree', file=f)
         print(f'', file=f)
         print(f'', file=f)
-        print(f'class KerMLTransTemplate(Transformer):', file=f)
+        print(f'class KerMLTransTemplate(Transformer_NonRecursive):', file=f)
         for s in all_starts:
             print(f'    @v_args(tree=True)', file=f)
             print(f'    def {s}(self, tree: Tree):', file=f)
@@ -48,6 +275,34 @@ def main():
             print(f'        return KerMLTransTemplate.{s}(self, tree)', file=f)
             print(f'', file=f)
 
+    table_file = os.path.normpath(os.path.join(_template_file, '..', 'table.py'))
+    with open(table_file, 'w') as f:
+        f.write(_table_transformer_code(all_starts))
+
+    all_models = _get_all_models()
+    from pysysml.kerml.cst.visitors import __file__ as _visitors_file
+
+    fields_file = os.path.normpath(os.path.join(_visitors_file, '..', 'fields.py'))
+    with open(fields_file, 'w') as f:
+        print(f'from typing import Dict, Tuple', file=f)
+        print(f'', file=f)
+        print(' \\\n'.join(textwrap.wrap(
+            f'from ..models import {", ".join(cls.__name__ for cls in all_models)}',
+            width=118, subsequent_indent=' ' * 4, break_long_words=False,
+        )), file=f)
+        print(f'', file=f)
+        print(f'# fields which may contain CST nodes, the fields of strings, booleans and enums are excluded', file=f)
+        print(f'CST_NODE_FIELDS: Dict[type, Tuple[str, ...]] = {{', file=f)
+        for cls in all_models:
+            print(_wrapped_tuple(f'    {cls.__name__}: ', _node_fields(cls)), file=f)
+        print(f'}}', file=f)
+        print(f'', file=f)
+        print(f'# names of the visiting methods', file=f)
+        print(f'CST_NODE_METHODS: Dict[type, str] = {{', file=f)
+        for cls in all_models:
+            print(f'    {cls.__name__}: {_method_name(cls)!r},', file=f)
+        print(f'}}', file=f)
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,23 @@
+import sys
+
+from pysysml.kerml.cst import open_kerml_lark_parser, list_kerml_files
+
+
+def main(paths):
+    files = list_kerml_files(paths)
+
+    parser = open_kerml_lark_parser(parser='auto')
+    for file in files:
+        with open(file, 'r', encoding='utf-8') as f:
+            text = f.read()
+        try:
+            parser.parse(text, start='start')
+        except Exception as err:
+            print(f'Failed to parse {file!r} - {err!r}', file=sys.stderr)
+
+    print(f'{len(files)} file(s) parsed.')
+    print(parser.report)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,24 @@
+import pathlib
+import re
+
+from pysysml.kerml.cst import list_reserved_words, __grammar_file__
+from pysysml.utils import words_regex
+
+_BASIC_NAME_PATTERN = re.compile(r'^BASIC_NAME:.*$', re.MULTILINE)
+
+
+def basic_name_definition() -> str:
+    reserved = words_regex(sorted(set(list_reserved_words())))
+    return f'BASIC_NAME: /(?!{reserved}(?![a-zA-Z0-9_]))/ BASIC_INITIAL_CHARACTER BASIC_NAME_CHARACTER*'
+
+
+def main():
+    grammar_file = pathlib.Path(__grammar_file__)
+    grammar_code = grammar_file.read_text()
+    grammar_code, count = _BASIC_NAME_PATTERN.subn(lambda x: basic_name_definition(), grammar_code)
+    assert count == 1, f'Exactly one BASIC_NAME definition expected, but {count!r} found.'
+    grammar_file.write_text(grammar_code)
+
+
+if __name__ == '__main__':
+    main()